@@ -29,12 +29,12 @@
 AccountHistory
 ==============
 """
-from typing import Iterable
+from typing import Dict
 
 import numpy as np
 from scipy.stats import skew, kurtosis
 
-from hokohoko.entities import Assessor
+from hokohoko.entities import Account, Assessor
 
 
 class AccountHistory(Assessor):
@@ -54,18 +54,25 @@ class AccountHistory(Assessor):
         :type parameters:   str
         """
         super().__init__(parameters)
+        self._equity: Dict[int, np.float64] = {}
 
-    def analyse(self, data: Iterable) -> None:
+    def consume(self, period_id: int, account: Account) -> None:
         """
-        Receives a list of period_results from the Simulator, and presents them in a user-friendly fashion.
-
-        :param data:    A list of period_results from the process Pool.
-        :type data:     Iterable[multiprocessing.pool.AsyncResult[hokohoko.entities.Account]]
+        Receives a Period's Account from the Simulator, keeping only its final equity.
 
+        :param period_id:   The Period.
+        :type period_id:    int
 
+        :param account:     The Period's Account.
+        :type account:      hokohoko.entities.Account
+        """
+        self._equity[period_id] = np.float64(account.equity[-1])
 
+    def finalize(self) -> None:
+        """
+        Presents every Period's results in a user-friendly fashion.
         """
-        results = np.array([a.get()[1].equity[-1] for a in data], dtype=np.float64)
+        results = np.array([self._equity[i] for i in sorted(self._equity)], dtype=np.float64)
         for i, r in enumerate(results):
             print(f"{i:03d}:{r:12.2f}")
         print("\nOverall\n-------")
@@ -29,17 +29,20 @@ SpeculativeAccuracy
 ===================
 """
 from argparse import ArgumentParser
-from typing import Iterable, List, NamedTuple, Union, Optional
+from typing import List, NamedTuple, Union, Optional
 
 import numpy as np
 from scipy.stats import kurtosis, skew
 
 from hokohoko import utils
-from hokohoko.entities import Assessor, Direction, Position, Status
+from hokohoko.entities import Account, Assessor, Direction, Order, Position, Status
 
 
 class _CalculatedAccuracy(NamedTuple):
-    history: Position
+    # The Order and Status, rather than the Position, which may be a
+    # view that keeps its whole PositionBook alive.
+    order: Order
+    status: Status
     max_profit: Union[float, np.float32]
     max_loss: Union[float, np.float32]
     actual_profit: Union[float, np.float32]
@@ -130,99 +133,115 @@ class SpeculativeAccuracy(Assessor):
         # 2. Stop-loss ratio
         self._show_results = self.parameters.show_results
 
-    def analyse(self, period_results: Iterable) -> None:
+        # 3. Collated results, per Period.
+        self._periodic = {}
+        self._symbols = {}
+
+    def consume(self, period: int, account: Account) -> None:
         """
-        This is the routine that is called by Hokohoko after initialization. It calculates and collates the provided
-        account data into an overview table.
+        This is the routine that is called by Hokohoko as each Period finishes. It calculates and collates the
+        Period's Positions, so the Account itself needn't be kept.
+
+        :param period:      The Period.
+        :type period:       int
 
-        :param period_results:    The accounts from benchmarking.
-        :type period_results:     Iterable[multiprocessing.pool.AsyncResult[hokohoko.entities.Account]]
+        :param account:     The Period's Account.
+        :type account:      hokohoko.entities.Account
 
         """
+        periodic = self._periodic
+        periodic[period] = []
+        self._symbols[period] = list(account.symbol_ids)
+        maxes = {}
+        for symbol in account.symbol_ids:
+            maxes[symbol] = 0
+
+        if self._show_results:
+            print()
+            print(
+                "{:>4}\t{:8}\t{:8}\t{:10}\t{:>12}\t{:16}\t{:>12}\t{:>12}\t{:>12}\t{:>12}\t{:>12}\t{:>12}"
+                "\t{:>12}".format(
+                    "Period",
+                    "Order ID",
+                    "Symbol",
+                    "Trade Type",
+                    "Order Time",
+                    "Result",
+                    "Open Time",
+                    "Close Time",
+                    "Profit",
+                    "Max Profit",
+                    "Max Loss",
+                    "Accuracy %",
+                    "Real Profit"
+                )
+            )
+            print("-" * 160)
 
-        periodic = {}
-        symbolic = {}
+        for h_id, history in account.history.items():
+            max_profit, max_loss, actual_profit = SpeculativeAccuracy.calculate_rate_changes(history)
+            maxes[history.order.symbol_id] = max(maxes[history.order.symbol_id], max_profit)
+            perf = SpeculativeAccuracy.calculate_accuracy(max_profit, max_loss, actual_profit, history.status)
 
-        for pr in period_results:
-            period, account = pr.get()
-            periodic[period] = []
-            maxes = {}
-            for symbol in account.symbol_ids:
-                if symbol not in symbolic:
-                    symbolic[symbol] = []
-                maxes[symbol] = 0
+            # Collate stats.
+            periodic[period].append(_CalculatedAccuracy(history.order, history.status, max_profit, max_loss, actual_profit, perf))
 
             if self._show_results:
-                print()
-                print(
-                    "{:>4}\t{:8}\t{:8}\t{:10}\t{:>12}\t{:16}\t{:>12}\t{:>12}\t{:>12}\t{:>12}\t{:>12}\t{:>12}"
-                    "\t{:>12}".format(
-                        "Period",
-                        "Order ID",
-                        "Symbol",
-                        "Trade Type",
-                        "Order Time",
-                        "Result",
-                        "Open Time",
-                        "Close Time",
-                        "Profit",
-                        "Max Profit",
-                        "Max Loss",
-                        "Accuracy %",
-                        "Real Profit"
-                    )
-                )
-                print("-" * 160)
-
-            for h_id, history in account.history.items():
-                max_profit, max_loss, actual_profit = Accuracy.calculate_rate_changes(history)
-                maxes[history.order.symbol_id] = max(maxes[history.order.symbol_id], max_profit)
-                perf = Accuracy.calculate_accuracy(max_profit, max_loss, actual_profit, history.status)
-
-                # Collate stats.
-                periodic[period].append(_CalculatedAccuracy(history, max_profit, max_loss, actual_profit, perf))
-
-                if self._show_results:
-                    print(str.format(
-                        "{:>4}\t{:8}\t{:8}\t{:10}\t{:12.0f}\t{:16}\t{:12.0f}\t{:12.0f}\t{:12.5f}\t{:12.5f}\t{:12.5f}"
-                        "\t{:12.5f}\t{:12.5f}",
-                        period,
-                        h_id,
-                        utils.convert_id_to_symbol(history.order.symbol_id),
-                        history.order.direction.name,
-                        history.future.start,
-                        history.status.name,
-                        history.open_time,
-                        history.close_time,
-                        actual_profit,
-                        max_profit,
-                        max_loss,
-                        perf,
-                        history.final_value - history.initial_value
-                    ))
-
-            # Normalise results, and collate into per_symbol.
-            for i in range(len(periodic[period])):
-                ca = periodic[period][i]
-                m_profit = ca.max_profit
-                t_perf = ca.performance
-                symbol = ca.history.order.symbol_id
-                if m_profit > 0:
-                    t_perf = ca.performance * m_profit / maxes[symbol]
-                    periodic[period][i] = _CalculatedAccuracy(ca.history, ca.max_profit, ca.max_loss, ca.actual_profit, t_perf)
-                symbolic[symbol].append(periodic[period][i])
+                print(str.format(
+                    "{:>4}\t{:8}\t{:8}\t{:10}\t{:12.0f}\t{:16}\t{:12.0f}\t{:12.0f}\t{:12.5f}\t{:12.5f}\t{:12.5f}"
+                    "\t{:12.5f}\t{:12.5f}",
+                    period,
+                    h_id,
+                    utils.convert_id_to_symbol(history.order.symbol_id),
+                    history.order.direction.name,
+                    history.future.start,
+                    history.status.name,
+                    history.open_time,
+                    history.close_time,
+                    actual_profit,
+                    max_profit,
+                    max_loss,
+                    perf,
+                    history.final_value - history.initial_value
+                ))
+
+        # Normalise results.
+        for i in range(len(periodic[period])):
+            ca = periodic[period][i]
+            m_profit = ca.max_profit
+            t_perf = ca.performance
+            symbol = ca.order.symbol_id
+            if m_profit > 0:
+                t_perf = ca.performance * m_profit / maxes[symbol]
+                periodic[period][i] = ca._replace(performance=t_perf)
+
+    def finalize(self) -> None:
+        """
+        This is the routine that is called by Hokohoko once every Period has been consumed. It outputs the collated
+        results into an overview table.
+
+        """
+        # Collate into per_symbol, in Period order.
+        periodic = dict(sorted(self._periodic.items()))
+        symbolic = {}
+        for period, part in periodic.items():
+            for symbol in self._symbols[period]:
+                if symbol not in symbolic:
+                    symbolic[symbol] = []
+            for ca in part:
+                symbolic[ca.order.symbol_id].append(ca)
 
         combined = []
-        Accuracy._output_header("Symbolic Results:")
+        SpeculativeAccuracy._output_header("Symbolic Results:")
         for key, part in symbolic.items():
-            Accuracy._output_collated(part, f"{utils.convert_id_to_symbol(key)}")
-        Accuracy._output_tail()
-        Accuracy._output_header("Period Results")
+            SpeculativeAccuracy._output_collated(part, f"{utils.convert_id_to_symbol(key)}")
+        SpeculativeAccuracy._output_tail()
+        SpeculativeAccuracy._output_header("Period Results")
         for key, part in periodic.items():
-            combined.append(Accuracy._output_collated(part, f"{key:03d}"))
-        Accuracy._output_tail()
+            combined.append(SpeculativeAccuracy._output_collated(part, f"{key:03d}"))
+        SpeculativeAccuracy._output_tail()
 
-        Accuracy._output_total(combined, "Overall Results:")
+        SpeculativeAccuracy._output_total(combined, "Overall Results:")
 
     @staticmethod
     def _output_total(combined: list, name: str):
@@ -296,27 +315,27 @@ class SpeculativeAccuracy(Assessor):
         print(f"{kurtosis([c.performance for c in collated]) if len(collated) > 1 else 0.0:12.5f}|", end='')
 
         # Profit
-        Accuracy._output_mean([c.performance for c in collated if c.max_profit > 0])
-        Accuracy._output_mean([c.performance for c in collated if c.max_profit <= 0])
+        SpeculativeAccuracy._output_mean([c.performance for c in collated if c.max_profit > 0])
+        SpeculativeAccuracy._output_mean([c.performance for c in collated if c.max_profit <= 0])
 
         # ALL
         print("|", end="")
         for status in Status:
-            Accuracy._output_mean([c.performance for c in collated if c.history.status == status])
+            SpeculativeAccuracy._output_mean([c.performance for c in collated if c.status == status])
 
         # BUY
         print("|", end="")
-        buy = [c for c in collated if c.history.order.direction in (Direction.BUY, Direction.DONT_BUY)]
-        Accuracy._output_mean([b.performance for b in buy])
+        buy = [c for c in collated if c.order.direction in (Direction.BUY, Direction.DONT_BUY)]
+        SpeculativeAccuracy._output_mean([b.performance for b in buy])
         for status in Status:
-            Accuracy._output_mean([b.performance for b in buy if b.history.status == status])
+            SpeculativeAccuracy._output_mean([b.performance for b in buy if b.status == status])
 
         # SELL
         print("|", end="")
-        sell = [c for c in collated if c.history.order.direction in (Direction.SELL, Direction.DONT_SELL)]
-        Accuracy._output_mean([s.performance for s in sell])
+        sell = [c for c in collated if c.order.direction in (Direction.SELL, Direction.DONT_SELL)]
+        SpeculativeAccuracy._output_mean([s.performance for s in sell])
         for status in Status:
-            Accuracy._output_mean([s.performance for s in sell if s.history.status == status])
+            SpeculativeAccuracy._output_mean([s.performance for s in sell if s.status == status])
         print("|")
 
         return mean
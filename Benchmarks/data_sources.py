@@ -0,0 +1,93 @@
+#   Benchmarks/data_sources.py
+#
+#   Copyright 2020 Neil Bradley
+#
+#   This file is part of Hokohoko.
+#
+#   Hokohoko is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   Hokohoko is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY# without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with Hokohoko.  If not, see <https://www.gnu.org/licenses/>.
+#
+#   ====================================================================
+#
+#   Measures how long Data sources take to open, load everything, and
+#   load random ranges of minutes. Convert the data.npz first, e.g.:
+#
+#       PYTHONPATH=Hokohoko python -m hokohoko.convert --sqlite data.npz data.sqlite
+#       PYTHONPATH=Hokohoko python Benchmarks/data_sources.py \
+#           -D "hokohoko.standard.Npz data.npz" \
+#           -D "hokohoko.standard.SQLite data.sqlite" -m 10080
+#
+
+import sys
+import time
+from argparse import ArgumentParser
+
+import numpy as np
+
+from hokohoko import defaults, utils
+
+
+def _time(data: str, subset, origin=0, end=None, load=True) -> float:
+    """
+    Opens a Data source over [origin, end).
+
+    :returns:   The seconds taken.
+    """
+    data_class, data_parameters = data.split(maxsplit=1)
+    started = time.perf_counter()
+    with utils.get_fq_class(data_class)(data_parameters, subset, origin, end, None, load):
+        pass
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Measures Data source load times.")
+    parser.add_argument(
+        "-D", "--data",
+        help="Data Source to use, plus configuration string. May be repeated.",
+        type=str,
+        action="append"
+    )
+    parser.add_argument(
+        "-S", "--subset",
+        help="Symbol subset to use.",
+        type=str,
+        default=defaults.DEFAULT_DATA_SUBSET
+    )
+    parser.add_argument(
+        "-m", "--minutes",
+        help="Minutes in each random range.",
+        type=int,
+        default=defaults.DEFAULT_PAST_MINUTES
+    )
+    parser.add_argument(
+        "-n", "--ranges",
+        help="Number of random ranges to load.",
+        type=int,
+        default=20
+    )
+    args = parser.parse_args()
+    sources = args.data or [defaults.DEFAULT_DATA]
+
+    _data_class, _data_parameters = sources[0].split(maxsplit=1)
+    with utils.get_fq_class(_data_class)(_data_parameters, None, load=False) as _data:
+        _minutes = _data.get_minutes()
+    _origins = np.random.default_rng(0).integers(0, max(1, _minutes - args.minutes), args.ranges)
+
+    print("source\t\t\t\topen (s)\tall (s)\t\trange (s)")
+    for source in sources:
+        opened = _time(source, args.subset, load=False)
+        loaded = _time(source, args.subset)
+        ranges = [_time(source, args.subset, int(o), int(o) + args.minutes) for o in _origins]
+        print(f"{source.split()[0]:32s}{opened:.3f}\t\t{loaded:.3f}\t\t{np.mean(ranges):.4f}")
+    sys.exit()
@@ -0,0 +1,129 @@
+#   Benchmarks/startup.py
+#
+#   Copyright 2020 Neil Bradley
+#
+#   This file is part of Hokohoko.
+#
+#   Hokohoko is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   Hokohoko is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY# without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with Hokohoko.  If not, see <https://www.gnu.org/licenses/>.
+#
+#   ====================================================================
+#
+#   Measures how long each Period takes to reach its first Bar, as the
+#   number of concurrent processes grows, with and without the shared
+#   data lock. Run with:
+#
+#       PYTHONPATH=Hokohoko python Benchmarks/startup.py \
+#           -D "hokohoko.standard.Npz data.npz" -c 1,2,4,8
+#
+
+import multiprocessing as mp
+import sys
+import time
+from argparse import ArgumentParser
+
+from hokohoko import Hokohoko, defaults, utils
+from hokohoko._period import Period, PeriodConfig, get_past_minutes
+from hokohoko.entities import Config
+
+
+def _first_bar(config: Config, period_config: PeriodConfig, started: float) -> float:
+    """
+    Opens a Period's data as ``_run.run`` does, and reads its first Bar.
+
+    :returns:   The seconds from ``started`` until the first Bar.
+    """
+    with utils.get_fq_class(config.data_class)(
+            config.data_parameters,
+            period_config.symbols.required_symbols,
+            period_config.origin,
+            period_config.end,
+            Period.data_lock
+    ) as source:
+        get_past_minutes(source, period_config.origin, period_config.origin + config.past_minutes)
+    return time.time() - started
+
+
+def _measure(config: Config, period_configs, processes: int, lock: bool) -> list:
+    """
+    Starts one Period per process at once.
+
+    :returns:   Each Period's time to its first Bar.
+    """
+    with mp.Pool(
+        processes=processes,
+        initializer=Period.init,
+        initargs=(mp.Lock() if lock else None, mp.Lock())
+    ) as pool:
+        # Start every process before timing.
+        pool.map(time.sleep, [0.1] * processes)
+        started = time.time()
+        return pool.starmap(_first_bar, [(config, pc, started) for pc in period_configs[:processes]])
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Measures each Period's time to its first Bar.")
+    parser.add_argument(
+        "-D", "--data",
+        help="Data Source to use, plus configuration string.",
+        type=str,
+        default=defaults.DEFAULT_DATA
+    )
+    parser.add_argument(
+        "-S", "--subset",
+        help="Symbol subset to use.",
+        type=str,
+        default=defaults.DEFAULT_DATA_SUBSET
+    )
+    parser.add_argument(
+        "-c", "--process-counts",
+        help="Comma-separated process counts to measure.",
+        type=str,
+        default="1,2,4,8"
+    )
+    parser.add_argument(
+        "--training-minutes",
+        help="Override training size.",
+        type=int,
+        default=defaults.DEFAULT_TRAINING_MINUTES
+    )
+    parser.add_argument(
+        "--test-minutes",
+        help="Override test size.",
+        type=int,
+        default=defaults.DEFAULT_TEST_MINUTES
+    )
+    args = parser.parse_args()
+
+    mp.set_start_method('spawn')
+    data_class, data_parameters = args.data.split(maxsplit=1)
+    counts = [int(c) for c in args.process_counts.split(",")]
+    _config = Config(
+        data_class=data_class,
+        data_parameters=data_parameters,
+        data_subset=args.subset,
+        period_count=max(counts),
+        training_minutes=args.training_minutes,
+        test_minutes=args.test_minutes
+    )
+    with utils.get_fq_class(_config.data_class)(_config.data_parameters, None, load=False) as data:
+        _period_configs = Hokohoko._calculate_periods(data.get_minutes(), _config, data.get_symbol_ids())
+    if len(_period_configs) == 0:
+        sys.exit("No Periods fit in the data. Try smaller --training-minutes or --test-minutes.")
+
+    print("processes\tlock\tmean (s)\tlast (s)")
+    for count in counts:
+        for _lock in (True, False):
+            times = _measure(_config, _period_configs, count, _lock)
+            print(f"{count}\t\t{'on' if _lock else 'off'}\t{sum(times) / len(times):.3f}\t\t{max(times):.3f}")
+    sys.exit()
@@ -49,7 +49,9 @@ should need to change are:
                     any required parameters.
     process_count   Tune for how many cores you are willing to use.
                     Hokohoko uses roughly 1GB of RAM, plus the
-                    Predictor's internal state, per core.
+                    Predictor's internal state, per core. With
+                    shared_memory, the data is loaded once and shared
+                    by all cores, leaving just the Predictor's state.
 
 and:
 
@@ -67,22 +69,29 @@ and:
 """
 import cProfile
 import multiprocessing as mp
+import os
 import sys
+import time
 from argparse import ArgumentParser
 from datetime import datetime
+from functools import partial
 from timeit import default_timer
 from typing import Iterable, List, Tuple
 
 import numpy as np
 
-from hokohoko import _run, defaults, utils
+from hokohoko import _run, _schedule, defaults, utils
 from hokohoko._period import Period, PeriodConfig
-from hokohoko.entities import Account, Config
+from hokohoko._schedule import Timing
+from hokohoko.entities import Config, PackedAccount
+from hokohoko.standard import Preloaded, SharedMemory
 
 
 @utils.generate_tests("""
     returns a HokohokoConfig.
     defaults are set correctly.
+    rejects --window-minutes with --range-index or --planar.
+    maps --data-lock auto, on and off to None, True and False.
 """)
 def _make_config_from_arguments() -> Config:
     """
@@ -169,8 +178,98 @@ def _make_config_from_arguments() -> Config:
         type=int,
         default=0
     )
+    parser.add_argument(
+        "--engine",
+        help="Simulation engine to use. loop and vectorized give the same results. resolved "
+             "doesn't: it decides each Position on its own, so its results differ whenever "
+             "Positions overlap.",
+        type=str,
+        choices=["loop", "vectorized", "resolved"],
+        default=defaults.DEFAULT_ENGINE
+    )
+    parser.add_argument(
+        "--account-dtype",
+        help="Type to store balance and equity as.",
+        type=str,
+        choices=["float64", "float32"],
+        default=defaults.DEFAULT_ACCOUNT_DTYPE
+    )
+    parser.add_argument(
+        "--account-stride",
+        help="Keep balance and equity once every this many minutes.",
+        type=int,
+        default=defaults.DEFAULT_ACCOUNT_STRIDE
+    )
+    parser.add_argument(
+        "--range-index",
+        help="Index the data for constant time high/low/volume range queries.",
+        action='store_true'
+    )
+    parser.add_argument(
+        "--shared-memory",
+        help="Load the data once, and share it between processes.",
+        action='store_true'
+    )
+    parser.add_argument(
+        "--planar",
+        help="Copy the data into one contiguous array per field.",
+        action='store_true'
+    )
+    parser.add_argument(
+        "--window-minutes",
+        help="Load each Period's data in chunks of this many minutes.",
+        type=int,
+        default=defaults.DEFAULT_WINDOW_MINUTES
+    )
+    parser.add_argument(
+        "--data-lock",
+        help="Serialise opening the data between processes.",
+        type=str,
+        choices=["auto", "on", "off"],
+        default="auto"
+    )
+    parser.add_argument(
+        "--cache-bytes",
+        help="Keep up to this many bytes of data per process, for later Periods.",
+        type=int,
+        default=defaults.DEFAULT_CACHE_BYTES
+    )
+    parser.add_argument(
+        "--prefetch",
+        help="Read this many ranges ahead on a background thread.",
+        type=int,
+        default=defaults.DEFAULT_PREFETCH
+    )
+    parser.add_argument(
+        "--schedule",
+        help="Order to run Periods in: by id, or the most expensive first.",
+        type=str,
+        choices=["ordered", "cost"],
+        default=defaults.DEFAULT_SCHEDULE
+    )
+    parser.add_argument(
+        "--timings",
+        help="File of Period timings, read to estimate costs and written after.",
+        type=str,
+        default=defaults.DEFAULT_TIMINGS
+    )
+    parser.add_argument(
+        "--start-method",
+        help="How to start processes. fork shares the data loaded once, copy-on-write.",
+        type=str,
+        choices=["spawn", "fork", "forkserver"],
+        default=defaults.DEFAULT_START_METHOD
+    )
+    parser.add_argument(
+        "--preload",
+        help="Module for the forkserver to import once. May be repeated.",
+        type=str, action='append',
+        default=defaults.DEFAULT_PRELOAD
+    )
 
     args = parser.parse_args()
+    if args.window_minutes is not None and (args.range_index or args.planar):
+        parser.error("--window-minutes can't be combined with --range-index or --planar")
 
     return Config(
         predictor_class=args.predictor,
@@ -186,7 +285,21 @@ def _make_config_from_arguments() -> Config:
         training_minutes=args.training_minutes,
         test_minutes=args.test_minutes,
         profiling=args.profiling,
-        verbosity=args.verbosity
+        verbosity=args.verbosity,
+        engine=args.engine,
+        account_dtype=args.account_dtype,
+        account_stride=args.account_stride,
+        range_index=args.range_index,
+        shared_memory=args.shared_memory,
+        planar=args.planar,
+        window_minutes=args.window_minutes,
+        data_lock={"auto": defaults.DEFAULT_DATA_LOCK, "on": True, "off": False}[args.data_lock],
+        cache_bytes=args.cache_bytes,
+        prefetch=args.prefetch,
+        schedule=args.schedule,
+        timings=args.timings,
+        start_method=args.start_method,
+        preload=args.preload
     )
 
 
@@ -199,6 +312,7 @@ def _make_config_from_arguments() -> Config:
     all PeriodConfigs are unique.
     doesn't over-saturate.
     periods include the available symbols.
+    periods include the symbol plan.
     respects load_limit if possible.
 """)
 def _calculate_periods(
@@ -239,26 +353,28 @@ def _calculate_periods(
 
     step = int((minutes - period_length) / period_count)
     offset = int(step / 2) + config.past_minutes
+    symbols = _run.plan_symbols(config.data_subset, available_symbols)
     return [
         PeriodConfig(
             i,
             i * step + offset,
             i * step + config.training_minutes + offset,
             i * step + period_length + offset,
-            available_symbols
+            available_symbols,
+            symbols
         )
         for i in range(period_count)
     ]
 
 
 @utils.generate_tests("""
-    returns an account
+    returns a packed account
     generates profiles if configured.
 """)
 def _process(
         shared_config: Config,
         config: PeriodConfig
-) -> Tuple[int, Account]:
+) -> Tuple[int, PackedAccount]:
     """
     Runs a Period with the given configuration.
 
@@ -268,8 +384,9 @@ def _process(
     :param config:          Per-Period configuration options.
     :type config:           hokohoko._period.PeriodConfig
 
-    :return:                The simulated Account histories, per-Period.
-    :rtype:                 Tuple[int, hokohoko.entities.Account]
+    :return:                The simulated Account histories, per-Period,
+                            packed to send back to the parent.
+    :rtype:                 Tuple[int, hokohoko.entities.PackedAccount]
     """
     period = Period()
 
@@ -279,12 +396,62 @@ def _process(
         prof = cProfile.Profile()
         account = prof.runcall(_run.run, period, shared_config, config)
         prof.dump_stats(f'profile_simulate_{config.period_id: 03d}')
-    return config.period_id, account
+    return config.period_id, PackedAccount.pack(account)
+
+
+@utils.generate_tests("""
+    runs the Periods in the order given.
+    returns when and in which process each Period ran.
+""")
+def _process_group(
+        shared_config: Config,
+        configs: List[PeriodConfig]
+) -> List[Tuple[int, PackedAccount, Timing]]:
+    """
+    Runs a group of Periods, one after another, in this process.
+
+    :param shared_config:   Global configuration options.
+    :type shared_config:    hokohoko.entities.Config
+
+    :param configs:         Per-Period configuration options.
+    :type configs:          list[hokohoko._period.PeriodConfig]
+
+    :return:                The result of ``_process`` for each Period,
+                            with when it ran.
+    :rtype:                 list[Tuple[int, hokohoko.entities.PackedAccount, hokohoko._schedule.Timing]]
+    """
+    results = []
+    for config in configs:
+        started = time.time()
+        period_id, packed = _process(shared_config, config)
+        results.append((period_id, packed, Timing(period_id, os.getpid(), started, time.time())))
+    return results
+
+
+@utils.generate_tests("""
+    uses the data source's needs_lock by default.
+    lets data_lock override needs_lock.
+""")
+def _needs_data_lock(config: Config) -> bool:
+    """
+    Works out whether Periods must take turns opening the data.
+
+    :param config:  The global configuration options.
+    :type config:   hokohoko.entities.Config
+
+    :returns:       ``config.data_lock``, or if that is None, the data
+                    source's ``needs_lock``.
+    :rtype:         bool
+    """
+    if config.data_lock is not None:
+        return config.data_lock
+    return utils.get_fq_class(config.data_class).needs_lock
 
 
 @utils.generate_tests("""
     a known benchmark with --debug produces an account with known results.
     a known simulation with --debug produces an account with known results.
+    raises an error if window_minutes is combined with range_index or planar.
 """)
 def run(config: Config) -> None:
     """
@@ -294,8 +461,18 @@ def run(config: Config) -> None:
     :type config:   hokohoko.entities.Config
     """
     # 0. Housekeeping.
-    if mp.get_start_method(True) is None:
-        mp.set_start_method('spawn')
+    if config.window_minutes is not None and (config.range_index or config.planar):
+        raise ValueError("window_minutes can't be combined with range_index or planar")
+    if config.start_method is not None:
+        context = mp.get_context(config.start_method)
+    else:
+        if mp.get_start_method(True) is None:
+            mp.set_start_method('spawn')
+        context = mp.get_context()
+    if config.start_method == 'forkserver':
+        context.set_forkserver_preload(list(config.preload) + [
+            c.rsplit('.', 1)[0] for c in (utils.split_class_options(config.predictor_class)[0], config.data_class)
+        ])
 
     if config.verbosity > 0:
         print(config)
@@ -312,19 +489,86 @@ def run(config: Config) -> None:
     ) as data:
         period_configs = _calculate_periods(data.get_minutes(), config, data.get_symbol_ids())
 
-    # 2. Run the processes.
-    with mp.Pool(
-        processes=config.process_count,
-        initializer=Period.init,
-        initargs=(mp.Lock(), mp.Lock())
-    ) as pool:
-        accounts = [pool.apply_async(_process, args=[config, pc]) for pc in period_configs]
-        pool.close()
-        pool.join()
+    # 1a. Work out the order to run them in, from any previous timings.
+    timings = _schedule.load_timings(config.timings)
+    tasks = _schedule.schedule(config, period_configs, timings)
+    keys = {pc.period_id: _schedule.timing_key(config, pc) for pc in period_configs}
+
+    # 1b. Optionally load every Period's data once, and publish it for
+    #     the processes to attach to. Forked processes see it already.
+    block = preloaded = None
+    if (config.shared_memory or context.get_start_method() == 'fork') and len(period_configs) > 0:
+        with utils.get_fq_class(config.data_class)(
+                config.data_parameters,
+                period_configs[0].symbols.required_symbols,
+                min(pc.origin for pc in period_configs),
+                max(pc.end for pc in period_configs)
+        ) as data:
+            if config.shared_memory:
+                block, parameters = SharedMemory.publish(data)
+                config = config._replace(data_class='hokohoko.standard.SharedMemory', data_parameters=parameters)
+            else:
+                preloaded = Preloaded.publish(data)
+                config = config._replace(data_class='hokohoko.standard.Preloaded', data_parameters=preloaded)
+
+    # 1c. Only serialise opening the data if needed.
+    data_lock = _needs_data_lock(config)
+
+    # 2. Run the processes, handing each Account to the Assessors as its
+    #    Period finishes, so none are kept longer than they need. They
+    #    come back packed, and their Positions are only unpacked if an
+    #    Assessor reads them.
+    transferred = 0
+    ran: List[Timing] = []
+    try:
+        pool_started = time.time()
+        with context.Pool(
+            processes=config.process_count,
+            initializer=Period.init,
+            initargs=(context.Lock() if data_lock else None, context.Lock(), config.cache_bytes)
+        ) as pool:
+            # Ordered hands the Accounts to the Assessors by id, as
+            # they were before scheduling.
+            imap = pool.imap if config.schedule == "ordered" else pool.imap_unordered
+            for results in imap(partial(_process_group, config), tasks):
+                for period_id, packed, timing in results:
+                    ran.append(timing)
+                    transferred += packed.nbytes
+                    if config.verbosity > 0:
+                        print(f"Period {period_id: 3d} returned {packed.nbytes} bytes.")
+                    if assessors:
+                        account = packed.unpack()
+                        for a in assessors:
+                            a.consume(period_id, account)
+                        del account
+                del results
+            pool_finished = time.time()
+            pool.close()
+            pool.join()
+    finally:
+        if block is not None:
+            block.close()
+            block.unlink()
+        if preloaded is not None:
+            Preloaded.withdraw(preloaded)
 
     # 3. Analyse the trace.
     for a in assessors:
-        a.analyse(accounts)
+        a.finalize()
+
+    # 4. Report how long the processes took to start and sat idle, and
+    #    keep the timings.
+    if len(ran) > 0:
+        started = min(t.started for t in ran)
+        print(f"Processes started in {started - pool_started: .2f} seconds.")
+        idle = _schedule.idle_times(ran, started, pool_finished, config.process_count)
+        for pid, seconds in idle.items():
+            name = "Unused processes" if pid is None else f"Process {pid}"
+            print(f"{name} idle for {seconds: .1f} of {pool_finished - started: .1f} seconds.")
+        print(f"Returned {transferred / len(ran):.0f} bytes per Period.")
+    if config.timings is not None:
+        timings.update({keys[t.period_id]: t.finished - t.started for t in ran})
+        _schedule.save_timings(config.timings, timings)
 
     end_time = default_timer()
     print(f"Finished in {end_time - start_time: .1f} seconds at {datetime.now()}.")
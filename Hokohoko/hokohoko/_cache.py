@@ -0,0 +1,321 @@
+#   hokohoko/_cache.py
+#
+#   Copyright 2020 Neil Bradley
+#
+#   This file is part of Hokohoko.
+#
+#   Hokohoko is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   Hokohoko is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY# without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with Hokohoko.  If not, see <https://www.gnu.org/licenses/>.
+#
+#   ====================================================================
+#
+#   Keeps the data loaded by a process, for later Periods to reuse.
+#
+
+import multiprocessing as mp
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko.entities import Data
+
+
+class CacheEntry(NamedTuple):
+    """
+    The data of one source, over the minutes [origin, end).
+    """
+    origin: int
+    end: int
+    symbol_ids: np.ndarray
+    timestamps: np.ndarray
+    data: np.ndarray
+
+
+class DataCache:
+    """
+    A least recently used cache of loaded data, bounded in bytes. Each
+    process in the pool has one, from ``Period.init``, so the Periods it
+    runs one after another can reuse each other's data.
+
+    Entries are keyed by the data source, its parameters and the symbols
+    requested, and each covers a range of minutes. The arrays are
+    read-only, as they are shared between Periods.
+    """
+
+    @utils.generate_tests("raises an error if max_bytes is negative")
+    def __init__(self, max_bytes: int) -> None:
+        """
+        :param max_bytes:   The most data to keep, in bytes.
+        :type max_bytes:    int
+        """
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes must not be negative: {max_bytes}")
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    @utils.generate_tests("""
+        returns None if no entry has the key
+        returns an entry covering the range
+        prefers an entry covering the range over one overlapping it
+        returns an entry overlapping the range
+        marks the entry as most recently used
+    """)
+    def find(self, key: Hashable, origin: int, end: int) -> Optional[CacheEntry]:
+        """
+        Finds the entry with the most minutes in [origin, end).
+
+        :param key:     The source, parameters and symbols.
+        :type key:      Hashable
+
+        :param origin:  The first minute wanted.
+        :type origin:   int
+
+        :param end:     Up to this minute.
+        :type end:      int
+
+        :returns:       The entry, or ``None`` if none overlap.
+        :rtype:         hokohoko._cache.CacheEntry
+        """
+        best, best_minutes = None, 0
+        for (k, e_origin, e_end), entry in self._entries.items():
+            minutes = min(end, e_end) - max(origin, e_origin)
+            if k == key and minutes > best_minutes:
+                best, best_minutes = (k, e_origin, e_end), minutes
+        if best is None:
+            return None
+        self._entries.move_to_end(best)
+        return self._entries[best]
+
+    @utils.generate_tests("""
+        doesn't keep entries larger than max_bytes
+        makes the arrays read-only
+        drops entries the new one covers
+        evicts the least recently used entries to fit
+    """)
+    def add(self, key: Hashable, entry: CacheEntry) -> None:
+        """
+        Adds an entry, evicting the least recently used entries until
+        the cache fits in ``max_bytes``. Entries of the same key that
+        the new entry covers are dropped.
+
+        :param key:     The source, parameters and symbols.
+        :type key:      Hashable
+
+        :param entry:   The data to keep.
+        :type entry:    hokohoko._cache.CacheEntry
+        """
+        size = entry.timestamps.nbytes + entry.data.nbytes
+        if size > self.max_bytes:
+            return
+        for array in (entry.symbol_ids, entry.timestamps, entry.data):
+            array.flags.writeable = False
+
+        for k in [k for k in self._entries if k[0] == key and entry.origin <= k[1] and k[2] <= entry.end]:
+            self._remove(k)
+        while self.bytes + size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+        self._entries[(key, entry.origin, entry.end)] = entry
+        self.bytes += size
+
+    def _remove(self, k: tuple) -> None:
+        """
+        Drops an entry.
+        """
+        entry = self._entries.pop(k)
+        self.bytes -= entry.timestamps.nbytes + entry.data.nbytes
+
+
+class Cached(Data):
+    """
+    Wraps a Data source, serving its data from a DataCache. Data already
+    in the cache is viewed rather than reloaded, and only the minutes
+    the cache doesn't have are read from the wrapped source. As Periods
+    overlap by most of their length, a process running them one after
+    another mostly reads just the minutes each one adds.
+    """
+
+    @utils.generate_tests("sets internal values correctly")
+    def __init__(
+            self,
+            data_class: Callable[..., Data],
+            cache: DataCache,
+            parameters: str,
+            symbol_subset: Optional[Iterable[str]] = None,
+            origin: int = 0,
+            end: Optional[int] = None,
+            lock: Optional[mp.Lock] = None,
+            load: bool = True
+    ) -> None:
+        """
+        :param data_class:  The Data source to wrap.
+        :type data_class:   Callable[..., hokohoko.entities.Data]
+
+        :param cache:       The cache to use.
+        :type cache:        hokohoko._cache.DataCache
+
+        Other arguments are passed through to the wrapped source.
+        """
+        super().__init__(parameters, symbol_subset, origin, end, lock, load)
+        self.data_class = data_class
+        self.cache = cache
+
+    @utils.generate_tests("""
+        reads the symbols and timestamps only if not loading.
+        loads and caches a range not in the cache.
+        views a range the cache covers without loading.
+        only loads the minutes the cache doesn't have.
+        matches the wrapped source.
+        doesn't cache if end is None.
+    """)
+    def __enter__(self) -> 'Cached':
+        """
+        Views the configured minutes from the cache, loading whatever
+        minutes it doesn't have.
+        """
+        if not self.load:
+            with self._open(self.origin, self.end, False) as source:
+                self.symbol_ids = np.array(source.get_symbol_ids())
+                self.timestamps = np.array(source.timestamps)
+            return self
+
+        if self.end is None:
+            entry = self._read(self.origin, None)
+        else:
+            key = (self.data_class, self.parameters, self.symbol_subset)
+            entry = self.cache.find(key, self.origin, self.end)
+            if entry is None or entry.origin > self.origin or entry.end < self.end:
+                entry = self._fill(entry)
+                self.cache.add(key, entry)
+
+        start, stop = self.origin - entry.origin, entry.end - entry.origin
+        if self.end is not None:
+            stop = min(stop, self.end - entry.origin)
+        self.symbol_ids = entry.symbol_ids
+        self.timestamps = entry.timestamps[start:stop]
+        self.data = entry.data[:, start * 5:stop * 5]
+        return self
+
+    def _fill(self, entry: Optional[CacheEntry]) -> CacheEntry:
+        """
+        Loads [origin, end), reusing the minutes of ``entry`` if given.
+        """
+        if entry is None:
+            return self._read(self.origin, self.end)
+
+        parts: List[CacheEntry] = []
+        if self.origin < entry.origin:
+            parts.append(self._read(self.origin, entry.origin))
+        start, stop = max(self.origin, entry.origin), min(self.end, entry.end)
+        parts.append(CacheEntry(
+            start,
+            stop,
+            entry.symbol_ids,
+            entry.timestamps[start - entry.origin:stop - entry.origin],
+            entry.data[:, (start - entry.origin) * 5:(stop - entry.origin) * 5]
+        ))
+        if entry.end < self.end:
+            parts.append(self._read(entry.end, self.end))
+        return CacheEntry(
+            parts[0].origin,
+            parts[-1].end,
+            entry.symbol_ids,
+            np.concatenate([p.timestamps for p in parts]),
+            np.concatenate([p.data for p in parts], axis=1)
+        )
+
+    def _read(self, origin: int, end: Optional[int]) -> CacheEntry:
+        """
+        Loads [origin, end) from the wrapped source.
+        """
+        with self._open(origin, end, True) as source:
+            # Copied, as the source may only lend its data while open.
+            timestamps, data = source.get_partial_data(origin, origin + source.get_minutes())
+            return CacheEntry(
+                origin, origin + len(timestamps), np.array(source.get_symbol_ids()),
+                np.array(timestamps), np.array(data)
+            )
+
+    def _open(self, origin: int, end: Optional[int], load: bool) -> Data:
+        """
+        Opens the wrapped source over [origin, end).
+        """
+        return self.data_class(self.parameters, self.symbol_subset, origin, end, self.lock, load)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Drops the views. The cache keeps the data.
+
+        :param exc_type:
+        :param exc_val:
+        :param exc_tb:
+        :return:
+
+        """
+        self.data = None
+        self.range_index = None
+        self.planar = None
+
+    @utils.generate_tests("returns the correct symbol ids")
+    def get_symbol_ids(self) -> np.ndarray:
+        """
+        :return:    The list of available symbols (as ids).
+        :rtype:     numpy.ndarray[numpy.int64]
+        """
+        return self.symbol_ids
+
+    @utils.generate_tests("returns the correct count of minutes")
+    def get_minutes(self) -> int:
+        """
+        :returns:   Number of minutes.
+        :rtype:     int
+        """
+        return self.timestamps.shape[0]
+
+    @utils.generate_tests("""
+        raises an error if origin is negative
+        raises an error if end is less than origin
+        returns views, not copies
+        matches the wrapped source
+    """)
+    def get_partial_data(
+            self,
+            origin: int,
+            end: int
+    ) -> (np.ndarray, np.ndarray):
+        """
+        Retrieve a block of data [origin, end).
+
+        :param origin:  The first minute to get. Note this is an index
+                        value, with 0 being the start of the available
+                        data.
+        :type origin:   int
+
+        :param end:     Get up to this minute.
+        :type end:      int
+
+        :returns:       | Two arrays:
+                        | 1. Per-minute timestamps.
+                        | 2. Per-symbol, per-minute exchange rate data.
+        :rtype:         tuple(numpy.ndarray, numpy.ndarray)
+
+        """
+        if origin < 0:
+            raise ValueError("origin < 0")
+        if end <= origin:
+            raise ValueError("end <= origin")
+
+        origin, end = origin - self.origin, end - self.origin
+        return self.timestamps[origin:end], self.data[:, origin * 5: end * 5]
@@ -30,12 +30,55 @@ Period
 
 A Period is a single time slice which Hokohoko benchmarks across.
 """
-from typing import List, NamedTuple
+from itertools import repeat
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 import numpy as np
 
 from hokohoko import utils
-from hokohoko.entities import Bar, Data
+from hokohoko._cache import DataCache
+from hokohoko.entities import Bar, Data, Planar
+
+
+class SymbolPlan(NamedTuple):
+    """
+    Everything a Period needs to know about its symbols, worked out once
+    by ``_run.plan_symbols`` before any data is loaded.
+    """
+    #: The symbols to request from the data source.
+    required_symbols: Optional[str]
+
+    #: The symbols the data source is expected to load, in row order.
+    symbol_ids: np.ndarray
+
+    #: The symbols the Predictor trades.
+    subset_filter: np.ndarray
+
+    #: Per row, if the symbol is in ``subset_filter``.
+    subset_mask: np.ndarray
+
+    #: The currency map, indexed to ``symbol_ids``.
+    graph: dict
+
+    #: Maps each symbol id to its row.
+    symbol_index: Dict[int, int]
+
+    #: Per row, if the symbol is its own conversion symbol.
+    same: np.ndarray
+
+    #: Per row, the chain of rows converting the base currency to the
+    #: account currency, padded with -1.
+    base_index: np.ndarray
+
+    #: Per row, if each rate in the base chain is inverted.
+    base_invert: np.ndarray
+
+    #: Per row, the chain of rows converting the target currency to the
+    #: account currency, padded with -1.
+    target_index: np.ndarray
+
+    #: Per row, if each rate in the target chain is inverted.
+    target_invert: np.ndarray
 
 
 class PeriodConfig(NamedTuple):
@@ -48,27 +91,35 @@ class PeriodConfig(NamedTuple):
     test_point: int
     end: int
     available_symbols: np.ndarray
+    symbols: Optional[SymbolPlan] = None
 
 
 class Period:
     """
     Runs each individual training/testing period. Provides a shared lock
-    to the Data and Predictor.
+    to the Data and Predictor, and the process's data cache, if any.
     """
     data_lock = None
     predictor_lock = None
+    data_cache = None
 
     @staticmethod
-    @utils.generate_tests("""sets internal locks correctly.""")
-    def init(data_lock, predictor_lock):
+    @utils.generate_tests("""
+        sets internal locks correctly.
+        creates a data cache only if cache_bytes is set.
+    """)
+    def init(data_lock, predictor_lock, cache_bytes=None):
         """
-        Initializes the shared locks.
+        Initializes the shared locks, and this process's data cache.
 
         :param data_lock:       Lock for data items.
         :param predictor_lock:  Lock for predictors to share.
+        :param cache_bytes:     The most data for this process to keep
+                                for later Periods, or ``None`` for none.
         """
         Period.data_lock = data_lock
         Period.predictor_lock = predictor_lock
+        Period.data_cache = None if cache_bytes is None else DataCache(cache_bytes)
 
 
 @utils.generate_tests("""
@@ -169,14 +220,177 @@ def get_past_minutes(
 
     :returns:       A list of Bars covering the specified time period.
     """
-    timestamps, data = source.get_partial_data(start, end)
-    return [Bar(
-        source.symbol_ids[i],
-        e[0],
-        np.max(e[1::5]),
-        np.min(e[2::5]),
-        e[-2],
-        np.float32(np.sum(e[4::5])),
-        timestamps[0],
-        timestamps[-1] + 60
-    ) for i, e in enumerate(data)]
+    timestamps, fields = source.get_partial_planar(start, end)
+    if source.range_index is not None:
+        high, low, volume = source.get_range(start, start + len(timestamps))
+    else:
+        high, low = np.max(fields.high, axis=1), np.min(fields.low, axis=1)
+        volume = np.sum(fields.volume, axis=1, dtype=np.float32)
+    return list(map(
+        Bar,
+        source.symbol_ids,
+        fields.open[:, 0],
+        high,
+        low,
+        fields.close[:, -1],
+        volume,
+        repeat(timestamps[0]),
+        repeat(timestamps[-1] + 60)
+    ))
+
+
+class _Level(NamedTuple):
+    """
+    The resampled Bars for a single width, one column per Bar.
+    """
+    first: int
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+
+
+class BarPyramid:
+    """
+    The Bars for a Period, resampled once to each width Hokohoko asks
+    for (``past_minutes`` for the Predictor, ``hold_minutes`` for
+    Positions), rather than reduced from the minute data on every call.
+    Each level holds a Bar starting every ``step`` minutes, and Bars are
+    then served by index.
+    """
+
+    @utils.generate_tests("""
+        builds a level for every width.
+        merges levels of the same width.
+        rounds the first minute of each level up to the step.
+    """)
+    def __init__(
+            self,
+            source: Data,
+            origin: int,
+            end: int,
+            step: int,
+            levels: Iterable[Tuple[int, int]]
+    ):
+        """
+        :param source:  The data source.
+        :type source:   hokohoko.entities.Data
+
+        :param origin:  The first minute of the Period.
+        :type origin:   int
+
+        :param end:     The end of the Period.
+        :type end:      int
+
+        :param step:    How many minutes between the start of each Bar.
+        :type step:     int
+
+        :param levels:  Pairs of Bar width, and the first minute Bars of
+                        that width are needed from.
+        :type levels:   Iterable[Tuple[int, int]]
+
+        """
+        self.source = source
+        self.step = step
+        self.levels: Dict[int, _Level] = {}
+
+        firsts: Dict[int, int] = {}
+        for width, first in levels:
+            firsts[width] = min(first, firsts.get(width, first))
+
+        timestamps, fields = source.get_partial_planar(origin, end)
+        for width, first in firsts.items():
+            # Round up on to the grid of Bars.
+            first = origin + max(0, -(-(first - origin) // step)) * step
+            starts = np.arange(first - origin, len(timestamps), step)
+            ends = np.minimum(starts + width, len(timestamps))
+            self.levels[width] = _Level(first, *_resample(source, origin, timestamps, fields, starts, ends))
+
+    @utils.generate_tests("""
+        matches get_past_minutes for every Bar in a level.
+        falls back to get_past_minutes for unknown widths.
+        falls back to get_past_minutes if start is not on the grid.
+    """)
+    def get_bars(self, start: int, end: int) -> List[Bar]:
+        """
+        Retrieves the Bars for [start, end), the same as
+        ``get_past_minutes``.
+
+        :param start:   The start of the Bar.
+        :type start:    int
+
+        :param end:     The end of the Bar.
+        :type end:      int
+
+        :returns:       A list of Bars covering the specified time period.
+        :rtype:         List[hokohoko.entities.Bar]
+        """
+        level = self.levels.get(end - start)
+        if level is not None:
+            k, r = divmod(start - level.first, self.step)
+            if r == 0 and 0 <= k < len(level.start):
+                return list(map(
+                    Bar,
+                    self.source.symbol_ids,
+                    level.open[:, k],
+                    level.high[:, k],
+                    level.low[:, k],
+                    level.close[:, k],
+                    level.volume[:, k],
+                    repeat(level.start[k]),
+                    repeat(level.end[k])
+                ))
+        return get_past_minutes(self.source, start, end)
+
+
+def _resample(
+        source: Data,
+        origin: int,
+        timestamps: np.ndarray,
+        fields: Planar,
+        starts: np.ndarray,
+        ends: np.ndarray
+) -> Tuple[np.ndarray, ...]:
+    """
+    Reduces the minute data to one Bar per window [starts[k], ends[k]),
+    relative to ``origin``. Windows may overlap.
+
+    With a RangeIndex, each window is a single query. Otherwise
+    ``reduceat`` is given the starts and ends interleaved, so every even
+    output is a window; windows running to the end of the data can't be
+    expressed that way, so are reduced on their own.
+
+    :returns:   The open, high, low, close, volume, start and end of each
+                Bar.
+    """
+    if source.range_index is not None:
+        high, low, volume = source.get_range(starts + origin, ends + origin)
+    else:
+        highs, lows, volumes = fields.high, fields.low, fields.volume
+        high = np.empty((len(highs), len(starts)), highs.dtype)
+        low = np.empty_like(high)
+        volume = np.empty_like(high)
+
+        n = np.count_nonzero(ends < len(timestamps))
+        if n > 0:
+            indexes = np.stack((starts[:n], ends[:n]), axis=1).ravel()
+            high[:, :n] = np.maximum.reduceat(highs, indexes, axis=1)[:, ::2]
+            low[:, :n] = np.minimum.reduceat(lows, indexes, axis=1)[:, ::2]
+            volume[:, :n] = np.add.reduceat(volumes, indexes, axis=1)[:, ::2]
+        for k in range(n, len(starts)):
+            high[:, k] = np.max(highs[:, starts[k]:], axis=1)
+            low[:, k] = np.min(lows[:, starts[k]:], axis=1)
+            volume[:, k] = np.sum(volumes[:, starts[k]:], axis=1)
+
+    return (
+        fields.open[:, starts],
+        high,
+        low,
+        fields.close[:, ends - 1],
+        volume,
+        timestamps[starts],
+        timestamps[ends - 1] + 60
+    )
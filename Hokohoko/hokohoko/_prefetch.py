@@ -0,0 +1,227 @@
+#   hokohoko/_prefetch.py
+#
+#   Copyright 2020 Neil Bradley
+#
+#   This file is part of Hokohoko.
+#
+#   Hokohoko is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   Hokohoko is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY# without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with Hokohoko.  If not, see <https://www.gnu.org/licenses/>.
+#
+#   ====================================================================
+#
+#   Reads a Data source ahead of the Period, on a background thread.
+#
+
+import multiprocessing as mp
+import queue
+import threading
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko.entities import Data
+
+
+class PrefetchingData(Data):
+    """
+    Wraps a Data source, reading the ranges a Period will ask for next
+    on a background thread, while the Predictor works on the current
+    Bar.
+
+    A Period asks for ranges of fixed lengths, each moving forward by a
+    fixed stride. Ranges of each length are a stream, and once a stream
+    has moved once, its next ``depth`` ranges are queued. Ranges the
+    stream has passed are dropped, so at most ``depth`` ranges per
+    stream are ever held. Anything not predicted is read as usual.
+
+    This only helps sources that read as they are asked, such as with
+    ``--window-minutes``. The wrapped source is only used by one thread
+    at a time.
+    """
+
+    @utils.generate_tests("raises an error if depth is less than 1")
+    def __init__(
+            self,
+            data_class: Callable[..., Data],
+            depth: int,
+            parameters: str,
+            symbol_subset: Optional[Iterable[str]] = None,
+            origin: int = 0,
+            end: Optional[int] = None,
+            lock: Optional[mp.Lock] = None,
+            load: bool = True
+    ) -> None:
+        """
+        :param data_class:  The Data source to wrap.
+        :type data_class:   Callable[..., hokohoko.entities.Data]
+
+        :param depth:       How many ranges ahead to read, per stream.
+        :type depth:        int
+
+        Other arguments are passed through to the wrapped source.
+        """
+        if depth < 1:
+            raise ValueError(f"depth must be at least 1: {depth}")
+        super().__init__(parameters, symbol_subset, origin, end, lock, load)
+        self.data_class = data_class
+        self.depth = depth
+        self._source: Optional[Data] = None
+        self._io = threading.Lock()
+        self._ready = threading.Condition()
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._buffer: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]] = {}
+        self._pending: Set[Tuple[int, int]] = set()
+        self._last: Dict[int, int] = {}
+
+    @utils.generate_tests("""
+        enters the wrapped source.
+        shares the wrapped source's symbols, timestamps and data.
+        starts the background thread only if loading.
+    """)
+    def __enter__(self) -> 'PrefetchingData':
+        """
+        Enters the wrapped source, and starts the background thread.
+        """
+        self._source = self.data_class(
+            self.parameters, self.symbol_subset, self.origin, self.end, self.lock, self.load
+        ).__enter__()
+        self.symbol_ids = self._source.symbol_ids
+        self.timestamps = self._source.timestamps
+        self.data = self._source.data
+        if self.load:
+            self._thread = threading.Thread(target=self._prefetch, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Stops the background thread, and exits the wrapped source.
+
+        :param exc_type:
+        :param exc_val:
+        :param exc_tb:
+        :return:
+
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._buffer.clear()
+        self._pending.clear()
+        return self._source.__exit__(exc_type, exc_val, exc_tb)
+
+    @utils.generate_tests("returns the wrapped source's symbol ids")
+    def get_symbol_ids(self) -> np.ndarray:
+        """
+        :return:    The list of available symbols (as ids).
+        :rtype:     numpy.ndarray[numpy.int64]
+        """
+        return self._source.get_symbol_ids()
+
+    @utils.generate_tests("returns the wrapped source's count of minutes")
+    def get_minutes(self) -> int:
+        """
+        :returns:   Number of minutes.
+        :rtype:     int
+        """
+        return self._source.get_minutes()
+
+    @utils.generate_tests("""
+        matches the wrapped source
+        reads unpredicted ranges directly
+        returns prefetched ranges without reading
+        waits for a range being prefetched
+        queues the next depth ranges of a stream
+        drops ranges a stream has passed
+        stops predicting at the end of the data
+    """)
+    def get_partial_data(
+            self,
+            origin: int,
+            end: int
+    ) -> (np.ndarray, np.ndarray):
+        """
+        Retrieve a block of data [origin, end), from those read ahead if
+        it was, and queues the next ranges of its stream.
+
+        :param origin:  The first minute to get. Note this is an index
+                        value, with 0 being the start of the available
+                        data.
+        :type origin:   int
+
+        :param end:     Get up to this minute.
+        :type end:      int
+
+        :returns:       | Two arrays:
+                        | 1. Per-minute timestamps.
+                        | 2. Per-symbol, per-minute exchange rate data.
+        :rtype:         tuple(numpy.ndarray, numpy.ndarray)
+
+        """
+        key = (origin, end)
+        with self._ready:
+            while key in self._pending:
+                self._ready.wait()
+            result = self._buffer.pop(key, None)
+            for k in [k for k in self._buffer if k[1] - k[0] == end - origin and k[0] < origin]:
+                del self._buffer[k]
+
+        if result is None:
+            with self._io:
+                result = self._source.get_partial_data(origin, end)
+        if self._thread is not None:
+            self._predict(origin, end)
+        return result
+
+    def _predict(self, origin: int, end: int) -> None:
+        """
+        Queues the next ``depth`` ranges of the stream [origin, end)
+        belongs to, if it has a stride yet.
+        """
+        last, self._last[end - origin] = self._last.get(end - origin), origin
+        if last is None or origin <= last:
+            return
+
+        stride = origin - last
+        limit = self.origin + self.get_minutes()
+        with self._ready:
+            for i in range(1, self.depth + 1):
+                key = (origin + i * stride, end + i * stride)
+                if key[1] > limit:
+                    break
+                if key not in self._buffer and key not in self._pending:
+                    self._pending.add(key)
+                    self._queue.put(key)
+
+    def _prefetch(self) -> None:
+        """
+        The background thread. Reads each queued range into the buffer.
+        Failures are left for the Period to meet when it asks.
+        """
+        while True:
+            key = self._queue.get()
+            if key is None:
+                return
+            try:
+                with self._io:
+                    result = self._source.get_partial_data(*key)
+            except Exception:
+                result = None
+            with self._ready:
+                self._pending.discard(key)
+                if result is not None:
+                    self._buffer[key] = result
+                self._ready.notify_all()
@@ -0,0 +1,435 @@
+#   hokohoko/_resolver.py
+#
+#   Copyright 2020 Neil Bradley
+#
+#   This file is part of Hokohoko.
+#
+#   Hokohoko is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   Hokohoko is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY# without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with Hokohoko.  If not, see <https://www.gnu.org/licenses/>.
+#
+#   ====================================================================
+#
+#   This file contains a closed-form alternative to _run.simulate. Every
+#   Position knows its whole hold window when it is created, so its
+#   first open, take-profit, stop-loss or expiry touch can be found by a
+#   binary search over the window's running extremes, rather than one
+#   minute at a time.
+#
+
+from typing import NamedTuple
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko._vectorized import _crossed, _final_value, _held_value, _OpenPositions, conversion_indexes
+from hokohoko.entities import Account, Data, Planar, Predictor, Status
+
+_PENDING = Status.PENDING.value
+_OPEN = Status.OPEN.value
+_CLOSED = Status.CLOSED.value
+_CLOSED_TAKE_PROFIT = Status.CLOSED_TAKE_PROFIT.value
+_CLOSED_STOP_LOSS = Status.CLOSED_STOP_LOSS.value
+
+
+class Resolution(NamedTuple):
+    """
+    The outcome of a Position over its hold window. The minutes it opens
+    and closes in are kept as their timestamps, so any later chunk can
+    find them.
+    """
+    #: The timestamp of the minute the Position opens in, or ``inf`` if
+    #: it never does.
+    open_minute: float
+
+    #: The timestamp of the minute the Position closes, or expires, in.
+    close_minute: float
+
+    status: Status
+    open_time: float
+    close_time: float
+    open_rate: float
+    close_rate: float
+    held_value: float
+    initial_value: float
+    final_value: float
+
+
+class _Minutes:
+    """
+    A minute of the window per Position, indexed as ``_vectorized``
+    indexes a single minute's (symbols, OHLC) data, so Positions opening
+    or closing in different minutes are valued together.
+    """
+
+    def __init__(self, fields: Planar, minutes: np.ndarray) -> None:
+        """
+        :param fields:  The window, from one minute before its start.
+        :type fields:   hokohoko.entities.Planar
+
+        :param minutes: The minute of the window for each Position.
+        :type minutes:  numpy.ndarray[numpy.int64]
+        """
+        self.fields = fields[:4]
+        self.minutes = minutes + 1
+        self.dtype = fields.close.dtype
+
+    def __getitem__(self, key) -> np.ndarray:
+        index, column = key if isinstance(key, tuple) else (key, None)
+        at = self.minutes.reshape((-1,) + (1,) * (np.ndim(index) - 1))
+        if column is not None:
+            return self.fields[column][index, at]
+        return np.stack([f[index, at] for f in self.fields], axis=-1)
+
+
+@utils.generate_tests("""
+    finds the first minute whose range includes the value.
+    includes the move from the previous close to the open.
+    only searches from the start given.
+    returns the window length if the value is never reached, or NaN.
+""")
+def first_touch(
+        fields: Planar,
+        rows: np.ndarray,
+        starts: np.ndarray,
+        values: np.ndarray
+) -> np.ndarray:
+    """
+    Finds, for each value, the first minute of the window at or after
+    its start where ``simulate`` would see the rate cross it: between
+    the previous close and the open, or within the minute's low and
+    high.
+
+    As the bars are continuous, the rates seen from the start form one
+    interval that only widens: the running lowest and highest of each
+    minute's previous close, open, low and high. The first touch is then
+    where that interval first reaches the value, found by a binary
+    search. Each symbol and start is scanned once, however many values
+    share it.
+
+    :param fields:  The window, from one minute before its start.
+    :type fields:   hokohoko.entities.Planar
+
+    :param rows:    The data row of each value.
+    :type rows:     numpy.ndarray[numpy.int64]
+
+    :param starts:  The first minute of the window to search from.
+    :type starts:   numpy.ndarray[numpy.int64]
+
+    :param values:  The values, at the data's precision. NaN is never
+                    reached.
+    :type values:   numpy.ndarray
+
+    :returns:       The minute of each first touch, or the window
+                    length if there is none.
+    :rtype:         numpy.ndarray[numpy.int64]
+    """
+    w = fields.open.shape[1] - 1
+    result = np.full(len(values), w, np.int64)
+    todo = np.flatnonzero(~np.isnan(values) & (starts < w))
+    if len(todo) == 0:
+        return result
+
+    keys, group = np.unique(rows[todo] * (w + 1) + starts[todo], return_inverse=True)
+    group = group.ravel()
+    for j, (row, start) in enumerate(zip(*np.divmod(keys, w + 1))):
+        l_close = fields.close[row, start:w]
+        t_open = fields.open[row, start + 1:]
+        highest = np.maximum.accumulate(np.maximum(np.maximum(l_close, t_open), fields.high[row, start + 1:]))
+        lowest = np.minimum.accumulate(np.minimum(np.minimum(l_close, t_open), fields.low[row, start + 1:]))
+        which = todo[group == j]
+        v = values[which]
+        result[which] = start + np.maximum(
+            np.searchsorted(highest, v, 'left'),
+            np.searchsorted(-lowest, -v, 'left')
+        )
+    return result
+
+
+@utils.generate_tests("""
+    resolves every new position in the account.
+    leaves already resolved positions alone.
+    opens immediately at the open if open_bid is None.
+    opens between minutes before opening within a minute.
+    closes on take_profit before stop_loss in the same step.
+    expires pending positions without changing their value.
+    expires open positions at the open of the expiry minute.
+    matches simulate when no two positions close in the same minute.
+""")
+def resolve_positions(
+        source: Data,
+        predictor: Predictor,
+        shared_config,
+        _locals,
+        minute: int
+) -> None:
+    """
+    Resolves all Positions created by ``_run.calculate_positions`` at
+    ``minute``, over their window ``[minute, minute + hold_minutes]``.
+    The last minute of the window is where unclosed Positions expire.
+    The result is kept in ``_locals.resolved`` until
+    ``simulate_resolved`` reaches it, so the Predictor never sees a
+    Position's future.
+
+    The rules are the same as ``_run.simulate``: first check between the
+    previous close and this open, then within this minute, with
+    take_profit taking precedence over stop_loss, and Positions are
+    valued with the same arithmetic. Each Position is resolved as if it
+    were the only one open: unlike ``_run.simulate``, a Position closing
+    doesn't leave the others unchecked until the next minute, so the
+    results differ when two close in one minute.
+
+    :param source:          The data source.
+    :type source:           hokohoko.entities.Data
+
+    :param predictor:       The predictor containing the account we are
+                            interested in.
+    :type predictor:        hokohoko.entities.Predictor
+
+    :param shared_config:   Globally-shared config options.
+    :type shared_config:    hokohoko.entities.Config
+
+    :param _locals:         Period-local variables.
+    :type _locals:          hokohoko._run._Locals
+
+    :param minute:          The first minute of the hold window.
+    :type minute:           int
+
+    """
+    positions = predictor.account.positions
+    rows = positions.rows()
+    new = np.array([p_id not in _locals.resolved for p_id in positions.ids()[rows].tolist()], np.bool_)
+    if not new.any():
+        return
+    book = _OpenPositions(predictor.account, _locals, rows[new])
+
+    # 1. Fetch the window, including the close of the previous minute.
+    timestamps, fields = source.get_partial_planar(minute - 1, minute + shared_config.hold_minutes + 1)
+    timestamps = timestamps[1:]
+    w = len(timestamps)
+    s_index = book.s_index
+
+    # Thresholds are compared at the data's precision, as the loop
+    # engine compares them against the data's scalars.
+    dtype = fields.close.dtype
+    open_bid, take_profit, stop_loss = (
+        a.astype(dtype) for a in (book.open_bid, book.take_profit, book.stop_loss)
+    )
+
+    def _touches(k, between):
+        # Which of take_profit and stop_loss simulate sees at minute k.
+        l_close, t_open = fields.close[s_index, k], fields.open[s_index, k + 1]
+        t_high, t_low = fields.high[s_index, k + 1], fields.low[s_index, k + 1]
+        return (
+            between & _crossed(l_close, t_open, take_profit),
+            between & _crossed(l_close, t_open, stop_loss),
+            _crossed(t_low, t_high, take_profit),
+            _crossed(t_low, t_high, stop_loss)
+        )
+
+    # 2. Expiry is the first minute at or past the Position's close_time.
+    expiry = np.minimum(np.searchsorted(timestamps, book.close_time, 'left'), w - 1)
+
+    # 3. Find the first opening touch.
+    market = np.isnan(open_bid)
+    open_index = np.where(market, 0, first_touch(fields, s_index, np.zeros(len(s_index), np.int64), open_bid))
+    opened = open_index < expiry
+    o = np.minimum(open_index, w - 1)
+    open_where = np.where(
+        market | _crossed(fields.close[s_index, o], fields.open[s_index, o + 1], open_bid), 0, 1
+    )
+
+    # 4. Find the first closing touch. In the opening minute, only the
+    #    checks after the open count.
+    at_open = np.any(_touches(o, open_where == 0), axis=0)
+    after = first_touch(
+        fields, np.tile(s_index, 2), np.tile(o + 1, 2), np.concatenate((take_profit, stop_loss))
+    ).reshape(2, -1).min(axis=0)
+    close_index = np.where(at_open, o, after)
+    closed = opened & (close_index < expiry)
+    c = np.where(closed, close_index, expiry)
+    tp_0, sl_0, tp_1, sl_1 = _touches(c, (c > o) | (open_where == 0))
+    close_where = np.where(tp_0 | sl_0, 0, 1)
+    take = tp_0 | (~sl_0 & tp_1)
+
+    # 5. Open, valuing each Position at its opening minute.
+    j = np.flatnonzero(opened)
+    book.status[j] = _OPEN
+    book.open_time[j] = timestamps[o[j]] + 30 * open_where[j]
+    book.open_rate[j] = np.where(market[j], fields.open[s_index[j], o[j] + 1], book.open_bid[j])
+    book.initial_value[j] = Account.POSITION_OPEN_VALUE
+    book.final_value[j] = Account.POSITION_OPEN_VALUE
+    for where in (0, 1):
+        k = j[open_where[j] == where]
+        _held_value(book, k, _Minutes(fields, o[k]), where)
+
+    # 6. Close, or expire, valuing each Position at its closing minute.
+    j = np.flatnonzero(closed)
+    book.status[j] = np.where(take[j], _CLOSED_TAKE_PROFIT, _CLOSED_STOP_LOSS)
+    book.close_rate[j] = np.where(take[j], book.take_profit[j], book.stop_loss[j])
+    book.close_time[j] = timestamps[c[j]] + 30 * close_where[j]
+    j = np.flatnonzero(opened & ~closed)
+    book.status[j] = _CLOSED
+    book.close_rate[j] = fields.open[s_index[j], c[j] + 1]
+    close_where[j] = 0
+    book.close_time[~closed] = timestamps[c[~closed]]
+    j = np.flatnonzero(opened)
+    for where in (0, 1):
+        k = j[close_where[j] == where]
+        _final_value(book, k, _Minutes(fields, c[k]), where)
+
+    for i, p_id in enumerate(book.ids.tolist()):
+        _locals.resolved[p_id] = Resolution(
+            timestamps[o[i]] if opened[i] else np.inf,
+            timestamps[c[i]],
+            Status(int(book.status[i])),
+            float(book.open_time[i]),
+            float(book.close_time[i]),
+            float(book.open_rate[i]),
+            float(book.close_rate[i]),
+            float(book.held_value[i]),
+            float(book.initial_value[i]),
+            float(book.final_value[i])
+        )
+
+
+def _mark_rates(
+        data: np.ndarray,
+        s_index: np.ndarray,
+        a_index: np.ndarray,
+        invert: np.ndarray,
+        same: np.ndarray,
+        buy: np.ndarray
+) -> np.ndarray:
+    """
+    The rate an open Position's held value is multiplied by to value it
+    at the end of each minute, as ``_run.calculate_final_value`` does,
+    per symbol and direction. A symbol that is its own conversion leaves
+    its open_rate out, as that differs per Position.
+
+    :returns:   The rates, shaped (len(s_index), minutes).
+    :rtype:     numpy.ndarray[numpy.float64]
+    """
+    close = data[s_index, 8::5].astype(np.float64)
+    # The End rate is the close for a BUY, but the low for a SELL.
+    end = np.where(buy[:, None, None], data[a_index, 8::5], data[a_index, 7::5]).astype(np.float64)
+    end = np.where(invert[:, :, None], 1 / end, end)
+    rate = np.where((a_index >= 0)[:, :, None], end, 1).prod(axis=1)
+    rate[same] = 1
+    return np.where(buy[:, None], close, 1 / close) / rate
+
+
+@utils.generate_tests("""
+    does nothing but carry the balance forward if there are no positions.
+    adds closed positions to the balance on their closing minute.
+    adds open positions to the equity every minute.
+    moves closed positions into the history.
+    shows positions as pending until their opening minute.
+""")
+def simulate_resolved(
+        predictor: Predictor,
+        _locals,
+        timestamps: np.ndarray,
+        data: np.ndarray
+) -> None:
+    """
+    A replacement for ``_run.simulate``, for Positions already resolved
+    by ``resolve_positions``. Closed Positions are added to the balance
+    on their closing minute, and the Positions are brought up to date.
+
+    An open Position's value is its held value times a rate that only
+    depends on its symbol and direction. So the equity is summed per
+    symbol and direction, from the total held value open each minute,
+    rather than Position by Position. This is in float64, so it can
+    differ from ``simulate``'s equity by the data's rounding.
+
+    :param predictor:   The Predictor associated with this Period.
+    :type predictor:    hokohoko.entities.Predictor
+
+    :param _locals:     The period-local variables.
+    :type _locals:      hokohoko._run._Locals
+
+    :param timestamps:  List of timestamps in the next chunk about to be
+                        processed. The first minute is the last minute
+                        of the previous chunk.
+    :type timestamps:   numpy.ndarray[numpy.int64]
+
+    :param data:        List of data in the next chunk about to be
+                        processed. The first minute is the last minute
+                        of the previous chunk.
+    :type data:         numpy.ndarray[numpy.float32]
+
+    """
+    account = predictor.account
+    positions = account.positions
+    n = len(timestamps) - 1
+    minutes = timestamps[1:]
+    balance = np.zeros(n, np.float64)
+
+    rows = positions.rows()
+    ids = positions.ids()[rows]
+    open_minute, close_minute, open_time, open_rate, held, initial, final = np.array([
+        (r.open_minute, r.close_minute, r.open_time, r.open_rate, r.held_value, r.initial_value, r.final_value)
+        for r in (_locals.resolved[p_id] for p_id in ids.tolist())
+    ], np.float64).reshape(-1, 7).T
+
+    # 1. Line each Position up with this chunk: it is open from the
+    #    minute it opens in until the minute it closes in.
+    start = np.searchsorted(minutes, open_minute, 'left')
+    stop = np.searchsorted(minutes, close_minute, 'left')
+
+    # 2. The equity, from the held value open per symbol and direction.
+    equity = np.zeros(n, np.float64)
+    live = np.flatnonzero(start < stop)
+    marks = np.zeros(len(live), np.float64)
+    if len(live) > 0:
+        s_index, a_index, same, invert, buy = conversion_indexes(positions, rows[live], _locals)
+        _, first, group = np.unique(2 * s_index + buy, return_index=True, return_inverse=True)
+        group = group.ravel()
+        rates = _mark_rates(data, s_index[first], a_index[first], invert[first], same[first], buy[first])
+
+        # A symbol that is its own conversion divides by its open_rate.
+        own = np.where(invert[:, 0], 1 / open_rate[live], open_rate[live])
+        weight = np.where(same, held[live] / own, held[live])
+        held_open = np.zeros((len(first), n + 1), np.float64)
+        np.add.at(held_open, (group, start[live]), weight)
+        np.add.at(held_open, (group, stop[live]), -weight)
+        initial_open = np.zeros(n + 1, np.float64)
+        np.add.at(initial_open, start[live], initial[live])
+        np.add.at(initial_open, stop[live], -initial[live])
+        equity = np.sum(np.cumsum(held_open, axis=1)[:, :n] * rates, axis=0) - np.cumsum(initial_open)[:n]
+        marks = weight * rates[group, n - 1]
+
+    # 3. Bring the Positions up to date, through the book's columns.
+    status = positions.column("status")
+    opening = (start < n) & (status[rows] == _PENDING)
+    status[rows[opening]] = _OPEN
+    for name, values in (
+            ("open_time", open_time), ("open_rate", open_rate), ("held_value", held), ("initial_value", initial)
+    ):
+        positions.column(name)[rows[opening]] = values[opening]
+    still_open = stop[live] >= n
+    positions.column("final_value")[rows[live[still_open]]] = marks[still_open]
+
+    # 4. Effect closed positions, in the order they closed.
+    closing = np.flatnonzero(stop < n)
+    np.add.at(balance, stop[closing], final[closing] - initial[closing])
+    order = closing[np.argsort(stop[closing], kind='stable')]
+    resolutions = [_locals.resolved.pop(p_id) for p_id in ids[order].tolist()]
+    status[rows[order]] = [r.status.value for r in resolutions]
+    for name in ("open_time", "close_time", "open_rate", "close_rate", "held_value", "initial_value", "final_value"):
+        positions.column(name)[rows[order]] = [getattr(r, name) for r in resolutions]
+    positions.move(ids[order].tolist(), account.history)
+
+    balance = account.balance[-1] + np.cumsum(balance)
+    account.balance.extend(balance)
+    account.equity.extend(balance + equity)
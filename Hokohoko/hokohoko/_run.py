@@ -22,12 +22,21 @@
 #   This file contains the engine that makes Hokohoko work.
 #
 
-from typing import Dict, List, Tuple, Union
+from functools import partial
+from itertools import compress
+from typing import Dict, List, Optional, Union
 
 import numpy as np
 
 from hokohoko import utils
-from hokohoko._period import Period, PeriodConfig, get_last_close_at_minute, get_past_minutes
+from hokohoko._cache import Cached
+from hokohoko._period import (
+    BarPyramid, Period, PeriodConfig, SymbolPlan, get_last_close_at_minute, get_past_minutes
+)
+from hokohoko._resolver import Resolution, resolve_positions, simulate_resolved
+from hokohoko._vectorized import simulate_vectorized
+from hokohoko._prefetch import PrefetchingData
+from hokohoko._window import Window
 from hokohoko.entities import Account, Config, Data, Direction, Order, Position, Predictor, Status
 
 
@@ -38,12 +47,23 @@ class _Locals:
     """
     def __init__(
             self,
-            graph: Dict[np.int64, Tuple[int, np.int64]],
-            subset_filter: List[np.int64]
+            symbols: SymbolPlan,
+            bars: Optional[BarPyramid] = None
     ):
-        self.graph = graph
-        self.subset_filter = subset_filter
+        self.graph = symbols.graph
+        self.subset_filter = symbols.subset_filter
+        self.subset_mask = symbols.subset_mask
+        self.bars = bars
         self.usd = utils.convert_symbol_to_id("USD")
+        self.resolved: Dict[int, Resolution] = {}
+
+        # Dense, per-row copies of the graph, from plan_symbols.
+        self.symbol_index = symbols.symbol_index
+        self.same = symbols.same
+        self.base_index = symbols.base_index
+        self.base_invert = symbols.base_invert
+        self.target_index = symbols.target_index
+        self.target_invert = symbols.target_invert
 
 
 @utils.generate_tests("""
@@ -78,13 +98,21 @@ def run(period: Period, shared_config: Config, config: PeriodConfig) -> Account:
     if __debug__:
         print(f"Period: {config}")
 
-    required_symbols = calculate_required_symbols(
-        shared_config.data_subset, config.available_symbols
-    )
+    symbols = config.symbols
+    if symbols is None:
+        symbols = plan_symbols(shared_config.data_subset, config.available_symbols)
+
+    data_class = utils.get_fq_class(shared_config.data_class)
+    if period.data_cache is not None:
+        data_class = partial(Cached, data_class, period.data_cache)
+    if shared_config.window_minutes is not None:
+        data_class = partial(Window, data_class, shared_config.window_minutes)
+    if shared_config.prefetch is not None:
+        data_class = partial(PrefetchingData, data_class, shared_config.prefetch)
 
-    with utils.get_fq_class(shared_config.data_class)(
+    with data_class(
             shared_config.data_parameters,
-            required_symbols,
+            symbols.required_symbols,
             config.origin,
             config.end,
             period.data_lock
@@ -96,26 +124,54 @@ def run(period: Period, shared_config: Config, config: PeriodConfig) -> Account:
                 period.predictor_lock, predictor_parameters
         ) as predictor:
             print(f"Period {config.period_id: 3d} started.")
-            # 1a. Keep a local copy of the subset for filtering.
-            if shared_config.data_subset is not None:
-                subset_filter = np.array(
-                    [utils.convert_symbol_to_id(s) for s in shared_config.data_subset.split(',')],
-                    np.int64
+            # 1a. The plan assumes the source loads the requested symbols
+            #     in the order available. Re-plan if not.
+            if not np.array_equal(source.get_symbol_ids(), symbols.symbol_ids):
+                symbols = plan_symbols(
+                    shared_config.data_subset, config.available_symbols, loaded=source.get_symbol_ids()
                 )
-            else:
-                subset_filter = source.get_symbol_ids()
 
-            # 1b. Initialize the local variables.
+            # 1b. Index the data for range queries, and split it by
+            #     field, if requested.
+            if shared_config.range_index:
+                source.build_range_index()
+            if shared_config.planar:
+                source.build_planar()
+
+            # 1c. Initialize the local variables. Resampling the Bars
+            #     needs the whole Period, so not when windowed.
             _locals = _Locals(
-                graph=utils.generate_currency_map(source.get_symbol_ids()),
-                subset_filter=subset_filter
+                symbols=symbols,
+                bars=None if shared_config.window_minutes is not None else BarPyramid(
+                    source,
+                    config.origin,
+                    config.end,
+                    shared_config.past_minutes,
+                    (
+                        (shared_config.past_minutes, config.origin),
+                        (shared_config.hold_minutes, config.test_point)
+                    )
+                )
             )
 
-            # 1c. Initialize the Predictor.
+            # 1d. Select the simulation engine.
+            if shared_config.engine == "vectorized":
+                _simulate = simulate_vectorized
+            elif shared_config.engine == "resolved":
+                _simulate = simulate_resolved
+            else:
+                _simulate = simulate
+
+            # 1e. Initialize the Predictor.
             predictor.seed(config.origin)
-            predictor.account.symbol_ids.extend(subset_filter)
+            predictor.account.symbol_ids.extend(symbols.subset_filter)
+            predictor.account.allocate(
+                config.end - config.test_point + shared_config.past_minutes,
+                shared_config.account_dtype,
+                shared_config.account_stride
+            )
             opening = get_last_close_at_minute(source, config.origin, shared_config.past_minutes)
-            predictor.on_start([o for o in opening if o.symbol_id in subset_filter])
+            predictor.on_start(list(compress(opening, symbols.subset_mask)))
 
             # 2. Cycle through every minute in the dataset, but only
             #    sends x past minutes to the predictor.
@@ -129,7 +185,7 @@ def run(period: Period, shared_config: Config, config: PeriodConfig) -> Account:
                     timestamps, data = source.get_partial_data(
                         minute - shared_config.past_minutes - 1, minute
                     )
-                    simulate(predictor, _locals, timestamps, data)
+                    _simulate(predictor, _locals, timestamps, data)
 
                     if __debug__:
                         print(f"\x1b[0;103mBalance: {predictor.account.balance[-1]}\tEquity: "
@@ -138,14 +194,19 @@ def run(period: Period, shared_config: Config, config: PeriodConfig) -> Account:
 
                 # 2B. Get the past bar, and send it to the Predictor.
                 if minute < config.end - shared_config.hold_minutes:
-                    past = get_past_minutes(source, minute - shared_config.past_minutes, minute)
+                    if _locals.bars is not None:
+                        past = _locals.bars.get_bars(minute - shared_config.past_minutes, minute)
+                    else:
+                        past = get_past_minutes(source, minute - shared_config.past_minutes, minute)
                     predictor.seed(config.origin + minute)
-                    predictor.on_bar([p for p in past if p.symbol_id in subset_filter])
+                    predictor.on_bar(list(compress(past, symbols.subset_mask)))
 
                     # 2Bi. Apply to the account.
                     if minute >= config.test_point:
                         sanitize_orders(predictor, _locals)
                         calculate_positions(source, predictor, shared_config, _locals, minute)
+                        if shared_config.engine == "resolved":
+                            resolve_positions(source, predictor, shared_config, _locals, minute)
 
                 # 2C. Always clear stale orders.
                 predictor.account.orders.clear()
@@ -202,11 +263,11 @@ def simulate(
     for i in range(1, len(timestamps)):
         closed = []
         for p_id, p in predictor.account.positions.items():
-            s_index = _locals.graph[p.order.symbol_id][0]
+            s_index = p.symbol_row
 
             # 1. Check for status changes between minutes.
             l_close = data[s_index][i * 5 - 2]
-            zz = (range(i * 5, i * 5 + 4))   # Array index.
+            zz = slice(i * 5, i * 5 + 4)   # Array index, as a view.
             if p.close_time <= timestamps[i]:
                 status = Status.CLOSED if p.status == Status.OPEN else p.status
                 close_position(p, timestamps[i], data[:, zz], _locals, status, 0, p_id)
@@ -291,16 +352,18 @@ def simulate(
                 calculate_final_value(p, data[:, zz], _locals, 2)
 
         # Effect closed positions.
-        predictor.account.balance.append(predictor.account.balance[-1])
+        balance = predictor.account.balance[-1]
         for c in closed:
             p = predictor.account.positions.pop(c)
-            predictor.account.balance[-1] += p.final_value - p.initial_value
+            balance += p.final_value - p.initial_value
             predictor.account.history[c] = p
+        predictor.account.balance.append(balance)
 
         # Update equity here.
-        predictor.account.equity.append(predictor.account.balance[-1])
+        equity = balance
         for p in predictor.account.positions.values():
-            predictor.account.equity[-1] += p.final_value - p.initial_value
+            equity += p.final_value - p.initial_value
+        predictor.account.equity.append(equity)
 
     # All positions need to be closed here.
     # for p_id, p in predictor.account.positions.items():
@@ -343,7 +406,7 @@ def open_position(position, timestamp, data, _locals, where, debug=None) -> None
     if where == 0:
         position.open_time = timestamp
         if position.order.open_bid is None:
-            position.open_rate = data[_locals.graph[position.order.symbol_id][0]][0]
+            position.open_rate = data[position.symbol_row][0]
         else:
             position.open_rate = position.order.open_bid
     elif where == 1:
@@ -394,7 +457,7 @@ def close_position(position, timestamp, data, _locals, status, where, debug=None
         elif status == Status.CLOSED_STOP_LOSS:
             position.close_rate = position.order.stop_loss
         elif status == Status.CLOSED:
-            position.close_rate = data[_locals.graph[position.order.symbol_id][0]][0]
+            position.close_rate = data[position.symbol_row][0]
 
     elif where == 1:
         position.close_time = timestamp + 30
@@ -403,7 +466,7 @@ def close_position(position, timestamp, data, _locals, status, where, debug=None
         elif status == Status.CLOSED_STOP_LOSS:
             position.close_rate = position.order.stop_loss
         elif status == Status.CLOSED:
-            position.close_rate = np.mean(data[_locals.graph[position.order.symbol_id][0]])
+            position.close_rate = np.mean(data[position.symbol_row])
 
     else:
         raise ValueError("close_position does not take where={}".format(where))
@@ -414,6 +477,33 @@ def close_position(position, timestamp, data, _locals, status, where, debug=None
         print("\tClosed   {:8}: {}".format(debug, position))
 
 
+def _account_rate(position, data, same, index, invert, column):
+    """
+    The rate converting a Position to the account currency, multiplied
+    along its chain of conversion rows, each inverted as required. A
+    symbol that is its own conversion uses the Position's open_rate.
+
+    :param position:
+    :param data:
+    :param same:        If the symbol is its own conversion symbol.
+    :param index:       The chain of conversion rows, padded with -1.
+    :param invert:      Whether each rate in the chain is inverted.
+    :param column:      The OHLC column to use, or None for the mean.
+    :return:
+    """
+    if same:
+        account_rate = position.open_rate
+        return 1 / account_rate if invert[0] else account_rate
+
+    account_rate = 1
+    for row, inverted in zip(index, invert):
+        if row < 0:
+            break
+        rate = data[row][column] if column is not None else np.mean(data[row])
+        account_rate = account_rate / rate if inverted else account_rate * rate
+    return account_rate
+
+
 def calculate_held_value(position, data, _locals, where) -> None:
     """
     Calculate a Positions value from the initial_value.
@@ -429,34 +519,27 @@ def calculate_held_value(position, data, _locals, where) -> None:
         raise ValueError("calculate_held_position does not support where={}".format(where))
 
     # 1. Need to calculate which values we need. This comes from the trade direction.
-    s_index, base_symbol, target_symbol = _locals.graph[position.order.symbol_id]
-    base_index, target_index = _locals.graph[base_symbol][0], _locals.graph[target_symbol][0]
+    s_index = position.symbol_row
+    if _locals.base_index[s_index, 0] < 0 or _locals.target_index[s_index, 0] < 0:
+        raise ValueError("No conversion to the account currency for {}".format(
+            utils.convert_id_to_symbol(np.int64(position.order.symbol_id))
+        ))
 
     # 2. The exact calculation depends on the direction, and the ordering of the symbols.
     if position.order.direction == Direction.BUY:
         # 2A. Buy base through target.
-        if base_index == target_index:
-            account_rate = position.open_rate
-        elif where == 0:
-            account_rate = data[target_index][0]
-        else:
-            account_rate = np.mean(data[target_index])
-        # Check for inversion
-        if target_symbol & 0xFFFFFF == _locals.usd:
-            account_rate = 1 / account_rate
+        account_rate = _account_rate(
+            position, data, _locals.same[s_index], _locals.target_index[s_index],
+            _locals.target_invert[s_index], 0 if where == 0 else None
+        )
         position.held_value = position.initial_value * account_rate / position.open_rate
 
     elif position.order.direction == Direction.SELL:
         # 2B. Buy target through base.
-        if base_index == target_index:
-            account_rate = position.open_rate
-        elif where == 0:
-            account_rate = data[base_index][0]
-        else:
-            account_rate = np.mean(data[base_index])
-        # Check for inversion
-        if base_symbol & 0xFFFFFF == _locals.usd:
-            account_rate = 1 / account_rate
+        account_rate = _account_rate(
+            position, data, _locals.same[s_index], _locals.base_index[s_index],
+            _locals.base_invert[s_index], 0 if where == 0 else None
+        )
         position.held_value = position.initial_value * account_rate * position.open_rate
 
 
@@ -475,8 +558,7 @@ def calculate_final_value(position, data, _locals, where) -> None:
         raise ValueError("calculate_held_position does not support where={}".format(where))
 
     # 1. Need to calculate which values we need. This comes from the trade direction.
-    s_index, base_symbol, target_symbol = _locals.graph[position.order.symbol_id]
-    base_index, target_index = _locals.graph[base_symbol][0], _locals.graph[target_symbol][0]
+    s_index = position.symbol_row
 
     # 2. Calculate close_rate
     if position.close_rate > 0:
@@ -491,32 +573,18 @@ def calculate_final_value(position, data, _locals, where) -> None:
     # 3. The exact calculation depends on the direction, and the ordering of the symbols.
     if position.order.direction == Direction.BUY:
         # 3A. Buy base through target.
-        if base_index == target_index:
-            account_rate = position.open_rate
-        elif where == 0:
-            account_rate = data[target_index][0]
-        elif where == 1:
-            account_rate = np.mean(data[target_index])
-        else:
-            account_rate = data[target_index][3]
-        # Check for inversion
-        if target_symbol & 0xFFFFFF == _locals.usd:
-            account_rate = 1 / account_rate
+        account_rate = _account_rate(
+            position, data, _locals.same[s_index], _locals.target_index[s_index],
+            _locals.target_invert[s_index], (0, None, 3)[where]
+        )
         position.final_value = position.held_value * close_rate / account_rate
 
     elif position.order.direction == Direction.SELL:
         # 3B. Buy target through base.
-        if base_index == target_index:
-            account_rate = position.open_rate
-        elif where == 0:
-            account_rate = data[base_index][0]
-        elif where == 1:
-            account_rate = np.mean(data[base_index])
-        else:
-            account_rate = data[base_index][2]
-        # Check for inversion
-        if base_symbol & 0xFFFFFF == _locals.usd:
-            account_rate = 1 / account_rate
+        account_rate = _account_rate(
+            position, data, _locals.same[s_index], _locals.base_index[s_index],
+            _locals.base_invert[s_index], (0, None, 2)[where]
+        )
         position.final_value = position.held_value / close_rate / account_rate
 
 
@@ -530,23 +598,31 @@ def calculate_final_value(position, data, _locals, where) -> None:
     returns symbols which have a conversion available
     doesnt return symbols which have no conversion available
 """)
-def calculate_required_symbols(requested: str, available: np.ndarray) -> Union[None, str]:
+def calculate_required_symbols(
+        requested: str,
+        available: np.ndarray,
+        currency_map: Optional[dict] = None
+) -> Union[None, str]:
     """
     Calculates the union of symbols requested with their conversion
     symbols if available. Filters out symbols that have no conversion
     available.
 
-    :param requested:   The currencies requested.
-    :type requested:    str
+    :param requested:       The currencies requested.
+    :type requested:        str
+
+    :param available:       The currencies available in the data source.
+    :type available:        numpy.ndarray[numpy.int64]
 
-    :param available:   The currencies available in the data source.
-    :type available:    numpy.ndarray[numpy.int64]
+    :param currency_map:    (Optional) The ``generate_currency_map`` of
+                            ``available``, if already calculated.
+    :type currency_map:     dict
 
-    :returns:           A comma-separated list of currencies to get.
-    :rtype:             str
+    :returns:               A comma-separated list of currencies to get.
+    :rtype:                 str
 
     """
-    graph = utils.generate_currency_map(available)
+    graph = currency_map if currency_map is not None else utils.generate_currency_map(available)
 
     needed = {}
     if requested is None:
@@ -556,12 +632,112 @@ def calculate_required_symbols(requested: str, available: np.ndarray) -> Union[N
             sid = utils.convert_symbol_to_id(r)
             if sid in graph and graph[sid][1] is not None and graph[sid][2] is not None:
                 needed[sid] = True
-                needed[graph[sid][1]] = True
-                needed[graph[sid][2]] = True
+                for chain in graph[sid][1:]:
+                    needed.update(dict.fromkeys(chain, True))
 
     return ",".join([utils.convert_id_to_symbol(n) for n in needed.keys()])
 
 
+@utils.generate_tests("""
+    plans to load every available symbol if there is no subset.
+    plans to load the subset and its conversion symbols.
+    keeps the order the symbols are available in.
+    uses the loaded symbols if given.
+    masks the loaded symbols in the subset.
+    maps each symbol to its chain of conversion rows.
+    inverts each rate quoted in the currency nearer the account currency.
+    inverts each hop of a chain through a USD-first pair correctly.
+""")
+def plan_symbols(
+        requested: Optional[str],
+        available: np.ndarray,
+        currency_map: Optional[dict] = None,
+        loaded: Optional[np.ndarray] = None
+) -> SymbolPlan:
+    """
+    Works out everything a Period needs to know about its symbols before
+    loading data. This is called once, in ``_calculate_periods``, and
+    the result shipped to every Period in its PeriodConfig.
+
+    :param requested:       The currencies requested, or None for all.
+    :type requested:        str
+
+    :param available:       The currencies available in the data source.
+    :type available:        numpy.ndarray[numpy.int64]
+
+    :param currency_map:    (Optional) The ``generate_currency_map`` of
+                            ``available``, if already calculated.
+    :type currency_map:     dict
+
+    :param loaded:          (Optional) The symbols the data source
+                            loaded, if known. Otherwise, the requested
+                            symbols in the order they are available.
+    :type loaded:           numpy.ndarray[numpy.int64]
+
+    :returns:               The plan.
+    :rtype:                 hokohoko._period.SymbolPlan
+
+    """
+    if currency_map is None:
+        currency_map = utils.generate_currency_map(available)
+    required_symbols = calculate_required_symbols(requested, available, currency_map)
+
+    # 1. Which symbols get loaded, and which of them the Predictor sees.
+    if loaded is None:
+        if required_symbols is None:
+            loaded = available
+        else:
+            required = [utils.convert_symbol_to_id(s) for s in required_symbols.split(",")]
+            loaded = available[np.isin(available, required)]
+    if requested is not None:
+        subset_filter = np.array([utils.convert_symbol_to_id(s) for s in requested.split(',')], np.int64)
+    else:
+        subset_filter = loaded
+    graph = utils.subset_currency_map(currency_map, loaded)
+
+    # 2. Dense, per-row copies of the graph, so the engines index arrays
+    #    rather than hash symbol ids. Each row holds the chain of rows
+    #    converting to the account currency, and whether each rate is
+    #    inverted, padded with -1. Rows without a conversion are all -1.
+    usd = utils.convert_symbol_to_id("USD")
+    hops = max([len(c) for _, b, t in graph.values() for c in (b, t) if c is not None], default=1)
+    same = np.zeros(len(graph), np.bool_)
+    base_index = np.full((len(graph), hops), -1, np.int64)
+    target_index = np.full((len(graph), hops), -1, np.int64)
+    base_invert = np.zeros((len(graph), hops), np.bool_)
+    target_invert = np.zeros((len(graph), hops), np.bool_)
+    for symbol_id, (i, base_chain, target_chain) in graph.items():
+        same[i] = base_chain == target_chain
+        for index, invert, chain, currency in (
+                (base_index, base_invert, base_chain, int(symbol_id) >> 24),
+                (target_index, target_invert, target_chain, int(symbol_id) & 0xFFFFFF)
+        ):
+            for h, pair in enumerate(chain or ()):
+                index[i, h] = graph[pair][0]
+                if same[i]:
+                    invert[i, h] = pair & 0xFFFFFF == usd
+                else:
+                    # Walk the chain; a rate is inverted when quoted in
+                    # the currency nearer the account currency, which
+                    # the next pair then converts.
+                    invert[i, h] = pair & 0xFFFFFF != currency
+                    currency = pair & 0xFFFFFF if invert[i, h] else pair >> 24
+
+    return SymbolPlan(
+        required_symbols=required_symbols,
+        symbol_ids=loaded,
+        subset_filter=subset_filter,
+        subset_mask=np.isin(loaded, subset_filter),
+        graph=graph,
+        symbol_index={int(k): v[0] for k, v in graph.items()},
+        same=same,
+        base_index=base_index,
+        base_invert=base_invert,
+        target_index=target_index,
+        target_invert=target_invert
+    )
+
+
 @utils.generate_tests("""
     raises an error if timestamps is None
     raises an error if timestamps is not a numpy array
@@ -608,9 +784,12 @@ def calculate_positions(
     :type minute:           int
 
     """
-    future = get_past_minutes(source, minute, minute + shared_config.hold_minutes)
+    if _locals.bars is not None:
+        future = _locals.bars.get_bars(minute, minute + shared_config.hold_minutes)
+    else:
+        future = get_past_minutes(source, minute, minute + shared_config.hold_minutes)
     for o_id, o in predictor.account.orders.items():
-        f_index = _locals.graph[o.symbol_id][0]
+        f_index = _locals.symbol_index[o.symbol_id]
         position = Position(
             order=o,
             future=future[f_index],
@@ -621,7 +800,8 @@ def calculate_positions(
             close_rate=-1,              # As above.
             held_value=0.0,
             initial_value=0.0,
-            final_value=0.0
+            final_value=0.0,
+            symbol_row=f_index
         )
         # Must be convertible to account currency.
         if o.direction in (Direction.BUY, Direction.SELL):
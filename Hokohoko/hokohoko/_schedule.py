@@ -0,0 +1,230 @@
+#   hokohoko/_schedule.py
+#
+#   Copyright 2020 Neil Bradley
+#
+#   This file is part of Hokohoko.
+#
+#   Hokohoko is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   Hokohoko is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY# without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with Hokohoko.  If not, see <https://www.gnu.org/licenses/>.
+#
+#   ====================================================================
+#
+#   Orders the Periods handed to the pool by their expected cost.
+#
+
+import json
+import os
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko._period import PeriodConfig
+from hokohoko.entities import Config
+
+#: Tasks to make per process when grouping Periods, so the last few
+#: still balance.
+TASKS_PER_PROCESS = 4
+
+
+class Timing(NamedTuple):
+    """
+    When, and in which process, a Period ran.
+    """
+    period_id: int
+    pid: int
+    started: float
+    finished: float
+
+
+@utils.generate_tests("""
+    returns an empty dict if filename is None.
+    returns an empty dict if the file doesn't exist.
+    reads the timings written by save_timings.
+""")
+def load_timings(filename: Optional[str]) -> Dict[str, float]:
+    """
+    :param filename:    The timings file, or ``None``.
+    :type filename:     str
+
+    :returns:           The seconds each Period took, keyed by
+                        ``timing_key``.
+    :rtype:             dict[str, float]
+    """
+    if filename is None or not os.path.exists(filename):
+        return {}
+    with open(filename) as f:
+        return json.load(f)
+
+
+def save_timings(filename: str, timings: Dict[str, float]) -> None:
+    """
+    :param filename:    The timings file.
+    :type filename:     str
+
+    :param timings:     The seconds each Period took, keyed by
+                        ``timing_key``.
+    :type timings:      dict[str, float]
+    """
+    with open(filename, "w") as f:
+        json.dump(timings, f, indent=4, sort_keys=True)
+
+
+@utils.generate_tests("""
+    differs by predictor, data, subset and engine.
+    differs by the Period's minutes.
+""")
+def timing_key(config: Config, period_config: PeriodConfig) -> str:
+    """
+    :returns:   The key of a Period's timing. This covers what the
+                Period's cost depends on, so timings from other
+                settings aren't used.
+    :rtype:     str
+    """
+    return "|".join(str(v) for v in (
+        config.predictor_class, config.data_class, config.data_parameters, config.data_subset,
+        config.engine, period_config.origin, period_config.test_point, period_config.end
+    ))
+
+
+@utils.generate_tests("""
+    uses the minutes times the symbols without timings.
+    uses the timings where known.
+    scales the estimate of the others to match the timings.
+""")
+def estimate_costs(
+        config: Config,
+        period_configs: List[PeriodConfig],
+        timings: Dict[str, float]
+) -> np.ndarray:
+    """
+    Estimates each Period's cost, from its timing if known. Otherwise
+    the minutes it simulates times its symbols are used, scaled to the
+    timings that are known.
+
+    :returns:   The cost of each Period, in order.
+    :rtype:     numpy.ndarray[numpy.float64]
+    """
+    estimate = np.array([
+        (pc.end - pc.origin) * len(pc.available_symbols if pc.symbols is None else pc.symbols.symbol_ids)
+        for pc in period_configs
+    ], np.float64)
+    known = np.array([timings.get(timing_key(config, pc), np.nan) for pc in period_configs], np.float64)
+    has = ~np.isnan(known)
+    if not has.any():
+        return estimate
+    scale = np.median(known[has] / np.maximum(estimate[has], 1))
+    return np.where(has, known, estimate * scale)
+
+
+@utils.generate_tests("""
+    returns one group per Period, in order, if ordered.
+    returns the most expensive groups first.
+    keeps each group in order of origin.
+    only groups Periods that overlap.
+    makes up to TASKS_PER_PROCESS groups per process.
+    doesn't group if there's no data cache.
+    raises an error on an unknown schedule.
+""")
+def schedule(
+        config: Config,
+        period_configs: List[PeriodConfig],
+        timings: Dict[str, float]
+) -> List[List[PeriodConfig]]:
+    """
+    Splits the Periods into the tasks to hand to the pool, in the order
+    to hand them over.
+
+    With ``schedule`` set to ``"ordered"``, each Period is a task, in
+    order. With ``"cost"``, the most expensive tasks go first, so no
+    long Period is left to run on its own at the end. If there's a data
+    cache, Periods that overlap are also grouped into runs of similar
+    cost, to run one after another in the same process, so each reuses
+    the data of the one before.
+
+    :param config:          The global configuration options.
+    :type config:           hokohoko.entities.Config
+
+    :param period_configs:  The Periods.
+    :type period_configs:   list[hokohoko._period.PeriodConfig]
+
+    :param timings:         The seconds each Period took before, keyed
+                            by ``timing_key``.
+    :type timings:          dict[str, float]
+
+    :returns:               The tasks.
+    :rtype:                 list[list[hokohoko._period.PeriodConfig]]
+    """
+    if config.schedule not in ("ordered", "cost"):
+        raise ValueError(f"Unknown schedule: {config.schedule}")
+    if config.schedule == "ordered" or len(period_configs) == 0:
+        return [[pc] for pc in period_configs]
+
+    costs = estimate_costs(config, period_configs, timings)
+    order = sorted(range(len(period_configs)), key=lambda i: period_configs[i].origin)
+    if config.cache_bytes is None:
+        groups = [[i] for i in order]
+    else:
+        # Cut where the running cost passes each equal share, or where
+        # neighbours don't overlap.
+        count = min(len(order), config.process_count * TASKS_PER_PROCESS)
+        before = np.cumsum(costs[order]) - costs[order]
+        shares = np.floor(before * count / max(before[-1] + costs[order[-1]], 1e-9))
+        groups = [[order[0]]]
+        for k in range(1, len(order)):
+            previous, current = period_configs[order[k - 1]], period_configs[order[k]]
+            if shares[k] != shares[k - 1] or current.origin >= previous.end:
+                groups.append([])
+            groups[-1].append(order[k])
+
+    groups.sort(key=lambda g: -costs[g].sum())
+    return [[period_configs[i] for i in g] for g in groups]
+
+
+@utils.generate_tests("""
+    reports the idle seconds of each process.
+    reports processes without Periods as idle throughout.
+""")
+def idle_times(
+        timings: Iterable[Timing],
+        started: float,
+        finished: float,
+        process_count: int
+) -> Dict[Optional[int], float]:
+    """
+    Works out how long each process in the pool sat idle.
+
+    :param timings:         When each Period ran.
+    :type timings:          Iterable[hokohoko._schedule.Timing]
+
+    :param started:         When the first Period started.
+    :type started:          float
+
+    :param finished:        When the last Period finished.
+    :type finished:         float
+
+    :param process_count:   The number of processes in the pool.
+    :type process_count:    int
+
+    :returns:               The idle seconds, by process id. Processes
+                            that ran no Periods are summed under
+                            ``None``.
+    :rtype:                 dict[int, float]
+    """
+    busy: Dict[Optional[int], float] = {}
+    for t in timings:
+        busy[t.pid] = busy.get(t.pid, 0.0) + t.finished - t.started
+    idle: Dict[Optional[int], float] = {pid: finished - started - b for pid, b in busy.items()}
+    if len(busy) < process_count:
+        idle[None] = (process_count - len(busy)) * (finished - started)
+    return idle
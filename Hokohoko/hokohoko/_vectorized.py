@@ -0,0 +1,408 @@
+#   hokohoko/_vectorized.py
+#
+#   Copyright 2020 Neil Bradley
+#
+#   This file is part of Hokohoko.
+#
+#   Hokohoko is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   Hokohoko is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY# without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with Hokohoko.  If not, see <https://www.gnu.org/licenses/>.
+#
+#   ====================================================================
+#
+#   This file contains an array-based alternative to the engine in
+#   _run.simulate. All open Positions are held in NumPy arrays, and
+#   every transition is decided for all of them at once, per minute.
+#
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko.entities import Account, Direction, PositionBook, Predictor, Status
+
+_PENDING = Status.PENDING.value
+_OPEN = Status.OPEN.value
+_CLOSED = Status.CLOSED.value
+_CLOSED_TAKE_PROFIT = Status.CLOSED_TAKE_PROFIT.value
+_CLOSED_STOP_LOSS = Status.CLOSED_STOP_LOSS.value
+
+
+@utils.generate_tests("""
+    takes each Position's symbol row from the book.
+    takes the target chain for a BUY and the base chain for a SELL.
+    raises an error naming a symbol with no conversion.
+""")
+def conversion_indexes(
+        positions: PositionBook,
+        rows: np.ndarray,
+        _locals
+) -> Tuple[np.ndarray, ...]:
+    """
+    Looks up, per Position, the data rows needed to value it in the
+    account currency.
+
+    :param positions:   The book holding the Positions.
+    :type positions:    hokohoko.entities.PositionBook
+
+    :param rows:        The book rows of the Positions.
+    :type rows:         numpy.ndarray[numpy.int64]
+
+    :param _locals:     The period-local variables.
+    :type _locals:      hokohoko._run._Locals
+
+    :returns:           | Five arrays, one element per Position:
+                        | 1. The row of the Position's symbol.
+                        | 2. The chain of account conversion rows,
+                        |    padded with -1.
+                        | 3. If the symbol is its own conversion symbol.
+                        | 4. If each conversion rate needs inverting.
+                        | 5. If the Position is a BUY.
+    :rtype:             tuple(numpy.ndarray, ...)
+    """
+    s_index = positions.column("symbol_row")[rows]
+    buy = positions.column("direction")[rows] == Direction.BUY.value
+    base_index, target_index = _locals.base_index[s_index], _locals.target_index[s_index]
+    unconvertible = (base_index[:, 0] < 0) | (target_index[:, 0] < 0)
+    if unconvertible.any():
+        missing = positions.column("symbol_id")[rows][unconvertible][0]
+        raise ValueError(f"No conversion to the account currency for {utils.convert_id_to_symbol(missing)}")
+
+    # The account conversion chain depends on the trade direction.
+    a_index = np.where(buy[:, None], target_index, base_index)
+    same = _locals.same[s_index]
+    invert = np.where(buy[:, None], _locals.target_invert[s_index], _locals.base_invert[s_index])
+
+    return s_index, a_index, same, invert, buy
+
+
+class _OpenPositions:
+    """
+    Copy of the live rows of ``account.positions``, in book order, with
+    the conversion rows needed to value them. Built at the start of
+    every chunk, and written back to the book at the end of it.
+    """
+
+    #: The PositionBook columns the engine reads and writes.
+    COLUMNS = (
+        "open_bid",
+        "take_profit",
+        "stop_loss",
+        "status",
+        "open_time",
+        "close_time",
+        "open_rate",
+        "close_rate",
+        "held_value",
+        "initial_value",
+        "final_value"
+    )
+
+    def __init__(self, account: Account, _locals, rows: Optional[np.ndarray] = None) -> None:
+        """
+        :param account: The Account to take the Positions from.
+        :type account:  hokohoko.entities.Account
+
+        :param _locals: The period-local variables.
+        :type _locals:  hokohoko._run._Locals
+
+        :param rows:    (Optional) The book rows to take, rather than
+                        every live one.
+        :type rows:     numpy.ndarray[numpy.int64]
+        """
+        positions = account.positions
+        self.rows = positions.rows() if rows is None else rows
+        self.ids = positions.ids()[self.rows]
+        for name in self.COLUMNS:
+            setattr(self, name, positions.column(name)[self.rows])
+
+        self.s_index, self.a_index, self.same, self.invert, self.buy = conversion_indexes(positions, self.rows, _locals)
+        self.live = np.ones(len(self.rows), np.bool_)
+        self.closed: List[int] = []
+
+    def write_back(self, account: Account) -> None:
+        """
+        Copies the array state back into the book, and moves any closed
+        Positions into the history.
+
+        :param account: The Account the Positions were taken from.
+        :type account:  hokohoko.entities.Account
+        """
+        for name in self.COLUMNS:
+            account.positions.column(name)[self.rows] = getattr(self, name)
+        account.positions.move([int(self.ids[j]) for j in self.closed], account.history)
+
+
+def _crossed(a: np.ndarray, b: np.ndarray, value: np.ndarray) -> np.ndarray:
+    """
+    Tests if value lies between a and b, in either order. NaN (an unset
+    value) never crosses.
+    """
+    return ((a <= value) & (value <= b)) | ((a >= value) & (value >= b))
+
+
+def _account_rate(
+        book: _OpenPositions,
+        rows: np.ndarray,
+        minute: np.ndarray,
+        where: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorised form of ``_run._account_rate``, for the rate lookups in
+    ``_run.calculate_held_value`` and ``_run.calculate_final_value``.
+
+    ``simulate`` works on scalars, so a rate read from the data keeps the
+    data's type, and anything combined with it is calculated at that
+    precision. This follows the same steps, in the same order, so both
+    engines round alike.
+
+    :param book:    The open Positions.
+    :param rows:    The rows of the book to calculate for.
+    :param minute:  The current minute's data, (symbols, OHLC).
+    :param where:   0 = Start, 1 = Middle, 2 = End
+
+    :returns:       | Two arrays, one element per row:
+                    | 1. The rate, as a float64 holding the value.
+                    | 2. If the rate was read from the data, so has the
+                    |    data's type.
+    """
+    a_index = book.a_index[rows]
+    if where == 0:
+        rate = minute[a_index, 0]
+    elif where == 1:
+        rate = minute[a_index].mean(axis=2)
+    else:
+        # The End rate is the close for a BUY, but the low for a SELL.
+        rate = np.where(book.buy[rows, None], minute[a_index, 3], minute[a_index, 2])
+
+    # Multiplied along the chain, hop by hop, at the data's precision.
+    account_rate = np.ones(len(rows), rate.dtype)
+    invert = book.invert[rows]
+    for h in range(a_index.shape[1]):
+        step = np.where(invert[:, h], account_rate / rate[:, h], account_rate * rate[:, h])
+        account_rate = np.where(a_index[:, h] >= 0, step, account_rate)
+
+    # A symbol that is its own conversion uses its open_rate instead.
+    same = book.same[rows]
+    open_rate = book.open_rate[rows]
+    own = np.where(invert[:, 0], 1 / open_rate, open_rate)
+    return np.where(same, own, account_rate), ~same
+
+
+def _held_value(book: _OpenPositions, rows: np.ndarray, minute: np.ndarray, where: int) -> None:
+    """
+    Vectorised ``_run.calculate_held_value``.
+    """
+    rate, from_data = _account_rate(book, rows, minute, where)
+    initial, open_rate = book.initial_value[rows], book.open_rate[rows]
+    buy = book.buy[rows]
+    held = np.where(buy, initial * rate / open_rate, initial * rate * open_rate)
+
+    # Where the rate came from the data, every step is at its precision.
+    dtype = minute.dtype
+    initial, rate, open_rate = initial.astype(dtype), rate.astype(dtype), open_rate.astype(dtype)
+    narrow = np.where(buy, initial * rate / open_rate, initial * rate * open_rate)
+    book.held_value[rows] = np.where(from_data, narrow, held)
+
+
+def _final_value(book: _OpenPositions, rows: np.ndarray, minute: np.ndarray, where: int) -> None:
+    """
+    Vectorised ``_run.calculate_final_value``.
+    """
+    s_index = book.s_index[rows]
+    if where == 0:
+        data_rate = minute[s_index, 0]
+    elif where == 1:
+        data_rate = minute[s_index].mean(axis=1)
+    else:
+        data_rate = minute[s_index, 3]
+    known = book.close_rate[rows] > 0
+    close_rate = np.where(known, book.close_rate[rows], data_rate)
+
+    rate, rate_from_data = _account_rate(book, rows, minute, where)
+    held = book.held_value[rows]
+    buy = book.buy[rows]
+
+    # The steps are taken at the data's precision from the first one
+    # that uses a rate read from the data, as simulate's scalars are.
+    dtype = minute.dtype
+    wide = np.where(buy, held * close_rate, held / close_rate)
+    narrow = np.where(buy, held.astype(dtype) * data_rate, held.astype(dtype) / data_rate)
+    first = np.where(known, wide.astype(dtype), narrow)
+    value = np.where(known & ~rate_from_data, wide / rate, first / rate.astype(dtype))
+    book.final_value[rows] = value
+
+
+@utils.generate_tests("""
+    does nothing but carry the balance forward if there are no positions.
+    produces the same balance and equity as simulate.
+    produces the same history as simulate.
+    closes at most one position per minute, as simulate does.
+    leaves the positions in the same order.
+    compares thresholds at the data's precision, as simulate does.
+""")
+def simulate_vectorized(
+        predictor: Predictor,
+        _locals,
+        timestamps: np.ndarray,
+        data: np.ndarray
+) -> None:
+    """
+    A drop-in replacement for ``_run.simulate``. Rather than visiting
+    each Position every minute, the Positions are copied into arrays
+    once per chunk, and the open, take-profit, stop-loss and expiry
+    transitions are decided for all of them at once.
+
+    .. note::
+        ``simulate`` stops visiting Positions for the rest of a minute
+        once one of them closes. This is preserved, so both engines give
+        the same balance and equity series.
+
+    :param predictor:   The Predictor associated with this Period.
+    :type predictor:    hokohoko.entities.Predictor
+
+    :param _locals:     The period-local variables.
+    :type _locals:      hokohoko._run._Locals
+
+    :param timestamps:  List of timestamps in the next chunk about to be
+                        processed. The first minute is the last minute
+                        of the previous chunk.
+    :type timestamps:   numpy.ndarray[numpy.int64]
+
+    :param data:        List of data in the next chunk about to be
+                        processed. The first minute is the last minute
+                        of the previous chunk.
+    :type data:         numpy.ndarray[numpy.float32]
+
+    """
+    account = predictor.account
+    book = _OpenPositions(account, _locals)
+    n = len(book.ids)
+    order = np.arange(n)
+    balance = np.empty(len(timestamps) - 1, np.float64)
+    equity = np.empty(len(timestamps) - 1, np.float64)
+    current = account.balance[-1]
+
+    for i in range(1, len(timestamps)):
+        # 0. Without open positions, the balance is just carried forward
+        #    for the rest of the chunk.
+        if not book.live.any():
+            balance[i - 1:] = current
+            equity[i - 1:] = current
+            break
+
+        timestamp = timestamps[i]
+        minute = data[:, i * 5:i * 5 + 4]
+        rows = np.flatnonzero(book.live)
+        s_index = book.s_index[rows]
+        l_close = data[s_index, i * 5 - 2]
+        t_open, t_high, t_low = minute[s_index, 0], minute[s_index, 1], minute[s_index, 2]
+        status = book.status[rows]
+        take_profit = book.take_profit[rows]
+        stop_loss = book.stop_loss[rows]
+
+        # Thresholds are compared at the data's precision, as the loop
+        # engine compares them against the data's scalars.
+        c_open_bid, c_take_profit, c_stop_loss = (
+            a.astype(data.dtype) for a in (book.open_bid[rows], take_profit, stop_loss)
+        )
+
+        # 1. Check for status changes between minutes.
+        expired = book.close_time[rows] <= timestamp
+        open_0 = ~expired & (status == _PENDING) & (
+            np.isnan(c_open_bid) | _crossed(l_close, t_open, c_open_bid)
+        )
+        status = np.where(open_0, _OPEN, status)
+        is_open = ~expired & (status == _OPEN)
+        tp_0 = is_open & _crossed(l_close, t_open, c_take_profit)
+        sl_0 = is_open & ~tp_0 & _crossed(l_close, t_open, c_stop_loss)
+        closed_0 = tp_0 | sl_0
+
+        # 2. Check for status changes within the minute.
+        open_1 = ~expired & ~closed_0 & (status == _PENDING) & _crossed(t_low, t_high, c_open_bid)
+        status = np.where(open_1, _OPEN, status)
+        is_open = ~expired & ~closed_0 & (status == _OPEN)
+        tp_1 = is_open & _crossed(t_low, t_high, c_take_profit)
+        sl_1 = is_open & ~tp_1 & _crossed(t_low, t_high, c_stop_loss)
+
+        # 3. Only Positions up to, and including, the first to close are
+        #    visited this minute.
+        closing = expired | closed_0 | tp_1 | sl_1
+        if closing.any():
+            k = np.argmax(closing)
+            visited = order[:len(rows)] <= k
+        else:
+            k = None
+            visited = np.ones(len(rows), np.bool_)
+
+        # 4. Open.
+        for where, opened in ((0, open_0 & visited), (1, open_1 & visited)):
+            if opened.any():
+                o_rows = rows[opened]
+                book.status[o_rows] = _OPEN
+                if where == 0:
+                    book.open_time[o_rows] = timestamp
+                    book.open_rate[o_rows] = np.where(
+                        np.isnan(book.open_bid[o_rows]), minute[book.s_index[o_rows], 0], book.open_bid[o_rows]
+                    )
+                else:
+                    book.open_time[o_rows] = timestamp + 30
+                    book.open_rate[o_rows] = book.open_bid[o_rows]
+                book.initial_value[o_rows] = Account.POSITION_OPEN_VALUE
+                book.final_value[o_rows] = Account.POSITION_OPEN_VALUE
+                _held_value(book, o_rows, minute, where)
+
+        # 5. Close.
+        if k is not None:
+            row = rows[k:k + 1]
+            if expired[k]:
+                where = 0
+                if status[k] == _OPEN:
+                    book.status[row] = _CLOSED
+                    book.close_rate[row] = minute[s_index[k], 0]
+            elif closed_0[k]:
+                where = 0
+                book.status[row] = _CLOSED_TAKE_PROFIT if tp_0[k] else _CLOSED_STOP_LOSS
+                book.close_rate[row] = take_profit[k] if tp_0[k] else stop_loss[k]
+            else:
+                where = 1
+                book.status[row] = _CLOSED_TAKE_PROFIT if tp_1[k] else _CLOSED_STOP_LOSS
+                book.close_rate[row] = take_profit[k] if tp_1[k] else stop_loss[k]
+            book.close_time[row] = timestamp if where == 0 else timestamp + 30
+            if book.status[row[0]] != _PENDING:
+                _final_value(book, row, minute, where)
+
+        # 6. Calculate the positions current value if still open.
+        held = rows[visited & ~closing & (status == _OPEN)]
+        if len(held) > 0:
+            _final_value(book, held, minute, 2)
+
+        # Effect closed positions.
+        if k is not None:
+            current += book.final_value[rows[k]] - book.initial_value[rows[k]]
+            book.live[rows[k]] = False
+            book.closed.append(rows[k])
+        balance[i - 1] = current
+
+        # Update equity here, summed in book order as simulate does.
+        live = book.live
+        change = book.final_value[live] - book.initial_value[live]
+        equity[i - 1] = np.add.accumulate(np.concatenate(([current], change)))[-1]
+
+    book.write_back(account)
+    account.balance.extend(balance)
+    account.equity.extend(equity)
+
+    if __debug__:
+        for p_id, p in account.positions.items():
+            print("\tUpdated  {:8}: {}".format(p_id, p))
@@ -0,0 +1,201 @@
+#   hokohoko/_window.py
+#
+#   Copyright 2020 Neil Bradley
+#
+#   This file is part of Hokohoko.
+#
+#   Hokohoko is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   Hokohoko is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY# without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with Hokohoko.  If not, see <https://www.gnu.org/licenses/>.
+#
+#   ====================================================================
+#
+#   Serves a Data source a window at a time, rather than all at once.
+#
+
+import multiprocessing as mp
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko.entities import Data
+
+
+class Window(Data):
+    """
+    Wraps a Data source, loading its data in chunks of ``minutes`` as
+    they are asked for, and releasing every chunk before the earliest
+    minute still being read. A Period reads several ranges each step,
+    such as the minutes to simulate, the past Bar and the hold, each
+    moving forward; these are told apart by their length. So only the
+    chunks covering its current Bar and hold are ever held, rather than
+    the whole Period.
+
+    Each chunk is loaded by entering the wrapped source over just those
+    minutes, so this suits sources that can read part of their data
+    cheaply, such as ``hokohoko.standard.Native``. There is no data
+    cache, so there is no RangeIndex or Planar copy either.
+    """
+
+    @utils.generate_tests("raises an error if minutes is less than 1")
+    def __init__(
+            self,
+            data_class: Callable[..., Data],
+            minutes: int,
+            parameters: str,
+            symbol_subset: Optional[Iterable[str]] = None,
+            origin: int = 0,
+            end: Optional[int] = None,
+            lock: Optional[mp.Lock] = None,
+            load: bool = True
+    ) -> None:
+        """
+        :param data_class:  The Data source to wrap.
+        :type data_class:   Callable[..., hokohoko.entities.Data]
+
+        :param minutes:     How many minutes to load in each chunk.
+        :type minutes:      int
+
+        Other arguments are passed through to the wrapped source.
+        """
+        if minutes < 1:
+            raise ValueError(f"minutes must be at least 1: {minutes}")
+        super().__init__(parameters, symbol_subset, origin, end, lock, load)
+        self.data_class = data_class
+        self.minutes = minutes
+        self._chunks: Dict[int, np.ndarray] = {}
+        #: The last origin, and read number, of each length of range.
+        self._streams: Dict[int, Tuple[int, int]] = {}
+        self._reads = 0
+
+    @utils.generate_tests("""
+        reads the symbols and timestamps without loading any data.
+        starts with no chunks.
+    """)
+    def __enter__(self) -> 'Window':
+        """
+        Reads the symbols and timestamps of the wrapped source.
+        """
+        with self.data_class(
+                self.parameters, self.symbol_subset, self.origin, self.end, self.lock, load=False
+        ) as source:
+            self.symbol_ids = np.array(source.get_symbol_ids())
+            self.timestamps = np.array(source.timestamps)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Releases every chunk.
+
+        :param exc_type:
+        :param exc_val:
+        :param exc_tb:
+        :return:
+
+        """
+        self._chunks.clear()
+        self._streams.clear()
+
+    @utils.generate_tests("returns the correct symbol ids")
+    def get_symbol_ids(self) -> np.ndarray:
+        """
+        :return:    The list of available symbols (as ids).
+        :rtype:     numpy.ndarray[numpy.int64]
+        """
+        return self.symbol_ids
+
+    @utils.generate_tests("returns the correct count of minutes")
+    def get_minutes(self) -> int:
+        """
+        :returns:   Number of minutes.
+        :rtype:     int
+        """
+        return self.timestamps.shape[0]
+
+    @utils.generate_tests("""
+        raises an error if origin is negative
+        raises an error if end is less than origin
+        matches the wrapped source
+        returns a view within a single chunk
+        joins ranges spanning chunks
+        only loads the chunks covering the range
+        releases chunks before origin
+        reloads released chunks if asked for again
+        keeps the chunks another length of range is still reading
+        forgets lengths of range no longer being read
+    """)
+    def get_partial_data(
+            self,
+            origin: int,
+            end: int
+    ) -> (np.ndarray, np.ndarray):
+        """
+        Retrieve a block of data [origin, end), loading the chunks that
+        cover it, and releasing those before every range still being
+        read.
+
+        :param origin:  The first minute to get. Note this is an index
+                        value, with 0 being the start of the available
+                        data.
+        :type origin:   int
+
+        :param end:     Get up to this minute.
+        :type end:      int
+
+        :returns:       | Two arrays:
+                        | 1. Per-minute timestamps.
+                        | 2. Per-symbol, per-minute exchange rate data.
+        :rtype:         tuple(numpy.ndarray, numpy.ndarray)
+
+        """
+        if origin < 0:
+            raise ValueError("origin < 0")
+        if end <= origin:
+            raise ValueError("end <= origin")
+
+        origin, end = origin - self.origin, end - self.origin
+        first, last = origin // self.minutes, (end - 1) // self.minutes
+
+        # Each length of range moves forward on its own, so only release
+        # what is before all of them. A length not read in as many reads
+        # as there are lengths has stopped, like the one-off opening
+        # read; if it hasn't, its chunks are just loaded again.
+        self._reads += 1
+        self._streams[end - origin] = (origin, self._reads)
+        for length in [
+            length for length, (_, read) in self._streams.items()
+            if self._reads - read > len(self._streams)
+        ]:
+            del self._streams[length]
+        lowest = min(o for o, _ in self._streams.values()) // self.minutes
+        for k in [k for k in self._chunks if k < lowest]:
+            del self._chunks[k]
+
+        chunks = [self._load(k) for k in range(first, last + 1)]
+        data = chunks[0] if len(chunks) == 1 else np.concatenate(chunks, axis=1)
+        start = first * self.minutes
+        return self.timestamps[origin:end], data[:, (origin - start) * 5:(end - start) * 5]
+
+    def _load(self, k: int) -> np.ndarray:
+        """
+        Loads the k-th chunk, if it isn't already.
+        """
+        if k not in self._chunks:
+            origin = self.origin + k * self.minutes
+            end = self.origin + min((k + 1) * self.minutes, len(self.timestamps))
+            with self.data_class(
+                    self.parameters, self.symbol_subset, origin, end, self.lock
+            ) as source:
+                # Copied, as the source may only lend its data while open.
+                self._chunks[k] = np.array(source.get_partial_data(origin, end)[1])
+        return self._chunks[k]
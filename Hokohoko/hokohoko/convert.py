@@ -0,0 +1,125 @@
+#   hokohoko/convert.py
+#
+#   Copyright 2020 Neil Bradley
+#
+#   This file is part of Hokohoko.
+#
+#   Hokohoko is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   Hokohoko is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY# without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with Hokohoko.  If not, see <https://www.gnu.org/licenses/>.
+#
+#   ====================================================================
+#
+#   Converts data files into Hokohoko's native format.
+#
+
+"""
+=======
+convert
+=======
+
+Converts a ``data.npz`` file into a directory in Hokohoko's native
+format, which ``hokohoko.standard.Native`` memory-maps:
+
+.. code-block :: Text
+
+    python3 -m hokohoko.convert data.npz directory
+
+Add ``--fixed-point`` to store the exchange rates as integers, e.g.
+``112345`` for ``1.12345``, each symbol's fields scaled by their own
+power of ten. They are read back as exactly the same values.
+
+Then use it with:
+
+.. code-block :: Text
+
+    python3 -m hokohoko.Hokohoko -D "hokohoko.standard.Native directory"
+
+Or, with ``--sqlite``, into an SQLite database, which
+``hokohoko.standard.SQLite`` reads, and which can be appended to:
+
+.. code-block :: Text
+
+    python3 -m hokohoko.convert --sqlite data.npz data.sqlite
+
+"""
+import sys
+from argparse import ArgumentParser
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko.standard import Native, SQLite
+
+
+@utils.generate_tests("""
+    raises an error if the file doesn't exist
+    writes every symbol
+    the converted data matches the original
+    the fixed-point data matches the original
+""")
+def convert_npz(filename: str, directory: str, fixed_point: bool = False) -> None:
+    """
+    Converts a ``data.npz`` file into the native format.
+
+    :param filename:    The ``data.npz`` file to convert.
+    :type filename:     str
+
+    :param directory:   The directory to write to.
+    :type directory:    str
+
+    :param fixed_point: Store the data as fixed-point.
+    :type fixed_point:  bool
+    """
+    with np.load(filename) as source:
+        data = source['data']
+        Native.write(
+            directory,
+            source['symbol_ids'],
+            source['timestamps'],
+            data,
+            Native.fixed_point_scales(data) if fixed_point else None
+        )
+
+
+@utils.generate_tests("""
+    raises an error if the file doesn't exist
+    raises an error if the database already has data
+    writes every symbol
+    the converted data matches the original
+""")
+def convert_npz_sqlite(filename: str, database: str) -> None:
+    """
+    Converts a ``data.npz`` file into a new SQLite database.
+
+    :param filename:    The ``data.npz`` file to convert.
+    :type filename:     str
+
+    :param database:    The SQLite database to write.
+    :type database:     str
+    """
+    with np.load(filename) as source:
+        SQLite.append(database, source['symbol_ids'], source['timestamps'], source['data'])
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Converts a data.npz file into Hokohoko's native format.")
+    parser.add_argument("source", help="The data.npz file to convert.", type=str)
+    parser.add_argument("directory", help="The directory (or database) to write to.", type=str)
+    parser.add_argument("--fixed-point", help="Store the data as fixed-point.", action="store_true")
+    parser.add_argument("--sqlite", help="Write an SQLite database instead.", action="store_true")
+    args = parser.parse_args()
+    if args.sqlite:
+        convert_npz_sqlite(args.source, args.directory)
+    else:
+        convert_npz(args.source, args.directory, args.fixed_point)
+    sys.exit()
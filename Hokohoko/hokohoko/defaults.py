@@ -36,3 +36,17 @@ DEFAULT_TRAINING_MINUTES = 10080 * 26 * 3  #: 18 months of weeks.
 DEFAULT_TEST_MINUTES = 10080 * 26  #: 6 months of weeks.
 DEFAULT_PROFILING = False  #: Don't enable Python's profiler.
 DEFAULT_VERBOSITY = 0   #: No debug output.
+DEFAULT_ENGINE = 'loop'  #: Simulate one Position at a time.
+DEFAULT_ACCOUNT_DTYPE = 'float64'  #: Keep balance and equity at full precision.
+DEFAULT_ACCOUNT_STRIDE = 1  #: Keep balance and equity for every minute.
+DEFAULT_RANGE_INDEX = False  #: Reduce Bars from the minute data directly.
+DEFAULT_SHARED_MEMORY = False  #: Each process loads its own data.
+DEFAULT_PLANAR = False  #: Read fields from the interleaved data.
+DEFAULT_WINDOW_MINUTES = None  #: Load each Period's data all at once.
+DEFAULT_DATA_LOCK = None  #: Serialise opening the data only if the source needs it.
+DEFAULT_CACHE_BYTES = None  #: Each Period loads its own data.
+DEFAULT_PREFETCH = None  #: Read the data only as it is asked for.
+DEFAULT_SCHEDULE = 'ordered'  #: Run the Periods by id.
+DEFAULT_TIMINGS = None  #: Estimate Period costs without timings.
+DEFAULT_START_METHOD = None  #: Use 'spawn', unless a start method is already set.
+DEFAULT_PRELOAD = ['hokohoko.Hokohoko']  #: Modules for the forkserver to import.
@@ -26,8 +26,10 @@ from typing import Dict, List, Union
 
 import numpy as np
 
+from hokohoko import utils
 from hokohoko.entities._Order import Order
-from hokohoko.entities._Position import Position
+from hokohoko.entities._PositionBook import PositionBook
+from hokohoko.entities._Series import Series
 
 
 class Account:
@@ -45,14 +47,14 @@ class Account:
 
         **balance**
 
-            A ``list[numpy.float64]`` of per-minute balances for the
-            testing period. Starts with an initial balance of ``0.0``.
-            Current balance can be retrieved via
+            A ``hokohoko.entities.Series`` of per-minute balances for
+            the testing period. Starts with an initial balance of
+            ``0.0``. Current balance can be retrieved via
             ``self.account.balance[-1]``.
 
         **equity**
 
-            A ``list[numpy.float64]`` of per-minute equity for the
+            A ``hokohoko.entities.Series`` of per-minute equity for the
             testing period. Starts with an initial value of ``0.0``.
             Current equity can be retrieved via
             ``self.account.equity[-1]``.
@@ -66,16 +68,16 @@ class Account:
 
         **positions**
 
-            The ``dict[numpy.int64, hokohoko.entities.Position]`` of
-            Positions that are considered 'open'. These are made
+            The ``hokohoko.entities.PositionBook`` of Positions that are
+            considered 'open', keyed by Order id. These are made
             available to the Predictor (so can be manually closed), but
             their primary purpose is to keep a running record of balance
             and equity.
 
         **history**
 
-            The ``list[hokohoko.entities.Positions]`` that will be passed
-            into the Assessors.
+            The ``hokohoko.entities.PositionBook`` of closed Positions
+            that will be passed into the Assessors.
 
         **symbol_ids**
 
@@ -83,9 +85,38 @@ class Account:
             Order should match that of returned Bars.
 
         """
-        self.balance: List[Union[float, np.float64]] = [0.0]
-        self.equity: List[Union[float, np.float64]] = [0.0]
+        self.balance: Series = Series(0.0)
+        self.equity: Series = Series(0.0)
         self.orders: Dict[int, Order] = {}
-        self.positions: Dict[int, Position] = {}
-        self.history: Dict[int, Position] = {}
+        self.positions: PositionBook = PositionBook()
+        self.history: PositionBook = PositionBook()
         self.symbol_ids: List[str] = []
+
+    @utils.generate_tests("""
+        reserves room for the requested number of minutes.
+        keeps the current balance and equity.
+        stores samples as the requested dtype.
+        only stores every stride-th minute.
+    """)
+    def allocate(
+            self,
+            minutes: int,
+            dtype: Union[str, type] = np.float64,
+            stride: int = 1
+    ) -> None:
+        """
+        Preallocates the balance and equity for the testing period, so
+        they are written by index rather than grown a minute at a time.
+
+        :param minutes: How many minutes will be simulated.
+        :type minutes:  int
+
+        :param dtype:   The type to store balance and equity as.
+        :type dtype:    Union[str, type]
+
+        :param stride:  Keep one sample every ``stride`` minutes.
+        :type stride:   int
+
+        """
+        self.balance = Series(self.balance[-1], minutes, dtype, stride)
+        self.equity = Series(self.equity[-1], minutes, dtype, stride)
@@ -21,11 +21,23 @@
 #
 #   Contains the definition of Hokohoko's Assessor object.
 #
-from typing import Iterable, Optional
+from typing import Any, Iterable, List, Optional
 
 from hokohoko import utils
 
 
+class _Result:
+    """
+    Holds a consumed result, with the ``get`` of the AsyncResult that
+    ``analyse`` was originally given.
+    """
+    def __init__(self, value: Any) -> None:
+        self._value = value
+
+    def get(self) -> Any:
+        return self._value
+
+
 class Assessor:
     """
     This is the base class for an assessor. It provides the following
@@ -35,6 +47,15 @@ class Assessor:
 
         parameters      The parameter string given for this Assessor.
 
+    Hokohoko hands each Period's Account to ``consume`` as the Period
+    finishes, in no particular order, then calls ``finalize`` once they
+    all have. Overriding both lets the Accounts be folded in and dropped
+    as they come.
+
+    Assessors that only override ``analyse`` still work: ``consume``
+    then keeps every Account until ``finalize`` hands them all to
+    ``analyse``.
+
     """
 
     @utils.generate_tests("should set internal parameters")
@@ -47,16 +68,56 @@ class Assessor:
 
         """
         self.parameters = parameters
+        self._results: List[_Result] = []
+
+    @utils.generate_tests("""
+        keeps the result for analyse if only analyse is overridden.
+    """)
+    def consume(self, period_id: int, account) -> None:
+        """
+        Takes one Period's results, as it finishes.
 
+        :param period_id:   The Period.
+        :type period_id:    int
+
+        :param account:     The Period's Account.
+        :type account:      hokohoko.entities.Account
+
+        """
+        self._results.append(_Result((period_id, account)))
+
+    @utils.generate_tests("""
+        hands every kept result to analyse.
+        raises an error if neither consume nor analyse is overridden.
+        does nothing if only consume is overridden.
+    """)
+    def finalize(self) -> None:
+        """
+        Called once every Period's results have been consumed.
+
+        """
+        if type(self).analyse is Assessor.analyse:
+            # An Assessor that only consumes has nothing kept to analyse.
+            if type(self).consume is Assessor.consume:
+                raise NotImplementedError
+            return
+        results, self._results = self._results, []
+        self.analyse(sorted(results, key=lambda r: r.get()[0]))
+
+    @utils.generate_tests("""
+        consumes every result, then finalizes.
+    """)
     def analyse(self, data: Iterable) -> None:
         """
-        Analyse Hokohoko's benchmarking results.
+        Analyse Hokohoko's benchmarking results all at once. By default,
+        this consumes each result then finalizes, so Assessors written
+        for either interface can be given every result at once.
 
         :param data:        The data to analyse. This is provided as an
                             Account per Period.
         :type data:         list[multiprocessing.pool.AsyncResult[tuple[int, hokohoko.entities.Account]]]
 
-        .. include:: must_override.rst
-
         """
-        raise NotImplementedError
+        for result in data:
+            self.consume(*result.get())
+        self.finalize()
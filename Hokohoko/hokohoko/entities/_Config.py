@@ -79,3 +79,65 @@ class Config(NamedTuple):
 
     #: The desired level of debug output.
     verbosity: int = defaults.DEFAULT_VERBOSITY
+
+    #: The simulation engine to use. ``loop`` visits each Position in
+    #: turn, ``vectorized`` decides all Positions at once per minute,
+    #: and ``resolved`` finds each Position's outcome when it is placed.
+    #: ``loop`` and ``vectorized`` give the same results. ``resolved``
+    #: decides each Position on its own, without leaving the rest until
+    #: the next minute once one closes, so its results can differ.
+    engine: str = defaults.DEFAULT_ENGINE
+
+    #: The type balance and equity are stored as, ``float64`` or
+    #: ``float32``.
+    account_dtype: str = defaults.DEFAULT_ACCOUNT_DTYPE
+
+    #: Keep balance and equity once every this many minutes.
+    account_stride: int = defaults.DEFAULT_ACCOUNT_STRIDE
+
+    #: Build a RangeIndex over the data, answering high, low and volume
+    #: queries over any range of minutes in constant time.
+    range_index: bool = defaults.DEFAULT_RANGE_INDEX
+
+    #: Load the data for every Period once, into shared memory, and
+    #: have each process view it rather than load its own copy.
+    shared_memory: bool = defaults.DEFAULT_SHARED_MEMORY
+
+    #: Copy each Period's data into one contiguous array per field, for
+    #: the Bars and the ``resolved`` engine to read.
+    planar: bool = defaults.DEFAULT_PLANAR
+
+    #: Load each Period's data in chunks of this many minutes as the
+    #: Period reaches them, releasing those it has passed, rather than
+    #: all at once. ``None`` loads it all at once.
+    window_minutes: Optional[int] = defaults.DEFAULT_WINDOW_MINUTES
+
+    #: Serialise opening the data between Periods with a shared lock.
+    #: ``None`` does so only if the data source's ``needs_lock`` is set.
+    data_lock: Optional[bool] = defaults.DEFAULT_DATA_LOCK
+
+    #: Keep up to this many bytes of data in each process, for the later
+    #: Periods it runs to reuse. ``None`` keeps none.
+    cache_bytes: Optional[int] = defaults.DEFAULT_CACHE_BYTES
+
+    #: Read this many of the ranges a Period will ask for next on a
+    #: background thread. ``None`` reads them only as asked for.
+    prefetch: Optional[int] = defaults.DEFAULT_PREFETCH
+
+    #: How to order the Periods handed to the pool: ``"ordered"``, by
+    #: id, or ``"cost"``, the most expensive first.
+    schedule: str = defaults.DEFAULT_SCHEDULE
+
+    #: Read and write how long each Period took in this file, to
+    #: estimate their costs next time. ``None`` keeps no timings.
+    timings: Optional[str] = defaults.DEFAULT_TIMINGS
+
+    #: How to start the processes: ``"spawn"``, ``"fork"``, where the
+    #: data is loaded once and shared copy-on-write, or
+    #: ``"forkserver"``. ``None`` uses ``"spawn"``, unless a start
+    #: method is already set.
+    start_method: Optional[str] = defaults.DEFAULT_START_METHOD
+
+    #: The modules the forkserver imports once, for every process to
+    #: start with, as well as the Predictor's and Data source's.
+    preload: list = defaults.DEFAULT_PRELOAD
@@ -23,11 +23,13 @@
 #
 
 import multiprocessing as mp
-from typing import Iterable, Optional
+from typing import Iterable, Optional, Tuple, Union
 
 import numpy as np
 
 from hokohoko import utils
+from hokohoko.entities._Planar import Planar
+from hokohoko.entities._RangeIndex import RangeIndex
 
 
 class Data:
@@ -41,6 +43,11 @@ class Data:
 
     """
 
+    #: If opening several of this source at once needs the shared
+    #: ``lock``. Hokohoko only shares one between Periods if so, unless
+    #: ``Config.data_lock`` says otherwise.
+    needs_lock: bool = False
+
     @utils.generate_tests("sets internal values correctly")
     def __init__(
             self,
@@ -72,7 +79,8 @@ class Data:
         :type end:              int
 
         :param lock:            A single Lock shared by all instances of
-                                this type.
+                                this type, or ``None`` if opens needn't
+                                be serialised (see ``needs_lock``).
         :type lock:             multiprocessing.Lock
 
         :param load:            Indicates if the data is being loaded or
@@ -106,6 +114,13 @@ class Data:
                 data:           The data cache
                                 (len(symbols_ids), origin:end).
 
+                range_index:    An optional RangeIndex over the data
+                                cache, from ``build_range_index``.
+
+                planar:         An optional copy of the data cache,
+                                one contiguous array per field, from
+                                ``build_planar``.
+
         """
         self.parameters = parameters
         self.symbol_subset = symbol_subset
@@ -117,6 +132,8 @@ class Data:
         self.symbol_ids = None
         self.timestamps = None
         self.data = None
+        self.range_index = None
+        self.planar = None
 
     def __enter__(self) -> 'Data':
         """
@@ -198,3 +215,142 @@ class Data:
 
         """
         raise NotImplementedError
+
+    @utils.generate_tests("""
+        returns the first minute at or after the timestamp.
+        returns the minute past the end if the timestamp is after it.
+        accepts arrays of timestamps.
+    """)
+    def get_minute_at(
+            self,
+            timestamp: Union[float, np.ndarray]
+    ) -> Union[int, np.ndarray]:
+        """
+        Finds the first minute at or after a UTC timestamp, by binary
+        search over ``self.timestamps``.
+
+        :param timestamp:   The UTC timestamp, or an array of them.
+        :type timestamp:    Union[float, numpy.ndarray]
+
+        :returns:           The minute, as an index value like
+                            ``origin``, or an array of them.
+        :rtype:             Union[int, numpy.ndarray]
+
+        """
+        minute = np.searchsorted(self.timestamps, timestamp, 'left') + self.origin
+        return int(minute) if np.ndim(minute) == 0 else minute
+
+    @utils.generate_tests("""
+        raises an error if the data is not cached.
+        builds a RangeIndex over the data cache.
+    """)
+    def build_range_index(self) -> RangeIndex:
+        """
+        Builds a RangeIndex over the data cache, so ``get_range`` can
+        answer high, low and volume queries over any range of minutes
+        in constant time. This is optional, and needs the data to have
+        been cached in ``self.data``.
+
+        :returns:   The index, also stored in ``self.range_index``.
+        :rtype:     hokohoko.entities.RangeIndex
+
+        """
+        if self.data is None:
+            raise ValueError("A RangeIndex needs the data to be cached.")
+        self.range_index = RangeIndex(self.data)
+        return self.range_index
+
+    @utils.generate_tests("""
+        raises an error if there is no range index.
+        returns the highest high, lowest low and total volume per symbol.
+        accepts arrays of ranges.
+    """)
+    def get_range(
+            self,
+            origin: Union[int, np.ndarray],
+            end: Union[int, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Finds the highest high, lowest low and total volume of every
+        symbol over the minutes [origin, end), through the RangeIndex.
+
+        :param origin:  The first minute. Note this is an index value,
+                        with 0 being the start of the available data.
+        :type origin:   Union[int, numpy.ndarray]
+
+        :param end:     Up to this minute.
+        :type end:      Union[int, numpy.ndarray]
+
+        :returns:       | Three arrays, per symbol:
+                        | 1. The highest high.
+                        | 2. The lowest low.
+                        | 3. The total volume.
+        :rtype:         Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+
+        """
+        if self.range_index is None:
+            raise ValueError("No RangeIndex, see build_range_index.")
+        return self.range_index.query(origin - self.origin, end - self.origin)
+
+    @utils.generate_tests("""
+        raises an error if the data is not cached.
+        builds every field by default.
+        builds only the requested fields.
+    """)
+    def build_planar(self, fields: Optional[Iterable[str]] = None) -> Planar:
+        """
+        Copies the data cache into one contiguous array per field, so
+        ``get_partial_planar`` can serve each field without striding
+        over the others. This is optional. Sources that can read single
+        fields directly should override it to do so.
+
+        :param fields:  The names of the fields to build, from
+                        ``Planar._fields``, or ``None`` for all of them.
+        :type fields:   Iterable[str]
+
+        :returns:       The fields, also stored in ``self.planar``.
+        :rtype:         hokohoko.entities.Planar
+
+        """
+        if self.data is None:
+            raise ValueError("A Planar copy needs the data to be cached.")
+        self.planar = Planar.from_interleaved(self.data, fields)
+        return self.planar
+
+    @utils.generate_tests("""
+        returns contiguous views if planar has been built.
+        returns strided views of the data otherwise.
+        returns strided views of fields that weren't built.
+        matches get_partial_data.
+    """)
+    def get_partial_planar(
+            self,
+            origin: int,
+            end: int
+    ) -> Tuple[np.ndarray, Planar]:
+        """
+        Retrieve a block of data [origin, end) from the source, split by
+        field. The fields are views of ``self.planar`` where it has them,
+        and otherwise strided views of ``get_partial_data``.
+
+        :param origin:  The first minute to load from. Note this is an
+                        index value, with 0 being the start of the
+                        available data.
+        :type origin:   int
+
+        :param end:     The last minute to load.
+        :type end:      int
+
+        :returns:       | Two items:
+                        | 1. Per-minute timestamps.
+                        | 2. Per-field, per-symbol, per-minute exchange
+                        |    rate data.
+        :rtype:         Tuple[numpy.ndarray, hokohoko.entities.Planar]
+
+        """
+        timestamps, data = self.get_partial_data(origin, end)
+        fields = Planar.from_interleaved(data, copy=False)
+        if self.planar is not None:
+            planar = self.planar.slice(origin - self.origin, end - self.origin)
+            fields = Planar(*(f if p is None else p for f, p in zip(fields, planar)))
+        return timestamps, fields
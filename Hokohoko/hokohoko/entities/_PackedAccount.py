@@ -0,0 +1,152 @@
+#   hokohoko/entities/_PackedAccount.py
+#
+#   Copyright 2020 Neil Bradley
+#
+#   This file is part of Hokohoko.
+#
+#   Hokohoko is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   Hokohoko is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY# without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with Hokohoko.  If not, see <https://www.gnu.org/licenses/>.
+#
+#   ====================================================================
+#
+#   Contains the definition of Hokohoko's PackedAccount object.
+#
+
+import pickle
+from typing import Dict, NamedTuple
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko.entities._Account import Account
+from hokohoko.entities._Order import Order
+from hokohoko.entities._PositionBook import PositionBook
+from hokohoko.entities._Series import Series
+
+
+class PackedAccount(NamedTuple):
+    """
+    An Account packed into plain arrays, as a Period returns it from its
+    process. The symbols used are sent once, as a table, and the
+    Positions refer to them by index. See ``PositionBook.pack``.
+
+    ``unpack`` only rebuilds the Account's Positions when they are first
+    read, so Assessors that only need the balance or equity never pay
+    for them.
+
+    """
+
+    #: The sorted ids of every symbol the Account refers to.
+    symbol_table: np.ndarray
+
+    #: The Account's ``symbol_ids``, as indices into ``symbol_table``.
+    symbol_ids: np.ndarray
+
+    #: The Account's balance.
+    balance: Series
+
+    #: The Account's equity.
+    equity: Series
+
+    #: The Account's unactioned Orders.
+    orders: Dict[int, Order]
+
+    #: The Account's open Positions, packed.
+    positions: dict
+
+    #: The Account's closed Positions, packed.
+    history: dict
+
+    @classmethod
+    @utils.generate_tests("""
+        builds a table of every symbol referred to.
+        round trips through unpack.
+    """)
+    def pack(cls, account: Account) -> 'PackedAccount':
+        """
+        :param account: The Account to pack.
+        :type account:  hokohoko.entities.Account
+
+        :returns:       The packed Account.
+        :rtype:         hokohoko.entities.PackedAccount
+        """
+        symbol_table = np.unique(np.concatenate([
+            np.array(account.symbol_ids, np.int64),
+            *(book.column(name)[book.rows()]
+              for book in (account.positions, account.history)
+              for name in ("symbol_id", "future_symbol_id"))
+        ]))
+        return cls(
+            symbol_table,
+            np.searchsorted(symbol_table, np.array(account.symbol_ids, np.int64)).astype(
+                np.min_scalar_type(max(len(symbol_table) - 1, 0))
+            ),
+            account.balance,
+            account.equity,
+            account.orders,
+            account.positions.pack(symbol_table),
+            account.history.pack(symbol_table)
+        )
+
+    @utils.generate_tests("""
+        returns an Account equal to the one packed
+        unpacks the Positions only when they are first read.
+    """)
+    def unpack(self) -> Account:
+        """
+        :returns:   The Account.
+        :rtype:     hokohoko.entities.Account
+        """
+        return _UnpackedAccount(self)
+
+    @property
+    @utils.generate_tests("is the size of the pickled PackedAccount.")
+    def nbytes(self) -> int:
+        """
+        :returns:   The size of the PackedAccount pickled, which is what
+                    is sent between processes.
+        :rtype:     int
+        """
+        return len(pickle.dumps(self))
+
+
+class _UnpackedAccount(Account):
+    """
+    An Account rebuilt from a PackedAccount. Its ``positions`` and
+    ``history`` are unpacked when first read.
+    """
+    def __init__(self, packed: PackedAccount) -> None:
+        self._packed = packed
+        self._books: Dict[str, PositionBook] = {}
+        self.balance = packed.balance
+        self.equity = packed.equity
+        self.orders = packed.orders
+        self.symbol_ids = list(packed.symbol_table[packed.symbol_ids])
+
+
+def _book(name: str) -> property:
+    def _get(self):
+        book = self._books.get(name)
+        if book is None:
+            book = PositionBook.unpack(getattr(self._packed, name), self._packed.symbol_table)
+            self._books[name] = book
+        return book
+
+    def _set(self, value):
+        self._books[name] = value
+
+    return property(_get, _set)
+
+
+for _name in ("positions", "history"):
+    setattr(_UnpackedAccount, _name, _book(_name))
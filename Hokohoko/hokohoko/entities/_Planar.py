@@ -0,0 +1,113 @@
+#   hokohoko/entities/_Planar.py
+#
+#   Copyright 2020 Neil Bradley
+#
+#   This file is part of Hokohoko.
+#
+#   Hokohoko is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   Hokohoko is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY# without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with Hokohoko.  If not, see <https://www.gnu.org/licenses/>.
+#
+#   ====================================================================
+#
+#   Contains the definition of Hokohoko's Planar object.
+#
+
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
+
+from hokohoko import utils
+
+
+class Planar(NamedTuple):
+    """
+    Exchange rate data split into one array per field, each shaped
+    ``(symbols, minutes)``. Where ``Data.data`` interleaves the fields,
+    so reading one field steps over the other four, each field here can
+    be contiguous. Fields that weren't asked for are ``None``.
+
+    """
+
+    #: The exchange rate at the open of each minute.
+    open: Optional[np.ndarray]
+
+    #: The highest exchange rate seen during each minute.
+    high: Optional[np.ndarray]
+
+    #: The lowest exchange rate seen during each minute.
+    low: Optional[np.ndarray]
+
+    #: The exchange rate at the close of each minute.
+    close: Optional[np.ndarray]
+
+    #: The relative trade volume during each minute.
+    volume: Optional[np.ndarray]
+
+    @classmethod
+    @utils.generate_tests("""
+        raises an error if data is not interleaved OHLCV.
+        copies every field by default.
+        copies only the requested fields.
+        returns strided views if not copying.
+    """)
+    def from_interleaved(
+            cls,
+            data: np.ndarray,
+            fields: Optional[Iterable[str]] = None,
+            copy: bool = True
+    ) -> 'Planar':
+        """
+        Splits interleaved data into its fields.
+
+        :param data:    The per-symbol, per-minute exchange rate data,
+                        interleaved as in ``Data.data``.
+        :type data:     numpy.ndarray[numpy.float32]
+
+        :param fields:  The names of the fields to keep, or ``None`` for
+                        all of them.
+        :type fields:   Iterable[str]
+
+        :param copy:    Copy each field into a contiguous array, rather
+                        than a strided view of ``data``.
+        :type copy:     bool
+
+        :returns:       The fields.
+        :rtype:         hokohoko.entities.Planar
+        """
+        if data.ndim != 2 or data.shape[1] % 5 != 0:
+            raise ValueError(f"data is not interleaved OHLCV: {data.shape}")
+
+        fields = cls._fields if fields is None else tuple(fields)
+        return cls(*(
+            None if f not in fields else np.ascontiguousarray(data[:, k::5]) if copy else data[:, k::5]
+            for k, f in enumerate(cls._fields)
+        ))
+
+    @utils.generate_tests("""
+        returns views of every field.
+        leaves missing fields as None.
+    """)
+    def slice(self, origin: int, end: int) -> 'Planar':
+        """
+        Views the minutes [origin, end) of every field.
+
+        :param origin:  The first minute.
+        :type origin:   int
+
+        :param end:     Up to this minute.
+        :type end:      int
+
+        :returns:       The fields over those minutes.
+        :rtype:         hokohoko.entities.Planar
+        """
+        return Planar(*(None if f is None else f[:, origin:end] for f in self))
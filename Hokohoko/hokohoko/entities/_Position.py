@@ -50,7 +50,8 @@ class Position:
             close_rate: Union[float, np.float32],
             held_value: Union[float, np.float64],
             initial_value: Union[float, np.float64],
-            final_value: Union[float, np.float64]
+            final_value: Union[float, np.float64],
+            symbol_row: int = -1
     ):
         """
         :param order:   The Order linked to this Position. Note: the Order may
@@ -92,6 +93,12 @@ class Position:
                                 changes. This is the final Equity for the
                                 Postion.
         :type final_value:      numpy.float64
+
+        :param symbol_row:  (Optional) The row of the Order's symbol in the
+                            Period's data, found once when the Order is
+                            placed, so the simulation needn't look it up
+                            every minute. -1 if not known.
+        :type symbol_row:   int
         """
         self.order = order
         self.future = future
@@ -103,6 +110,7 @@ class Position:
         self.held_value = held_value
         self.initial_value = initial_value
         self.final_value = final_value
+        self.symbol_row = symbol_row
 
     def __str__(self):
         return "\n\t\t{}\n\t\t{}\n\t\t{}\n\t\t\t{} -> {}\n\t\t\t{} -> {}\n\t\t\t{} -> {}".format(
@@ -0,0 +1,502 @@
+#   hokohoko/entities/_PositionBook.py
+#
+#   Copyright 2020 Neil Bradley
+#
+#   This file is part of Hokohoko.
+#
+#   Hokohoko is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   Hokohoko is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY# without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with Hokohoko.  If not, see <https://www.gnu.org/licenses/>.
+#
+#   ====================================================================
+#
+#   Contains the definition of Hokohoko's PositionBook object.
+#
+
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko.entities._Bar import Bar
+from hokohoko.entities._Direction import Direction
+from hokohoko.entities._Order import Order
+from hokohoko.entities._Position import Position
+from hokohoko.entities._Status import Status
+
+#: Status members, indexed by value.
+_STATUSES = tuple(sorted(Status, key=lambda status: status.value))
+
+#: Columns holding symbol ids, which pack as indices into a symbol table.
+_SYMBOL_FIELDS = ("symbol_id", "future_symbol_id")
+
+
+class PositionBook(MutableMapping):
+    """
+    A columnar store of Positions, keyed by Order id. Every Position
+    field is held in its own contiguous, growable ``numpy.ndarray``,
+    which keeps memory, iteration and pickling cheap.
+
+    The book behaves like the ``dict[int, hokohoko.entities.Position]``
+    it replaces. Looking up a Position returns a view onto its row,
+    which reads and writes the underlying columns, so
+    ``book[p_id].status = Status.CLOSED`` works as expected.
+
+    The columns themselves are available through ``column(name)``, and
+    the live rows, in insertion order, through ``rows()``.
+
+    """
+
+    #: The columns held per Position, and their types. ``None`` is
+    #: stored as ``NaN`` for the optional Order rates.
+    FIELDS: Tuple[Tuple[str, type], ...] = (
+        ("symbol_id", np.int64),
+        ("direction", np.int8),
+        ("open_bid", np.float64),
+        ("take_profit", np.float64),
+        ("stop_loss", np.float64),
+        ("future_symbol_id", np.int64),
+        ("future_open", np.float64),
+        ("future_high", np.float64),
+        ("future_low", np.float64),
+        ("future_close", np.float64),
+        ("future_volume", np.float64),
+        ("future_start", np.float64),
+        ("future_end", np.float64),
+        ("status", np.int8),
+        ("open_time", np.float64),
+        ("close_time", np.float64),
+        ("open_rate", np.float64),
+        ("close_rate", np.float64),
+        ("held_value", np.float64),
+        ("initial_value", np.float64),
+        ("final_value", np.float64),
+        ("symbol_row", np.int32)
+    )
+
+    _INITIAL_CAPACITY = 64
+
+    @utils.generate_tests("""
+        starts empty.
+        accepts a dict of Positions.
+    """)
+    def __init__(self, positions: Optional[Dict[int, Position]] = None) -> None:
+        """
+        :param positions:   (Optional) Positions to start the book with.
+        :type positions:    dict[int, hokohoko.entities.Position]
+        """
+        self._ids = np.empty(self._INITIAL_CAPACITY, np.int64)
+        self._live = np.zeros(self._INITIAL_CAPACITY, np.bool_)
+        self._columns = {
+            name: np.empty(self._INITIAL_CAPACITY, dtype) for name, dtype in self.FIELDS
+        }
+        self._size = 0
+        self._dead = 0
+        self._index: Dict[int, int] = {}
+        self._views: Dict[int, '_PositionView'] = {}
+
+        if positions is not None:
+            self.update(positions)
+
+    # Mapping interface. ===============================================
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, p_id) -> bool:
+        return p_id in self._index
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(list(self._index))
+
+    def __getitem__(self, p_id) -> Position:
+        view = self._views.get(p_id)
+        if view is None:
+            view = _PositionView(self, self._index[p_id])
+            self._views[p_id] = view
+        return view
+
+    @utils.generate_tests("""
+        appends a new Position.
+        overwrites an existing Position in place.
+        grows the columns when full.
+        grows an unpickled empty book.
+        detaches the view of an overwritten Position.
+    """)
+    def __setitem__(self, p_id, position: Position) -> None:
+        row = self._index.get(p_id)
+        if row is None:
+            if self._size == len(self._ids):
+                self._grow(max(2 * len(self._ids), self._INITIAL_CAPACITY))
+            row = self._size
+            self._size += 1
+            self._ids[row] = p_id
+            self._live[row] = True
+            self._index[p_id] = row
+        elif self._views.get(p_id) is position:
+            return
+        else:
+            # Like a dict, the Position being replaced keeps its values.
+            view = self._views.pop(p_id, None)
+            if view is not None:
+                view._detach()
+
+        order, future = position.order, position.future
+        c = self._columns
+        c["symbol_id"][row] = order.symbol_id
+        c["direction"][row] = order.direction.value
+        c["open_bid"][row] = np.nan if order.open_bid is None else order.open_bid
+        c["take_profit"][row] = np.nan if order.take_profit is None else order.take_profit
+        c["stop_loss"][row] = np.nan if order.stop_loss is None else order.stop_loss
+        c["future_symbol_id"][row] = future.symbol_id
+        c["future_open"][row] = future.open
+        c["future_high"][row] = future.high
+        c["future_low"][row] = future.low
+        c["future_close"][row] = future.close
+        c["future_volume"][row] = future.volume
+        c["future_start"][row] = future.start
+        c["future_end"][row] = future.end
+        c["status"][row] = position.status.value
+        for name in _PositionView.SCALARS:
+            c[name][row] = getattr(position, name)
+
+    @utils.generate_tests("""
+        removes the Position.
+        detaches any outstanding view.
+        compacts the columns once half the rows are dead.
+    """)
+    def __delitem__(self, p_id) -> None:
+        row = self._index.pop(p_id)
+        view = self._views.pop(p_id, None)
+        if view is not None:
+            view._detach()
+        self._live[row] = False
+        self._dead += 1
+        if self._dead > self._INITIAL_CAPACITY and 2 * self._dead > self._size:
+            self._compact()
+
+    def pop(self, p_id, *default) -> Position:
+        """
+        Removes a Position from the book, returning it as a standalone
+        Position.
+        """
+        if p_id not in self._index:
+            if default:
+                return default[0]
+            raise KeyError(p_id)
+        position = self._materialise(self._index[p_id])
+        del self[p_id]
+        return position
+
+    def clear(self) -> None:
+        for view in self._views.values():
+            view._detach()
+        self._views.clear()
+        self._index.clear()
+        self._live[:self._size] = False
+        self._size = 0
+        self._dead = 0
+
+    def items(self) -> Iterable[Tuple[int, Position]]:
+        return [(p_id, self[p_id]) for p_id in self._index]
+
+    def values(self) -> Iterable[Position]:
+        return [self[p_id] for p_id in self._index]
+
+    # Columnar interface. ==============================================
+    @utils.generate_tests("""
+        returns the live rows in insertion order.
+    """)
+    def rows(self) -> np.ndarray:
+        """
+        :returns:   The row of every Position in the book, in insertion
+                    order. These index into ``ids()`` and ``column()``.
+        :rtype:     numpy.ndarray[numpy.int64]
+        """
+        return np.flatnonzero(self._live[:self._size])
+
+    def ids(self) -> np.ndarray:
+        """
+        :returns:   The Order id of every row, including dead rows.
+        :rtype:     numpy.ndarray[numpy.int64]
+        """
+        return self._ids[:self._size]
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Provides direct access to a column, including dead rows. Writes
+        go straight into the book.
+
+        :param name:    The field name, as in ``FIELDS``.
+        :type name:     str
+
+        :returns:       The column.
+        :rtype:         numpy.ndarray
+        """
+        return self._columns[name][:self._size]
+
+    @utils.generate_tests("""
+        moves the rows into the target book.
+        keeps the order given.
+    """)
+    def move(self, p_ids: Iterable[int], target: 'PositionBook') -> None:
+        """
+        Moves Positions, column-wise, into another book.
+
+        :param p_ids:   The ids of the Positions to move.
+        :type p_ids:    Iterable[int]
+
+        :param target:  The book to move them to.
+        :type target:   hokohoko.entities.PositionBook
+        """
+        p_ids = [p for p in p_ids]
+        if len(p_ids) == 0:
+            return
+        rows = np.array([self._index[p] for p in p_ids], np.int64)
+        for p_id in p_ids:
+            if p_id in target:
+                del target[p_id]
+        needed = target._size + len(rows)
+        if needed > len(target._ids):
+            target._grow(max(needed, 2 * len(target._ids)))
+        start, target._size = target._size, needed
+        target._ids[start:needed] = self._ids[rows]
+        target._live[start:needed] = True
+        for name, _ in self.FIELDS:
+            target._columns[name][start:needed] = self._columns[name][rows]
+        for offset, p_id in enumerate(p_ids):
+            target._index[p_id] = start + offset
+            del self[p_id]
+
+    # Internals. =======================================================
+    def _materialise(self, row: int) -> Position:
+        c = self._columns
+        return Position(
+            order=self._order(row),
+            future=self._future(row),
+            status=_STATUSES[c["status"][row]],
+            **{name: c[name][row] for name in _PositionView.SCALARS}
+        )
+
+    def _order(self, row: int) -> Order:
+        c = self._columns
+
+        def _optional(name):
+            value = float(c[name][row])
+            return None if np.isnan(value) else value
+
+        return Order(
+            c["symbol_id"][row],
+            Direction(int(c["direction"][row])),
+            _optional("open_bid"),
+            _optional("take_profit"),
+            _optional("stop_loss")
+        )
+
+    def _future(self, row: int) -> Bar:
+        c = self._columns
+        return Bar(
+            c["future_symbol_id"][row],
+            c["future_open"][row],
+            c["future_high"][row],
+            c["future_low"][row],
+            c["future_close"][row],
+            c["future_volume"][row],
+            c["future_start"][row],
+            c["future_end"][row]
+        )
+
+    def _grow(self, capacity: int) -> None:
+        def _resize(a):
+            b = np.empty(capacity, a.dtype)
+            b[:self._size] = a[:self._size]
+            return b
+
+        self._ids = _resize(self._ids)
+        live = np.zeros(capacity, np.bool_)
+        live[:self._size] = self._live[:self._size]
+        self._live = live
+        # Updated in place, as the views hold on to the dictionary.
+        self._columns.update({name: _resize(a) for name, a in self._columns.items()})
+
+    def _compact(self) -> None:
+        rows = self.rows()
+        n = len(rows)
+        self._ids[:n] = self._ids[rows]
+        for a in self._columns.values():
+            a[:n] = a[rows]
+        self._live[:n] = True
+        self._live[n:self._size] = False
+        self._size = n
+        self._dead = 0
+        self._index = {int(p_id): row for row, p_id in enumerate(self._ids[:n])}
+        for p_id, view in self._views.items():
+            view._row = self._index[p_id]
+
+    def __getstate__(self) -> dict:
+        rows = self.rows()
+        return {
+            "ids": self._ids[rows],
+            "columns": {name: a[rows] for name, a in self._columns.items()}
+        }
+
+    @utils.generate_tests("""
+        stores symbol ids as indices into the symbol table.
+        narrows float columns that float32 holds exactly.
+        keeps float columns that float32 doesn't hold exactly.
+        round trips through unpack.
+    """)
+    def pack(self, symbol_table: np.ndarray) -> dict:
+        """
+        Packs the live rows into narrower columns, for sending between
+        processes. Symbol ids become indices into ``symbol_table``, and
+        float64 columns whose values float32 holds exactly, such as the
+        rates taken from the data, are stored as float32.
+
+        :param symbol_table:    The sorted ids of every symbol in the
+                                book.
+        :type symbol_table:     numpy.ndarray[numpy.int64]
+
+        :returns:               The packed ids and columns.
+        :rtype:                 dict
+        """
+        rows = self.rows()
+        index_type = np.min_scalar_type(max(len(symbol_table) - 1, 0))
+        columns = {}
+        for name, dtype in self.FIELDS:
+            a = self._columns[name][rows]
+            if name in _SYMBOL_FIELDS:
+                a = np.searchsorted(symbol_table, a).astype(index_type)
+            elif dtype is np.float64:
+                narrow = a.astype(np.float32)
+                if np.array_equal(narrow, a, equal_nan=True):
+                    a = narrow
+            columns[name] = a
+        return {"ids": self._ids[rows], "columns": columns}
+
+    @classmethod
+    def unpack(cls, packed: dict, symbol_table: np.ndarray) -> 'PositionBook':
+        """
+        Rebuilds a book from ``pack``.
+
+        :param packed:          The packed ids and columns.
+        :type packed:           dict
+
+        :param symbol_table:    The symbol table passed to ``pack``.
+        :type symbol_table:     numpy.ndarray[numpy.int64]
+
+        :returns:               The book.
+        :rtype:                 hokohoko.entities.PositionBook
+        """
+        columns = {}
+        for name, dtype in cls.FIELDS:
+            a = packed["columns"][name]
+            columns[name] = (symbol_table[a] if name in _SYMBOL_FIELDS else a).astype(dtype, copy=False)
+        book = cls.__new__(cls)
+        book.__setstate__({"ids": packed["ids"], "columns": columns})
+        return book
+
+    def __setstate__(self, state: dict) -> None:
+        self._ids = state["ids"]
+        self._size = len(self._ids)
+        self._live = np.ones(self._size, np.bool_)
+        self._columns = state["columns"]
+        self._dead = 0
+        self._index = {int(p_id): row for row, p_id in enumerate(self._ids)}
+        self._views = {}
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class _PositionView(Position):
+    """
+    A Position backed by a row of a PositionBook. Once removed from the
+    book, it keeps the values it had at the time.
+    """
+
+    #: The fields that map directly onto a column.
+    SCALARS = (
+        "open_time",
+        "close_time",
+        "open_rate",
+        "close_rate",
+        "held_value",
+        "initial_value",
+        "final_value",
+        "symbol_row"
+    )
+
+    def __init__(self, book: PositionBook, row: int) -> None:
+        self._book = book
+        self._columns = book._columns
+        self._row = row
+        self._detached: Optional[Position] = None
+        self._cached_order: Optional[Order] = None
+        self._cached_future: Optional[Bar] = None
+
+    def _detach(self) -> None:
+        self._detached = self._book._materialise(self._row)
+        self._book = None
+        self._columns = None
+
+    @property
+    def order(self) -> Order:
+        order = self._cached_order
+        if order is None:
+            order = self._detached.order if self._book is None else self._book._order(self._row)
+            self._cached_order = order
+        return order
+
+    @property
+    def future(self) -> Bar:
+        future = self._cached_future
+        if future is None:
+            future = self._detached.future if self._book is None else self._book._future(self._row)
+            self._cached_future = future
+        return future
+
+    @property
+    def status(self) -> Status:
+        columns = self._columns
+        if columns is None:
+            return self._detached.status
+        return _STATUSES[columns["status"][self._row]]
+
+    @status.setter
+    def status(self, value: Status) -> None:
+        columns = self._columns
+        if columns is None:
+            self._detached.status = value
+        else:
+            columns["status"][self._row] = value.value
+
+
+def _scalar(name: str) -> property:
+    def _get(self):
+        columns = self._columns
+        if columns is None:
+            return getattr(self._detached, name)
+        return columns[name].item(self._row)
+
+    def _set(self, value):
+        columns = self._columns
+        if columns is None:
+            setattr(self._detached, name, value)
+        else:
+            columns[name][self._row] = value
+
+    return property(_get, _set)
+
+
+for _name in _PositionView.SCALARS:
+    setattr(_PositionView, _name, _scalar(_name))
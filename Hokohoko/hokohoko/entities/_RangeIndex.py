@@ -0,0 +1,162 @@
+#   hokohoko/entities/_RangeIndex.py
+#
+#   Copyright 2020 Neil Bradley
+#
+#   This file is part of Hokohoko.
+#
+#   Hokohoko is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   Hokohoko is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY# without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with Hokohoko.  If not, see <https://www.gnu.org/licenses/>.
+#
+#   ====================================================================
+#
+#   Contains the definition of Hokohoko's RangeIndex object.
+#
+
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from hokohoko import utils
+
+
+class RangeIndex:
+    """
+    Answers highest high, lowest low and total volume queries, per
+    symbol, over any range of minutes in constant time.
+
+    Minutes are split into blocks of ``BLOCK`` minutes. Each block keeps
+    its running high and low from either end, and a sparse table over
+    the blocks' own highs and lows covers any run of whole blocks. A
+    range is then the suffix of its first block, the run of blocks
+    between, and the prefix of its last. Ranges inside a single block
+    are reduced directly. Volume is a cumulative sum.
+
+    This needs about twice the memory of the highs and lows themselves.
+
+    """
+
+    #: Minutes per block.
+    BLOCK = 64
+
+    @utils.generate_tests("""
+        raises an error if data is not interleaved OHLCV.
+        builds a sparse table level for every power of two blocks.
+        handles a partial last block.
+    """)
+    def __init__(self, data: np.ndarray):
+        """
+        :param data:    The per-symbol, per-minute exchange rate data,
+                        interleaved as ``OPEN``, ``HIGH``, ``LOW``,
+                        ``CLOSE`` and ``VOLUME``.
+        :type data:     numpy.ndarray[numpy.float32]
+
+        """
+        if data.ndim != 2 or data.shape[1] % 5 != 0:
+            raise ValueError(f"data is not interleaved OHLCV: {data.shape}")
+
+        self.data = data
+        self.minutes = data.shape[1] // 5
+        symbols = data.shape[0]
+        blocks = -(-self.minutes // self.BLOCK)
+        padding = blocks * self.BLOCK - self.minutes
+
+        def _blocked(values, fill):
+            values = np.pad(values, ((0, 0), (0, padding)), constant_values=fill)
+            return values.reshape(symbols, blocks, self.BLOCK)
+
+        highs = _blocked(data[:, 1::5], -np.inf)
+        lows = _blocked(data[:, 2::5], np.inf)
+
+        # 1. Running highs and lows within each block, from either end.
+        self.high_prefix = np.maximum.accumulate(highs, axis=2).reshape(symbols, -1)
+        self.high_suffix = np.maximum.accumulate(highs[:, :, ::-1], axis=2)[:, :, ::-1].reshape(symbols, -1)
+        self.low_prefix = np.minimum.accumulate(lows, axis=2).reshape(symbols, -1)
+        self.low_suffix = np.minimum.accumulate(lows[:, :, ::-1], axis=2)[:, :, ::-1].reshape(symbols, -1)
+
+        # 2. Sparse tables over whole blocks; level j covers 2 ** j blocks.
+        self.high_table: List[np.ndarray] = [highs.max(axis=2)]
+        self.low_table: List[np.ndarray] = [lows.min(axis=2)]
+        width = 1
+        while width * 2 <= blocks:
+            self.high_table.append(np.maximum(self.high_table[-1][:, :-width], self.high_table[-1][:, width:]))
+            self.low_table.append(np.minimum(self.low_table[-1][:, :-width], self.low_table[-1][:, width:]))
+            width *= 2
+
+        # 3. Volume.
+        self.volume = np.zeros((symbols, self.minutes + 1), np.float64)
+        np.cumsum(data[:, 4::5], axis=1, dtype=np.float64, out=self.volume[:, 1:])
+
+    @utils.generate_tests("""
+        matches numpy max, min and sum for every range.
+        accepts single minutes.
+        accepts ranges within a single block.
+        accepts ranges spanning many blocks.
+        accepts arrays of ranges.
+    """)
+    def query(
+            self,
+            start: Union[int, np.ndarray],
+            end: Union[int, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Finds the highest high, lowest low and total volume over the
+        minutes [start, end), for every symbol.
+
+        :param start:   The first minute, or an array of first minutes.
+        :type start:    Union[int, numpy.ndarray]
+
+        :param end:     The minute after the last, or an array of them.
+        :type end:      Union[int, numpy.ndarray]
+
+        :returns:       The highs, lows and volumes, shaped
+                        ``(symbols,)`` for a single range, or
+                        ``(symbols, len(start))`` for an array.
+        :rtype:         Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        """
+        single = np.ndim(start) == 0
+        start = np.atleast_1d(np.asarray(start, np.int64))
+        last = np.atleast_1d(np.asarray(end, np.int64)) - 1
+        if np.any(last < start) or np.any(start < 0) or np.any(last >= self.minutes):
+            raise ValueError("Range out of bounds.")
+
+        # 1. The partial first and last blocks.
+        high = np.maximum(self.high_suffix[:, start], self.high_prefix[:, last])
+        low = np.minimum(self.low_suffix[:, start], self.low_prefix[:, last])
+
+        # 2. The whole blocks between.
+        first_block = start // self.BLOCK + 1
+        last_block = last // self.BLOCK - 1
+        between = last_block >= first_block
+        if between.any():
+            count = last_block - first_block + 1
+            level = np.zeros(len(start), np.int64)
+            level[between] = np.log2(count[between]).astype(np.int64)
+            for j in np.unique(level[between]):
+                k = np.flatnonzero(between & (level == j))
+                a, b = first_block[k], last_block[k] - (1 << j) + 1
+                high[:, k] = np.maximum(
+                    high[:, k], np.maximum(self.high_table[j][:, a], self.high_table[j][:, b])
+                )
+                low[:, k] = np.minimum(
+                    low[:, k], np.minimum(self.low_table[j][:, a], self.low_table[j][:, b])
+                )
+
+        # 3. Ranges within a single block.
+        for k in np.flatnonzero(start // self.BLOCK == last // self.BLOCK):
+            high[:, k] = np.max(self.data[:, start[k] * 5 + 1:last[k] * 5 + 2:5], axis=1)
+            low[:, k] = np.min(self.data[:, start[k] * 5 + 2:last[k] * 5 + 3:5], axis=1)
+
+        volume = (self.volume[:, last + 1] - self.volume[:, start]).astype(self.data.dtype)
+        if single:
+            return high[:, 0], low[:, 0], volume[:, 0]
+        return high, low, volume
@@ -0,0 +1,179 @@
+#   hokohoko/entities/_Series.py
+#
+#   Copyright 2020 Neil Bradley
+#
+#   This file is part of Hokohoko.
+#
+#   Hokohoko is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   Hokohoko is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY# without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with Hokohoko.  If not, see <https://www.gnu.org/licenses/>.
+#
+#   ====================================================================
+#
+#   Contains the definition of Hokohoko's Series object.
+#
+
+from typing import Iterable, Iterator, Union
+
+import numpy as np
+
+from hokohoko import utils
+
+
+class Series:
+    """
+    A preallocated, per-minute record of an Account value, such as its
+    balance or equity. Values are written by index into a
+    ``numpy.ndarray`` sized up front, rather than boxed into a ``list``.
+
+    With a ``stride`` greater than ``1``, only every ``stride``-th
+    minute is kept, so ``series[k]`` is the value ``k * stride`` minutes
+    after the start. ``series[-1]`` is always the current value, even
+    if it falls between samples.
+
+    """
+
+    @utils.generate_tests("""
+        starts with the initial value.
+        reserves room for the requested number of minutes.
+        raises an error if stride is less than 1.
+    """)
+    def __init__(
+            self,
+            initial: float = 0.0,
+            minutes: int = 0,
+            dtype: Union[str, type] = np.float64,
+            stride: int = 1
+    ):
+        """
+        :param initial: The starting value.
+        :type initial:  float
+
+        :param minutes: How many minutes to reserve room for. The series
+                        grows if more are appended.
+        :type minutes:  int
+
+        :param dtype:   The type to store samples as.
+        :type dtype:    Union[str, type]
+
+        :param stride:  Keep one sample every ``stride`` minutes.
+        :type stride:   int
+
+        """
+        if stride < 1:
+            raise ValueError(f"stride must be at least 1: {stride}")
+        self.stride = stride
+        self._values = np.empty(minutes // stride + 1, dtype)
+        self._values[0] = initial
+        self._size = 1
+        self._minutes = 0
+        self._current = float(initial)
+
+    @utils.generate_tests("""
+        updates the current value.
+        only stores every stride-th minute.
+        grows when full.
+    """)
+    def append(self, value: float) -> None:
+        """
+        Records the value for the next minute.
+
+        :param value:   The value at the next minute.
+        :type value:    float
+
+        """
+        self._minutes += 1
+        self._current = float(value)
+        if self._minutes % self.stride == 0:
+            if self._size == len(self._values):
+                self._grow(1)
+            self._values[self._size] = value
+            self._size += 1
+
+    @utils.generate_tests("""
+        matches appending each value in turn.
+        does nothing for an empty sequence.
+    """)
+    def extend(self, values: Iterable[float]) -> None:
+        """
+        Records the values for the next ``len(values)`` minutes.
+
+        :param values:  The values, one per minute.
+        :type values:   Iterable[float]
+
+        """
+        values = np.asarray(values)
+        if len(values) == 0:
+            return
+        first = self.stride - self._minutes % self.stride - 1
+        sampled = values[first::self.stride]
+        if self._size + len(sampled) > len(self._values):
+            self._grow(len(sampled))
+        self._values[self._size:self._size + len(sampled)] = sampled
+        self._size += len(sampled)
+        self._minutes += len(values)
+        self._current = float(values[-1])
+
+    @property
+    def minutes(self) -> int:
+        """
+        :returns:   How many minutes have been recorded.
+        :rtype:     int
+        """
+        return self._minutes
+
+    @property
+    def values(self) -> np.ndarray:
+        """
+        :returns:   The stored samples, starting with the initial value.
+        :rtype:     numpy.ndarray
+        """
+        return self._values[:self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.values)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)) and index == -1:
+            return self._current
+        return self.values[index]
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(index, (int, np.integer)) and index == -1:
+            self._current = float(value)
+            if self._minutes % self.stride == 0:
+                self._values[self._size - 1] = value
+        else:
+            self.values[index] = value
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        return self.values if dtype is None else self.values.astype(dtype)
+
+    def __repr__(self) -> str:
+        return f"Series({self.values!r}, stride={self.stride})"
+
+    def __getstate__(self) -> dict:
+        # Only ship the samples actually used.
+        state = self.__dict__.copy()
+        state['_values'] = self.values.copy()
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+
+    def _grow(self, count: int) -> None:
+        values = np.empty(max(len(self._values) * 2, self._size + count), self._values.dtype)
+        values[:self._size] = self.values
+        self._values = values
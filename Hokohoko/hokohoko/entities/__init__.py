@@ -30,8 +30,13 @@ __all__ = [
     "Data",
     "Direction",
     "Order",
+    "PackedAccount",
+    "Planar",
     "Position",
+    "PositionBook",
     "Predictor",
+    "RangeIndex",
+    "Series",
     "Status"
 ]
 
@@ -42,6 +47,11 @@ from hokohoko.entities._Config import Config
 from hokohoko.entities._Data import Data
 from hokohoko.entities._Direction import Direction
 from hokohoko.entities._Order import Order
+from hokohoko.entities._PackedAccount import PackedAccount
+from hokohoko.entities._Planar import Planar
 from hokohoko.entities._Position import Position
+from hokohoko.entities._PositionBook import PositionBook
 from hokohoko.entities._Predictor import Predictor
+from hokohoko.entities._RangeIndex import RangeIndex
+from hokohoko.entities._Series import Series
 from hokohoko.entities._Status import Status
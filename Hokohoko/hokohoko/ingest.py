@@ -0,0 +1,322 @@
+#   hokohoko/ingest.py
+#
+#   Copyright 2020 Neil Bradley
+#
+#   This file is part of Hokohoko.
+#
+#   Hokohoko is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   Hokohoko is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY# without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with Hokohoko.  If not, see <https://www.gnu.org/licenses/>.
+#
+#   ====================================================================
+#
+#   Ingests raw per-symbol CSV files into Hokohoko's native format.
+#
+
+"""
+======
+ingest
+======
+
+Streams per-symbol tick or minute CSV files into a directory in
+Hokohoko's native format, which ``hokohoko.standard.Native``
+memory-maps:
+
+.. code-block :: Text
+
+    python3 -m hokohoko.ingest directory EURUSD.csv GBPUSD.csv ...
+
+Each file is named for its symbol, and each line is either a tick:
+
+.. code-block :: Text
+
+    timestamp,price[,volume]
+
+or a minute:
+
+.. code-block :: Text
+
+    timestamp,open,high,low,close[,volume]
+
+Timestamps are UTC seconds or ISO 8601 dates and times, in order. A
+header line is skipped. Ticks without a volume count as one each.
+
+Files are read ``chunk`` lines at a time, and written ``chunk`` minutes
+at a time, so memory doesn't grow with the files, only with the common
+index of minutes (8 bytes each). Symbols are processed in parallel:
+
+1. Each file is reduced to one OHLCV packet per minute it has data for.
+2. The minutes of every symbol are merged into a common index.
+3. Each symbol is aligned to the index. Minutes without data repeat the
+   previous close, with no volume.
+
+"""
+import itertools
+import multiprocessing as mp
+import os
+import sys
+from argparse import ArgumentParser
+from functools import reduce
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko.standard import Native
+
+#: Lines or minutes processed at a time.
+DEFAULT_CHUNK = 1 << 20
+
+
+@utils.generate_tests("""
+    parses numeric timestamps
+    parses ISO 8601 timestamps
+    expands ticks into flat packets
+    counts ticks without a volume as one each
+    gives minutes without a volume no volume
+    raises an error for an unknown number of columns
+""")
+def _parse(lines: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parses a chunk of lines.
+
+    :returns:   The timestamps, and an OHLCV packet per line.
+    """
+    try:
+        table = np.loadtxt(lines, delimiter=",", ndmin=2, dtype=np.float64)
+        timestamps, values = table[:, 0], table[:, 1:]
+    except ValueError:
+        rows = [line.strip().split(",") for line in lines]
+        timestamps = np.array([utils.parse_timestamp(r[0]) for r in rows], np.float64)
+        values = np.array([r[1:] for r in rows], np.float64).reshape(len(rows), -1)
+
+    packets = np.empty((len(values), 5), np.float64)
+    if values.shape[1] in (1, 2):
+        packets[:, 0:4] = values[:, 0:1]
+        packets[:, 4] = values[:, 1] if values.shape[1] == 2 else 1
+    elif values.shape[1] in (4, 5):
+        packets[:, 0:4] = values[:, 0:4]
+        packets[:, 4] = values[:, 4] if values.shape[1] == 5 else 0
+    else:
+        raise ValueError(f"Expected 2, 3, 5 or 6 columns, not {values.shape[1] + 1}.")
+    return timestamps, packets
+
+
+def _read(filename: str, chunk: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Reads a CSV file ``chunk`` lines at a time, skipping any header.
+    """
+    with open(filename, "r") as f:
+        first = True
+        while True:
+            lines = list(itertools.islice(f, chunk))
+            if not lines:
+                return
+            lines = [line for line in lines if line.strip()]
+            if first and lines:
+                try:
+                    _parse(lines[:1])
+                except ValueError:
+                    lines = lines[1:]
+                first = False
+            if lines:
+                yield _parse(lines)
+
+
+@utils.generate_tests("""
+    raises an error if the timestamps are out of order
+    raises an error if there is no data
+    reduces ticks to minute OHLCV
+    merges a minute split between chunks
+    writes one packet per minute with data
+""")
+def aggregate(filename: str, directory: str, chunk: int = DEFAULT_CHUNK) -> str:
+    """
+    Reduces a CSV file to one OHLCV packet per minute, written to two
+    temporary files in ``directory``: the minutes (as int64 UTC seconds)
+    and the packets (as float32).
+
+    :param filename:    The CSV file, named for its symbol.
+    :type filename:     str
+
+    :param directory:   The directory to write to.
+    :type directory:    str
+
+    :param chunk:       How many lines to read at a time.
+    :type chunk:        int
+
+    :returns:           The symbol.
+    :rtype:             str
+    """
+    symbol = os.path.splitext(os.path.basename(filename))[0].upper()
+    pending: Optional[Tuple[int, np.ndarray]] = None
+    last = -np.inf
+    with open(os.path.join(directory, f"{symbol}.minutes.tmp"), "wb") as f_minutes, \
+            open(os.path.join(directory, f"{symbol}.packets.tmp"), "wb") as f_packets:
+        for timestamps, packets in _read(filename, chunk):
+            if timestamps[0] < last or np.any(np.diff(timestamps) < 0):
+                raise ValueError(f"{filename} is not in time order.")
+            last = timestamps[-1]
+
+            # 1. Reduce the chunk to minutes.
+            minutes = (timestamps // 60).astype(np.int64) * 60
+            starts = np.flatnonzero(np.r_[True, minutes[1:] != minutes[:-1]])
+            ends = np.r_[starts[1:], len(minutes)]
+            reduced = np.stack((
+                packets[starts, 0],
+                np.maximum.reduceat(packets[:, 1], starts),
+                np.minimum.reduceat(packets[:, 2], starts),
+                packets[ends - 1, 3],
+                np.add.reduceat(packets[:, 4], starts)
+            ), axis=1)
+            minutes = minutes[starts]
+
+            # 2. The last minute of the previous chunk may carry on.
+            if pending is not None:
+                if pending[0] == minutes[0]:
+                    p = pending[1]
+                    reduced[0] = (p[0], max(p[1], reduced[0, 1]), min(p[2], reduced[0, 2]),
+                                  reduced[0, 3], p[4] + reduced[0, 4])
+                else:
+                    f_minutes.write(np.int64(pending[0]).tobytes())
+                    f_packets.write(pending[1].astype(np.float32).tobytes())
+
+            # 3. Hold back the last minute, in case it carries on.
+            f_minutes.write(minutes[:-1].tobytes())
+            f_packets.write(reduced[:-1].astype(np.float32).tobytes())
+            pending = (int(minutes[-1]), reduced[-1])
+
+        if pending is None:
+            raise ValueError(f"{filename} has no data.")
+        f_minutes.write(np.int64(pending[0]).tobytes())
+        f_packets.write(pending[1].astype(np.float32).tobytes())
+    return symbol
+
+
+@utils.generate_tests("""
+    places each packet at its minute
+    repeats the previous close, without volume, for minutes without data
+    repeats the first open before the first minute with data
+    carries the previous close across chunks
+""")
+def align(symbol: str, directory: str, chunk: int = DEFAULT_CHUNK) -> None:
+    """
+    Writes a symbol's ``SYMBOL.npy`` from its temporary files, with a
+    packet for every minute of the common index in ``timestamps.npy``.
+    The temporary files are then removed.
+
+    :param symbol:      The symbol.
+    :type symbol:       str
+
+    :param directory:   The directory written to.
+    :type directory:    str
+
+    :param chunk:       How many minutes to write at a time.
+    :type chunk:        int
+    """
+    index = np.load(os.path.join(directory, "timestamps.npy"), mmap_mode='r')
+    minutes_file = os.path.join(directory, f"{symbol}.minutes.tmp")
+    packets_file = os.path.join(directory, f"{symbol}.packets.tmp")
+    minutes = np.memmap(minutes_file, np.int64, 'r')
+    packets = np.memmap(packets_file, np.float32, 'r').reshape(-1, 5)
+    out = np.lib.format.open_memmap(
+        os.path.join(directory, f"{symbol}.npy"), 'w+', np.float32, (len(index) * 5,)
+    )
+
+    close = packets[0, 0]
+    for a in range(0, len(index), chunk):
+        block = np.asarray(index[a:a + chunk], np.int64)
+        lo = np.searchsorted(minutes, block[0], 'left')
+        hi = np.searchsorted(minutes, block[-1], 'right')
+        rows = np.searchsorted(block, minutes[lo:hi])
+
+        # Forward fill from the last minute with data, or the close
+        # carried from the previous block. closes[0] is that close.
+        closes = np.r_[close, packets[lo:hi, 3]]
+        last = np.zeros(len(block), np.int64)
+        last[rows] = np.arange(1, hi - lo + 1)
+        last = np.maximum.accumulate(last)
+
+        values = np.empty((len(block), 5), np.float32)
+        values[:, 0:4] = closes[last][:, None]
+        values[:, 4] = 0
+        values[rows] = packets[lo:hi]
+        out[a * 5:(a + len(block)) * 5] = values.ravel()
+        close = closes[-1]
+
+    out.flush()
+    del out, minutes, packets
+    os.remove(minutes_file)
+    os.remove(packets_file)
+
+
+@utils.generate_tests("""
+    raises an error if two files are for the same symbol
+    writes the native format
+    writes a common timestamp index
+    matches ingesting with one process
+""")
+def ingest(
+        filenames: Iterable[str],
+        directory: str,
+        processes: Optional[int] = None,
+        chunk: int = DEFAULT_CHUNK
+) -> None:
+    """
+    Ingests per-symbol CSV files into the native format.
+
+    :param filenames:   The CSV files, each named for its symbol.
+    :type filenames:    Iterable[str]
+
+    :param directory:   The directory to write to.
+    :type directory:    str
+
+    :param processes:   How many processes to use, or ``None`` for one
+                        per core.
+    :type processes:    int
+
+    :param chunk:       How many lines or minutes to process at a time.
+    :type chunk:        int
+    """
+    filenames = list(filenames)
+    os.makedirs(directory, exist_ok=True)
+    with mp.Pool(processes) as pool:
+        # 1. Reduce each file to minutes.
+        symbols = pool.starmap(aggregate, [(f, directory, chunk) for f in filenames])
+        if len(set(symbols)) != len(symbols):
+            raise ValueError(f"More than one file per symbol: {symbols}")
+
+        # 2. Merge every symbol's minutes into a common index.
+        index = reduce(np.union1d, (
+            np.fromfile(os.path.join(directory, f"{s}.minutes.tmp"), np.int64) for s in symbols
+        ), np.empty(0, np.int64))
+        Native.write_header(
+            directory,
+            np.array([utils.convert_symbol_to_id(s) for s in symbols], np.int64),
+            index.astype(np.float64),
+            np.float32
+        )
+        del index
+
+        # 3. Align each symbol to the index.
+        pool.starmap(align, [(s, directory, chunk) for s in symbols])
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Ingests per-symbol CSV files into Hokohoko's native format.")
+    parser.add_argument("directory", help="The directory to write to.", type=str)
+    parser.add_argument("files", help="The CSV files, each named for its symbol.", type=str, nargs="+")
+    parser.add_argument("-c", "--process-count", help="Number of processes to use.", type=int, default=None)
+    parser.add_argument("--chunk", help="Lines or minutes to process at a time.", type=int, default=DEFAULT_CHUNK)
+    args = parser.parse_args()
+    ingest(args.files, args.directory, args.process_count, args.chunk)
+    sys.exit()
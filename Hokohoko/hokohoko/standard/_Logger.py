@@ -23,11 +23,11 @@
 #   running balance and equity totals.
 #
 
-from typing import Iterable, Optional
+from typing import Dict, Optional
 
 import numpy as np
 
-from hokohoko.entities import Assessor
+from hokohoko.entities import Account, Assessor
 
 
 class Logger(Assessor):
@@ -39,16 +39,24 @@ class Logger(Assessor):
         """
         """
         super().__init__(None)
+        self._equity: Dict[int, np.float64] = {}
 
-    def analyse(self, data: Iterable) -> None:
+    def consume(self, period_id: int, account: Account) -> None:
         """
-        Output the benchmark results into a readable form.
+        Keeps the final equity of a Period.
+
+        :param period_id:   The Period.
+        :type period_id:    int
+
+        :param account:     The Period's Account.
+        :type account:      hokohoko.entities.Account
+        """
+        self._equity[period_id] = np.float64(account.equity[-1])
 
-        :param data:        The data to analyse. This is provided as an
-                            Account per Period.
-        :type data:         list[multiprocessing.pool.AsyncResult[tuple[int, hokohoko.entities.Account]]]
+    def finalize(self) -> None:
+        """
+        Output the benchmark results into a readable form.
         """
         # TODO: Make this output per-Order rather than total equity.
-        results = np.array([a.get()[1].equity[-1] for a in data], dtype=np.float64)
-        for i, r in enumerate(results):
-            print(f"{i:03d}:{r:12.2f}")
+        for i in sorted(self._equity):
+            print(f"{i:03d}:{self._equity[i]:12.2f}")
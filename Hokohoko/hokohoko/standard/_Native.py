@@ -0,0 +1,423 @@
+#   hokohoko/standard/_Native.py
+#
+#   Copyright 2020 Neil Bradley
+#
+#   This file is part of Hokohoko.
+#
+#   Hokohoko is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   Hokohoko is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY# without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with Hokohoko.  If not, see <https://www.gnu.org/licenses/>.
+#
+#   ====================================================================
+#
+#   This file contains a Data source that memory-maps Hokohoko's native,
+#   uncompressed, data format.
+#
+
+import json
+import multiprocessing as mp
+import os
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko.entities import Data, Planar
+
+
+class Native(Data):
+    """
+    Memory-maps the data from a directory in Hokohoko's native format.
+    Unlike a ``.npz`` file, nothing is compressed or zipped, so only the
+    requested symbols and minutes are ever read.
+    """
+
+    #: Identifies the format in the header.
+    FORMAT = "hokohoko-native"
+
+    #: The version of the format written. Version 1, which had no
+    #: fixed-point storage, is still read.
+    VERSION = 2
+
+    #: The largest power of ten ``fixed_point_scales`` will try.
+    MAX_DECIMALS = 9
+
+    def __init__(
+            self,
+            parameters: str,
+            symbol_subset: Optional[Iterable[str]] = None,
+            origin: int = 0,
+            end: Optional[int] = None,
+            lock: Optional[mp.Lock] = None,
+            load: bool = True
+    ) -> None:
+        """
+        :param parameters:      A string of arguments, from
+                                ``HokohokoConfig.data_parameters``.
+                                See Parameter Arguments below for
+                                details.
+        :type parameters:       str
+
+        :param symbol_subset:   A comma-separated string of specific
+                                symbols to load. If the requested symbol
+                                doesn't exist in the data set it is
+                                ignored. This list may be augmented by
+                                other currency pairs required to convert
+                                Orders to the Account base currency.
+        :type symbol_subset:    str
+
+        Other arguments are internal to Hokohoko.
+
+        **Parameters Arguments:**
+
+            .. code-block:: Text
+
+                directory
+
+                    directory       The directory holding the data.
+
+        **The Data Directory:**
+
+            The directory contains:
+
+            1. ``header.json``. The format, its version, the symbols
+               available in order, the number of minutes, and the type
+               of the exchange rate data. For fixed-point data, also the
+               type stored, and the scales.
+            2. ``timestamps.npy``. An array of numpy.float64s
+               representing the UTC timestamp for each minute.
+            3. ``SYMBOL.npy`` for each symbol. The exchange rate data
+               for that symbol, one packet per minute, each of five data
+               points: ``OPEN``, ``HIGH``, ``LOW``, ``CLOSE`` and
+               ``VOLUME``.
+
+            Fixed-point data is stored as ``numpy.int32``, each field of
+            each symbol multiplied by its own power of ten, e.g.
+            ``100000`` for a five decimal place quote. It is divided
+            back as it is read, to exactly the values written.
+
+            Existing ``data.npz`` files can be converted with:
+
+            .. code-block:: Text
+
+                python3 -m hokohoko.convert [--fixed-point] data.npz directory
+
+            and raw per-symbol tick or minute CSV files with
+            ``hokohoko.ingest``.
+
+        """
+        super().__init__(parameters, symbol_subset, origin, end, lock, load)
+        self._symbols = None
+        self._end = None
+        self._dtype = None
+        self._scales = None
+
+    @staticmethod
+    @utils.generate_tests("""
+        raises an error if the data doesn't match the symbols and timestamps
+        creates the directory if needed
+        writes a header, timestamps and a file per symbol
+        writes data that Native loads unchanged
+    """)
+    def write(
+            directory: str,
+            symbol_ids: np.ndarray,
+            timestamps: np.ndarray,
+            data: np.ndarray,
+            scales: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Writes data in the native format.
+
+        :param directory:   The directory to write to.
+        :type directory:    str
+
+        :param symbol_ids:  The symbols, as ids.
+        :type symbol_ids:   numpy.ndarray[numpy.int64]
+
+        :param timestamps:  The per-minute timestamps.
+        :type timestamps:   numpy.ndarray[numpy.float64]
+
+        :param data:        The per-symbol, per-minute exchange rate
+                            data, as in ``Data.data``.
+        :type data:         numpy.ndarray[numpy.float32]
+
+        :param scales:      (Optional) Store the data as fixed-point,
+                            with these per-symbol, per-field scales,
+                            from ``fixed_point_scales``.
+        :type scales:       numpy.ndarray[numpy.int64]
+        """
+        if data.shape != (len(symbol_ids), len(timestamps) * 5):
+            raise ValueError(f"data doesn't match the symbols and timestamps: {data.shape}")
+        if scales is not None and np.shape(scales) != (len(symbol_ids), 5):
+            raise ValueError(f"scales don't match the symbols: {np.shape(scales)}")
+
+        Native.write_header(directory, symbol_ids, timestamps, data.dtype, scales)
+        for i, (symbol_id, row) in enumerate(zip(symbol_ids, data)):
+            if scales is not None:
+                row = np.round(row.reshape(-1, 5) * np.asarray(scales[i], np.float64)).astype(np.int32).ravel()
+            np.save(os.path.join(directory, f"{utils.convert_id_to_symbol(symbol_id)}.npy"), row)
+
+    @staticmethod
+    @utils.generate_tests("""
+        raises an error if a field has too many decimal places
+        raises an error if a field doesn't fit in an int32
+        finds the fewest decimal places for each field
+        the scales reproduce the data exactly
+    """)
+    def fixed_point_scales(data: np.ndarray) -> np.ndarray:
+        """
+        Finds, for each field of each symbol, the smallest power of ten
+        that stores it exactly as an ``numpy.int32``, i.e. that divides
+        back to exactly the same values.
+
+        :param data:    The per-symbol, per-minute exchange rate data,
+                        as in ``Data.data``.
+        :type data:     numpy.ndarray[numpy.float32]
+
+        :returns:       The scales, shaped ``(symbols, 5)``.
+        :rtype:         numpy.ndarray[numpy.int64]
+        """
+        scales = np.zeros((data.shape[0], 5), np.int64)
+        for (i, k), _ in np.ndenumerate(scales):
+            values = data[i, k::5]
+            for decimals in range(Native.MAX_DECIMALS + 1):
+                scaled = np.round(values * np.float64(10 ** decimals))
+                if np.abs(scaled).max(initial=0) >= 2 ** 31:
+                    break
+                if np.array_equal((scaled / 10 ** decimals).astype(data.dtype), values):
+                    scales[i, k] = 10 ** decimals
+                    break
+            if scales[i, k] == 0:
+                raise ValueError(f"Field {k} of symbol {i} can't be stored as fixed-point.")
+        return scales
+
+    @staticmethod
+    @utils.generate_tests("""
+        creates the directory if needed
+        writes the header and timestamps
+    """)
+    def write_header(
+            directory: str,
+            symbol_ids: np.ndarray,
+            timestamps: np.ndarray,
+            dtype: Union[str, np.dtype],
+            scales: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Writes the header and timestamps of the native format, leaving
+        each ``SYMBOL.npy`` to be written separately, e.g. a part at a
+        time through ``numpy.lib.format.open_memmap``.
+
+        :param directory:   The directory to write to.
+        :type directory:    str
+
+        :param symbol_ids:  The symbols, as ids.
+        :type symbol_ids:   numpy.ndarray[numpy.int64]
+
+        :param timestamps:  The per-minute timestamps.
+        :type timestamps:   numpy.ndarray[numpy.float64]
+
+        :param dtype:       The type of the exchange rate data.
+        :type dtype:        Union[str, numpy.dtype]
+
+        :param scales:      (Optional) The per-symbol, per-field scales,
+                            if each ``SYMBOL.npy`` is fixed-point.
+        :type scales:       numpy.ndarray[numpy.int64]
+        """
+        header = {
+            "format": Native.FORMAT,
+            "version": Native.VERSION,
+            "symbols": [utils.convert_id_to_symbol(s) for s in symbol_ids],
+            "minutes": len(timestamps),
+            "dtype": np.dtype(dtype).str
+        }
+        if scales is not None:
+            header["storage"] = np.dtype(np.int32).str
+            header["scales"] = np.asarray(scales, np.int64).tolist()
+
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "header.json"), "w") as f:
+            json.dump(header, f, indent=4)
+        np.save(os.path.join(directory, "timestamps.npy"), timestamps)
+
+    @utils.generate_tests("""
+        raises an error if the directory doesn't exist
+        raises an error if the header is not the native format
+        reads version 1 directories
+        decodes fixed-point data exactly
+        raises an error if origin is negative
+        raises an error if end is less than origin
+        loads all the symbols correctly
+        loads only the specified symbols
+        loads the requested timestamps only
+        loads the requested data only
+        reads only the header and timestamps if not loading
+    """)
+    def __enter__(self) -> 'Native':
+        """
+        Memory-maps the configured directory, and reads the configured
+        symbols and minutes.
+        """
+        if self.origin < 0:
+            raise ValueError("origin < 0")
+        if self.end is not None and self.end <= self.origin:
+            raise ValueError("end <= origin")
+
+        with open(os.path.join(self.parameters, "header.json")) as f:
+            header = json.load(f)
+        if header.get("format") != self.FORMAT or header.get("version") not in (1, self.VERSION):
+            raise ValueError(f"Not a native data directory: {self.parameters}")
+
+        # 1. Build list of symbols.
+        symbol_ids = np.array([utils.convert_symbol_to_id(s) for s in header["symbols"]], np.int64)
+        rows = utils.resolve_subset(symbol_ids, self.symbol_subset)
+        self.symbol_ids = symbol_ids[rows]
+        self._symbols = [header["symbols"][i] for i in rows]
+        self._dtype = np.dtype(header["dtype"])
+        if "scales" in header:
+            self._scales = np.array(header["scales"], np.int64)[rows]
+
+        # 2. Read the requested minutes.
+        self._end = header["minutes"] if self.end is None else min(self.end, header["minutes"])
+        self.timestamps = np.load(
+            os.path.join(self.parameters, "timestamps.npy"), mmap_mode='r'
+        )[self.origin:self._end]
+        if self.load:
+            self.data = np.empty((len(rows), len(self.timestamps) * 5), self._dtype)
+            for i, row in enumerate(self._rows()):
+                self.data[i] = self._decode(i, row[self.origin * 5:self._end * 5])
+
+        return self
+
+    @utils.generate_tests("""
+        builds every field by default.
+        builds only the requested fields.
+        matches Data.build_planar.
+        decodes fixed-point data exactly.
+    """)
+    def build_planar(self, fields: Optional[Iterable[str]] = None) -> Planar:
+        """
+        Reads each requested field straight from the memory-mapped
+        files, into one contiguous array per field. Unlike
+        ``Data.build_planar``, this doesn't need the data cached, and
+        only the requested fields are copied.
+
+        :param fields:  The names of the fields to build, from
+                        ``Planar._fields``, or ``None`` for all of them.
+        :type fields:   Iterable[str]
+
+        :returns:       The fields, also stored in ``self.planar``.
+        :rtype:         hokohoko.entities.Planar
+        """
+        fields = Planar._fields if fields is None else tuple(fields)
+        planar = [
+            np.empty((len(self._symbols), len(self.timestamps)), self._dtype) if f in fields else None
+            for f in Planar._fields
+        ]
+        for i, row in enumerate(self._rows()):
+            for k, field in enumerate(planar):
+                if field is not None:
+                    values = row[self.origin * 5 + k:self._end * 5:5]
+                    field[i] = values if self._scales is None else values / self._scales[i, k]
+        self.planar = Planar(*planar)
+        return self.planar
+
+    def _decode(self, i: int, values: np.ndarray) -> np.ndarray:
+        """
+        Divides the i-th selected symbol's fixed-point packets by their
+        scales, if the data is fixed-point.
+        """
+        if self._scales is None:
+            return values
+        return (values.reshape(-1, 5) / self._scales[i]).ravel()
+
+    def _rows(self) -> Iterable[np.ndarray]:
+        """
+        Memory-maps the data of each selected symbol in turn.
+        """
+        for s in self._symbols:
+            yield np.load(os.path.join(self.parameters, f"{s}.npy"), mmap_mode='r')
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Releases the memory-mapped timestamps.
+
+        :param exc_type:
+        :param exc_val:
+        :param exc_tb:
+        :return:
+
+        """
+        self.timestamps = None
+
+    @utils.generate_tests("returns the correct symbol ids")
+    def get_symbol_ids(self) -> np.ndarray:
+        """
+        Returns the list of symbols currently available in the data
+        source. If a subset was selected, this will be the intersection
+        of symbols available and the requested subset. Additional
+        symbols may be loaded for internal use if required.
+
+        :return:    The list of available symbols (as ids).
+        :rtype:     numpy.ndarray[numpy.int64]
+
+        """
+        return self.symbol_ids
+
+    @utils.generate_tests("returns the correct count of minutes")
+    def get_minutes(self) -> int:
+        """
+        Get how many minutes are available in this data source. This may
+        vary depending on loading conditions.
+
+        :returns:   Number of minutes.
+        :rtype:     int
+
+        """
+        return self.timestamps.shape[0]
+
+    @utils.generate_tests("""
+        raises an error if origin is negative
+        raises an error if end is less than origin
+        returns expected data for all symbols
+        returns expected data for specified symbols
+    """)
+    def get_partial_data(
+            self,
+            origin: int,
+            end: int
+    ) -> (np.ndarray, np.ndarray):
+        """
+        Retrieve a block of data [origin, end) from the source.
+
+        :param origin:  The first minute to get. Note this is an index
+                        value, with 0 being the start of the available
+                        data.
+        :type origin:   int
+
+        :param end:     Get up to this minute.
+        :type end:      int
+
+        :returns:       | Two arrays:
+                        | 1. Per-minute timestamps.
+                        | 2. Per-symbol, per-minute exchange rate data.
+        :rtype:         tuple(numpy.ndarray, numpy.ndarray)
+
+        """
+        if origin < 0:
+            raise ValueError("origin < 0")
+        if end <= origin:
+            raise ValueError("end <= origin")
+
+        origin, end = origin - self.origin, end - self.origin
+        return self.timestamps[origin:end], self.data[:, origin * 5: end * 5]
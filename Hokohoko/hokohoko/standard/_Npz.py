@@ -24,7 +24,8 @@
 #
 
 import multiprocessing as mp
-from typing import Iterable, Optional
+import sys
+from typing import Iterable, Optional, Tuple
 
 import numpy as np
 
@@ -37,6 +38,9 @@ class Npz(Data):
     Loads the data from a numpy.npz file.
     """
 
+    #: Only Windows needs opens serialised, see Performance Issues.
+    needs_lock = sys.platform == "win32"
+
     def __init__(
             self,
             parameters: str,
@@ -72,12 +76,17 @@ class Npz(Data):
                     filename        The name of the data file to load.
 
                     start_override  Specify the timestamp within the
-                                    data to load from.
-                                    [Not implemented yet]
+                                    data to load from. Minute 0 is then
+                                    the first at or after it.
 
                     end_override    Specify the timestamp within the
-                                    data to stop at.
-                                    [Not implemented yet]
+                                    data to stop at. Minutes at or after
+                                    it are not available.
+
+                Timestamps are UTC seconds, or ISO 8601 dates and times
+                such as ``2015-06-01``. Each is found by binary search
+                over the timestamps, so only the minutes between them
+                are loaded or planned over.
 
         **The Data File:**
 
@@ -98,11 +107,12 @@ class Npz(Data):
 
         **Performance Issues:**
 
-            Due to Windows caching issues, Hokohoko uses a shared
-            ``multiprocessing.lock`` to synchronise access to the data
-            file. Also due to Windows, the RAM requirements [currently,
-            version |version|] are significant - approximately 1GB per
-            current process.
+            Due to Windows caching issues, on Windows Hokohoko uses a
+            shared ``multiprocessing.lock`` to synchronise access to the
+            data file. Elsewhere, Periods open it concurrently, unless
+            ``--data-lock on`` is given. Also due to Windows, the RAM
+            requirements [currently, version |version|] are significant
+            - approximately 1GB per current process.
 
         """
         super().__init__(parameters, symbol_subset, origin, end, lock, load)
@@ -118,6 +128,7 @@ class Npz(Data):
         raises an error if lock is not a lock
         loads all the symbols correctly
         loads only the specified symbols
+        doesn't match partial symbols
         loads the requested timestamps only
         loads the requested data only
         doesnt load data if load is false
@@ -135,39 +146,61 @@ class Npz(Data):
         if self.end is not None and self.end <= self.origin:
             raise ValueError("end <= origin")
 
+        filename, start_override, end_override = self._parse_parameters()
+
         if self.lock is not None:
             self.lock.acquire()
 
-        with np.load(self.parameters, mmap_mode='r') as source:
+        with np.load(filename, mmap_mode='r') as source:
             # 1. Build list of symbols and their indexes.
             _symbol_ids = source['symbol_ids']
-            if self.symbol_subset is not None:
-                self.symbol_ids = np.array([
-                    s for s in _symbol_ids if utils.convert_id_to_symbol(s) in self.symbol_subset
-                ])
-            else:
-                self.symbol_ids = _symbol_ids
-            _symbol_indexes = np.array(
-                [i for i, s in np.ndenumerate(_symbol_ids) if s in self.symbol_ids]
-            )
-
-            # 2. Load the data.
-            if self.end is not None:
-                self.timestamps = source['timestamps'][self.origin:self.end]
-                if self.load:
-                    self.data = (
-                        source['data'][_symbol_indexes, self.origin * 5:self.end * 5]
-                    )[:, 0, :]
-            else:
-                self.timestamps = source['timestamps'][self.origin:]
-                if self.load:
-                    self.data = (source['data'][_symbol_indexes, self.origin * 5:])[:, 0, :]
+            _symbol_indexes = utils.resolve_subset(_symbol_ids, self.symbol_subset)
+            self.symbol_ids = _symbol_ids[_symbol_indexes]
+
+            # 2. Find the overridden range of the file.
+            timestamps = source['timestamps']
+            first, last = 0, len(timestamps)
+            if start_override is not None:
+                first = int(np.searchsorted(timestamps, start_override, 'left'))
+            if end_override is not None:
+                last = int(np.searchsorted(timestamps, end_override, 'left'))
+
+            # 3. Load the data.
+            origin = first + self.origin
+            end = last if self.end is None else min(first + self.end, last)
+            self.timestamps = timestamps[origin:end]
+            if self.load:
+                self.data = source['data'][_symbol_indexes, origin * 5:end * 5]
 
         if self.lock is not None:
             self.lock.release()
 
         return self
 
+    @utils.generate_tests("""
+        returns the whole parameters as the filename if there are no overrides
+        parses each override
+        keeps spaces in the filename
+    """)
+    def _parse_parameters(self) -> Tuple[str, Optional[float], Optional[float]]:
+        """
+        Splits the filename from the overrides.
+
+        :returns:   The filename, start_override and end_override.
+        """
+        words = self.parameters.split(" ")
+        overrides = {}
+        while len(words) > 1 and words[-1].split("=", 1)[0] in ("start_override", "end_override"):
+            key, value = words.pop().split("=", 1)
+            overrides[key] = utils.parse_timestamp(value)
+
+        start_override, end_override = overrides.get("start_override"), overrides.get("end_override")
+        if start_override is not None and start_override < 0:
+            raise ValueError("start_override < 0")
+        if start_override is not None and end_override is not None and end_override <= start_override:
+            raise ValueError("end_override <= start_override")
+        return " ".join(words), start_override, end_override
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         """
         Nothing to clean up.
@@ -0,0 +1,218 @@
+#   hokohoko/standard/_Preloaded.py
+#
+#   Copyright 2020 Neil Bradley
+#
+#   This file is part of Hokohoko.
+#
+#   Hokohoko is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   Hokohoko is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY# without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with Hokohoko.  If not, see <https://www.gnu.org/licenses/>.
+#
+#   ====================================================================
+#
+#   This file contains a Data source that views data loaded by the
+#   parent process before it forked.
+#
+
+import multiprocessing as mp
+from itertools import count
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko.entities import Data
+
+
+class Preloaded(Data):
+    """
+    Views data published by ``Preloaded.publish`` in this process, or in
+    the process this one was forked from. Hokohoko does this itself with
+    ``--start-method fork``: the parent loads the data once before
+    starting the pool, and every process then shares its pages
+    copy-on-write. As nothing writes to them, they are never copied.
+
+    Only works with the ``fork`` start method, as ``spawn`` and
+    ``forkserver`` start processes without the parent's memory.
+    """
+
+    #: The published data, by parameters: the symbol ids, timestamps,
+    #: data and the minute of the source it starts at.
+    _published: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, int]] = {}
+
+    #: Numbers each publication.
+    _counter = count()
+
+    def __init__(
+            self,
+            parameters: str,
+            symbol_subset: Optional[Iterable[str]] = None,
+            origin: int = 0,
+            end: Optional[int] = None,
+            lock: Optional[mp.Lock] = None,
+            load: bool = True
+    ) -> None:
+        """
+        :param parameters:      The name of the published data, from
+                                ``Preloaded.publish``.
+        :type parameters:       str
+
+        :param symbol_subset:   A comma-separated string of specific
+                                symbols to view. Unknown symbols are
+                                ignored. If the symbols are not
+                                consecutive rows, their data is copied.
+        :type symbol_subset:    str
+
+        Other arguments are internal to Hokohoko.
+        """
+        super().__init__(parameters, symbol_subset, origin, end, lock, load)
+
+    @staticmethod
+    @utils.generate_tests("""
+        raises an error if the source is not loaded
+        makes the arrays read-only
+        returns parameters that view the data
+    """)
+    def publish(source: Data) -> str:
+        """
+        Keeps an entered, loaded, data source's arrays in this process,
+        for it and any processes forked from it to view. The caller must
+        ``withdraw`` them once every process is finished with them.
+
+        :param source:  The data source to publish.
+        :type source:   hokohoko.entities.Data
+
+        :returns:       The parameters with which to open a Preloaded
+                        data source onto the data.
+        :rtype:         str
+        """
+        if source.data is None:
+            raise ValueError("Only loaded data can be published.")
+
+        arrays = (np.asarray(source.get_symbol_ids()), source.timestamps, source.data)
+        for array in arrays:
+            array.flags.writeable = False
+        parameters = f"preloaded-{next(Preloaded._counter)}"
+        Preloaded._published[parameters] = (*arrays, source.origin)
+        return parameters
+
+    @staticmethod
+    def withdraw(parameters: str) -> None:
+        """
+        Drops published data.
+
+        :param parameters:  The parameters from ``publish``.
+        :type parameters:   str
+        """
+        Preloaded._published.pop(parameters, None)
+
+    @utils.generate_tests("""
+        raises an error if the data isn't published in this process
+        raises an error if origin is before the data
+        raises an error if end is less than origin
+        views only the specified symbols
+        views the requested minutes only
+        the data is read-only
+    """)
+    def __enter__(self) -> 'Preloaded':
+        """
+        Views the configured symbols and minutes of the published data.
+        """
+        if self.parameters not in Preloaded._published:
+            raise ValueError(f"{self.parameters} isn't published in this process. "
+                             f"Preloaded data needs the fork start method.")
+        symbol_ids, timestamps, data, data_origin = Preloaded._published[self.parameters]
+        if self.origin < data_origin:
+            raise ValueError("origin is before the preloaded data")
+        if self.end is not None and self.end <= self.origin:
+            raise ValueError("end <= origin")
+
+        # 1. Select the symbols, as a slice of rows if possible.
+        rows = utils.resolve_subset(symbol_ids, self.symbol_subset)
+        if len(rows) > 0 and rows[-1] - rows[0] + 1 == len(rows):
+            rows = slice(rows[0], rows[-1] + 1)
+        self.symbol_ids = symbol_ids[rows]
+
+        # 2. Select the minutes.
+        start = self.origin - data_origin
+        stop = len(timestamps) if self.end is None else self.end - data_origin
+        self.timestamps = timestamps[start:stop]
+        if self.load:
+            self.data = data[rows, start * 5:stop * 5]
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Drops the views. The published data is kept.
+
+        :param exc_type:
+        :param exc_val:
+        :param exc_tb:
+        :return:
+
+        """
+        self.symbol_ids = None
+        self.timestamps = None
+        self.data = None
+        self.range_index = None
+
+    @utils.generate_tests("returns the correct symbol ids")
+    def get_symbol_ids(self) -> np.ndarray:
+        """
+        :return:    The list of available symbols (as ids).
+        :rtype:     numpy.ndarray[numpy.int64]
+        """
+        return self.symbol_ids
+
+    @utils.generate_tests("returns the correct count of minutes")
+    def get_minutes(self) -> int:
+        """
+        :returns:   Number of minutes.
+        :rtype:     int
+        """
+        return self.timestamps.shape[0]
+
+    @utils.generate_tests("""
+        raises an error if origin is negative
+        raises an error if end is less than origin
+        returns views, not copies
+    """)
+    def get_partial_data(
+            self,
+            origin: int,
+            end: int
+    ) -> (np.ndarray, np.ndarray):
+        """
+        Retrieve a block of data [origin, end).
+
+        :param origin:  The first minute to get. Note this is an index
+                        value, with 0 being the start of the available
+                        data.
+        :type origin:   int
+
+        :param end:     Get up to this minute.
+        :type end:      int
+
+        :returns:       | Two arrays:
+                        | 1. Per-minute timestamps.
+                        | 2. Per-symbol, per-minute exchange rate data.
+        :rtype:         tuple(numpy.ndarray, numpy.ndarray)
+
+        """
+        if origin < 0:
+            raise ValueError("origin < 0")
+        if end <= origin:
+            raise ValueError("end <= origin")
+
+        origin, end = origin - self.origin, end - self.origin
+        return self.timestamps[origin:end], self.data[:, origin * 5: end * 5]
@@ -0,0 +1,408 @@
+#   hokohoko/standard/_SQLite.py
+#
+#   Copyright 2020 Neil Bradley
+#
+#   This file is part of Hokohoko.
+#
+#   Hokohoko is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   Hokohoko is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY# without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with Hokohoko.  If not, see <https://www.gnu.org/licenses/>.
+#
+#   ====================================================================
+#
+#   This file contains a Data source that reads from an SQLite database
+#   of per-symbol chunks.
+#
+
+import multiprocessing as mp
+import sqlite3
+from contextlib import closing
+from typing import Iterable, Optional
+from urllib.request import pathname2url
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko.entities import Data
+
+
+class SQLite(Data):
+    """
+    Reads the data from an SQLite database, in which each symbol's data
+    is stored in chunks of ``CHUNK`` minutes, clustered by symbol and
+    chunk. Any range of minutes is read with one indexed range query per
+    symbol, and new minutes can be appended without rewriting what's
+    already there.
+    """
+
+    #: Identifies the format in the database.
+    FORMAT = "hokohoko-sqlite"
+
+    #: The version of the format written.
+    VERSION = 1
+
+    #: Minutes per chunk, for new databases.
+    CHUNK = 1440
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS symbols (
+            row INTEGER PRIMARY KEY,
+            symbol_id INTEGER NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS timestamps (
+            chunk INTEGER PRIMARY KEY,
+            data BLOB NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS chunks (
+            symbol_id INTEGER NOT NULL,
+            chunk INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            PRIMARY KEY (symbol_id, chunk)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(
+            self,
+            parameters: str,
+            symbol_subset: Optional[Iterable[str]] = None,
+            origin: int = 0,
+            end: Optional[int] = None,
+            lock: Optional[mp.Lock] = None,
+            load: bool = True
+    ) -> None:
+        """
+        :param parameters:      A string of arguments, from
+                                ``HokohokoConfig.data_parameters``.
+                                See Parameter Arguments below for
+                                details.
+        :type parameters:       str
+
+        :param symbol_subset:   A comma-separated string of specific
+                                symbols to load. If the requested symbol
+                                doesn't exist in the data set it is
+                                ignored. This list may be augmented by
+                                other currency pairs required to convert
+                                Orders to the Account base currency.
+        :type symbol_subset:    str
+
+        Other arguments are internal to Hokohoko.
+
+        **Parameters Arguments:**
+
+            .. code-block:: Text
+
+                filename
+
+                    filename        The SQLite database to read.
+
+        **The Database:**
+
+            The database contains four tables:
+
+            1. ``meta``. The format, its version, the number of minutes,
+               the minutes per chunk, and the type of the exchange rate
+               data.
+            2. ``symbols``. The symbols available, as ids, in order.
+            3. ``timestamps``. The UTC timestamp of each minute, as
+               chunks of numpy.float64s.
+            4. ``chunks``. The exchange rate data, as chunks per symbol,
+               each of one packet per minute of five data points:
+               ``OPEN``, ``HIGH``, ``LOW``, ``CLOSE`` and ``VOLUME``.
+
+            Existing ``data.npz`` files can be converted with:
+
+            .. code-block:: Text
+
+                python3 -m hokohoko.convert --sqlite data.npz data.sqlite
+
+            and new minutes added with ``SQLite.append``.
+
+        """
+        super().__init__(parameters, symbol_subset, origin, end, lock, load)
+        self._db = None
+        self._chunk = None
+        self._dtype = None
+        self._end = None
+
+    @staticmethod
+    @utils.generate_tests("""
+        raises an error if the data doesn't match the symbols and timestamps
+        raises an error if the symbols don't match the database
+        raises an error if the timestamps don't follow the database's
+        creates the database if needed
+        writes data that SQLite loads unchanged
+        appends to a partial last chunk
+        accepts the symbols in any order
+    """)
+    def append(
+            filename: str,
+            symbol_ids: np.ndarray,
+            timestamps: np.ndarray,
+            data: np.ndarray,
+            chunk: Optional[int] = None
+    ) -> None:
+        """
+        Appends minutes to a database, creating it if needed. Only the
+        last chunk, if partial, and the new chunks are written.
+
+        :param filename:    The SQLite database.
+        :type filename:     str
+
+        :param symbol_ids:  The symbols, as ids. For an existing
+                            database, these must be its symbols, though
+                            in any order.
+        :type symbol_ids:   numpy.ndarray[numpy.int64]
+
+        :param timestamps:  The per-minute timestamps, after those
+                            already in the database.
+        :type timestamps:   numpy.ndarray[numpy.float64]
+
+        :param data:        The per-symbol, per-minute exchange rate
+                            data, as in ``Data.data``.
+        :type data:         numpy.ndarray[numpy.float32]
+
+        :param chunk:       Minutes per chunk, for a new database, or
+                            ``None`` for ``CHUNK``.
+        :type chunk:        int
+        """
+        if data.shape != (len(symbol_ids), len(timestamps) * 5):
+            raise ValueError(f"data doesn't match the symbols and timestamps: {data.shape}")
+
+        with closing(sqlite3.connect(filename)) as db, db:
+            # 1. Create the database, if needed.
+            db.executescript(SQLite._SCHEMA)
+            if db.execute("SELECT COUNT(*) FROM meta").fetchone()[0] == 0:
+                db.executemany("INSERT INTO meta VALUES (?, ?)", [
+                    ("format", SQLite.FORMAT),
+                    ("version", str(SQLite.VERSION)),
+                    ("minutes", "0"),
+                    ("chunk", str(SQLite.CHUNK if chunk is None else chunk)),
+                    ("dtype", data.dtype.str)
+                ])
+                db.executemany("INSERT INTO symbols VALUES (?, ?)", enumerate(map(int, symbol_ids)))
+            meta = SQLite._read_meta(db, filename)
+
+            # 2. Match the rows to the database's symbols.
+            known = [s for (s,) in db.execute("SELECT symbol_id FROM symbols ORDER BY row")]
+            if sorted(known) != sorted(map(int, symbol_ids)):
+                raise ValueError(f"The symbols don't match {filename}.")
+            rows = {int(s): i for i, s in enumerate(symbol_ids)}
+            data = data[[rows[s] for s in known]].astype(meta["dtype"])
+            timestamps = np.asarray(timestamps, np.float64)
+
+            minutes, size = meta["minutes"], meta["chunk"]
+            if minutes > 0 and len(timestamps) > 0:
+                last = SQLite._read_timestamps(db, size, minutes - 1, minutes)[0]
+                if timestamps[0] <= last:
+                    raise ValueError(f"The timestamps must follow those in {filename}.")
+
+            # 3. Write each chunk, extending a partial last chunk.
+            total = minutes + len(timestamps)
+            for first in range(minutes // size * size, total, size):
+                k = first // size
+                a, b = max(first, minutes) - minutes, min(first + size, total) - minutes
+                chunk_timestamps, chunk_data = timestamps[a:b], data[:, a * 5:b * 5]
+                if first < minutes:
+                    chunk_timestamps = np.r_[SQLite._read_timestamps(db, size, first, minutes), chunk_timestamps]
+                    chunk_data = np.concatenate(
+                        (SQLite._read_chunks(db, known, size, meta["dtype"], first, minutes), chunk_data), axis=1
+                    )
+                db.execute("INSERT OR REPLACE INTO timestamps VALUES (?, ?)", (k, chunk_timestamps.tobytes()))
+                db.executemany("INSERT OR REPLACE INTO chunks VALUES (?, ?, ?)", (
+                    (s, k, row.tobytes()) for s, row in zip(known, chunk_data)
+                ))
+            db.execute("UPDATE meta SET value = ? WHERE key = 'minutes'", (str(total),))
+
+    @staticmethod
+    def _read_meta(db: sqlite3.Connection, filename: str) -> dict:
+        """
+        Reads and checks the ``meta`` table.
+        """
+        meta = dict(db.execute("SELECT key, value FROM meta"))
+        if meta.get("format") != SQLite.FORMAT or meta.get("version") != str(SQLite.VERSION):
+            raise ValueError(f"Not a Hokohoko SQLite database: {filename}")
+        return {
+            "minutes": int(meta["minutes"]),
+            "chunk": int(meta["chunk"]),
+            "dtype": np.dtype(meta["dtype"])
+        }
+
+    @staticmethod
+    def _read_timestamps(db: sqlite3.Connection, size: int, origin: int, end: int) -> np.ndarray:
+        """
+        Reads the timestamps [origin, end) with one range query.
+        """
+        if end <= origin:
+            return np.empty(0, np.float64)
+        first = origin // size * size
+        blobs = db.execute(
+            "SELECT data FROM timestamps WHERE chunk BETWEEN ? AND ? ORDER BY chunk",
+            (origin // size, (end - 1) // size)
+        )
+        return np.concatenate([np.frombuffer(b, np.float64) for (b,) in blobs])[origin - first:end - first]
+
+    @staticmethod
+    def _read_chunks(
+            db: sqlite3.Connection,
+            symbol_ids: Iterable[int],
+            size: int,
+            dtype: np.dtype,
+            origin: int,
+            end: int
+    ) -> np.ndarray:
+        """
+        Reads the data [origin, end) of each symbol with one range query
+        per symbol.
+        """
+        if end <= origin:
+            return np.empty((len(symbol_ids), 0), dtype)
+        first = origin // size * size
+        rows = []
+        for s in symbol_ids:
+            blobs = db.execute(
+                "SELECT data FROM chunks WHERE symbol_id = ? AND chunk BETWEEN ? AND ? ORDER BY chunk",
+                (int(s), origin // size, (end - 1) // size)
+            )
+            rows.append(np.concatenate([np.frombuffer(b, dtype) for (b,) in blobs])[
+                (origin - first) * 5:(end - first) * 5
+            ])
+        return np.stack(rows) if rows else np.empty((0, (end - origin) * 5), dtype)
+
+    @utils.generate_tests("""
+        raises an error if the file doesn't exist
+        raises an error if the database is not the SQLite format
+        raises an error if origin is negative
+        raises an error if end is less than origin
+        loads all the symbols correctly
+        loads only the specified symbols
+        loads the requested timestamps only
+        loads the requested data only
+        doesn't load data if load is false
+    """)
+    def __enter__(self) -> 'SQLite':
+        """
+        Opens the configured database, read-only, and reads the
+        configured symbols and minutes.
+        """
+        if self.origin < 0:
+            raise ValueError("origin < 0")
+        if self.end is not None and self.end <= self.origin:
+            raise ValueError("end <= origin")
+
+        self._db = sqlite3.connect(f"file:{pathname2url(self.parameters)}?mode=ro", uri=True)
+        meta = self._read_meta(self._db, self.parameters)
+        self._chunk, self._dtype = meta["chunk"], meta["dtype"]
+
+        # 1. Build list of symbols.
+        symbol_ids = np.array(
+            [s for (s,) in self._db.execute("SELECT symbol_id FROM symbols ORDER BY row")], np.int64
+        )
+        self.symbol_ids = symbol_ids[utils.resolve_subset(symbol_ids, self.symbol_subset)]
+
+        # 2. Read the requested minutes.
+        self._end = meta["minutes"] if self.end is None else min(self.end, meta["minutes"])
+        self.timestamps = self._read_timestamps(self._db, self._chunk, self.origin, self._end)
+        if self.load:
+            self.data = self._read_chunks(
+                self._db, self.symbol_ids, self._chunk, self._dtype, self.origin, self._end
+            )
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Closes the database.
+
+        :param exc_type:
+        :param exc_val:
+        :param exc_tb:
+        :return:
+
+        """
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    @utils.generate_tests("returns the correct symbol ids")
+    def get_symbol_ids(self) -> np.ndarray:
+        """
+        Returns the list of symbols currently available in the data
+        source. If a subset was selected, this will be the intersection
+        of symbols available and the requested subset. Additional
+        symbols may be loaded for internal use if required.
+
+        :return:    The list of available symbols (as ids).
+        :rtype:     numpy.ndarray[numpy.int64]
+
+        """
+        return self.symbol_ids
+
+    @utils.generate_tests("returns the correct count of minutes")
+    def get_minutes(self) -> int:
+        """
+        Get how many minutes are available in this data source. This may
+        vary depending on loading conditions.
+
+        :returns:   Number of minutes.
+        :rtype:     int
+
+        """
+        return self.timestamps.shape[0]
+
+    @utils.generate_tests("""
+        raises an error if origin is negative
+        raises an error if end is less than origin
+        returns expected data for all symbols
+        returns expected data for specified symbols
+        reads from the database if not loaded
+    """)
+    def get_partial_data(
+            self,
+            origin: int,
+            end: int
+    ) -> (np.ndarray, np.ndarray):
+        """
+        Retrieve a block of data [origin, end) from the source. If the
+        data wasn't loaded, it is read from the database with one range
+        query per symbol.
+
+        :param origin:  The first minute to get. Note this is an index
+                        value, with 0 being the start of the available
+                        data.
+        :type origin:   int
+
+        :param end:     Get up to this minute.
+        :type end:      int
+
+        :returns:       | Two arrays:
+                        | 1. Per-minute timestamps.
+                        | 2. Per-symbol, per-minute exchange rate data.
+        :rtype:         tuple(numpy.ndarray, numpy.ndarray)
+
+        """
+        if origin < 0:
+            raise ValueError("origin < 0")
+        if end <= origin:
+            raise ValueError("end <= origin")
+
+        if self.data is None:
+            end = min(end, self._end)
+            return (
+                self._read_timestamps(self._db, self._chunk, origin, end),
+                self._read_chunks(self._db, self.symbol_ids, self._chunk, self._dtype, origin, end)
+            )
+        origin, end = origin - self.origin, end - self.origin
+        return self.timestamps[origin:end], self.data[:, origin * 5: end * 5]
@@ -0,0 +1,271 @@
+#   hokohoko/standard/_SharedMemory.py
+#
+#   Copyright 2020 Neil Bradley
+#
+#   This file is part of Hokohoko.
+#
+#   Hokohoko is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   Hokohoko is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY# without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with Hokohoko.  If not, see <https://www.gnu.org/licenses/>.
+#
+#   ====================================================================
+#
+#   This file contains a Data source that attaches to data already
+#   loaded into shared memory by the parent process.
+#
+
+import multiprocessing as mp
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko.entities import Data
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8.
+    shared_memory = None
+
+
+class SharedMemory(Data):
+    """
+    Attaches to data published into ``multiprocessing.shared_memory``
+    by ``SharedMemory.publish``. Hokohoko does this itself with
+    ``--shared-memory``: the parent loads the data once, and every
+    Period's data is then a read-only view onto the shared block, with
+    no copies, so each process needs little more RAM than its Predictor.
+
+    Requires Python 3.8 or later.
+    """
+
+    #: Byte alignment of each array in the block.
+    ALIGNMENT = 64
+
+    def __init__(
+            self,
+            parameters: str,
+            symbol_subset: Optional[Iterable[str]] = None,
+            origin: int = 0,
+            end: Optional[int] = None,
+            lock: Optional[mp.Lock] = None,
+            load: bool = True
+    ) -> None:
+        """
+        :param parameters:      The description of the shared block,
+                                from ``SharedMemory.publish``.
+        :type parameters:       str
+
+        :param symbol_subset:   A comma-separated string of specific
+                                symbols to attach to. Unknown symbols
+                                are ignored. If the symbols are not
+                                consecutive rows of the block, their
+                                data is copied.
+        :type symbol_subset:    str
+
+        Other arguments are internal to Hokohoko.
+
+        **Parameters Arguments:**
+
+            .. code-block:: Text
+
+                name symbols minutes origin timestamp_dtype data_dtype
+
+                    name            The name of the shared block.
+
+                    symbols         How many symbols are in the block.
+
+                    minutes         How many minutes are in the block.
+
+                    origin          The minute of the source the block
+                                    starts at.
+
+                    timestamp_dtype The type of the timestamps.
+
+                    data_dtype      The type of the exchange rate data.
+
+        """
+        super().__init__(parameters, symbol_subset, origin, end, lock, load)
+        self._block = None
+
+    @staticmethod
+    @utils.generate_tests("""
+        raises an error before Python 3.8
+        raises an error if the source is not loaded
+        copies the symbols, timestamps and data into the block
+        returns parameters that attach to the block
+    """)
+    def publish(source: Data) -> Tuple['shared_memory.SharedMemory', str]:
+        """
+        Copies an entered, loaded, data source into a new shared block.
+        The caller owns the block, and must ``close`` and ``unlink`` it
+        once every process is finished with it.
+
+        :param source:  The data source to share.
+        :type source:   hokohoko.entities.Data
+
+        :returns:       The shared block, and the parameters with which
+                        to attach a SharedMemory data source to it.
+        :rtype:         Tuple[multiprocessing.shared_memory.SharedMemory, str]
+        """
+        if shared_memory is None:
+            raise RuntimeError("Shared memory requires Python 3.8 or later.")
+        if source.data is None:
+            raise ValueError("Only loaded data can be shared.")
+
+        symbol_ids, timestamps, data = source.get_symbol_ids(), source.timestamps, source.data
+        offsets = SharedMemory._offsets(len(symbol_ids), len(timestamps), timestamps.dtype, data.dtype)
+        block = shared_memory.SharedMemory(create=True, size=offsets[-1])
+        for array, offset in zip((symbol_ids, timestamps, data), offsets):
+            np.ndarray(array.shape, array.dtype, block.buf, offset)[...] = array
+
+        parameters = (f"{block.name} {len(symbol_ids)} {len(timestamps)} {source.origin} "
+                      f"{timestamps.dtype.str} {data.dtype.str}")
+        return block, parameters
+
+    @staticmethod
+    def _offsets(symbols: int, minutes: int, timestamp_dtype, data_dtype) -> Tuple[int, int, int, int]:
+        """
+        Lays out the symbol ids, timestamps and data in the block.
+
+        :returns:   The offset of each array, and the size of the block.
+        """
+        def _align(offset):
+            return -(-offset // SharedMemory.ALIGNMENT) * SharedMemory.ALIGNMENT
+
+        timestamps = _align(symbols * np.dtype(np.int64).itemsize)
+        data = _align(timestamps + minutes * np.dtype(timestamp_dtype).itemsize)
+        return 0, timestamps, data, max(1, data + symbols * minutes * 5 * np.dtype(data_dtype).itemsize)
+
+    @utils.generate_tests("""
+        raises an error if the block doesn't exist
+        raises an error if origin is before the block
+        raises an error if end is less than origin
+        attaches to all the symbols
+        attaches to only the specified symbols
+        doesn't copy consecutive symbols
+        attaches to the requested timestamps only
+        attaches to the requested data only
+        the data is read-only
+    """)
+    def __enter__(self) -> 'SharedMemory':
+        """
+        Attaches to the shared block, and views the configured symbols
+        and minutes.
+        """
+        name, symbols, minutes, block_origin, timestamp_dtype, data_dtype = self.parameters.split()
+        symbols, minutes, block_origin = int(symbols), int(minutes), int(block_origin)
+        if self.origin < block_origin:
+            raise ValueError("origin is before the shared data")
+        if self.end is not None and self.end <= self.origin:
+            raise ValueError("end <= origin")
+
+        self._block = shared_memory.SharedMemory(name=name)
+        offsets = self._offsets(symbols, minutes, timestamp_dtype, data_dtype)
+        symbol_ids = np.ndarray((symbols,), np.int64, self._block.buf, offsets[0])
+        timestamps = np.ndarray((minutes,), timestamp_dtype, self._block.buf, offsets[1])
+        data = np.ndarray((symbols, minutes * 5), data_dtype, self._block.buf, offsets[2])
+        for array in (symbol_ids, timestamps, data):
+            array.flags.writeable = False
+
+        # 1. Select the symbols, as a slice of rows if possible.
+        rows = utils.resolve_subset(symbol_ids, self.symbol_subset)
+        if len(rows) > 0 and rows[-1] - rows[0] + 1 == len(rows):
+            rows = slice(rows[0], rows[-1] + 1)
+        self.symbol_ids = symbol_ids[rows]
+
+        # 2. Select the minutes.
+        start = self.origin - block_origin
+        stop = minutes if self.end is None else self.end - block_origin
+        self.timestamps = timestamps[start:stop]
+        if self.load:
+            self.data = data[rows, start * 5:stop * 5]
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Detaches from the shared block. The views are dropped first, as
+        the block can't be closed while they exist.
+
+        :param exc_type:
+        :param exc_val:
+        :param exc_tb:
+        :return:
+
+        """
+        self.symbol_ids = None
+        self.timestamps = None
+        self.data = None
+        self.range_index = None
+        if self._block is not None:
+            self._block.close()
+            self._block = None
+
+    @utils.generate_tests("returns the correct symbol ids")
+    def get_symbol_ids(self) -> np.ndarray:
+        """
+        Returns the list of symbols attached to.
+
+        :return:    The list of available symbols (as ids).
+        :rtype:     numpy.ndarray[numpy.int64]
+
+        """
+        return self.symbol_ids
+
+    @utils.generate_tests("returns the correct count of minutes")
+    def get_minutes(self) -> int:
+        """
+        Get how many minutes are attached to.
+
+        :returns:   Number of minutes.
+        :rtype:     int
+
+        """
+        return self.timestamps.shape[0]
+
+    @utils.generate_tests("""
+        raises an error if origin is negative
+        raises an error if end is less than origin
+        returns views, not copies
+        returns expected data for all symbols
+        returns expected data for specified symbols
+    """)
+    def get_partial_data(
+            self,
+            origin: int,
+            end: int
+    ) -> (np.ndarray, np.ndarray):
+        """
+        Retrieve a block of data [origin, end) from the shared block.
+
+        :param origin:  The first minute to get. Note this is an index
+                        value, with 0 being the start of the available
+                        data.
+        :type origin:   int
+
+        :param end:     Get up to this minute.
+        :type end:      int
+
+        :returns:       | Two arrays:
+                        | 1. Per-minute timestamps.
+                        | 2. Per-symbol, per-minute exchange rate data.
+        :rtype:         tuple(numpy.ndarray, numpy.ndarray)
+
+        """
+        if origin < 0:
+            raise ValueError("origin < 0")
+        if end <= origin:
+            raise ValueError("end <= origin")
+
+        origin, end = origin - self.origin, end - self.origin
+        return self.timestamps[origin:end], self.data[:, origin * 5: end * 5]
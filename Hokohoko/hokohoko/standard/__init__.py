@@ -26,9 +26,17 @@
 __all__ = [
     "DoNothing",
     "Logger",
-    "Npz"
+    "Native",
+    "Npz",
+    "Preloaded",
+    "SharedMemory",
+    "SQLite"
 ]
 
 from hokohoko.standard._DoNothing import DoNothing
 from hokohoko.standard._Logger import Logger
+from hokohoko.standard._Native import Native
 from hokohoko.standard._Npz import Npz
+from hokohoko.standard._Preloaded import Preloaded
+from hokohoko.standard._SharedMemory import SharedMemory
+from hokohoko.standard._SQLite import SQLite
@@ -28,8 +28,10 @@
 utils
 =====
 """
+from collections import deque
+from datetime import datetime, timezone
 from importlib import import_module
-from typing import Optional
+from typing import Iterable, Optional, Union
 
 import numpy as np
 
@@ -126,8 +128,11 @@ def convert_id_to_symbol(symbol_id: np.int64) -> str:
     symbols that are base currency already map to themselves
     symbols map to the correct base pair
     symbols map to the correct reversed base pair
+    symbols map to a chain of pairs if there is no direct pair
+    chains are the shortest available
     symbols that don't have a base connection map to None
     the base currency gets changed correctly
+    scales linearly with the number of symbols
 """)
 def generate_currency_map(symbol_ids: np.ndarray, base: Optional[str] = "USD") -> dict:
     """
@@ -136,9 +141,11 @@ def generate_currency_map(symbol_ids: np.ndarray, base: Optional[str] = "USD") -
     the currencies conversion to USD. If the Tuple is None, it cannot be
     used by Hokohoko, and will be ignored if requested.
 
-    .. note::
-        This assumes there is a single direct currency pair available.
-        It makes no attempt to build chains.
+    Currencies without a direct pair to USD are converted through a
+    chain of pairs, e.g. ``XXXEUR`` then ``EURUSD``. Pairs are indexed
+    by currency, and each currency's shortest chain is found once, by a
+    breadth-first search out from USD, so this is linear in the number
+    of symbols.
 
     :param symbol_ids:  The set of IDs available from the data source.
     :type symbol_ids:   numpy.ndarray<numpy.int64>
@@ -147,37 +154,139 @@ def generate_currency_map(symbol_ids: np.ndarray, base: Optional[str] = "USD") -
     :type base:         str
 
     :returns:           A dictionary mapping symbol_ids to their index,
-                        and the currency pair required to convert
-                        Account currency to the symbol's currency pair,
-                        or None if not available.
-    :rtype:             dict<numpy.int64: tuple<int, Union[numpy.int64, None]>
+                        and the chains of currency pairs required to
+                        convert the symbol's base and target currencies
+                        to the Account currency, or None if not
+                        available. Symbols that include the Account
+                        currency map to themselves.
+    :rtype:             dict<numpy.int64: tuple<int, Union[tuple<numpy.int64>, None], Union[tuple<numpy.int64>, None]>
 
     """
-    base_id = convert_symbol_to_id(base)
+    base_id = int(convert_symbol_to_id(base))
+
+    # 1. Index every pair by both of its currencies.
+    pairs = {}
+    for symbol_pair in symbol_ids:
+        a, b = int(symbol_pair) >> 24, int(symbol_pair) & 0xFFFFFF
+        pairs.setdefault(a, []).append((symbol_pair, b))
+        pairs.setdefault(b, []).append((symbol_pair, a))
+
+    # 2. Walk out from the base currency, so each currency is reached
+    #    once, by its shortest chain.
+    chains = {base_id: ()}
+    queue = deque([base_id])
+    while queue:
+        currency = queue.popleft()
+        for symbol_pair, other in pairs.get(currency, ()):
+            if other not in chains:
+                chains[other] = (symbol_pair,) + chains[currency]
+                queue.append(other)
 
     results = {}
     for i, symbol_pair in enumerate(symbol_ids):
-        a = symbol_pair >> 24
-        b = symbol_pair & 0xFFFFFF
-
+        a, b = int(symbol_pair) >> 24, int(symbol_pair) & 0xFFFFFF
         if a == base_id or b == base_id:
-            # results[i] = i
-            results[symbol_pair] = (i, symbol_pair, symbol_pair)
+            results[symbol_pair] = (i, (symbol_pair,), (symbol_pair,))
         else:
-            found_base = None
-            found_target = None
-            for j, target in enumerate(symbol_ids):
-                c = target & 0xFFFFFF
-                d = target >> 24
+            results[symbol_pair] = (i, chains.get(a), chains.get(b))
 
-                if (c == a and d == base_id) or (c == base_id and d == a):
-                    found_base = target
-                if (c == b and d == base_id) or (c == base_id and d == b):
-                    found_target = target
+    return results
 
-            results[symbol_pair] = (i, found_base, found_target)
 
-    return results
+@generate_tests("""
+    re-indexes symbols to the rows of symbol_ids
+    drops symbols that are not in symbol_ids
+    maps chains to None if any of their pairs are not in symbol_ids
+""")
+def subset_currency_map(currency_map: dict, symbol_ids: np.ndarray) -> dict:
+    """
+    Re-indexes a map from ``generate_currency_map`` to the rows of a
+    subset of its symbols, e.g. those a Period loaded, so the map need
+    only be generated once.
+
+    :param currency_map:    The map for all available symbols.
+    :type currency_map:     dict
+
+    :param symbol_ids:      The symbols to re-index the map to.
+    :type symbol_ids:       numpy.ndarray<numpy.int64>
+
+    :returns:               The map, in the same form as
+                            ``generate_currency_map``.
+    :rtype:                 dict
+    """
+    rows = {int(s): i for i, s in enumerate(symbol_ids)}
+
+    def _chain(chain):
+        if chain is None or any(int(s) not in rows for s in chain):
+            return None
+        return chain
+
+    return {
+        symbol_pair: (rows[int(symbol_pair)], _chain(base_chain), _chain(target_chain))
+        for symbol_pair, (_, base_chain, target_chain) in currency_map.items()
+        if int(symbol_pair) in rows
+    }
+
+
+@generate_tests("""
+    returns every row if there is no subset
+    returns the rows of the subset, in the order of symbol_ids
+    accepts a comma-separated string or a list of symbols
+    ignores symbols that are not in symbol_ids
+    only matches whole symbols
+""")
+def resolve_subset(
+        symbol_ids: np.ndarray,
+        symbol_subset: Union[None, str, Iterable[str]]
+) -> np.ndarray:
+    """
+    Finds which rows of ``symbol_ids`` a Data source's ``symbol_subset``
+    selects. Symbols are matched whole, as ids, so ``USD`` matches no
+    pairs.
+
+    :param symbol_ids:      The symbols available, as ids.
+    :type symbol_ids:       numpy.ndarray<numpy.int64>
+
+    :param symbol_subset:   The requested symbols, as a comma-separated
+                            string or list, or ``None`` for all of them.
+    :type symbol_subset:    Union[None, str, Iterable[str]]
+
+    :returns:               The selected rows, in order.
+    :rtype:                 numpy.ndarray<numpy.int64>
+    """
+    if symbol_subset is None:
+        return np.arange(len(symbol_ids))
+    if isinstance(symbol_subset, str):
+        symbol_subset = symbol_subset.split(",")
+    requested = np.array([convert_symbol_to_id(s.strip()) for s in symbol_subset if s.strip()], np.int64)
+    return np.flatnonzero(np.isin(symbol_ids, requested))
+
+
+@generate_tests("""
+    accepts UTC seconds
+    accepts ISO 8601 dates and times
+    treats dates and times without a timezone as UTC
+    raises an error if the value is neither
+""")
+def parse_timestamp(value: str) -> float:
+    """
+    Parses a timestamp, given either as UTC seconds or as an ISO 8601
+    date and time, e.g. ``2015-06-01`` or ``2015-06-01T12:00+12:00``.
+
+    :param value:   The timestamp.
+    :type value:    str
+
+    :returns:       The timestamp in UTC seconds.
+    :rtype:         float
+    """
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
 
 
 def split_class_options(class_options: str):
@@ -0,0 +1,43 @@
+# Generated by generate_tests (from the Hokohoko project).
+import unittest as ut
+
+import numpy as np
+
+from hokohoko.entities import Account
+
+class TestAccount(ut.TestCase):
+    def test_allocate_reserves_room_for_the_requested_number_of_minutes(self):
+        """Auto-generated from _Account.py:95"""
+        account = Account()
+        account.allocate(100)
+        for series in (account.balance, account.equity):
+            self.assertGreaterEqual(len(series._values), 101)
+            self.assertEqual(len(series), 1)
+
+    def test_allocate_keeps_the_current_balance_and_equity(self):
+        """Auto-generated from _Account.py:95"""
+        account = Account()
+        account.balance.append(3.0)
+        account.equity.append(4.5)
+        account.allocate(10)
+        self.assertEqual(list(account.balance), [3.0])
+        self.assertEqual(list(account.equity), [4.5])
+
+    def test_allocate_stores_samples_as_the_requested_dtype(self):
+        """Auto-generated from _Account.py:95"""
+        account = Account()
+        account.allocate(10, np.float32)
+        self.assertEqual(account.balance.values.dtype, np.float32)
+        self.assertEqual(account.equity.values.dtype, np.float32)
+
+    def test_allocate_only_stores_every_strideth_minute(self):
+        """Auto-generated from _Account.py:95"""
+        account = Account()
+        account.allocate(10, stride=5)
+        account.balance.extend(np.arange(1.0, 11.0))
+        self.assertEqual(list(account.balance), [0.0, 5.0, 10.0])
+        self.assertEqual(account.equity.stride, 5)
+
+
+if __name__ == '__main__':
+    ut.main()
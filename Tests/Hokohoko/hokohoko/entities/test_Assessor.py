@@ -1,11 +1,84 @@
 # Generated by generate_tests (from the Hokohoko project).
 import unittest as ut
 
+from hokohoko.entities import Assessor
+
+
+class _Analyser(Assessor):
+    def __init__(self):
+        super().__init__("--option")
+        self.analysed = None
+
+    def analyse(self, data):
+        self.analysed = [result.get() for result in data]
+
+
+class _Consumer(Assessor):
+    def __init__(self):
+        super().__init__()
+        self.consumed = []
+        self.finalized = False
+
+    def consume(self, period_id, account):
+        self.consumed.append((period_id, account))
+
+    def finalize(self):
+        self.finalized = True
+
+
+class _Result:
+    def __init__(self, value):
+        self._value = value
+
+    def get(self):
+        return self._value
+
 
 class TestAssessor(ut.TestCase):
     def test_init_should_set_internal_parameters(self):
         """Auto-generated from _Assessor.py:40"""
-        self.fail('TODO: Implement me!')
+        self.assertEqual(_Analyser().parameters, "--option")
+        self.assertIsNone(Assessor().parameters)
+
+    def test_consume_keeps_the_result_for_analyse_if_only_analyse_is_overridden(self):
+        """Auto-generated from _Assessor.py:73"""
+        assessor = _Analyser()
+        assessor.consume(1, "b")
+        assessor.consume(0, "a")
+        self.assertIsNone(assessor.analysed)
+        assessor.finalize()
+        self.assertEqual(assessor.analysed, [(0, "a"), (1, "b")])
+
+    def test_finalize_hands_every_kept_result_to_analyse(self):
+        """Auto-generated from _Assessor.py:89"""
+        assessor = _Analyser()
+        for period_id in (2, 0, 1):
+            assessor.consume(period_id, str(period_id))
+        assessor.finalize()
+        self.assertEqual(assessor.analysed, [(0, "0"), (1, "1"), (2, "2")])
+        assessor.finalize()
+        self.assertEqual(assessor.analysed, [])
+
+    def test_finalize_raises_an_error_if_neither_consume_nor_analyse_is_overridden(self):
+        """Auto-generated from _Assessor.py:89"""
+        with self.assertRaises(NotImplementedError):
+            Assessor().finalize()
+
+    def test_analyse_consumes_every_result_then_finalizes(self):
+        """Auto-generated from _Assessor.py:103"""
+        assessor = _Consumer()
+        assessor.analyse([_Result((0, "a")), _Result((1, "b"))])
+        self.assertEqual(assessor.consumed, [(0, "a"), (1, "b")])
+        self.assertTrue(assessor.finalized)
+
+    def test_finalize_does_nothing_if_only_consume_is_overridden(self):
+        """Auto-generated from _Assessor.py:89"""
+
+        class Consumer(Assessor):
+            def consume(self, period_id, account):
+                pass
+
+        Consumer().finalize()
 
 
 if __name__ == '__main__':
@@ -1,12 +1,162 @@
 # Generated by generate_tests (from the Hokohoko project).
 import unittest as ut
 
+import numpy as np
+
+from hokohoko.entities import Data, Planar, RangeIndex
+
+
+class _Memory(Data):
+    """
+    Serves random data for two symbols from memory, from origin.
+    """
+    def __enter__(self):
+        rng = np.random.default_rng(0)
+        self.symbol_ids = np.array([1, 2], np.int64)
+        self.timestamps = 60.0 * np.arange(self.origin, self.end)
+        if self.load:
+            self.data = rng.random((2, 5 * (self.end - self.origin))).astype(np.float32)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def get_partial_data(self, origin, end):
+        return (
+            self.timestamps[origin - self.origin:end - self.origin],
+            self.data[:, 5 * (origin - self.origin):5 * (end - self.origin)]
+        )
+
 
 class TestData(ut.TestCase):
     def test_init_sets_internal_values_correctly(self):
         """Auto-generated from _Data.py:44"""
         self.fail('TODO: Implement me!')
 
+    def test_build_range_index_raises_an_error_if_the_data_is_not_cached(self):
+        """Auto-generated from _Data.py:207"""
+        with _Memory(None, origin=10, end=300, load=False) as data:
+            with self.assertRaises(ValueError):
+                data.build_range_index()
+
+    def test_build_range_index_builds_a_RangeIndex_over_the_data_cache(self):
+        """Auto-generated from _Data.py:207"""
+        with _Memory(None, origin=10, end=300) as data:
+            index = data.build_range_index()
+            self.assertIsInstance(index, RangeIndex)
+            self.assertIs(data.range_index, index)
+            self.assertIs(index.data, data.data)
+
+    def test_get_range_raises_an_error_if_there_is_no_range_index(self):
+        """Auto-generated from _Data.py:227"""
+        with _Memory(None, origin=10, end=300) as data:
+            with self.assertRaises(ValueError):
+                data.get_range(10, 20)
+
+    def test_get_range_returns_the_highest_high_lowest_low_and_total_volume_per_symbol(self):
+        """Auto-generated from _Data.py:227"""
+        with _Memory(None, origin=10, end=300) as data:
+            data.build_range_index()
+            high, low, volume = data.get_range(50, 200)
+            _, values = data.get_partial_data(50, 200)
+            np.testing.assert_array_equal(high, values[:, 1::5].max(axis=1))
+            np.testing.assert_array_equal(low, values[:, 2::5].min(axis=1))
+            np.testing.assert_allclose(volume, values[:, 4::5].sum(axis=1, dtype=np.float64), rtol=1e-6)
+
+    def test_get_range_accepts_arrays_of_ranges(self):
+        """Auto-generated from _Data.py:227"""
+        with _Memory(None, origin=10, end=300) as data:
+            data.build_range_index()
+            high, low, volume = data.get_range(np.array([10, 50, 100]), np.array([20, 200, 300]))
+            self.assertEqual(high.shape, (2, 3))
+            for k, (origin, end) in enumerate(((10, 20), (50, 200), (100, 300))):
+                expected = data.get_range(origin, end)
+                np.testing.assert_array_equal(high[:, k], expected[0])
+                np.testing.assert_array_equal(low[:, k], expected[1])
+                np.testing.assert_array_equal(volume[:, k], expected[2])
+
+    def test_build_planar_raises_an_error_if_the_data_is_not_cached(self):
+        """Auto-generated from _Data.py:265"""
+        with _Memory(None, origin=10, end=300, load=False) as data:
+            with self.assertRaises(ValueError):
+                data.build_planar()
+
+    def test_build_planar_builds_every_field_by_default(self):
+        """Auto-generated from _Data.py:265"""
+        with _Memory(None, origin=10, end=300) as data:
+            planar = data.build_planar()
+            self.assertIs(data.planar, planar)
+            for k, field in enumerate(planar):
+                self.assertTrue(field.flags.c_contiguous)
+                np.testing.assert_array_equal(field, data.data[:, k::5])
+
+    def test_build_planar_builds_only_the_requested_fields(self):
+        """Auto-generated from _Data.py:265"""
+        with _Memory(None, origin=10, end=300) as data:
+            planar = data.build_planar(("low", "volume"))
+            self.assertEqual([f is None for f in planar], [True, True, False, True, False])
+            np.testing.assert_array_equal(planar.low, data.data[:, 2::5])
+            np.testing.assert_array_equal(planar.volume, data.data[:, 4::5])
+
+    def test_get_partial_planar_returns_contiguous_views_if_planar_has_been_built(self):
+        """Auto-generated from _Data.py:290"""
+        with _Memory(None, origin=10, end=300) as data:
+            planar = data.build_planar()
+            _, fields = data.get_partial_planar(50, 200)
+            for field, built in zip(fields, planar):
+                self.assertIs(field.base, built)
+                self.assertEqual(field.strides[1], field.itemsize)
+
+    def test_get_partial_planar_returns_strided_views_of_the_data_otherwise(self):
+        """Auto-generated from _Data.py:290"""
+        with _Memory(None, origin=10, end=300) as data:
+            _, fields = data.get_partial_planar(50, 200)
+            for field in fields:
+                self.assertTrue(np.shares_memory(field, data.data))
+                self.assertEqual(field.strides[1], 5 * field.itemsize)
+
+    def test_get_partial_planar_returns_strided_views_of_fields_that_werent_built(self):
+        """Auto-generated from _Data.py:290"""
+        with _Memory(None, origin=10, end=300) as data:
+            data.build_planar(("close",))
+            _, fields = data.get_partial_planar(50, 200)
+            self.assertIs(fields.close.base, data.planar.close)
+            for field in fields.open, fields.high, fields.low, fields.volume:
+                self.assertTrue(np.shares_memory(field, data.data))
+
+    def test_get_partial_planar_matches_get_partial_data(self):
+        """Auto-generated from _Data.py:290"""
+        with _Memory(None, origin=10, end=300) as data:
+            expected_timestamps, expected = data.get_partial_data(50, 200)
+            for fields in (None, ("open", "close"), Planar._fields):
+                if fields is not None:
+                    data.build_planar(fields)
+                timestamps, planar = data.get_partial_planar(50, 200)
+                np.testing.assert_array_equal(timestamps, expected_timestamps)
+                for k, field in enumerate(planar):
+                    np.testing.assert_array_equal(field, expected[:, k::5])
+
+    def test_get_minute_at_returns_the_first_minute_at_or_after_the_timestamp(self):
+        """Auto-generated from _Data.py:219"""
+        with _Memory(None, origin=10, end=300) as data:
+            self.assertEqual(data.get_minute_at(60.0 * 10), 10)
+            self.assertEqual(data.get_minute_at(60.0 * 50), 50)
+            self.assertEqual(data.get_minute_at(60.0 * 50 + 1), 51)
+            self.assertEqual(data.get_minute_at(0.0), 10)
+            self.assertIsInstance(data.get_minute_at(60.0 * 50), int)
+
+    def test_get_minute_at_returns_the_minute_past_the_end_if_the_timestamp_is_after_it(self):
+        """Auto-generated from _Data.py:219"""
+        with _Memory(None, origin=10, end=300) as data:
+            self.assertEqual(data.get_minute_at(60.0 * 299 + 1), 300)
+            self.assertEqual(data.get_minute_at(1e12), 300)
+
+    def test_get_minute_at_accepts_arrays_of_timestamps(self):
+        """Auto-generated from _Data.py:219"""
+        with _Memory(None, origin=10, end=300) as data:
+            minutes = data.get_minute_at(np.array([0.0, 60.0 * 50, 60.0 * 50 + 1, 1e12]))
+            self.assertEqual(minutes.tolist(), [10, 50, 51, 300])
+
 
 if __name__ == '__main__':
     ut.main()
@@ -0,0 +1,79 @@
+# Generated by generate_tests (from the Hokohoko project).
+import pickle
+import unittest as ut
+
+import numpy as np
+
+from hokohoko.entities import Account, Bar, Direction, Order, PackedAccount, Position, PositionBook, Status
+
+
+def _account():
+    account = Account()
+    account.symbol_ids = [np.int64(30), np.int64(10)]
+    account.balance.extend([1.0, 2.0])
+    account.equity.extend([1.5, 2.5])
+    account.orders[9] = Order(10, Direction.SELL)
+    for book, p_id, symbol_id, future_symbol_id in (
+            (account.positions, 1, 10, 10),
+            (account.history, 2, 20, 40)
+    ):
+        book[p_id] = Position(
+            Order(symbol_id, Direction.BUY, 1.1, None, 0.9),
+            Bar(future_symbol_id, 1.0, 1.25, 0.75, 1.0, 10.0, 0, 60),
+            Status.CLOSED_STOP_LOSS, 0, 60, 1.1, 0.9, 2.0, 1.0, 0.5, 0
+        )
+    return account
+
+
+def _assert_equal(test, a, b):
+    test.assertEqual(a.symbol_ids, b.symbol_ids)
+    test.assertEqual(list(a.balance), list(b.balance))
+    test.assertEqual(list(a.equity), list(b.equity))
+    test.assertEqual(a.orders, b.orders)
+    for name in ("positions", "history"):
+        x, y = getattr(a, name), getattr(b, name)
+        test.assertEqual(list(x), list(y))
+        for field, _ in PositionBook.FIELDS:
+            np.testing.assert_array_equal(x.column(field)[x.rows()], y.column(field)[y.rows()])
+
+
+class TestPackedaccount(ut.TestCase):
+    def test_pack_builds_a_table_of_every_symbol_referred_to(self):
+        """Auto-generated from _PackedAccount.py:68"""
+        packed = PackedAccount.pack(_account())
+        self.assertEqual(packed.symbol_table.tolist(), [10, 20, 30, 40])
+        self.assertEqual(packed.symbol_ids.tolist(), [2, 0])
+        self.assertEqual(packed.history["columns"]["future_symbol_id"].tolist(), [3])
+
+    def test_pack_round_trips_through_unpack(self):
+        """Auto-generated from _PackedAccount.py:68"""
+        account = _account()
+        _assert_equal(self, PackedAccount.pack(account).unpack(), account)
+
+    def test_unpack_returns_an_Account_equal_to_the_one_packed(self):
+        """Auto-generated from _PackedAccount.py:98"""
+        account = _account()
+        unpacked = pickle.loads(pickle.dumps(PackedAccount.pack(account))).unpack()
+        self.assertIsInstance(unpacked, Account)
+        _assert_equal(self, unpacked, account)
+        unpacked.history[3] = account.history[2]
+        self.assertEqual(list(unpacked.history), [2, 3])
+
+    def test_unpack_unpacks_the_Positions_only_when_they_are_first_read(self):
+        """Auto-generated from _PackedAccount.py:98"""
+        unpacked = PackedAccount.pack(_account()).unpack()
+        self.assertEqual(unpacked._books, {})
+        self.assertEqual(unpacked.equity[-1], 2.5)
+        self.assertEqual(unpacked._books, {})
+        history = unpacked.history
+        self.assertIs(unpacked.history, history)
+        self.assertEqual(list(unpacked._books), ["history"])
+
+    def test_nbytes_is_the_size_of_the_pickled_PackedAccount(self):
+        """Auto-generated from _PackedAccount.py:113"""
+        packed = PackedAccount.pack(_account())
+        self.assertEqual(packed.nbytes, len(pickle.dumps(packed)))
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,70 @@
+# Generated by generate_tests (from the Hokohoko project).
+import unittest as ut
+
+import numpy as np
+
+from hokohoko.entities import Planar
+
+
+def _data(symbols=3, minutes=20):
+    """
+    Interleaved data where each value encodes its symbol, minute and
+    field, as 1000 * symbol + 10 * minute + field.
+    """
+    s, m, k = np.meshgrid(np.arange(symbols), np.arange(minutes), np.arange(5), indexing="ij")
+    return (1000 * s + 10 * m + k).reshape(symbols, 5 * minutes).astype(np.float32)
+
+
+class TestPlanar(ut.TestCase):
+    def test_from_interleaved_raises_an_error_if_data_is_not_interleaved_OHLCV(self):
+        """Auto-generated from _Planar.py:57"""
+        with self.assertRaises(ValueError):
+            Planar.from_interleaved(np.zeros((2, 12), np.float32))
+        with self.assertRaises(ValueError):
+            Planar.from_interleaved(np.zeros(10, np.float32))
+
+    def test_from_interleaved_copies_every_field_by_default(self):
+        """Auto-generated from _Planar.py:57"""
+        data = _data()
+        planar = Planar.from_interleaved(data)
+        for k, field in enumerate(planar):
+            np.testing.assert_array_equal(field, data[:, k::5])
+            self.assertTrue(field.flags.c_contiguous)
+            self.assertFalse(np.shares_memory(field, data))
+
+    def test_from_interleaved_copies_only_the_requested_fields(self):
+        """Auto-generated from _Planar.py:57"""
+        data = _data()
+        planar = Planar.from_interleaved(data, ("high", "close"))
+        self.assertIsNone(planar.open)
+        self.assertIsNone(planar.low)
+        self.assertIsNone(planar.volume)
+        np.testing.assert_array_equal(planar.high, data[:, 1::5])
+        np.testing.assert_array_equal(planar.close, data[:, 3::5])
+
+    def test_from_interleaved_returns_strided_views_if_not_copying(self):
+        """Auto-generated from _Planar.py:57"""
+        data = _data()
+        planar = Planar.from_interleaved(data, copy=False)
+        for k, field in enumerate(planar):
+            np.testing.assert_array_equal(field, data[:, k::5])
+            self.assertIs(field.base, data)
+
+    def test_slice_returns_views_of_every_field(self):
+        """Auto-generated from _Planar.py:96"""
+        data = _data()
+        planar = Planar.from_interleaved(data).slice(5, 12)
+        for k, field in enumerate(planar):
+            self.assertEqual(field.shape, (3, 7))
+            np.testing.assert_array_equal(field, data[:, 5 * 5 + k:12 * 5:5])
+            self.assertIsNotNone(field.base)
+
+    def test_slice_leaves_missing_fields_as_None(self):
+        """Auto-generated from _Planar.py:96"""
+        planar = Planar.from_interleaved(_data(), ("open",)).slice(5, 12)
+        self.assertEqual(planar.open.shape, (3, 7))
+        self.assertEqual(planar[1:], (None,) * 4)
+
+
+if __name__ == '__main__':
+    ut.main()
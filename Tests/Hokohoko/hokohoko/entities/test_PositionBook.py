@@ -0,0 +1,178 @@
+# Generated by generate_tests (from the Hokohoko project).
+import pickle
+import unittest as ut
+
+import numpy as np
+
+from hokohoko.entities import Account, Bar, Direction, Order, PackedAccount, Position, PositionBook, Status
+
+
+def _position(symbol_id=1, rate=1.25, status=Status.OPEN):
+    return Position(
+        Order(symbol_id, Direction.BUY, None, rate + 0.5, rate - 0.5),
+        Bar(symbol_id, rate, rate + 1, rate - 1, rate, 100.0, 60.0, 120.0),
+        status, 60, 0, rate, 0.0, 2.0, 1.0, 2.5
+    )
+
+
+def _assert_same(test, a, b):
+    test.assertEqual(tuple(a.order), tuple(b.order))
+    test.assertEqual(tuple(a.future), tuple(b.future))
+    test.assertEqual(a.status, b.status)
+    for name in ("open_time", "close_time", "open_rate", "close_rate",
+                 "held_value", "initial_value", "final_value"):
+        test.assertEqual(getattr(a, name), getattr(b, name), name)
+
+
+class TestPositionbook(ut.TestCase):
+    def test_init_starts_empty(self):
+        """Auto-generated from _PositionBook.py:85"""
+        book = PositionBook()
+        self.assertEqual(len(book), 0)
+        self.assertEqual(list(book), [])
+        self.assertEqual(len(book.rows()), 0)
+
+    def test_init_accepts_a_dict_of_Positions(self):
+        """Auto-generated from _PositionBook.py:85"""
+        positions = {3: _position(1), 5: _position(2)}
+        book = PositionBook(positions)
+        self.assertEqual(list(book), [3, 5])
+        for p_id, position in positions.items():
+            _assert_same(self, book[p_id], position)
+
+    def test_setitem_appends_a_new_Position(self):
+        """Auto-generated from _PositionBook.py:124"""
+        book = PositionBook()
+        book[7] = _position(rate=2.0)
+        self.assertIn(7, book)
+        _assert_same(self, book[7], _position(rate=2.0))
+        self.assertEqual(book.column("open_rate")[book.rows()].tolist(), [2.0])
+
+    def test_setitem_overwrites_an_existing_Position_in_place(self):
+        """Auto-generated from _PositionBook.py:124"""
+        book = PositionBook({1: _position(rate=1.0), 2: _position(rate=2.0)})
+        book[1] = _position(rate=3.0)
+        self.assertEqual(list(book), [1, 2])
+        self.assertEqual(len(book.ids()), 2)
+        _assert_same(self, book[1], _position(rate=3.0))
+
+    def test_setitem_grows_the_columns_when_full(self):
+        """Auto-generated from _PositionBook.py:124"""
+        book = PositionBook()
+        count = PositionBook._INITIAL_CAPACITY + 1
+        for p_id in range(count):
+            book[p_id] = _position(rate=float(p_id))
+        self.assertEqual(len(book), count)
+        self.assertEqual(book.column("open_rate")[book.rows()].tolist(), [float(p) for p in range(count)])
+
+    def test_delitem_removes_the_Position(self):
+        """Auto-generated from _PositionBook.py:161"""
+        book = PositionBook({1: _position(), 2: _position()})
+        del book[1]
+        self.assertNotIn(1, book)
+        self.assertEqual(list(book), [2])
+        with self.assertRaises(KeyError):
+            book[1]
+
+    def test_delitem_detaches_any_outstanding_view(self):
+        """Auto-generated from _PositionBook.py:161"""
+        book = PositionBook({1: _position(rate=1.0)})
+        view = book[1]
+        del book[1]
+        book[2] = _position(rate=9.0)
+        _assert_same(self, view, _position(rate=1.0))
+        view.status = Status.CLOSED
+        self.assertEqual(view.status, Status.CLOSED)
+        self.assertEqual(book[2].status, Status.OPEN)
+
+    def test_delitem_compacts_the_columns_once_half_the_rows_are_dead(self):
+        """Auto-generated from _PositionBook.py:161"""
+        count = 4 * PositionBook._INITIAL_CAPACITY
+        book = PositionBook({p_id: _position(rate=float(p_id)) for p_id in range(count)})
+        kept = book[count - 1]
+        for p_id in range(count // 2 + 1):
+            del book[p_id]
+        self.assertEqual(len(book.ids()), len(book))
+        self.assertEqual(book.rows().tolist(), list(range(len(book))))
+        self.assertEqual(kept.open_rate, float(count - 1))
+        kept.open_rate = -1.0
+        self.assertEqual(book.column("open_rate")[book.rows()][-1], -1.0)
+
+    def test_rows_returns_the_live_rows_in_insertion_order(self):
+        """Auto-generated from _PositionBook.py:205"""
+        book = PositionBook({p_id: _position() for p_id in (4, 2, 9)})
+        del book[2]
+        rows = book.rows()
+        self.assertEqual(rows.tolist(), [0, 2])
+        self.assertEqual(book.ids()[rows].tolist(), [4, 9])
+
+    def test_move_moves_the_rows_into_the_target_book(self):
+        """Auto-generated from _PositionBook.py:236"""
+        source = PositionBook({1: _position(rate=1.0), 2: _position(rate=2.0)})
+        target = PositionBook({1: _position(rate=7.0)})
+        source.move([1], target)
+        self.assertEqual(list(source), [2])
+        self.assertEqual(list(target), [1])
+        _assert_same(self, target[1], _position(rate=1.0))
+
+    def test_move_keeps_the_order_given(self):
+        """Auto-generated from _PositionBook.py:236"""
+        source = PositionBook({p_id: _position(rate=float(p_id)) for p_id in range(5)})
+        target = PositionBook()
+        source.move([3, 0, 4], target)
+        self.assertEqual(list(target), [3, 0, 4])
+        self.assertEqual(target.column("open_rate")[target.rows()].tolist(), [3.0, 0.0, 4.0])
+
+    def test_pack_stores_symbol_ids_as_indices_into_the_symbol_table(self):
+        """Auto-generated from _PositionBook.py:344"""
+        book = PositionBook({1: _position(symbol_id=40), 2: _position(symbol_id=10)})
+        packed = book.pack(np.array([10, 40], np.int64))
+        self.assertEqual(packed["columns"]["symbol_id"].tolist(), [1, 0])
+        self.assertEqual(packed["columns"]["symbol_id"].dtype, np.uint8)
+
+    def test_pack_narrows_float_columns_that_float32_holds_exactly(self):
+        """Auto-generated from _PositionBook.py:344"""
+        book = PositionBook({1: _position(rate=1.25)})
+        packed = book.pack(np.array([1], np.int64))
+        self.assertEqual(packed["columns"]["open_rate"].dtype, np.float32)
+        self.assertEqual(packed["columns"]["take_profit"].dtype, np.float32)
+
+    def test_pack_keeps_float_columns_that_float32_doesnt_hold_exactly(self):
+        """Auto-generated from _PositionBook.py:344"""
+        book = PositionBook({1: _position(rate=1.1)})
+        packed = book.pack(np.array([1], np.int64))
+        self.assertEqual(packed["columns"]["open_rate"].dtype, np.float64)
+
+    def test_pack_round_trips_through_unpack(self):
+        """Auto-generated from _PositionBook.py:344"""
+        table = np.array([1, 2], np.int64)
+        positions = {1: _position(1, 1.1), 2: _position(2, 1.25, Status.CLOSED_TAKE_PROFIT)}
+        book = PositionBook.unpack(PositionBook(positions).pack(table), table)
+        self.assertEqual(list(book), [1, 2])
+        for p_id, position in positions.items():
+            _assert_same(self, book[p_id], position)
+
+    def test_setitem_grows_an_unpickled_empty_book(self):
+        """Auto-generated from _PositionBook.py:127"""
+        books = (
+            pickle.loads(pickle.dumps(PositionBook())),
+            PackedAccount.pack(Account()).unpack().history
+        )
+        for book in books:
+            for p_id in range(3):
+                book[p_id] = _position(rate=float(p_id))
+            self.assertEqual(list(book), [0, 1, 2])
+            _assert_same(self, book[2], _position(rate=2.0))
+
+    def test_setitem_detaches_the_view_of_an_overwritten_Position(self):
+        """Auto-generated from _PositionBook.py:127"""
+        book = PositionBook({1: _position(rate=1.0)})
+        view = book[1]
+        book[1] = _position(rate=3.0)
+        _assert_same(self, view, _position(rate=1.0))
+        self.assertIsNot(book[1], view)
+        _assert_same(self, book[1], _position(rate=3.0))
+
+
+if __name__ == '__main__':
+    ut.main()
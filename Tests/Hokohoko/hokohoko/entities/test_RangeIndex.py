@@ -0,0 +1,99 @@
+# Generated by generate_tests (from the Hokohoko project).
+import unittest as ut
+
+import numpy as np
+
+from hokohoko.entities import RangeIndex
+
+
+def _data(minutes, symbols=3):
+    return np.random.default_rng(minutes).random((symbols, 5 * minutes)).astype(np.float32)
+
+
+def _expected(data, start, end):
+    """
+    The highs, lows and volumes over [start, end), reduced directly.
+    """
+    window = data[:, 5 * start:5 * end]
+    return window[:, 1::5].max(axis=1), window[:, 2::5].min(axis=1), window[:, 4::5].sum(axis=1, dtype=np.float64)
+
+
+class TestRangeindex(ut.TestCase):
+    def test_init_raises_an_error_if_data_is_not_interleaved_OHLCV(self):
+        """Auto-generated from _RangeIndex.py:51"""
+        with self.assertRaises(ValueError):
+            RangeIndex(np.zeros((2, 12), np.float32))
+        with self.assertRaises(ValueError):
+            RangeIndex(np.zeros(10, np.float32))
+
+    def test_init_builds_a_sparse_table_level_for_every_power_of_two_blocks(self):
+        """Auto-generated from _RangeIndex.py:51"""
+        index = RangeIndex(_data(9 * RangeIndex.BLOCK))
+        self.assertEqual([level.shape[1] for level in index.high_table], [9, 8, 6, 2])
+        self.assertEqual([level.shape[1] for level in index.low_table], [9, 8, 6, 2])
+
+    def test_init_handles_a_partial_last_block(self):
+        """Auto-generated from _RangeIndex.py:51"""
+        minutes = 2 * RangeIndex.BLOCK + 5
+        data = _data(minutes)
+        index = RangeIndex(data)
+        self.assertEqual(index.minutes, minutes)
+        self.assertEqual(index.high_table[0].shape[1], 3)
+        for start in (0, RangeIndex.BLOCK + 3, minutes - 3):
+            for a, b in zip(index.query(start, minutes), _expected(data, start, minutes)):
+                np.testing.assert_allclose(a, b, rtol=1e-6)
+
+    def test_query_matches_numpy_max_min_and_sum_for_every_range(self):
+        """Auto-generated from _RangeIndex.py:99"""
+        minutes = 3 * RangeIndex.BLOCK + 7
+        data = _data(minutes, 2)
+        index = RangeIndex(data)
+        for start in range(0, minutes, 5):
+            for end in range(start + 1, minutes + 1, 3):
+                for a, b in zip(index.query(start, end), _expected(data, start, end)):
+                    np.testing.assert_allclose(a, b, rtol=1e-6)
+
+    def test_query_accepts_single_minutes(self):
+        """Auto-generated from _RangeIndex.py:99"""
+        data = _data(RangeIndex.BLOCK + 10)
+        index = RangeIndex(data)
+        for minute in (0, RangeIndex.BLOCK - 1, RangeIndex.BLOCK, RangeIndex.BLOCK + 9):
+            high, low, volume = index.query(minute, minute + 1)
+            np.testing.assert_array_equal(high, data[:, 5 * minute + 1])
+            np.testing.assert_array_equal(low, data[:, 5 * minute + 2])
+            np.testing.assert_allclose(volume, data[:, 5 * minute + 4], rtol=1e-6)
+
+    def test_query_accepts_ranges_within_a_single_block(self):
+        """Auto-generated from _RangeIndex.py:99"""
+        data = _data(2 * RangeIndex.BLOCK)
+        index = RangeIndex(data)
+        for start, end in ((1, 10), (RangeIndex.BLOCK + 2, 2 * RangeIndex.BLOCK - 1)):
+            for a, b in zip(index.query(start, end), _expected(data, start, end)):
+                np.testing.assert_allclose(a, b, rtol=1e-6)
+
+    def test_query_accepts_ranges_spanning_many_blocks(self):
+        """Auto-generated from _RangeIndex.py:99"""
+        minutes = 20 * RangeIndex.BLOCK
+        data = _data(minutes)
+        index = RangeIndex(data)
+        for start, end in ((3, minutes - 3), (RangeIndex.BLOCK - 1, 13 * RangeIndex.BLOCK + 1), (0, minutes)):
+            for a, b in zip(index.query(start, end), _expected(data, start, end)):
+                np.testing.assert_allclose(a, b, rtol=1e-6)
+
+    def test_query_accepts_arrays_of_ranges(self):
+        """Auto-generated from _RangeIndex.py:99"""
+        minutes = 5 * RangeIndex.BLOCK
+        data = _data(minutes)
+        index = RangeIndex(data)
+        starts, ends = np.array([0, 5, 70, 100]), np.array([1, 60, 300, minutes])
+        highs, lows, volumes = index.query(starts, ends)
+        self.assertEqual(highs.shape, (3, 4))
+        for k, (start, end) in enumerate(zip(starts, ends)):
+            high, low, volume = index.query(int(start), int(end))
+            np.testing.assert_array_equal(highs[:, k], high)
+            np.testing.assert_array_equal(lows[:, k], low)
+            np.testing.assert_array_equal(volumes[:, k], volume)
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,80 @@
+# Generated by generate_tests (from the Hokohoko project).
+import unittest as ut
+
+import numpy as np
+
+from hokohoko.entities import Series
+
+class TestSeries(ut.TestCase):
+    def test_init_starts_with_the_initial_value(self):
+        """Auto-generated from _Series.py:45"""
+        series = Series(5.0)
+        self.assertEqual(list(series), [5.0])
+        self.assertEqual(series[-1], 5.0)
+        self.assertEqual(series.minutes, 0)
+
+    def test_init_reserves_room_for_the_requested_number_of_minutes(self):
+        """Auto-generated from _Series.py:45"""
+        series = Series(0.0, 10)
+        values = series._values
+        for minute in range(10):
+            series.append(float(minute))
+        self.assertIs(series._values, values)
+        self.assertEqual(len(series), 11)
+
+    def test_init_raises_an_error_if_stride_is_less_than_1(self):
+        """Auto-generated from _Series.py:45"""
+        with self.assertRaises(ValueError):
+            Series(0.0, 10, stride=0)
+
+    def test_append_updates_the_current_value(self):
+        """Auto-generated from _Series.py:81"""
+        series = Series(0.0, 10, stride=3)
+        series.append(2.5)
+        self.assertEqual(series[-1], 2.5)
+        self.assertEqual(series.minutes, 1)
+
+    def test_append_only_stores_every_strideth_minute(self):
+        """Auto-generated from _Series.py:81"""
+        series = Series(0.0, 10, stride=3)
+        for minute in range(1, 8):
+            series.append(float(minute))
+        self.assertEqual(list(series), [0.0, 3.0, 6.0])
+        self.assertEqual(series[-1], 7.0)
+
+    def test_append_grows_when_full(self):
+        """Auto-generated from _Series.py:81"""
+        series = Series(0.0, 2)
+        for minute in range(1, 11):
+            series.append(float(minute))
+        self.assertEqual(list(series), [float(m) for m in range(11)])
+
+    def test_extend_matches_appending_each_value_in_turn(self):
+        """Auto-generated from _Series.py:102"""
+        values = np.arange(1, 24, dtype=np.float64)
+        for stride in (1, 2, 5):
+            appended = Series(0.0, 8, stride=stride)
+            extended = Series(0.0, 8, stride=stride)
+            for value in values[:3]:
+                appended.append(value)
+                extended.append(value)
+            for value in values[3:]:
+                appended.append(value)
+            extended.extend(values[3:10])
+            extended.extend(values[10:])
+            np.testing.assert_array_equal(appended.values, extended.values)
+            self.assertEqual(appended[-1], extended[-1])
+            self.assertEqual(appended.minutes, extended.minutes)
+
+    def test_extend_does_nothing_for_an_empty_sequence(self):
+        """Auto-generated from _Series.py:102"""
+        series = Series(1.0, 4)
+        series.append(2.0)
+        series.extend([])
+        self.assertEqual(list(series), [1.0, 2.0])
+        self.assertEqual(series[-1], 2.0)
+        self.assertEqual(series.minutes, 1)
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,303 @@
+# Generated by generate_tests (from the Hokohoko project).
+import json
+import os
+import tempfile
+import unittest as ut
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko.entities import Planar
+from hokohoko.convert import convert_npz
+from hokohoko.standard import Native, Npz
+
+_SYMBOLS = ("EURUSD", "GBPUSD", "USDJPY", "EURGBP")
+
+
+def _write_data(filename, minutes=300, decimals=None):
+    """
+    Writes random data for four symbols in the npz format, rounded to
+    decimals if given.
+    """
+    rng = np.random.default_rng(0)
+    data = rng.random((len(_SYMBOLS), 5 * minutes))
+    np.savez(
+        filename,
+        symbol_ids=np.array([utils.convert_symbol_to_id(s) for s in _SYMBOLS], np.int64),
+        timestamps=1577836800.0 + 60 * np.arange(minutes),
+        data=(data if decimals is None else np.round(data, decimals)).astype(np.float32)
+    )
+
+
+class TestNative(ut.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.filename = os.path.join(cls.directory.name, "data.npz")
+        cls.native = os.path.join(cls.directory.name, "native")
+        _write_data(cls.filename)
+        convert_npz(cls.filename, cls.native)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def assertSameAsNpz(self, symbol_subset=None, origin=0, end=None):
+        """
+        Checks Native loads what Npz loads.
+        """
+        with Npz(self.filename, symbol_subset, origin, end) as expected:
+            with Native(self.native, symbol_subset, origin, end) as actual:
+                np.testing.assert_array_equal(actual.get_symbol_ids(), expected.get_symbol_ids())
+                np.testing.assert_array_equal(actual.timestamps, expected.timestamps)
+                np.testing.assert_array_equal(actual.data, expected.data)
+                self.assertEqual(actual.get_minutes(), expected.get_minutes())
+                for a, b in ((origin, origin + 1), (origin + 5, origin + 50)):
+                    for x, y in zip(actual.get_partial_data(a, b), expected.get_partial_data(a, b)):
+                        np.testing.assert_array_equal(x, y)
+
+    def test_write_raises_an_error_if_the_data_doesnt_match_the_symbols_and_timestamps(self):
+        """Auto-generated from _Native.py:108"""
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(ValueError):
+                Native.write(directory, np.array([1, 2], np.int64), np.arange(10.0), np.zeros((2, 45), np.float32))
+            with self.assertRaises(ValueError):
+                Native.write(directory, np.array([1], np.int64), np.arange(10.0), np.zeros((2, 50), np.float32))
+
+    def test_write_creates_the_directory_if_needed(self):
+        """Auto-generated from _Native.py:108"""
+        with tempfile.TemporaryDirectory() as directory:
+            target = os.path.join(directory, "a", "b")
+            Native.write(target, np.array([utils.convert_symbol_to_id("EURUSD")]), np.arange(2.0), np.ones((1, 10)))
+            self.assertTrue(os.path.isdir(target))
+
+    def test_write_writes_a_header_timestamps_and_a_file_per_symbol(self):
+        """Auto-generated from _Native.py:108"""
+        self.assertEqual(
+            sorted(os.listdir(self.native)),
+            sorted(["header.json", "timestamps.npy"] + [f"{s}.npy" for s in _SYMBOLS])
+        )
+        with open(os.path.join(self.native, "header.json")) as f:
+            header = json.load(f)
+        self.assertEqual(header["format"], Native.FORMAT)
+        self.assertEqual(header["symbols"], list(_SYMBOLS))
+        self.assertEqual(header["minutes"], 300)
+
+    def test_write_writes_data_that_Native_loads_unchanged(self):
+        """Auto-generated from _Native.py:108"""
+        self.assertSameAsNpz()
+
+    def test_enter_raises_an_error_if_the_directory_doesnt_exist(self):
+        """Auto-generated from _Native.py:153"""
+        with self.assertRaises(FileNotFoundError):
+            Native(os.path.join(self.directory.name, "missing")).__enter__()
+
+    def test_enter_raises_an_error_if_the_header_is_not_the_native_format(self):
+        """Auto-generated from _Native.py:153"""
+        with tempfile.TemporaryDirectory() as directory:
+            for header in ({"format": "other", "version": Native.VERSION}, {"format": Native.FORMAT, "version": 99}):
+                with open(os.path.join(directory, "header.json"), "w") as f:
+                    json.dump(header, f)
+                with self.assertRaises(ValueError):
+                    Native(directory).__enter__()
+
+    def test_enter_raises_an_error_if_origin_is_negative(self):
+        """Auto-generated from _Native.py:153"""
+        with self.assertRaises(ValueError):
+            Native(self.native, origin=-1).__enter__()
+
+    def test_enter_raises_an_error_if_end_is_less_than_origin(self):
+        """Auto-generated from _Native.py:153"""
+        with self.assertRaises(ValueError):
+            Native(self.native, origin=20, end=10).__enter__()
+
+    def test_enter_loads_all_the_symbols_correctly(self):
+        """Auto-generated from _Native.py:153"""
+        self.assertSameAsNpz()
+
+    def test_enter_loads_only_the_specified_symbols(self):
+        """Auto-generated from _Native.py:153"""
+        for symbol_subset in ("GBPUSD,USDJPY", "EURUSD,EURGBP", "USDJPY", "EURUSD,AUDNZD"):
+            self.assertSameAsNpz(symbol_subset)
+
+    def test_enter_loads_the_requested_timestamps_only(self):
+        """Auto-generated from _Native.py:153"""
+        with Native(self.native, origin=20, end=80) as data:
+            self.assertEqual(len(data.timestamps), 60)
+        self.assertSameAsNpz(origin=20, end=80)
+        self.assertSameAsNpz(origin=250, end=400)
+
+    def test_enter_loads_the_requested_data_only(self):
+        """Auto-generated from _Native.py:153"""
+        with Native(self.native, "USDJPY", 20, 80) as data:
+            self.assertEqual(data.data.shape, (1, 300))
+        self.assertSameAsNpz("USDJPY", 20, 80)
+
+    def test_enter_reads_only_the_header_and_timestamps_if_not_loading(self):
+        """Auto-generated from _Native.py:153"""
+        with tempfile.TemporaryDirectory() as directory:
+            convert_npz(self.filename, directory)
+            for s in _SYMBOLS:
+                os.remove(os.path.join(directory, f"{s}.npy"))
+            with Native(directory, load=False) as data:
+                self.assertIsNone(data.data)
+                self.assertEqual(data.get_minutes(), 300)
+                self.assertEqual(len(data.get_symbol_ids()), len(_SYMBOLS))
+
+    def test_get_symbol_ids_returns_the_correct_symbol_ids(self):
+        """Auto-generated from _Native.py:211"""
+        with Native(self.native, "USDJPY,EURGBP") as data:
+            self.assertEqual(data.get_symbol_ids().tolist(), [utils.convert_symbol_to_id(s) for s in _SYMBOLS[2:]])
+
+    def test_get_minutes_returns_the_correct_count_of_minutes(self):
+        """Auto-generated from _Native.py:225"""
+        with Native(self.native) as data:
+            self.assertEqual(data.get_minutes(), 300)
+        with Native(self.native, origin=100, end=150) as data:
+            self.assertEqual(data.get_minutes(), 50)
+
+    def test_get_partial_data_raises_an_error_if_origin_is_negative(self):
+        """Auto-generated from _Native.py:237"""
+        with Native(self.native) as data:
+            with self.assertRaises(ValueError):
+                data.get_partial_data(-1, 10)
+
+    def test_get_partial_data_raises_an_error_if_end_is_less_than_origin(self):
+        """Auto-generated from _Native.py:237"""
+        with Native(self.native) as data:
+            with self.assertRaises(ValueError):
+                data.get_partial_data(10, 5)
+
+    def test_get_partial_data_returns_expected_data_for_all_symbols(self):
+        """Auto-generated from _Native.py:237"""
+        self.assertSameAsNpz(origin=10, end=200)
+
+    def test_get_partial_data_returns_expected_data_for_specified_symbols(self):
+        """Auto-generated from _Native.py:237"""
+        self.assertSameAsNpz("EURUSD,EURGBP", 10, 200)
+
+    def test_build_planar_builds_every_field_by_default(self):
+        """Auto-generated from _Native.py:202"""
+        with Native(self.native, "GBPUSD,EURGBP", 20, 80, load=False) as data:
+            planar = data.build_planar()
+            self.assertIs(data.planar, planar)
+            with Npz(self.filename, "GBPUSD,EURGBP", 20, 80) as expected:
+                for k, field in enumerate(planar):
+                    self.assertTrue(field.flags.c_contiguous)
+                    np.testing.assert_array_equal(field, expected.data[:, k::5])
+
+    def test_build_planar_builds_only_the_requested_fields(self):
+        """Auto-generated from _Native.py:202"""
+        with Native(self.native, load=False) as data:
+            planar = data.build_planar(("open", "close"))
+            self.assertEqual([f is None for f in planar], [False, True, True, False, True])
+            self.assertEqual(planar.close.shape, (len(_SYMBOLS), 300))
+
+    def test_build_planar_matches_Databuild_planar(self):
+        """Auto-generated from _Native.py:202"""
+        for symbol_subset, origin, end in ((None, 0, None), ("USDJPY,EURUSD", 50, 250)):
+            with Native(self.native, symbol_subset, origin, end) as data:
+                expected = Planar.from_interleaved(data.data)
+                for field, e in zip(data.build_planar(), expected):
+                    np.testing.assert_array_equal(field, e)
+                    self.assertEqual(field.dtype, e.dtype)
+
+    def test_write_header_creates_the_directory_if_needed(self):
+        """Auto-generated from _Native.py:150"""
+        with tempfile.TemporaryDirectory() as directory:
+            target = os.path.join(directory, "a", "b")
+            Native.write_header(target, np.array([utils.convert_symbol_to_id("EURUSD")]), np.arange(2.0), np.float32)
+            self.assertTrue(os.path.isfile(os.path.join(target, "header.json")))
+
+    def test_write_header_writes_the_header_and_timestamps(self):
+        """Auto-generated from _Native.py:150"""
+        symbol_ids = np.array([utils.convert_symbol_to_id(s) for s in ("EURUSD", "USDJPY")])
+        timestamps = 1577836800.0 + 60 * np.arange(3)
+        with tempfile.TemporaryDirectory() as directory:
+            Native.write_header(directory, symbol_ids, timestamps, np.float32)
+            self.assertEqual(sorted(os.listdir(directory)), ["header.json", "timestamps.npy"])
+            with open(os.path.join(directory, "header.json")) as f:
+                self.assertEqual(json.load(f), {
+                    "format": Native.FORMAT,
+                    "version": Native.VERSION,
+                    "symbols": ["EURUSD", "USDJPY"],
+                    "minutes": 3,
+                    "dtype": np.dtype(np.float32).str
+                })
+            np.testing.assert_array_equal(np.load(os.path.join(directory, "timestamps.npy")), timestamps)
+
+            Native.write_header(directory, symbol_ids, timestamps, np.float32, np.full((2, 5), 1000))
+            with open(os.path.join(directory, "header.json")) as f:
+                header = json.load(f)
+            self.assertEqual(header["storage"], np.dtype(np.int32).str)
+            self.assertEqual(header["scales"], [[1000] * 5] * 2)
+
+    def test_fixed_point_scales_raises_an_error_if_a_field_has_too_many_decimal_places(self):
+        """Auto-generated from _Native.py:171"""
+        data = np.ones((2, 10), np.float32)
+        data[1, 7] = np.float32(1.234e-6 / 3)
+        with self.assertRaises(ValueError):
+            Native.fixed_point_scales(data)
+
+    def test_fixed_point_scales_raises_an_error_if_a_field_doesnt_fit_in_an_int32(self):
+        """Auto-generated from _Native.py:171"""
+        data = np.ones((1, 10), np.float32)
+        data[0, 4] = 3e9
+        with self.assertRaises(ValueError):
+            Native.fixed_point_scales(data)
+
+    def test_fixed_point_scales_finds_the_fewest_decimal_places_for_each_field(self):
+        """Auto-generated from _Native.py:171"""
+        data = np.array([[1.5, 1, 1.12345, 0.5, 100, 2.25, 2, 1.1, 0.5, 7]], np.float32)
+        self.assertEqual(Native.fixed_point_scales(data).tolist(), [[100, 1, 100000, 10, 1]])
+
+    def test_fixed_point_scales_the_scales_reproduce_the_data_exactly(self):
+        """Auto-generated from _Native.py:171"""
+        data = np.round(np.random.default_rng(1).random((3, 500)), 5).astype(np.float32)
+        scales = Native.fixed_point_scales(data)
+        for (i, k), scale in np.ndenumerate(scales):
+            stored = np.round(data[i, k::5] * np.float64(scale)).astype(np.int32)
+            np.testing.assert_array_equal((stored / scale).astype(np.float32), data[i, k::5])
+
+    def test_enter_reads_version_1_directories(self):
+        """Auto-generated from _Native.py:253"""
+        with tempfile.TemporaryDirectory() as directory:
+            convert_npz(self.filename, directory)
+            with open(os.path.join(directory, "header.json")) as f:
+                header = json.load(f)
+            header["version"] = 1
+            with open(os.path.join(directory, "header.json"), "w") as f:
+                json.dump(header, f)
+            with Native(directory) as actual, Npz(self.filename) as expected:
+                np.testing.assert_array_equal(actual.data, expected.data)
+
+    def test_enter_decodes_fixedpoint_data_exactly(self):
+        """Auto-generated from _Native.py:253"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "data.npz")
+            _write_data(filename, decimals=5)
+            convert_npz(filename, os.path.join(directory, "native"), fixed_point=True)
+            self.assertEqual(np.load(os.path.join(directory, "native", "EURUSD.npy")).dtype, np.int32)
+            for symbol_subset, origin, end in ((None, 0, None), ("USDJPY,EURUSD", 20, 80)):
+                with Native(os.path.join(directory, "native"), symbol_subset, origin, end) as actual:
+                    with Npz(filename, symbol_subset, origin, end) as expected:
+                        self.assertEqual(actual.data.dtype, expected.data.dtype)
+                        np.testing.assert_array_equal(actual.data, expected.data)
+                        for x, y in zip(actual.get_partial_data(30, 60), expected.get_partial_data(30, 60)):
+                            np.testing.assert_array_equal(x, y)
+
+    def test_build_planar_decodes_fixedpoint_data_exactly(self):
+        """Auto-generated from _Native.py:302"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "data.npz")
+            _write_data(filename, decimals=5)
+            convert_npz(filename, os.path.join(directory, "native"), fixed_point=True)
+            with Native(os.path.join(directory, "native"), "GBPUSD,EURGBP", 20, 80, load=False) as actual:
+                with Npz(filename, "GBPUSD,EURGBP", 20, 80) as expected:
+                    for k, field in enumerate(actual.build_planar()):
+                        self.assertEqual(field.dtype, np.float32)
+                        np.testing.assert_array_equal(field, expected.data[:, k::5])
+
+
+if __name__ == '__main__':
+    ut.main()
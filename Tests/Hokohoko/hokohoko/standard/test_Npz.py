@@ -1,6 +1,26 @@
 # Generated by generate_tests (from the Hokohoko project).
+import os
+import tempfile
 import unittest as ut
 
+import numpy as np
+
+from hokohoko import utils
+from hokohoko.standard import Npz
+
+
+def _write_data(filename, symbols, minutes=10):
+    """
+    Writes random data for the given symbols in the npz format.
+    """
+    rng = np.random.default_rng(0)
+    np.savez(
+        filename,
+        symbol_ids=np.array([utils.convert_symbol_to_id(s) for s in symbols], np.int64),
+        timestamps=1577836800.0 + 60 * np.arange(minutes),
+        data=rng.random((len(symbols), 5 * minutes)).astype(np.float32)
+    )
+
 
 class TestNpz(ut.TestCase):
     def test_enter_raises_an_error_if_parameters_has_no_filename(self):
@@ -91,6 +111,40 @@ class TestNpz(ut.TestCase):
         """Auto-generated from _Npz.py:206"""
         self.fail('TODO: Implement me!')
 
+    def test_enter_doesnt_match_partial_symbols(self):
+        """Auto-generated from _Npz.py:115"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "data.npz")
+            _write_data(filename, ("EURUSD", "GBPUSD", "USDJPY"))
+            for symbol_subset in ("USD", "EUR,JPY", "EURUSDX", "URUS"):
+                with Npz(filename, symbol_subset) as data:
+                    self.assertEqual(len(data.get_symbol_ids()), 0, symbol_subset)
+            with Npz(filename, "USD,GBPUSD") as data:
+                self.assertEqual(data.get_symbol_ids().tolist(), [utils.convert_symbol_to_id("GBPUSD")])
+
+    def test__parse_parameters_returns_the_whole_parameters_as_the_filename_if_there_are_no_overrides(self):
+        """Auto-generated from _Npz.py:180"""
+        self.assertEqual(Npz("data.npz")._parse_parameters(), ("data.npz", None, None))
+        self.assertEqual(Npz("start_override=5")._parse_parameters(), ("start_override=5", None, None))
+
+    def test__parse_parameters_parses_each_override(self):
+        """Auto-generated from _Npz.py:180"""
+        self.assertEqual(
+            Npz("data.npz start_override=60 end_override=2020-01-01T00:02")._parse_parameters(),
+            ("data.npz", 60.0, 1577836920.0)
+        )
+        self.assertEqual(Npz("data.npz end_override=2020-01-01")._parse_parameters(), ("data.npz", None, 1577836800.0))
+        with self.assertRaises(ValueError):
+            Npz("data.npz start_override=60 end_override=60")._parse_parameters()
+
+    def test__parse_parameters_keeps_spaces_in_the_filename(self):
+        """Auto-generated from _Npz.py:180"""
+        self.assertEqual(
+            Npz("my data/rates 2020.npz start_override=60")._parse_parameters(),
+            ("my data/rates 2020.npz", 60.0, None)
+        )
+        self.assertEqual(Npz("my data.npz")._parse_parameters(), ("my data.npz", None, None))
+
 
 if __name__ == '__main__':
     ut.main()
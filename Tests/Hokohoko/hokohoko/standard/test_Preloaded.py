@@ -0,0 +1,179 @@
+# Generated by generate_tests (from the Hokohoko project).
+import multiprocessing as mp
+import os
+import tempfile
+import unittest as ut
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko.standard import Npz, Preloaded
+
+_SYMBOLS = ("EURUSD", "GBPUSD", "USDJPY", "EURGBP")
+
+
+def _write_data(filename, minutes=300):
+    """
+    Writes random data for four symbols in the npz format.
+    """
+    rng = np.random.default_rng(0)
+    np.savez(
+        filename,
+        symbol_ids=np.array([utils.convert_symbol_to_id(s) for s in _SYMBOLS], np.int64),
+        timestamps=1577836800.0 + 60 * np.arange(minutes),
+        data=rng.random((len(_SYMBOLS), 5 * minutes)).astype(np.float32)
+    )
+
+
+def _sum(parameters):
+    """
+    Sums the published data, in a forked process.
+    """
+    with Preloaded(parameters) as data:
+        return float(data.data.sum(dtype=np.float64))
+
+
+class TestPreloaded(ut.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.filename = os.path.join(cls.directory.name, "data.npz")
+        _write_data(cls.filename)
+        with Npz(cls.filename) as source:
+            cls.parameters = Preloaded.publish(source)
+
+    @classmethod
+    def tearDownClass(cls):
+        Preloaded.withdraw(cls.parameters)
+        cls.directory.cleanup()
+
+    def assertSameAsNpz(self, symbol_subset=None, origin=0, end=None):
+        """
+        Checks Preloaded views what Npz loads.
+        """
+        with Npz(self.filename, symbol_subset, origin, end) as expected:
+            with Preloaded(self.parameters, symbol_subset, origin, end) as actual:
+                np.testing.assert_array_equal(actual.get_symbol_ids(), expected.get_symbol_ids())
+                np.testing.assert_array_equal(actual.timestamps, expected.timestamps)
+                np.testing.assert_array_equal(actual.data, expected.data)
+                self.assertEqual(actual.get_minutes(), expected.get_minutes())
+                for a, b in ((origin, origin + 1), (origin + 5, origin + 50)):
+                    for x, y in zip(actual.get_partial_data(a, b), expected.get_partial_data(a, b)):
+                        np.testing.assert_array_equal(x, y)
+
+    def test_publish_raises_an_error_if_the_source_is_not_loaded(self):
+        """Auto-generated from _Preloaded.py:80"""
+        with Npz(self.filename, load=False) as source:
+            with self.assertRaises(ValueError):
+                Preloaded.publish(source)
+
+    def test_publish_makes_the_arrays_readonly(self):
+        """Auto-generated from _Preloaded.py:80"""
+        with Npz(self.filename) as source:
+            parameters = Preloaded.publish(source)
+            try:
+                self.assertFalse(source.timestamps.flags.writeable)
+                self.assertFalse(source.data.flags.writeable)
+                with self.assertRaises(ValueError):
+                    source.data[0, 0] = 0
+            finally:
+                Preloaded.withdraw(parameters)
+
+    def test_publish_returns_parameters_that_view_the_data(self):
+        """Auto-generated from _Preloaded.py:80"""
+        with Npz(self.filename) as source, Preloaded(self.parameters) as data:
+            self.assertTrue(np.shares_memory(data.data, Preloaded._published[self.parameters][2]))
+            np.testing.assert_array_equal(data.data, source.data)
+            expected = float(source.data.sum(dtype=np.float64))
+        if "fork" in mp.get_all_start_methods():
+            with mp.get_context("fork").Pool(1) as pool:
+                self.assertEqual(pool.apply(_sum, (self.parameters,)), expected)
+
+    def test_enter_raises_an_error_if_the_data_isnt_published_in_this_process(self):
+        """Auto-generated from _Preloaded.py:118"""
+        with self.assertRaises(ValueError):
+            Preloaded("preloaded-unknown").__enter__()
+        with Npz(self.filename) as source:
+            parameters = Preloaded.publish(source)
+        Preloaded.withdraw(parameters)
+        with self.assertRaises(ValueError):
+            Preloaded(parameters).__enter__()
+
+    def test_enter_raises_an_error_if_origin_is_before_the_data(self):
+        """Auto-generated from _Preloaded.py:118"""
+        with Npz(self.filename, origin=50) as source:
+            parameters = Preloaded.publish(source)
+        try:
+            with self.assertRaises(ValueError):
+                Preloaded(parameters, origin=49).__enter__()
+            with Preloaded(parameters, origin=60, end=100) as data, Npz(self.filename, origin=60, end=100) as expected:
+                np.testing.assert_array_equal(data.data, expected.data)
+                for x, y in zip(data.get_partial_data(70, 90), expected.get_partial_data(70, 90)):
+                    np.testing.assert_array_equal(x, y)
+        finally:
+            Preloaded.withdraw(parameters)
+
+    def test_enter_raises_an_error_if_end_is_less_than_origin(self):
+        """Auto-generated from _Preloaded.py:118"""
+        with self.assertRaises(ValueError):
+            Preloaded(self.parameters, origin=20, end=10).__enter__()
+
+    def test_enter_views_only_the_specified_symbols(self):
+        """Auto-generated from _Preloaded.py:118"""
+        for symbol_subset in ("GBPUSD,USDJPY", "EURUSD,EURGBP", "USDJPY", "EURUSD,AUDNZD"):
+            self.assertSameAsNpz(symbol_subset)
+        with Preloaded(self.parameters, "GBPUSD,USDJPY") as data:
+            self.assertTrue(np.shares_memory(data.data, Preloaded._published[self.parameters][2]))
+
+    def test_enter_views_the_requested_minutes_only(self):
+        """Auto-generated from _Preloaded.py:118"""
+        with Preloaded(self.parameters, origin=20, end=80) as data:
+            self.assertEqual(len(data.timestamps), 60)
+            self.assertEqual(data.data.shape, (len(_SYMBOLS), 300))
+        self.assertSameAsNpz(origin=20, end=80)
+        self.assertSameAsNpz("USDJPY", 250)
+
+    def test_enter_the_data_is_readonly(self):
+        """Auto-generated from _Preloaded.py:118"""
+        for symbol_subset in (None, "GBPUSD,USDJPY"):
+            with Preloaded(self.parameters, symbol_subset) as data:
+                for array in (data.symbol_ids, data.timestamps, data.data):
+                    with self.assertRaises(ValueError):
+                        array[0] = 0
+
+    def test_get_symbol_ids_returns_the_correct_symbol_ids(self):
+        """Auto-generated from _Preloaded.py:169"""
+        with Preloaded(self.parameters, "USDJPY,EURGBP") as data:
+            self.assertEqual(data.get_symbol_ids().tolist(), [utils.convert_symbol_to_id(s) for s in _SYMBOLS[2:]])
+
+    def test_get_minutes_returns_the_correct_count_of_minutes(self):
+        """Auto-generated from _Preloaded.py:177"""
+        with Preloaded(self.parameters) as data:
+            self.assertEqual(data.get_minutes(), 300)
+        with Preloaded(self.parameters, origin=100, end=150) as data:
+            self.assertEqual(data.get_minutes(), 50)
+
+    def test_get_partial_data_raises_an_error_if_origin_is_negative(self):
+        """Auto-generated from _Preloaded.py:185"""
+        with Preloaded(self.parameters) as data:
+            with self.assertRaises(ValueError):
+                data.get_partial_data(-1, 10)
+
+    def test_get_partial_data_raises_an_error_if_end_is_less_than_origin(self):
+        """Auto-generated from _Preloaded.py:185"""
+        with Preloaded(self.parameters) as data:
+            with self.assertRaises(ValueError):
+                data.get_partial_data(10, 5)
+
+    def test_get_partial_data_returns_views_not_copies(self):
+        """Auto-generated from _Preloaded.py:185"""
+        with Preloaded(self.parameters, "GBPUSD,USDJPY", 20, 200) as data:
+            timestamps, values = data.get_partial_data(50, 100)
+            _, published_timestamps, published, _ = Preloaded._published[self.parameters]
+            self.assertTrue(np.shares_memory(timestamps, published_timestamps))
+            self.assertTrue(np.shares_memory(values, published))
+        self.assertSameAsNpz("GBPUSD,USDJPY", 20, 200)
+
+
+if __name__ == '__main__':
+    ut.main()
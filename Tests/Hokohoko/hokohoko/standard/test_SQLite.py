@@ -0,0 +1,225 @@
+# Generated by generate_tests (from the Hokohoko project).
+import os
+import sqlite3
+import tempfile
+import unittest as ut
+from contextlib import closing
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko.standard import Npz, SQLite
+
+_SYMBOLS = ("EURUSD", "GBPUSD", "USDJPY", "EURGBP")
+
+
+def _arrays(minutes=300):
+    """
+    Random symbol ids, timestamps and data for four symbols.
+    """
+    rng = np.random.default_rng(0)
+    return (
+        np.array([utils.convert_symbol_to_id(s) for s in _SYMBOLS], np.int64),
+        1577836800.0 + 60 * np.arange(minutes),
+        rng.random((len(_SYMBOLS), 5 * minutes)).astype(np.float32)
+    )
+
+
+class TestSqlite(ut.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.filename = os.path.join(cls.directory.name, "data.npz")
+        cls.database = os.path.join(cls.directory.name, "data.sqlite")
+        symbol_ids, timestamps, data = _arrays()
+        np.savez(cls.filename, symbol_ids=symbol_ids, timestamps=timestamps, data=data)
+        # Small chunks, so ranges span several.
+        SQLite.append(cls.database, symbol_ids, timestamps, data, 64)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def assertSameAsNpz(self, symbol_subset=None, origin=0, end=None, load=True):
+        """
+        Checks SQLite loads what Npz loads.
+        """
+        with Npz(self.filename, symbol_subset, origin, end) as expected:
+            with SQLite(self.database, symbol_subset, origin, end, load=load) as actual:
+                np.testing.assert_array_equal(actual.get_symbol_ids(), expected.get_symbol_ids())
+                np.testing.assert_array_equal(actual.timestamps, expected.timestamps)
+                if load:
+                    np.testing.assert_array_equal(actual.data, expected.data)
+                self.assertEqual(actual.get_minutes(), expected.get_minutes())
+                for a, b in ((origin, origin + 1), (origin + 5, origin + 50), (origin + 60, origin + 200)):
+                    for x, y in zip(actual.get_partial_data(a, b), expected.get_partial_data(a, b)):
+                        np.testing.assert_array_equal(x, y)
+
+    def test_append_raises_an_error_if_the_data_doesnt_match_the_symbols_and_timestamps(self):
+        """Auto-generated from _SQLite.py:141"""
+        symbol_ids, timestamps, data = _arrays(10)
+        with tempfile.TemporaryDirectory() as directory:
+            database = os.path.join(directory, "data.sqlite")
+            with self.assertRaises(ValueError):
+                SQLite.append(database, symbol_ids[:3], timestamps, data)
+            with self.assertRaises(ValueError):
+                SQLite.append(database, symbol_ids, timestamps[:9], data)
+            self.assertFalse(os.path.exists(database))
+
+    def test_append_raises_an_error_if_the_symbols_dont_match_the_database(self):
+        """Auto-generated from _SQLite.py:141"""
+        symbol_ids, timestamps, data = _arrays(10)
+        with tempfile.TemporaryDirectory() as directory:
+            database = os.path.join(directory, "data.sqlite")
+            SQLite.append(database, symbol_ids, timestamps[:5], data[:, :25])
+            with self.assertRaises(ValueError):
+                SQLite.append(database, symbol_ids[:3], timestamps[5:], data[:3, 25:])
+
+    def test_append_raises_an_error_if_the_timestamps_dont_follow_the_databases(self):
+        """Auto-generated from _SQLite.py:141"""
+        symbol_ids, timestamps, data = _arrays(10)
+        with tempfile.TemporaryDirectory() as directory:
+            database = os.path.join(directory, "data.sqlite")
+            SQLite.append(database, symbol_ids, timestamps[:5], data[:, :25])
+            with self.assertRaises(ValueError):
+                SQLite.append(database, symbol_ids, timestamps[4:], data[:, 20:])
+            with SQLite(database) as loaded:
+                self.assertEqual(loaded.get_minutes(), 5)
+
+    def test_append_creates_the_database_if_needed(self):
+        """Auto-generated from _SQLite.py:141"""
+        symbol_ids, timestamps, data = _arrays(10)
+        with tempfile.TemporaryDirectory() as directory:
+            database = os.path.join(directory, "data.sqlite")
+            SQLite.append(database, symbol_ids, timestamps, data)
+            with closing(sqlite3.connect(database)) as db:
+                meta = dict(db.execute("SELECT key, value FROM meta"))
+            self.assertEqual(meta["format"], SQLite.FORMAT)
+            self.assertEqual(meta["minutes"], "10")
+            self.assertEqual(meta["chunk"], str(SQLite.CHUNK))
+
+    def test_append_writes_data_that_SQLite_loads_unchanged(self):
+        """Auto-generated from _SQLite.py:141"""
+        self.assertSameAsNpz()
+
+    def test_append_appends_to_a_partial_last_chunk(self):
+        """Auto-generated from _SQLite.py:141"""
+        symbol_ids, timestamps, data = _arrays()
+        with tempfile.TemporaryDirectory() as directory:
+            database = os.path.join(directory, "data.sqlite")
+            for a, b in ((0, 10), (10, 64), (64, 100), (100, 101), (101, 300)):
+                SQLite.append(database, symbol_ids, timestamps[a:b], data[:, a * 5:b * 5], 64)
+            with SQLite(database) as loaded:
+                np.testing.assert_array_equal(loaded.timestamps, timestamps)
+                np.testing.assert_array_equal(loaded.data, data)
+            with closing(sqlite3.connect(database)) as db:
+                self.assertEqual(db.execute("SELECT COUNT(*) FROM timestamps").fetchone()[0], 5)
+
+    def test_append_accepts_the_symbols_in_any_order(self):
+        """Auto-generated from _SQLite.py:141"""
+        symbol_ids, timestamps, data = _arrays(100)
+        order = [2, 0, 3, 1]
+        with tempfile.TemporaryDirectory() as directory:
+            database = os.path.join(directory, "data.sqlite")
+            SQLite.append(database, symbol_ids, timestamps[:50], data[:, :250], 16)
+            SQLite.append(database, symbol_ids[order], timestamps[50:], data[order, 250:], 16)
+            with SQLite(database) as loaded:
+                np.testing.assert_array_equal(loaded.get_symbol_ids(), symbol_ids)
+                np.testing.assert_array_equal(loaded.data, data)
+
+    def test_enter_raises_an_error_if_the_file_doesnt_exist(self):
+        """Auto-generated from _SQLite.py:284"""
+        with self.assertRaises(sqlite3.OperationalError):
+            SQLite(os.path.join(self.directory.name, "missing.sqlite")).__enter__()
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, "missing.sqlite")))
+
+    def test_enter_raises_an_error_if_the_database_is_not_the_SQLite_format(self):
+        """Auto-generated from _SQLite.py:284"""
+        with tempfile.TemporaryDirectory() as directory:
+            database = os.path.join(directory, "other.sqlite")
+            with closing(sqlite3.connect(database)) as db, db:
+                db.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                db.executemany("INSERT INTO meta VALUES (?, ?)", [("format", "other"), ("version", "1")])
+            data = SQLite(database)
+            with self.assertRaises(ValueError):
+                data.__enter__()
+            data.__exit__(None, None, None)
+
+    def test_enter_raises_an_error_if_origin_is_negative(self):
+        """Auto-generated from _SQLite.py:284"""
+        with self.assertRaises(ValueError):
+            SQLite(self.database, origin=-1).__enter__()
+
+    def test_enter_raises_an_error_if_end_is_less_than_origin(self):
+        """Auto-generated from _SQLite.py:284"""
+        with self.assertRaises(ValueError):
+            SQLite(self.database, origin=20, end=10).__enter__()
+
+    def test_enter_loads_all_the_symbols_correctly(self):
+        """Auto-generated from _SQLite.py:284"""
+        self.assertSameAsNpz()
+
+    def test_enter_loads_only_the_specified_symbols(self):
+        """Auto-generated from _SQLite.py:284"""
+        for symbol_subset in ("GBPUSD,USDJPY", "EURUSD,EURGBP", "USDJPY", "EURUSD,AUDNZD"):
+            self.assertSameAsNpz(symbol_subset)
+
+    def test_enter_loads_the_requested_timestamps_only(self):
+        """Auto-generated from _SQLite.py:284"""
+        with SQLite(self.database, origin=20, end=80) as data:
+            self.assertEqual(len(data.timestamps), 60)
+        self.assertSameAsNpz(origin=20, end=80)
+        self.assertSameAsNpz(origin=63, end=400)
+
+    def test_enter_loads_the_requested_data_only(self):
+        """Auto-generated from _SQLite.py:284"""
+        with SQLite(self.database, "USDJPY", 20, 80) as data:
+            self.assertEqual(data.data.shape, (1, 300))
+        self.assertSameAsNpz("USDJPY", 20, 80)
+
+    def test_enter_doesnt_load_data_if_load_is_false(self):
+        """Auto-generated from _SQLite.py:284"""
+        with SQLite(self.database, load=False) as data:
+            self.assertIsNone(data.data)
+            self.assertEqual(data.get_minutes(), 300)
+
+    def test_get_symbol_ids_returns_the_correct_symbol_ids(self):
+        """Auto-generated from _SQLite.py:339"""
+        with SQLite(self.database, "USDJPY,EURGBP") as data:
+            self.assertEqual(data.get_symbol_ids().tolist(), [utils.convert_symbol_to_id(s) for s in _SYMBOLS[2:]])
+
+    def test_get_minutes_returns_the_correct_count_of_minutes(self):
+        """Auto-generated from _SQLite.py:353"""
+        with SQLite(self.database) as data:
+            self.assertEqual(data.get_minutes(), 300)
+        with SQLite(self.database, origin=100, end=150) as data:
+            self.assertEqual(data.get_minutes(), 50)
+
+    def test_get_partial_data_raises_an_error_if_origin_is_negative(self):
+        """Auto-generated from _SQLite.py:365"""
+        with SQLite(self.database) as data:
+            with self.assertRaises(ValueError):
+                data.get_partial_data(-1, 10)
+
+    def test_get_partial_data_raises_an_error_if_end_is_less_than_origin(self):
+        """Auto-generated from _SQLite.py:365"""
+        with SQLite(self.database) as data:
+            with self.assertRaises(ValueError):
+                data.get_partial_data(10, 5)
+
+    def test_get_partial_data_returns_expected_data_for_all_symbols(self):
+        """Auto-generated from _SQLite.py:365"""
+        self.assertSameAsNpz(origin=10, end=280)
+
+    def test_get_partial_data_returns_expected_data_for_specified_symbols(self):
+        """Auto-generated from _SQLite.py:365"""
+        self.assertSameAsNpz("EURUSD,EURGBP", 10, 280)
+
+    def test_get_partial_data_reads_from_the_database_if_not_loaded(self):
+        """Auto-generated from _SQLite.py:365"""
+        self.assertSameAsNpz(load=False)
+        self.assertSameAsNpz("GBPUSD,EURGBP", 30, 270, load=False)
+
+
+if __name__ == '__main__':
+    ut.main()
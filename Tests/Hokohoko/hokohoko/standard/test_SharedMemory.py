@@ -0,0 +1,192 @@
+# Generated by generate_tests (from the Hokohoko project).
+import os
+import tempfile
+import unittest as ut
+from unittest import mock
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko.standard import Npz, SharedMemory
+
+_SYMBOLS = ("EURUSD", "GBPUSD", "USDJPY", "EURGBP")
+
+
+def _write_data(filename, minutes=300):
+    """
+    Writes random data for four symbols in the npz format.
+    """
+    rng = np.random.default_rng(0)
+    np.savez(
+        filename,
+        symbol_ids=np.array([utils.convert_symbol_to_id(s) for s in _SYMBOLS], np.int64),
+        timestamps=1577836800.0 + 60 * np.arange(minutes),
+        data=rng.random((len(_SYMBOLS), 5 * minutes)).astype(np.float32)
+    )
+
+
+class TestSharedmemory(ut.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.filename = os.path.join(cls.directory.name, "data.npz")
+        _write_data(cls.filename)
+        with Npz(cls.filename) as source:
+            cls.block, cls.parameters = SharedMemory.publish(source)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.block.close()
+        cls.block.unlink()
+        cls.directory.cleanup()
+
+    def assertSameAsNpz(self, symbol_subset=None, origin=0, end=None):
+        """
+        Checks SharedMemory attaches to what Npz loads.
+        """
+        with Npz(self.filename, symbol_subset, origin, end) as expected:
+            with SharedMemory(self.parameters, symbol_subset, origin, end) as actual:
+                np.testing.assert_array_equal(actual.get_symbol_ids(), expected.get_symbol_ids())
+                np.testing.assert_array_equal(actual.timestamps, expected.timestamps)
+                np.testing.assert_array_equal(actual.data, expected.data)
+                self.assertEqual(actual.get_minutes(), expected.get_minutes())
+                for a, b in ((origin, origin + 1), (origin + 5, origin + 50)):
+                    for x, y in zip(actual.get_partial_data(a, b), expected.get_partial_data(a, b)):
+                        np.testing.assert_array_equal(x, y)
+
+    def test_publish_raises_an_error_before_Python_38(self):
+        """Auto-generated from _SharedMemory.py:101"""
+        with Npz(self.filename) as source:
+            with mock.patch("hokohoko.standard._SharedMemory.shared_memory", None):
+                with self.assertRaises(RuntimeError):
+                    SharedMemory.publish(source)
+
+    def test_publish_raises_an_error_if_the_source_is_not_loaded(self):
+        """Auto-generated from _SharedMemory.py:101"""
+        with Npz(self.filename, load=False) as source:
+            with self.assertRaises(ValueError):
+                SharedMemory.publish(source)
+
+    def test_publish_copies_the_symbols_timestamps_and_data_into_the_block(self):
+        """Auto-generated from _SharedMemory.py:101"""
+        with Npz(self.filename) as source:
+            symbols, minutes = len(source.symbol_ids), len(source.timestamps)
+            offsets = SharedMemory._offsets(symbols, minutes, source.timestamps.dtype, source.data.dtype)
+            buffer = self.block.buf
+            np.testing.assert_array_equal(np.ndarray((symbols,), np.int64, buffer, offsets[0]), source.symbol_ids)
+            np.testing.assert_array_equal(
+                np.ndarray((minutes,), source.timestamps.dtype, buffer, offsets[1]), source.timestamps
+            )
+            np.testing.assert_array_equal(
+                np.ndarray(source.data.shape, source.data.dtype, buffer, offsets[2]), source.data
+            )
+
+    def test_publish_returns_parameters_that_attach_to_the_block(self):
+        """Auto-generated from _SharedMemory.py:101"""
+        self.assertTrue(self.parameters.startswith(self.block.name + " "))
+        self.assertSameAsNpz()
+
+    def test_enter_raises_an_error_if_the_block_doesnt_exist(self):
+        """Auto-generated from _SharedMemory.py:149"""
+        name = self.parameters.split()[0]
+        with self.assertRaises(FileNotFoundError):
+            SharedMemory(self.parameters.replace(name, name + "_missing")).__enter__()
+
+    def test_enter_raises_an_error_if_origin_is_before_the_block(self):
+        """Auto-generated from _SharedMemory.py:149"""
+        with Npz(self.filename, origin=50) as source:
+            block, parameters = SharedMemory.publish(source)
+        try:
+            with self.assertRaises(ValueError):
+                SharedMemory(parameters, origin=10).__enter__()
+            with SharedMemory(parameters, origin=60) as data:
+                with Npz(self.filename, origin=60) as expected:
+                    np.testing.assert_array_equal(data.data, expected.data)
+        finally:
+            block.close()
+            block.unlink()
+
+    def test_enter_raises_an_error_if_end_is_less_than_origin(self):
+        """Auto-generated from _SharedMemory.py:149"""
+        with self.assertRaises(ValueError):
+            SharedMemory(self.parameters, origin=20, end=10).__enter__()
+        with self.assertRaises(ValueError):
+            SharedMemory(self.parameters, origin=20, end=20).__enter__()
+
+    def test_enter_attaches_to_all_the_symbols(self):
+        """Auto-generated from _SharedMemory.py:149"""
+        self.assertSameAsNpz()
+
+    def test_enter_attaches_to_only_the_specified_symbols(self):
+        """Auto-generated from _SharedMemory.py:149"""
+        for symbol_subset in ("GBPUSD,USDJPY", "EURUSD,EURGBP", "USDJPY", "EURUSD,AUDNZD"):
+            self.assertSameAsNpz(symbol_subset)
+
+    def test_enter_doesnt_copy_consecutive_symbols(self):
+        """Auto-generated from _SharedMemory.py:149"""
+        with SharedMemory(self.parameters, "GBPUSD,USDJPY") as data:
+            self.assertFalse(data.data.flags.owndata)
+        with SharedMemory(self.parameters, "EURUSD,EURGBP") as data:
+            self.assertTrue(data.data.flags.owndata)
+
+    def test_enter_attaches_to_the_requested_timestamps_only(self):
+        """Auto-generated from _SharedMemory.py:149"""
+        with SharedMemory(self.parameters, origin=20, end=80) as data:
+            self.assertEqual(len(data.timestamps), 60)
+        self.assertSameAsNpz(origin=20, end=80)
+
+    def test_enter_attaches_to_the_requested_data_only(self):
+        """Auto-generated from _SharedMemory.py:149"""
+        with SharedMemory(self.parameters, "USDJPY", 20, 80) as data:
+            self.assertEqual(data.data.shape, (1, 300))
+        self.assertSameAsNpz("USDJPY", 20, 80)
+
+    def test_enter_the_data_is_readonly(self):
+        """Auto-generated from _SharedMemory.py:149"""
+        with SharedMemory(self.parameters) as data:
+            for array in (data.symbol_ids, data.timestamps, data.data):
+                with self.assertRaises(ValueError):
+                    array[0] = 0
+
+    def test_get_symbol_ids_returns_the_correct_symbol_ids(self):
+        """Auto-generated from _SharedMemory.py:218"""
+        with SharedMemory(self.parameters, "USDJPY,EURGBP") as data:
+            self.assertEqual(data.get_symbol_ids().tolist(), [utils.convert_symbol_to_id(s) for s in _SYMBOLS[2:]])
+
+    def test_get_minutes_returns_the_correct_count_of_minutes(self):
+        """Auto-generated from _SharedMemory.py:229"""
+        with SharedMemory(self.parameters) as data:
+            self.assertEqual(data.get_minutes(), 300)
+        with SharedMemory(self.parameters, origin=100, end=150) as data:
+            self.assertEqual(data.get_minutes(), 50)
+
+    def test_get_partial_data_raises_an_error_if_origin_is_negative(self):
+        """Auto-generated from _SharedMemory.py:240"""
+        with SharedMemory(self.parameters) as data:
+            with self.assertRaises(ValueError):
+                data.get_partial_data(-1, 10)
+
+    def test_get_partial_data_raises_an_error_if_end_is_less_than_origin(self):
+        """Auto-generated from _SharedMemory.py:240"""
+        with SharedMemory(self.parameters) as data:
+            with self.assertRaises(ValueError):
+                data.get_partial_data(10, 5)
+
+    def test_get_partial_data_returns_views_not_copies(self):
+        """Auto-generated from _SharedMemory.py:240"""
+        with SharedMemory(self.parameters, origin=10) as data:
+            timestamps, values = data.get_partial_data(20, 30)
+            self.assertTrue(np.shares_memory(timestamps, data.timestamps))
+            self.assertTrue(np.shares_memory(values, data.data))
+
+    def test_get_partial_data_returns_expected_data_for_all_symbols(self):
+        """Auto-generated from _SharedMemory.py:240"""
+        self.assertSameAsNpz(origin=10, end=200)
+
+    def test_get_partial_data_returns_expected_data_for_specified_symbols(self):
+        """Auto-generated from _SharedMemory.py:240"""
+        self.assertSameAsNpz("EURUSD,EURGBP", 10, 200)
+
+
+if __name__ == '__main__':
+    ut.main()
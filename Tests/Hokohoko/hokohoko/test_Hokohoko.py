@@ -1,5 +1,91 @@
 # Generated by generate_tests (from the Hokohoko project).
+import os
+import sys
+import tempfile
 import unittest as ut
+from unittest import mock
+
+import numpy as np
+
+from hokohoko import Hokohoko, _run, utils
+from hokohoko._period import Period
+from hokohoko.entities import Config, Direction, Order, PackedAccount, Predictor
+from hokohoko.standard import Npz
+
+
+class _Buyer(Predictor):
+    """
+    Buys every symbol every Bar, taking a small profit.
+    """
+    def seed(self, a=None, version=2):
+        # Predictor seeds with itself, which newer Pythons reject.
+        super().seed(0, version)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def on_start(self, bars):
+        pass
+
+    def on_bar(self, bars):
+        for b in bars:
+            self.place_order(Order(b.symbol_id, Direction.BUY, None, float(b.close) * 1.0005, None))
+
+
+def _write_data(filename, minutes=600):
+    """
+    Writes a random walk for two symbols in the npz format.
+    """
+    rng = np.random.default_rng(0)
+    data = np.empty((2, minutes * 5), np.float32)
+    for i, start in enumerate((1.1, 1.3)):
+        close = start * np.exp(rng.normal(0, 0.0004, minutes).cumsum())
+        open_ = np.concatenate(([start], close[:-1]))
+        data[i, 0::5] = open_
+        data[i, 1::5] = np.maximum(open_, close) * 1.0002
+        data[i, 2::5] = np.minimum(open_, close) * 0.9998
+        data[i, 3::5] = close
+        data[i, 4::5] = 1
+    np.savez(
+        filename,
+        symbol_ids=np.array([utils.convert_symbol_to_id(s) for s in ("EURUSD", "GBPUSD")], np.int64),
+        timestamps=1577836800.0 + 60 * np.arange(minutes),
+        data=data
+    )
+
+
+def _periods(filename, period_count=3):
+    """
+    The Config and Periods of the buying Predictor over filename.
+    """
+    config = Config(
+        predictor_class=f"{__name__}._Buyer",
+        data_class="hokohoko.standard.Npz",
+        data_parameters=filename,
+        period_count=period_count,
+        past_minutes=5,
+        hold_minutes=30,
+        training_minutes=50,
+        test_minutes=200
+    )
+    with Npz(filename, None, load=False) as data:
+        period_configs = Hokohoko._calculate_periods(data.get_minutes(), config, data.get_symbol_ids())
+    Period.init(None, None)
+    return config, period_configs
+
+
+def _assert_same_account(test, a, b):
+    test.assertEqual(list(a.balance), list(b.balance))
+    test.assertEqual(list(a.equity), list(b.equity))
+    test.assertEqual(list(a.symbol_ids), list(b.symbol_ids))
+    for name in ("positions", "history"):
+        x, y = getattr(a, name), getattr(b, name)
+        test.assertEqual(list(x), list(y))
+        for column in ("open_rate", "close_rate", "close_time", "final_value"):
+            np.testing.assert_array_equal(x.column(column)[x.rows()], y.column(column)[y.rows()])
 
 
 class TestHokohoko(ut.TestCase):
@@ -63,6 +149,103 @@ class TestHokohoko(ut.TestCase):
         """Auto-generated from Hokohoko.py:278"""
         self.fail('TODO: Implement me!')
 
+    def test__calculate_periods_periods_include_the_currency_map_of_the_available_symbols(self):
+        """Auto-generated from Hokohoko.py:222"""
+        available = np.array([utils.convert_symbol_to_id(s) for s in ("EURUSD", "GBPEUR", "USDJPY")], np.int64)
+        periods = Hokohoko._calculate_periods(10000, Config(), available)
+        currency_map = utils.generate_currency_map(available)
+        for pc in periods:
+            self.assertEqual(pc.symbols.graph, currency_map)
+
+    def test__calculate_periods_periods_include_the_symbol_plan(self):
+        """Auto-generated from Hokohoko.py:222"""
+        available = np.array([utils.convert_symbol_to_id(s) for s in ("EURUSD", "GBPUSD", "EURGBP")], np.int64)
+        periods = Hokohoko._calculate_periods(10000, Config(data_subset="EURGBP"), available)
+        plan = _run.plan_symbols("EURGBP", available)
+        for pc in periods:
+            self.assertEqual(pc.symbols.required_symbols, plan.required_symbols)
+            np.testing.assert_array_equal(pc.symbols.symbol_ids, plan.symbol_ids)
+            np.testing.assert_array_equal(pc.symbols.subset_mask, plan.subset_mask)
+            np.testing.assert_array_equal(pc.symbols.base_index, plan.base_index)
+
+    def test__process_returns_a_packed_account(self):
+        """Auto-generated from Hokohoko.py:331"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "data.npz")
+            _write_data(filename)
+            config, period_configs = _periods(filename, 1)
+            period_id, packed = Hokohoko._process(config, period_configs[0])
+            self.assertEqual(period_id, period_configs[0].period_id)
+            self.assertIsInstance(packed, PackedAccount)
+            account = packed.unpack()
+            self.assertGreater(len(account.history), 0)
+            _assert_same_account(self, account, _run.run(Period(), config, period_configs[0]))
+
+    def test__process_group_runs_the_Periods_in_the_order_given(self):
+        """Auto-generated from Hokohoko.py:381"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "data.npz")
+            _write_data(filename)
+            config, period_configs = _periods(filename)
+            group = [period_configs[2], period_configs[0], period_configs[1]]
+            results = Hokohoko._process_group(config, group)
+            self.assertEqual([period_id for period_id, _, _ in results], [2, 0, 1])
+            for (_, packed, _), pc in zip(results, group):
+                _assert_same_account(self, packed.unpack(), Hokohoko._process(config, pc)[1].unpack())
+
+    def test__process_group_returns_when_and_in_which_process_each_Period_ran(self):
+        """Auto-generated from Hokohoko.py:381"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "data.npz")
+            _write_data(filename)
+            config, period_configs = _periods(filename)
+            results = Hokohoko._process_group(config, period_configs)
+            timings = [timing for _, _, timing in results]
+            self.assertEqual([t.period_id for t in timings], [0, 1, 2])
+            self.assertEqual({t.pid for t in timings}, {os.getpid()})
+            for previous, timing in zip(timings, timings[1:]):
+                self.assertLessEqual(previous.finished, timing.started)
+            for timing in timings:
+                self.assertLessEqual(timing.started, timing.finished)
+
+    def test__make_config_from_arguments_rejects_windowminutes_with_rangeindex_or_planar(self):
+        """Auto-generated from Hokohoko.py:90"""
+        for option in ("--range-index", "--planar"):
+            argv = ["hokohoko", "--window-minutes", "60", option]
+            with mock.patch.object(sys, "argv", argv), mock.patch("sys.stderr"):
+                with self.assertRaises(SystemExit):
+                    Hokohoko._make_config_from_arguments()
+
+    def test_run_raises_an_error_if_window_minutes_is_combined_with_range_index_or_planar(self):
+        """Auto-generated from Hokohoko.py:428"""
+        for option in ("range_index", "planar"):
+            config = Config(window_minutes=60, **{option: True})
+            with self.assertRaises(ValueError):
+                Hokohoko.run(config)
+
+    def test__make_config_from_arguments_maps_datalock_auto_on_and_off_to_None_True_and_False(self):
+        """Auto-generated from Hokohoko.py:90"""
+        for value, expected in (("auto", None), ("on", True), ("off", False)):
+            with mock.patch.object(sys, "argv", ["hokohoko", "--data-lock", value]):
+                self.assertIs(Hokohoko._make_config_from_arguments().data_lock, expected)
+        with mock.patch.object(sys, "argv", ["hokohoko"]):
+            self.assertIsNone(Hokohoko._make_config_from_arguments().data_lock)
+
+    def test__needs_data_lock_uses_the_data_sources_needs_lock_by_default(self):
+        """Auto-generated from Hokohoko.py:431"""
+        config = Config(data_class="hokohoko.standard.Npz")
+        for needs_lock in (True, False):
+            with mock.patch.object(Npz, "needs_lock", needs_lock):
+                self.assertIs(Hokohoko._needs_data_lock(config), needs_lock)
+
+    def test__needs_data_lock_lets_data_lock_override_needs_lock(self):
+        """Auto-generated from Hokohoko.py:431"""
+        for needs_lock in (True, False):
+            with mock.patch.object(Npz, "needs_lock", needs_lock):
+                for data_lock in (True, False):
+                    config = Config(data_class="hokohoko.standard.Npz", data_lock=data_lock)
+                    self.assertIs(Hokohoko._needs_data_lock(config), data_lock)
+
 
 if __name__ == '__main__':
     ut.main()
@@ -0,0 +1,286 @@
+# Generated by generate_tests (from the Hokohoko project).
+import os
+import tempfile
+import unittest as ut
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko._cache import CacheEntry, Cached, DataCache
+from hokohoko.entities import Data
+from hokohoko.standard import Npz
+
+# The bytes of each minute of one float32 symbol: a timestamp and OHLCV.
+_MINUTE = 8 + 5 * 4
+
+
+def _entry(origin, end):
+    """
+    An entry of one symbol over [origin, end).
+    """
+    return CacheEntry(
+        origin, end, np.array([1], np.int64), 60.0 * np.arange(origin, end),
+        np.arange(origin * 5, end * 5, dtype=np.float32)[None, :]
+    )
+
+
+class _Source(Data):
+    """
+    100 minutes of one symbol, recording the ranges loaded.
+    """
+    loads = []
+
+    def __enter__(self):
+        end = 100 if self.end is None else min(self.end, 100)
+        self.symbol_ids = np.array([1], np.int64)
+        self.timestamps = 60.0 * np.arange(self.origin, end)
+        if self.load:
+            _Source.loads.append((self.origin, end))
+            self.data = np.arange(self.origin * 5, end * 5, dtype=np.float32)[None, :]
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.data = None
+
+    def get_symbol_ids(self):
+        return self.symbol_ids
+
+    def get_minutes(self):
+        return len(self.timestamps)
+
+    def get_partial_data(self, origin, end):
+        return (self.timestamps[origin - self.origin:end - self.origin],
+                self.data[:, (origin - self.origin) * 5:(end - self.origin) * 5])
+
+
+def _write_data(filename, minutes=300):
+    """
+    Writes random data for three symbols in the npz format.
+    """
+    rng = np.random.default_rng(0)
+    np.savez(
+        filename,
+        symbol_ids=np.array([utils.convert_symbol_to_id(s) for s in ("EURUSD", "GBPUSD", "USDJPY")], np.int64),
+        timestamps=1577836800.0 + 60 * np.arange(minutes),
+        data=rng.random((3, 5 * minutes)).astype(np.float32)
+    )
+
+
+class TestCache(ut.TestCase):
+    def test_init_raises_an_error_if_max_bytes_is_negative(self):
+        """Auto-generated from _cache.py:57"""
+        with self.assertRaises(ValueError):
+            DataCache(-1)
+        self.assertEqual(DataCache(0).max_bytes, 0)
+
+    def test_find_returns_None_if_no_entry_has_the_key(self):
+        """Auto-generated from _cache.py:69"""
+        cache = DataCache(1 << 20)
+        self.assertIsNone(cache.find("a", 0, 10))
+        cache.add("a", _entry(0, 10))
+        self.assertIsNone(cache.find("b", 0, 10))
+        self.assertIsNone(cache.find("a", 10, 20))
+
+    def test_find_returns_an_entry_covering_the_range(self):
+        """Auto-generated from _cache.py:69"""
+        cache = DataCache(1 << 20)
+        entry = _entry(0, 50)
+        cache.add("a", entry)
+        self.assertIs(cache.find("a", 10, 20), entry)
+
+    def test_find_prefers_an_entry_covering_the_range_over_one_overlapping_it(self):
+        """Auto-generated from _cache.py:69"""
+        cache = DataCache(1 << 20)
+        covering = _entry(0, 50)
+        cache.add("a", _entry(15, 60))
+        cache.add("a", covering)
+        cache.add("a", _entry(5, 25))
+        self.assertIs(cache.find("a", 10, 30), covering)
+
+    def test_find_returns_an_entry_overlapping_the_range(self):
+        """Auto-generated from _cache.py:69"""
+        cache = DataCache(1 << 20)
+        entry = _entry(0, 50)
+        cache.add("a", entry)
+        self.assertIs(cache.find("a", 40, 90), entry)
+
+    def test_find_marks_the_entry_as_most_recently_used(self):
+        """Auto-generated from _cache.py:69"""
+        cache = DataCache(3 * 10 * _MINUTE)
+        first = _entry(0, 10)
+        cache.add("a", first)
+        cache.add("a", _entry(10, 20))
+        cache.add("a", _entry(20, 30))
+        cache.find("a", 0, 5)
+        cache.add("a", _entry(30, 40))
+        self.assertIs(cache.find("a", 0, 5), first)
+        self.assertIsNone(cache.find("a", 10, 20))
+
+    def test_add_doesnt_keep_entries_larger_than_max_bytes(self):
+        """Auto-generated from _cache.py:102"""
+        cache = DataCache(10 * _MINUTE - 1)
+        cache.add("a", _entry(0, 10))
+        self.assertIsNone(cache.find("a", 0, 10))
+        self.assertEqual(cache.bytes, 0)
+
+    def test_add_makes_the_arrays_readonly(self):
+        """Auto-generated from _cache.py:102"""
+        entry = _entry(0, 10)
+        DataCache(1 << 20).add("a", entry)
+        for array in (entry.symbol_ids, entry.timestamps, entry.data):
+            self.assertFalse(array.flags.writeable)
+            with self.assertRaises(ValueError):
+                array[0] = 0
+
+    def test_add_drops_entries_the_new_one_covers(self):
+        """Auto-generated from _cache.py:102"""
+        cache = DataCache(1 << 20)
+        cache.add("a", _entry(10, 20))
+        cache.add("b", _entry(10, 20))
+        cache.add("a", _entry(30, 60))
+        covering = _entry(0, 40)
+        cache.add("a", covering)
+        self.assertIs(cache.find("a", 10, 20), covering)
+        self.assertEqual(cache.bytes, (10 + 30 + 40) * _MINUTE)
+
+    def test_add_evicts_the_least_recently_used_entries_to_fit(self):
+        """Auto-generated from _cache.py:102"""
+        cache = DataCache(30 * _MINUTE)
+        cache.add("a", _entry(0, 10))
+        cache.add("a", _entry(10, 20))
+        cache.add("a", _entry(20, 30))
+        cache.add("a", _entry(40, 60))
+        self.assertIsNone(cache.find("a", 0, 20))
+        self.assertIsNotNone(cache.find("a", 20, 30))
+        self.assertEqual(cache.bytes, 30 * _MINUTE)
+
+    def test_init_sets_internal_values_correctly(self):
+        """Auto-generated from _cache.py:150"""
+        cache = DataCache(1 << 20)
+        data = Cached(_Source, cache, "parameters", "EURUSD", 10, 20, None, False)
+        self.assertIs(data.data_class, _Source)
+        self.assertIs(data.cache, cache)
+        self.assertEqual(
+            (data.parameters, data.symbol_subset, data.origin, data.end, data.lock, data.load),
+            ("parameters", "EURUSD", 10, 20, None, False)
+        )
+
+    def test_enter_reads_the_symbols_and_timestamps_only_if_not_loading(self):
+        """Auto-generated from _cache.py:175"""
+        _Source.loads = []
+        cache = DataCache(1 << 20)
+        with Cached(_Source, cache, "", origin=10, end=20, load=False) as data:
+            self.assertEqual(data.get_symbol_ids().tolist(), [1])
+            self.assertEqual(data.timestamps.tolist(), (60.0 * np.arange(10, 20)).tolist())
+            self.assertIsNone(data.data)
+        self.assertEqual(_Source.loads, [])
+        self.assertEqual(cache.bytes, 0)
+
+    def test_enter_loads_and_caches_a_range_not_in_the_cache(self):
+        """Auto-generated from _cache.py:175"""
+        _Source.loads = []
+        cache = DataCache(1 << 20)
+        with Cached(_Source, cache, "", origin=10, end=20) as data:
+            self.assertEqual(data.data.tolist(), [list(range(50, 100))])
+        self.assertEqual(_Source.loads, [(10, 20)])
+        self.assertIsNotNone(cache.find((_Source, "", None), 10, 20))
+
+    def test_enter_views_a_range_the_cache_covers_without_loading(self):
+        """Auto-generated from _cache.py:175"""
+        cache = DataCache(1 << 20)
+        with Cached(_Source, cache, "", origin=0, end=50):
+            pass
+        _Source.loads = []
+        with Cached(_Source, cache, "", origin=10, end=20) as data:
+            self.assertEqual(data.data.tolist(), [list(range(50, 100))])
+            self.assertIs(data.data.base, cache.find((_Source, "", None), 10, 20).data)
+        self.assertEqual(_Source.loads, [])
+
+    def test_enter_only_loads_the_minutes_the_cache_doesnt_have(self):
+        """Auto-generated from _cache.py:175"""
+        cache = DataCache(1 << 20)
+        with Cached(_Source, cache, "", origin=20, end=50):
+            pass
+        _Source.loads = []
+        with Cached(_Source, cache, "", origin=10, end=70) as data:
+            self.assertEqual(data.data.tolist(), [list(range(50, 350))])
+        self.assertEqual(_Source.loads, [(10, 20), (50, 70)])
+        self.assertEqual(cache.bytes, 60 * _MINUTE)
+
+    def test_enter_matches_the_wrapped_source(self):
+        """Auto-generated from _cache.py:175"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "data.npz")
+            _write_data(filename)
+            cache = DataCache(1 << 20)
+            # Overlapping ranges, as Periods run one after another read.
+            for symbol_subset, origin, end in (
+                    (None, 50, 150), (None, 20, 120), (None, 100, 250), (None, 0, 300),
+                    ("USDJPY,EURUSD", 100, 200), ("USDJPY,EURUSD", 150, 280), (None, 200, None)
+            ):
+                with Npz(filename, symbol_subset, origin, end) as source:
+                    with Cached(Npz, cache, filename, symbol_subset, origin, end) as data:
+                        np.testing.assert_array_equal(data.get_symbol_ids(), source.get_symbol_ids())
+                        np.testing.assert_array_equal(data.timestamps, source.timestamps)
+                        np.testing.assert_array_equal(data.data, source.data)
+                        for x, y in zip(data.get_partial_data(origin + 5, origin + 40),
+                                        source.get_partial_data(origin + 5, origin + 40)):
+                            np.testing.assert_array_equal(x, y)
+
+    def test_enter_doesnt_cache_if_end_is_None(self):
+        """Auto-generated from _cache.py:175"""
+        _Source.loads = []
+        cache = DataCache(1 << 20)
+        with Cached(_Source, cache, "", origin=10) as data:
+            self.assertEqual(data.get_minutes(), 90)
+        with Cached(_Source, cache, "", origin=10):
+            pass
+        self.assertEqual(_Source.loads, [(10, 100), (10, 100)])
+        self.assertEqual(cache.bytes, 0)
+
+    def test_get_symbol_ids_returns_the_correct_symbol_ids(self):
+        """Auto-generated from _cache.py:271"""
+        with Cached(_Source, DataCache(1 << 20), "", origin=10, end=20) as data:
+            self.assertEqual(data.get_symbol_ids().tolist(), [1])
+
+    def test_get_minutes_returns_the_correct_count_of_minutes(self):
+        """Auto-generated from _cache.py:279"""
+        with Cached(_Source, DataCache(1 << 20), "", origin=10, end=20) as data:
+            self.assertEqual(data.get_minutes(), 10)
+        with Cached(_Source, DataCache(1 << 20), "", origin=90, end=120) as data:
+            self.assertEqual(data.get_minutes(), 10)
+
+    def test_get_partial_data_raises_an_error_if_origin_is_negative(self):
+        """Auto-generated from _cache.py:287"""
+        with Cached(_Source, DataCache(1 << 20), "", origin=10, end=20) as data:
+            with self.assertRaises(ValueError):
+                data.get_partial_data(-1, 15)
+
+    def test_get_partial_data_raises_an_error_if_end_is_less_than_origin(self):
+        """Auto-generated from _cache.py:287"""
+        with Cached(_Source, DataCache(1 << 20), "", origin=10, end=20) as data:
+            with self.assertRaises(ValueError):
+                data.get_partial_data(15, 12)
+
+    def test_get_partial_data_returns_views_not_copies(self):
+        """Auto-generated from _cache.py:287"""
+        cache = DataCache(1 << 20)
+        with Cached(_Source, cache, "", origin=10, end=20) as data:
+            timestamps, values = data.get_partial_data(12, 15)
+            entry = cache.find((_Source, "", None), 10, 20)
+            self.assertTrue(np.shares_memory(timestamps, entry.timestamps))
+            self.assertTrue(np.shares_memory(values, entry.data))
+
+    def test_get_partial_data_matches_the_wrapped_source(self):
+        """Auto-generated from _cache.py:287"""
+        cache = DataCache(1 << 20)
+        with Cached(_Source, cache, "", origin=30, end=60):
+            pass
+        with Cached(_Source, cache, "", origin=10, end=90) as data, _Source("", origin=10, end=90) as source:
+            for origin, end in ((10, 11), (25, 35), (55, 90)):
+                for x, y in zip(data.get_partial_data(origin, end), source.get_partial_data(origin, end)):
+                    np.testing.assert_array_equal(x, y)
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,107 @@
+# Generated by generate_tests (from the Hokohoko project).
+import os
+import tempfile
+import unittest as ut
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko.convert import convert_npz, convert_npz_sqlite
+from hokohoko.standard import Native, Npz, SQLite
+
+_SYMBOLS = ("EURUSD", "GBPUSD", "USDJPY")
+
+
+def _write_data(filename, minutes=100):
+    """
+    Writes random five decimal place data for three symbols in the npz
+    format.
+    """
+    rng = np.random.default_rng(0)
+    np.savez(
+        filename,
+        symbol_ids=np.array([utils.convert_symbol_to_id(s) for s in _SYMBOLS], np.int64),
+        timestamps=1577836800.0 + 60 * np.arange(minutes),
+        data=np.round(rng.random((len(_SYMBOLS), 5 * minutes)), 5).astype(np.float32)
+    )
+
+
+class TestConvert(ut.TestCase):
+    def test_convert_npz_raises_an_error_if_the_file_doesnt_exist(self):
+        """Auto-generated from convert.py:53"""
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(FileNotFoundError):
+                convert_npz(os.path.join(directory, "missing.npz"), os.path.join(directory, "native"))
+
+    def test_convert_npz_writes_every_symbol(self):
+        """Auto-generated from convert.py:53"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename, native = os.path.join(directory, "data.npz"), os.path.join(directory, "native")
+            _write_data(filename)
+            convert_npz(filename, native)
+            for s in _SYMBOLS:
+                self.assertTrue(os.path.isfile(os.path.join(native, f"{s}.npy")))
+
+    def test_convert_npz_the_converted_data_matches_the_original(self):
+        """Auto-generated from convert.py:53"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename, native = os.path.join(directory, "data.npz"), os.path.join(directory, "native")
+            _write_data(filename)
+            convert_npz(filename, native)
+            with Npz(filename) as expected, Native(native) as actual:
+                np.testing.assert_array_equal(actual.symbol_ids, expected.symbol_ids)
+                np.testing.assert_array_equal(actual.timestamps, expected.timestamps)
+                np.testing.assert_array_equal(actual.data, expected.data)
+                self.assertEqual(actual.data.dtype, expected.data.dtype)
+
+    def test_convert_npz_the_fixedpoint_data_matches_the_original(self):
+        """Auto-generated from convert.py:57"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename, native = os.path.join(directory, "data.npz"), os.path.join(directory, "native")
+            _write_data(filename)
+            convert_npz(filename, native, fixed_point=True)
+            for s in _SYMBOLS:
+                self.assertEqual(np.load(os.path.join(native, f"{s}.npy")).dtype, np.int32)
+            with Npz(filename) as expected, Native(native) as actual:
+                np.testing.assert_array_equal(actual.data, expected.data)
+                self.assertEqual(actual.data.dtype, expected.data.dtype)
+
+    def test_convert_npz_sqlite_raises_an_error_if_the_file_doesnt_exist(self):
+        """Auto-generated from convert.py:94"""
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(FileNotFoundError):
+                convert_npz_sqlite(os.path.join(directory, "missing.npz"), os.path.join(directory, "data.sqlite"))
+
+    def test_convert_npz_sqlite_raises_an_error_if_the_database_already_has_data(self):
+        """Auto-generated from convert.py:94"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename, database = os.path.join(directory, "data.npz"), os.path.join(directory, "data.sqlite")
+            _write_data(filename)
+            convert_npz_sqlite(filename, database)
+            with self.assertRaises(ValueError):
+                convert_npz_sqlite(filename, database)
+
+    def test_convert_npz_sqlite_writes_every_symbol(self):
+        """Auto-generated from convert.py:94"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename, database = os.path.join(directory, "data.npz"), os.path.join(directory, "data.sqlite")
+            _write_data(filename)
+            convert_npz_sqlite(filename, database)
+            with SQLite(database) as data:
+                self.assertEqual(data.get_symbol_ids().tolist(), [utils.convert_symbol_to_id(s) for s in _SYMBOLS])
+
+    def test_convert_npz_sqlite_the_converted_data_matches_the_original(self):
+        """Auto-generated from convert.py:94"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename, database = os.path.join(directory, "data.npz"), os.path.join(directory, "data.sqlite")
+            _write_data(filename)
+            convert_npz_sqlite(filename, database)
+            with Npz(filename) as expected, SQLite(database) as actual:
+                np.testing.assert_array_equal(actual.symbol_ids, expected.symbol_ids)
+                np.testing.assert_array_equal(actual.timestamps, expected.timestamps)
+                np.testing.assert_array_equal(actual.data, expected.data)
+                self.assertEqual(actual.data.dtype, expected.data.dtype)
+
+
+if __name__ == '__main__':
+    ut.main()
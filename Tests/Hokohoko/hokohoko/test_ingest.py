@@ -0,0 +1,229 @@
+# Generated by generate_tests (from the Hokohoko project).
+import os
+import tempfile
+import unittest as ut
+
+import numpy as np
+
+from hokohoko import ingest, utils
+from hokohoko.standard import Native
+
+# Ticks over minutes 60, 120 and 300, with none for 180 and 240.
+_TICKS = [
+    "timestamp,price,volume\n",
+    "60,1.0,2\n", "70,1.5,1\n", "90,0.75,1\n", "110,1.25,1\n",
+    "130,2.0,1\n",
+    "300,1.75,4\n", "359,1.5,1\n"
+]
+
+
+def _write_csv(directory, name, lines):
+    """
+    Writes lines to a CSV file, returning its filename.
+    """
+    filename = os.path.join(directory, name)
+    with open(filename, "w") as f:
+        f.writelines(lines)
+    return filename
+
+
+def _aggregated(directory, symbol):
+    """
+    Reads the temporary files aggregate writes.
+    """
+    return (
+        np.fromfile(os.path.join(directory, f"{symbol}.minutes.tmp"), np.int64),
+        np.fromfile(os.path.join(directory, f"{symbol}.packets.tmp"), np.float32).reshape(-1, 5)
+    )
+
+
+def _align(directory, lines, index, chunk=ingest.DEFAULT_CHUNK):
+    """
+    Aggregates lines for EURUSD, then aligns them to index.
+
+    :returns:   The packet for each minute of index.
+    """
+    symbol = ingest.aggregate(_write_csv(directory, "EURUSD.csv", lines), directory)
+    Native.write_header(directory, np.array([utils.convert_symbol_to_id(symbol)]), np.array(index, np.float64), np.float32)
+    ingest.align(symbol, directory, chunk)
+    return np.load(os.path.join(directory, f"{symbol}.npy")).reshape(-1, 5)
+
+
+class TestIngest(ut.TestCase):
+    def test__parse_parses_numeric_timestamps(self):
+        """Auto-generated from ingest.py:80"""
+        timestamps, _ = ingest._parse(["60,1.5\n", "90.5,1.5\n"])
+        self.assertEqual(timestamps.tolist(), [60.0, 90.5])
+
+    def test__parse_parses_ISO_8601_timestamps(self):
+        """Auto-generated from ingest.py:80"""
+        timestamps, packets = ingest._parse(["2020-01-01T00:00:30,1.5\n", "2020-01-01T12:01+12:00,1.25\n"])
+        self.assertEqual(timestamps.tolist(), [1577836830.0, 1577836860.0])
+        self.assertEqual(packets[:, 0].tolist(), [1.5, 1.25])
+
+    def test__parse_expands_ticks_into_flat_packets(self):
+        """Auto-generated from ingest.py:80"""
+        _, packets = ingest._parse(["60,1.5,3\n", "70,1.25,2\n"])
+        self.assertEqual(packets.tolist(), [[1.5, 1.5, 1.5, 1.5, 3.0], [1.25, 1.25, 1.25, 1.25, 2.0]])
+
+    def test__parse_counts_ticks_without_a_volume_as_one_each(self):
+        """Auto-generated from ingest.py:80"""
+        _, packets = ingest._parse(["60,1.5\n", "70,1.25\n"])
+        self.assertEqual(packets[:, 4].tolist(), [1.0, 1.0])
+
+    def test__parse_gives_minutes_without_a_volume_no_volume(self):
+        """Auto-generated from ingest.py:80"""
+        _, packets = ingest._parse(["60,1.0,2.0,0.5,1.5\n"])
+        self.assertEqual(packets.tolist(), [[1.0, 2.0, 0.5, 1.5, 0.0]])
+        _, packets = ingest._parse(["60,1.0,2.0,0.5,1.5,7\n"])
+        self.assertEqual(packets.tolist(), [[1.0, 2.0, 0.5, 1.5, 7.0]])
+
+    def test__parse_raises_an_error_for_an_unknown_number_of_columns(self):
+        """Auto-generated from ingest.py:80"""
+        for line in ("60\n", "60,1,2,3\n", "60,1,2,3,4,5,6\n"):
+            with self.assertRaises(ValueError):
+                ingest._parse([line])
+
+    def test_aggregate_raises_an_error_if_the_timestamps_are_out_of_order(self):
+        """Auto-generated from ingest.py:135"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = _write_csv(directory, "EURUSD.csv", ["120,1.0\n", "60,1.0\n"])
+            for chunk in (1, 10):
+                with self.assertRaises(ValueError):
+                    ingest.aggregate(filename, directory, chunk)
+
+    def test_aggregate_raises_an_error_if_there_is_no_data(self):
+        """Auto-generated from ingest.py:135"""
+        with tempfile.TemporaryDirectory() as directory:
+            for lines in ([], ["timestamp,price\n"], ["\n", "\n"]):
+                with self.assertRaises(ValueError):
+                    ingest.aggregate(_write_csv(directory, "EURUSD.csv", lines), directory)
+
+    def test_aggregate_reduces_ticks_to_minute_OHLCV(self):
+        """Auto-generated from ingest.py:135"""
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(ingest.aggregate(_write_csv(directory, "eurusd.csv", _TICKS), directory), "EURUSD")
+            _, packets = _aggregated(directory, "EURUSD")
+            self.assertEqual(packets.tolist(), [
+                [1.0, 1.5, 0.75, 1.25, 5.0],
+                [2.0, 2.0, 2.0, 2.0, 1.0],
+                [1.75, 1.75, 1.5, 1.5, 5.0]
+            ])
+
+    def test_aggregate_merges_a_minute_split_between_chunks(self):
+        """Auto-generated from ingest.py:135"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = _write_csv(directory, "EURUSD.csv", _TICKS)
+            ingest.aggregate(filename, directory)
+            expected = _aggregated(directory, "EURUSD")
+            for chunk in (1, 2, 3):
+                ingest.aggregate(filename, directory, chunk)
+                for a, b in zip(_aggregated(directory, "EURUSD"), expected):
+                    np.testing.assert_array_equal(a, b)
+
+    def test_aggregate_writes_one_packet_per_minute_with_data(self):
+        """Auto-generated from ingest.py:135"""
+        with tempfile.TemporaryDirectory() as directory:
+            ingest.aggregate(_write_csv(directory, "EURUSD.csv", _TICKS), directory)
+            minutes, packets = _aggregated(directory, "EURUSD")
+            self.assertEqual(minutes.tolist(), [60, 120, 300])
+            self.assertEqual(len(packets), 3)
+
+    def test_align_places_each_packet_at_its_minute(self):
+        """Auto-generated from ingest.py:205"""
+        with tempfile.TemporaryDirectory() as directory:
+            packets = _align(directory, _TICKS, [60, 120, 180, 240, 300])
+            self.assertEqual(packets[[0, 1, 4]].tolist(), [
+                [1.0, 1.5, 0.75, 1.25, 5.0],
+                [2.0, 2.0, 2.0, 2.0, 1.0],
+                [1.75, 1.75, 1.5, 1.5, 5.0]
+            ])
+            self.assertFalse(os.path.exists(os.path.join(directory, "EURUSD.minutes.tmp")))
+            self.assertFalse(os.path.exists(os.path.join(directory, "EURUSD.packets.tmp")))
+
+    def test_align_repeats_the_previous_close_without_volume_for_minutes_without_data(self):
+        """Auto-generated from ingest.py:205"""
+        with tempfile.TemporaryDirectory() as directory:
+            packets = _align(directory, _TICKS, [60, 120, 180, 240, 300, 360])
+            self.assertEqual(packets[[2, 3, 5]].tolist(), [[2.0] * 4 + [0.0]] * 2 + [[1.5] * 4 + [0.0]])
+
+    def test_align_repeats_the_first_open_before_the_first_minute_with_data(self):
+        """Auto-generated from ingest.py:205"""
+        with tempfile.TemporaryDirectory() as directory:
+            packets = _align(directory, _TICKS, [0, 30, 60])
+            self.assertEqual(packets[:2].tolist(), [[1.0] * 4 + [0.0]] * 2)
+
+    def test_align_carries_the_previous_close_across_chunks(self):
+        """Auto-generated from ingest.py:205"""
+        index = [0, 60, 120, 180, 240, 300, 360, 420]
+        with tempfile.TemporaryDirectory() as directory:
+            expected = _align(directory, _TICKS, index)
+            for chunk in (1, 2, 3):
+                np.testing.assert_array_equal(_align(directory, _TICKS, index, chunk), expected)
+
+    def test_ingest_raises_an_error_if_two_files_are_for_the_same_symbol(self):
+        """Auto-generated from ingest.py:262"""
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, "a"))
+            os.makedirs(os.path.join(directory, "b"))
+            filenames = [
+                _write_csv(os.path.join(directory, "a"), "EURUSD.csv", _TICKS),
+                _write_csv(os.path.join(directory, "b"), "eurusd.csv", _TICKS)
+            ]
+            with self.assertRaises(ValueError):
+                ingest.ingest(filenames, os.path.join(directory, "native"), 1)
+
+    def test_ingest_writes_the_native_format(self):
+        """Auto-generated from ingest.py:262"""
+        with tempfile.TemporaryDirectory() as directory:
+            filenames = [
+                _write_csv(directory, "EURUSD.csv", _TICKS),
+                _write_csv(directory, "GBPUSD.csv", ["60,1.0,2.0,0.5,1.5,0\n", "120,1.5,1.5,1.25,1.25,3\n"])
+            ]
+            native = os.path.join(directory, "native")
+            ingest.ingest(filenames, native, 2)
+            with Native(native) as data:
+                self.assertEqual(data.get_symbol_ids().tolist(), [utils.convert_symbol_to_id(s) for s in ("EURUSD", "GBPUSD")])
+                self.assertEqual(data.data.dtype, np.float32)
+                self.assertEqual(data.data.reshape(2, -1, 5)[1].tolist(), [
+                    [1.0, 2.0, 0.5, 1.5, 0.0],
+                    [1.5, 1.5, 1.25, 1.25, 3.0],
+                    [1.25] * 4 + [0.0]
+                ])
+            self.assertEqual(sorted(os.listdir(native)), ["EURUSD.npy", "GBPUSD.npy", "header.json", "timestamps.npy"])
+
+    def test_ingest_writes_a_common_timestamp_index(self):
+        """Auto-generated from ingest.py:262"""
+        with tempfile.TemporaryDirectory() as directory:
+            filenames = [
+                _write_csv(directory, "EURUSD.csv", _TICKS),
+                _write_csv(directory, "GBPUSD.csv", ["0,1.0\n", "200,1.5\n"])
+            ]
+            native = os.path.join(directory, "native")
+            ingest.ingest(filenames, native, 2)
+            with Native(native) as data:
+                self.assertEqual(data.timestamps.tolist(), [0.0, 60.0, 120.0, 180.0, 300.0])
+                self.assertEqual(data.data.shape, (2, 25))
+
+    def test_ingest_matches_ingesting_with_one_process(self):
+        """Auto-generated from ingest.py:262"""
+        with tempfile.TemporaryDirectory() as directory:
+            filenames = [
+                _write_csv(directory, "EURUSD.csv", _TICKS),
+                _write_csv(directory, "GBPUSD.csv", ["0,1.0\n", "200,1.5\n"]),
+                _write_csv(directory, "USDJPY.csv", ["2020-01-01,100.5,101,100,100.75,9\n"])
+            ]
+            one, many = os.path.join(directory, "one"), os.path.join(directory, "many")
+            ingest.ingest(filenames, one, 1)
+            ingest.ingest(filenames, many, 3, 2)
+            with open(os.path.join(one, "header.json")) as a, open(os.path.join(many, "header.json")) as b:
+                self.assertEqual(a.read(), b.read())
+            for name in ("timestamps", "EURUSD", "GBPUSD", "USDJPY"):
+                np.testing.assert_array_equal(
+                    np.load(os.path.join(one, f"{name}.npy")),
+                    np.load(os.path.join(many, f"{name}.npy"))
+                )
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -1,8 +1,50 @@
 # Generated by generate_tests (from the Hokohoko project).
+import os
+import tempfile
 import unittest as ut
 
+import numpy as np
+
+from hokohoko import utils
+from hokohoko._cache import DataCache
+from hokohoko._period import BarPyramid, Period, get_past_minutes
+from hokohoko.standard import Npz
+
+
+def _write_data(filename, minutes=200):
+    """
+    Writes a random walk for two symbols in the npz format.
+    """
+    rng = np.random.default_rng(0)
+    data = np.empty((2, minutes * 5), np.float32)
+    for i, start in enumerate((1.1, 110.0)):
+        close = start * np.exp(rng.normal(0, 0.0004, minutes).cumsum())
+        open_ = np.concatenate(([start], close[:-1]))
+        data[i, 0::5] = open_
+        data[i, 1::5] = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.0002, minutes)))
+        data[i, 2::5] = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.0002, minutes)))
+        data[i, 3::5] = close
+        data[i, 4::5] = rng.integers(0, 100, minutes)
+    np.savez(
+        filename,
+        symbol_ids=np.array([utils.convert_symbol_to_id(s) for s in ("EURUSD", "USDJPY")], np.int64),
+        timestamps=1577836800.0 + 60 * np.arange(minutes),
+        data=data
+    )
+
 
 class TestPeriod(ut.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.filename = os.path.join(cls.directory.name, "data.npz")
+        _write_data(cls.filename)
+        cls.source = Npz(cls.filename).__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
     def test_get_last_close_at_minute_raises_an_error_if_the_data_source_does_not_inherit_hokohokoentitiesData(self):
         """Auto-generated from _period.py:74"""
         self.fail('TODO: Implement me!')
@@ -111,6 +153,60 @@ class TestPeriod(ut.TestCase):
         """Auto-generated from _period.py:62"""
         self.fail('TODO: Implement me!')
 
+    def test_init_builds_a_level_for_every_width(self):
+        """Auto-generated from _period.py:209"""
+        pyramid = BarPyramid(self.source, 0, 200, 5, ((5, 0), (60, 50)))
+        self.assertEqual(sorted(pyramid.levels), [5, 60])
+
+    def test_init_merges_levels_of_the_same_width(self):
+        """Auto-generated from _period.py:209"""
+        pyramid = BarPyramid(self.source, 0, 200, 5, ((5, 20), (60, 50), (5, 10)))
+        self.assertEqual(sorted(pyramid.levels), [5, 60])
+        self.assertEqual(pyramid.levels[5].first, 10)
+
+    def test_init_rounds_the_first_minute_of_each_level_up_to_the_step(self):
+        """Auto-generated from _period.py:209"""
+        pyramid = BarPyramid(self.source, 3, 200, 5, ((5, 10), (60, 0)))
+        self.assertEqual(pyramid.levels[5].first, 13)
+        self.assertEqual(pyramid.levels[60].first, 3)
+
+    def test_get_bars_matches_get_past_minutes_for_every_Bar_in_a_level(self):
+        """Auto-generated from _period.py:256"""
+        for range_index in (False, True):
+            with Npz(self.filename) as source:
+                if range_index:
+                    source.build_range_index()
+                pyramid = BarPyramid(source, 0, 200, 5, ((5, 0), (60, 50)))
+                for width, first in ((5, 0), (60, 50)):
+                    for start in range(first, 200 - width, 5):
+                        self.assertEqual(
+                            pyramid.get_bars(start, start + width),
+                            get_past_minutes(source, start, start + width)
+                        )
+
+    def test_get_bars_falls_back_to_get_past_minutes_for_unknown_widths(self):
+        """Auto-generated from _period.py:256"""
+        pyramid = BarPyramid(self.source, 0, 200, 5, ((5, 0),))
+        self.assertNotIn(7, pyramid.levels)
+        self.assertEqual(pyramid.get_bars(10, 17), get_past_minutes(self.source, 10, 17))
+
+    def test_get_bars_falls_back_to_get_past_minutes_if_start_is_not_on_the_grid(self):
+        """Auto-generated from _period.py:256"""
+        pyramid = BarPyramid(self.source, 0, 200, 5, ((5, 10),))
+        self.assertEqual(pyramid.get_bars(12, 17), get_past_minutes(self.source, 12, 17))
+        self.assertEqual(pyramid.get_bars(5, 10), get_past_minutes(self.source, 5, 10))
+
+    def test_init_creates_a_data_cache_only_if_cache_bytes_is_set(self):
+        """Auto-generated from _period.py:107"""
+        try:
+            Period.init(None, None)
+            self.assertIsNone(Period.data_cache)
+            Period.init(None, None, 1 << 20)
+            self.assertIsInstance(Period.data_cache, DataCache)
+            self.assertEqual(Period.data_cache.max_bytes, 1 << 20)
+        finally:
+            Period.init(None, None)
+
 
 if __name__ == '__main__':
     ut.main()
@@ -0,0 +1,202 @@
+# Generated by generate_tests (from the Hokohoko project).
+import functools
+import os
+import tempfile
+import threading
+import unittest as ut
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko._prefetch import PrefetchingData
+from hokohoko._window import Window
+from hokohoko.entities import Data
+from hokohoko.standard import Npz
+
+
+class _Source(Data):
+    """
+    100 minutes of one symbol, recording the ranges read. Reads on the
+    background thread wait for gate.
+    """
+    reads = []
+    gate = threading.Event()
+
+    def __enter__(self):
+        end = 100 if self.end is None else min(self.end, 100)
+        self.symbol_ids = np.array([1], np.int64)
+        self.timestamps = 60.0 * np.arange(self.origin, end)
+        if self.load:
+            self.data = np.arange(self.origin * 5, end * 5, dtype=np.float32)[None, :]
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.data = None
+
+    def get_symbol_ids(self):
+        return self.symbol_ids
+
+    def get_minutes(self):
+        return len(self.timestamps)
+
+    def get_partial_data(self, origin, end):
+        if threading.current_thread() is not threading.main_thread():
+            _Source.gate.wait()
+        _Source.reads.append((origin, end))
+        return (self.timestamps[origin - self.origin:end - self.origin],
+                self.data[:, (origin - self.origin) * 5:(end - self.origin) * 5])
+
+
+def _drain(data):
+    """
+    Waits for the background thread to read every queued range.
+    """
+    with data._ready:
+        data._ready.wait_for(lambda: not data._pending, 5)
+
+
+def _write_data(filename, minutes=300):
+    """
+    Writes random data for three symbols in the npz format.
+    """
+    rng = np.random.default_rng(0)
+    np.savez(
+        filename,
+        symbol_ids=np.array([utils.convert_symbol_to_id(s) for s in ("EURUSD", "GBPUSD", "USDJPY")], np.int64),
+        timestamps=1577836800.0 + 60 * np.arange(minutes),
+        data=rng.random((3, 5 * minutes)).astype(np.float32)
+    )
+
+
+class TestPrefetch(ut.TestCase):
+    def setUp(self):
+        _Source.reads = []
+        _Source.gate.set()
+
+    def test_init_raises_an_error_if_depth_is_less_than_1(self):
+        """Auto-generated from _prefetch.py:53"""
+        for depth in (0, -1):
+            with self.assertRaises(ValueError):
+                PrefetchingData(_Source, depth, "")
+
+    def test_enter_enters_the_wrapped_source(self):
+        """Auto-generated from _prefetch.py:88"""
+        with PrefetchingData(_Source, 2, "parameters", "EURUSD", 10, 50) as data:
+            self.assertIsInstance(data._source, _Source)
+            source = data._source
+            self.assertEqual(
+                (source.parameters, source.symbol_subset, source.origin, source.end, source.load),
+                ("parameters", "EURUSD", 10, 50, True)
+            )
+            self.assertIsNotNone(source.data)
+        self.assertIsNone(source.data)
+
+    def test_enter_shares_the_wrapped_sources_symbols_timestamps_and_data(self):
+        """Auto-generated from _prefetch.py:88"""
+        with PrefetchingData(_Source, 2, "", origin=10, end=50) as data:
+            self.assertIs(data.symbol_ids, data._source.symbol_ids)
+            self.assertIs(data.timestamps, data._source.timestamps)
+            self.assertIs(data.data, data._source.data)
+
+    def test_enter_starts_the_background_thread_only_if_loading(self):
+        """Auto-generated from _prefetch.py:88"""
+        with PrefetchingData(_Source, 2, "") as data:
+            self.assertTrue(data._thread.is_alive())
+            thread = data._thread
+        self.assertIsNone(data._thread)
+        self.assertFalse(thread.is_alive())
+        with PrefetchingData(_Source, 2, "", load=False) as data:
+            self.assertIsNone(data._thread)
+
+    def test_get_symbol_ids_returns_the_wrapped_sources_symbol_ids(self):
+        """Auto-generated from _prefetch.py:126"""
+        with PrefetchingData(_Source, 2, "") as data:
+            self.assertEqual(data.get_symbol_ids().tolist(), [1])
+
+    def test_get_minutes_returns_the_wrapped_sources_count_of_minutes(self):
+        """Auto-generated from _prefetch.py:134"""
+        with PrefetchingData(_Source, 2, "", origin=10, end=50) as data:
+            self.assertEqual(data.get_minutes(), 40)
+
+    def test_get_partial_data_matches_the_wrapped_source(self):
+        """Auto-generated from _prefetch.py:142"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "data.npz")
+            _write_data(filename)
+            for data_class in (Npz, functools.partial(Window, Npz, 16)):
+                with Npz(filename, "USDJPY,EURUSD", 20, 290) as source:
+                    with PrefetchingData(data_class, 3, filename, "USDJPY,EURUSD", 20, 290) as data:
+                        # As a Period reads: the past minutes, then the hold.
+                        for minute in range(30, 260, 5):
+                            for a, b in ((minute - 10, minute), (minute, minute + 30)):
+                                for x, y in zip(data.get_partial_data(a, b), source.get_partial_data(a, b)):
+                                    np.testing.assert_array_equal(x, y)
+
+    def test_get_partial_data_reads_unpredicted_ranges_directly(self):
+        """Auto-generated from _prefetch.py:142"""
+        with PrefetchingData(_Source, 2, "") as data:
+            _, values = data.get_partial_data(20, 30)
+            self.assertEqual(values.tolist(), [list(range(100, 150))])
+            self.assertEqual(_Source.reads, [(20, 30)])
+            self.assertEqual(data._buffer, {})
+
+    def test_get_partial_data_returns_prefetched_ranges_without_reading(self):
+        """Auto-generated from _prefetch.py:142"""
+        with PrefetchingData(_Source, 2, "") as data:
+            data.get_partial_data(0, 10)
+            data.get_partial_data(5, 15)
+            _drain(data)
+            _Source.reads = []
+            _, values = data.get_partial_data(10, 20)
+            self.assertEqual(values.tolist(), [list(range(50, 100))])
+            self.assertNotIn((10, 20), _Source.reads)
+
+    def test_get_partial_data_waits_for_a_range_being_prefetched(self):
+        """Auto-generated from _prefetch.py:142"""
+        _Source.gate.clear()
+        with PrefetchingData(_Source, 2, "") as data:
+            data.get_partial_data(0, 10)
+            data.get_partial_data(5, 15)
+            self.assertIn((10, 20), data._pending)
+            timer = threading.Timer(0.1, _Source.gate.set)
+            timer.start()
+            _, values = data.get_partial_data(10, 20)
+            timer.join()
+            self.assertEqual(values.tolist(), [list(range(50, 100))])
+            self.assertEqual(_Source.reads.count((10, 20)), 1)
+
+    def test_get_partial_data_queues_the_next_depth_ranges_of_a_stream(self):
+        """Auto-generated from _prefetch.py:142"""
+        with PrefetchingData(_Source, 3, "") as data:
+            data.get_partial_data(0, 10)
+            self.assertEqual(data._pending, set())
+            data.get_partial_data(5, 15)
+            data.get_partial_data(40, 41)
+            _drain(data)
+            self.assertEqual(set(data._buffer), {(10, 20), (15, 25), (20, 30)})
+
+    def test_get_partial_data_drops_ranges_a_stream_has_passed(self):
+        """Auto-generated from _prefetch.py:142"""
+        with PrefetchingData(_Source, 3, "") as data:
+            data.get_partial_data(0, 10)
+            data.get_partial_data(5, 15)
+            data.get_partial_data(0, 1)
+            data.get_partial_data(1, 2)
+            _drain(data)
+            data.get_partial_data(15, 25)
+            _drain(data)
+            # (10, 20) is passed; the stride is now 10, and the other
+            # stream is untouched.
+            self.assertEqual(set(data._buffer), {(20, 30), (25, 35), (35, 45), (45, 55), (2, 3), (3, 4), (4, 5)})
+
+    def test_get_partial_data_stops_predicting_at_the_end_of_the_data(self):
+        """Auto-generated from _prefetch.py:142"""
+        with PrefetchingData(_Source, 3, "") as data:
+            data.get_partial_data(80, 90)
+            data.get_partial_data(85, 95)
+            _drain(data)
+            self.assertEqual(set(data._buffer), {(90, 100)})
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,344 @@
+# Generated by generate_tests (from the Hokohoko project).
+import os
+import tempfile
+import unittest as ut
+from types import SimpleNamespace
+
+import numpy as np
+
+from hokohoko import Hokohoko, _run, utils
+from hokohoko._period import Period
+from hokohoko._resolver import first_touch, resolve_positions, simulate_resolved
+from hokohoko.entities import Account, Bar, Config, Direction, Order, Planar, Position, PositionBook, Predictor, Status
+from hokohoko.standard import Npz
+
+_EURUSD = utils.convert_symbol_to_id("EURUSD")
+
+
+class _OneAtATime(Predictor):
+    """
+    Places a random Order on a random symbol whenever it has no
+    Positions, so no two Positions are ever open together.
+    """
+    def seed(self, a=None, version=2):
+        # Predictor seeds with itself, which newer Pythons reject.
+        super().seed(0, version)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def on_start(self, bars):
+        pass
+
+    def on_bar(self, bars):
+        if self.account.positions:
+            return
+        b = self.choice(bars)
+        direction = Direction.BUY if self.random() < 0.5 else Direction.SELL
+        close = float(b.close)
+        width = (float(b.high) - float(b.low)) or close * 0.001
+        open_bid = None if self.random() < 0.5 else close + (self.random() - 0.5) * width
+        sign = 1 if direction == Direction.BUY else -1
+        rate = close if open_bid is None else open_bid
+        take_profit = None if self.random() < 0.2 else rate + sign * self.random() * 4 * width
+        stop_loss = None if self.random() < 0.2 else rate - sign * self.random() * 4 * width
+        self.place_order(Order(b.symbol_id, direction, open_bid, take_profit, stop_loss))
+
+
+def _write_data(filename, minutes=1500):
+    """
+    Writes a random walk for symbols converted directly, by a cross and
+    through another pair, in the npz format.
+    """
+    symbols = ("EURUSD", "USDJPY", "EURJPY", "GBPUSD", "EURGBP")
+    rng = np.random.default_rng(2)
+    data = np.empty((len(symbols), minutes * 5), np.float32)
+    for i, start in enumerate((1.1, 110.0, 121.0, 1.3, 0.85)):
+        close = start * np.exp(rng.normal(0, 0.0004, minutes).cumsum())
+        open_ = np.concatenate(([start], close[:-1]))
+        data[i, 0::5] = open_
+        data[i, 1::5] = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.0002, minutes)))
+        data[i, 2::5] = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.0002, minutes)))
+        data[i, 3::5] = close
+        data[i, 4::5] = rng.integers(0, 100, minutes)
+    np.savez(
+        filename,
+        symbol_ids=np.array([utils.convert_symbol_to_id(s) for s in symbols], np.int64),
+        timestamps=1577836800.0 + 60 * np.arange(minutes),
+        data=data
+    )
+
+
+def _run_periods(filename, engine):
+    """
+    Runs two Periods of the one-at-a-time Predictor with the given
+    engine.
+    """
+    config = Config(
+        predictor_class=f"{__name__}._OneAtATime",
+        data_class="hokohoko.standard.Npz",
+        data_parameters=filename,
+        engine=engine,
+        period_count=2,
+        past_minutes=5,
+        hold_minutes=60,
+        training_minutes=100,
+        test_minutes=500
+    )
+    with Npz(filename, None, load=False) as data:
+        period_configs = Hokohoko._calculate_periods(data.get_minutes(), config, data.get_symbol_ids())
+    Period.init(None, None)
+    return [_run.run(Period(), config, pc) for pc in period_configs]
+
+
+def _by_id(book, name):
+    """
+    Returns the book's column, ordered by Position id.
+    """
+    rows = book.rows()
+    return book.column(name)[rows[np.argsort(book.ids()[rows])]]
+
+
+def _data(*bars):
+    """
+    EURUSD data, one (open, high, low, close) per minute, and its
+    timestamps, a minute apart.
+    """
+    data = np.array([[v for b in bars for v in (*b, 1.0)]], np.float32)
+    return np.arange(len(bars), dtype=np.int64) * 60, data
+
+
+def _account(*orders, close_time=240):
+    """
+    An account holding a pending EURUSD Position per Order, numbered
+    from 1, which expire at close_time.
+    """
+    account = Account()
+    future = Bar(_EURUSD, 1.0, 1.0, 1.0, 1.0, 0.0, 60, close_time)
+    for p_id, (direction, open_bid, take_profit, stop_loss) in enumerate(orders, 1):
+        account.positions[p_id] = Position(
+            Order(_EURUSD, direction, open_bid, take_profit, stop_loss), future,
+            Status.PENDING, 60, close_time, -1, -1, 0.0, 0.0, 0.0, 0
+        )
+    return account
+
+
+def _locals():
+    return _run._Locals(_run.plan_symbols(None, np.array([_EURUSD], np.int64)))
+
+
+def _resolve(account, timestamps, data, _locals, minute=1, hold=3):
+    """
+    Resolves the account's new Positions over the hold window from
+    minute, as run does.
+    """
+    source = SimpleNamespace(get_partial_planar=lambda o, e: (
+        timestamps[o:e], Planar.from_interleaved(data[:, 5 * o:5 * e])
+    ))
+    resolve_positions(source, SimpleNamespace(account=account), SimpleNamespace(hold_minutes=hold), _locals, minute)
+    return _locals.resolved
+
+
+def _engines(orders, bars, close_time=240):
+    """
+    Runs the Orders through the loop engine and the resolved engine,
+    placed at the second minute and held to the last, and returns both
+    accounts.
+    """
+    timestamps, data = _data(*bars)
+    loop = _account(*orders, close_time=close_time)
+    _run.simulate(SimpleNamespace(account=loop), _locals(), timestamps, data)
+    resolved = _account(*orders, close_time=close_time)
+    _l = _locals()
+    _resolve(resolved, timestamps, data, _l, hold=len(bars) - 2)
+    simulate_resolved(SimpleNamespace(account=resolved), _l, timestamps, data)
+    return loop, resolved
+
+
+_FLAT = (1.0, 1.0, 1.0, 1.0)
+
+
+class TestResolver(ut.TestCase):
+    def test_resolve_positions_resolves_every_new_position_in_the_account(self):
+        """Auto-generated from _resolver.py:56"""
+        timestamps, data = _data(_FLAT, _FLAT, _FLAT, _FLAT, _FLAT)
+        account = _account((Direction.BUY, None, None, None), (Direction.SELL, 0.5, None, None))
+        resolved = _resolve(account, timestamps, data, _locals())
+        self.assertEqual(sorted(resolved), [1, 2])
+
+    def test_resolve_positions_leaves_already_resolved_positions_alone(self):
+        """Auto-generated from _resolver.py:56"""
+        timestamps, data = _data(_FLAT, _FLAT, _FLAT, _FLAT, _FLAT)
+        account = _account((Direction.BUY, None, None, None), (Direction.BUY, None, None, None))
+        _l = _locals()
+        _l.resolved[1] = "resolved"
+        resolved = _resolve(account, timestamps, data, _l)
+        self.assertEqual(resolved[1], "resolved")
+        self.assertEqual(resolved[2].status, Status.CLOSED)
+        self.assertEqual(account.positions[2].status, Status.PENDING)
+
+    def test_resolve_positions_opens_immediately_at_the_open_if_open_bid_is_None(self):
+        """Auto-generated from _resolver.py:56"""
+        timestamps, data = _data(_FLAT, (1.5, 1.5, 1.5, 1.5), _FLAT, _FLAT, _FLAT)
+        resolution = _resolve(_account((Direction.BUY, None, None, None)), timestamps, data, _locals())[1]
+        self.assertEqual(resolution.open_minute, 60)
+        self.assertEqual(resolution.open_time, 60)
+        self.assertEqual(resolution.open_rate, 1.5)
+        self.assertEqual(resolution.initial_value, Account.POSITION_OPEN_VALUE)
+
+    def test_resolve_positions_opens_between_minutes_before_opening_within_a_minute(self):
+        """Auto-generated from _resolver.py:56"""
+        # The rate moves from 1.0 to 1.2 between minutes, then ranges
+        # over [1.1, 1.3] within the minute.
+        timestamps, data = _data(_FLAT, _FLAT, (1.2, 1.3, 1.1, 1.2), _FLAT, _FLAT)
+        resolved = _resolve(
+            _account((Direction.BUY, 1.15, None, None), (Direction.BUY, 1.25, None, None)),
+            timestamps, data, _locals()
+        )
+        self.assertEqual((resolved[1].open_minute, resolved[1].open_time), (120, 120))
+        self.assertEqual((resolved[2].open_minute, resolved[2].open_time), (120, 150))
+        self.assertAlmostEqual(resolved[1].open_rate, 1.15)
+        self.assertAlmostEqual(resolved[2].open_rate, 1.25)
+
+    def test_resolve_positions_closes_on_take_profit_before_stop_loss_in_the_same_step(self):
+        """Auto-generated from _resolver.py:56"""
+        timestamps, data = _data(_FLAT, _FLAT, (1.0, 1.2, 0.8, 1.0), _FLAT, _FLAT)
+        resolution = _resolve(_account((Direction.BUY, None, 1.1, 0.9)), timestamps, data, _locals())[1]
+        self.assertEqual(resolution.status, Status.CLOSED_TAKE_PROFIT)
+        self.assertEqual((resolution.close_minute, resolution.close_time), (120, 150))
+        self.assertAlmostEqual(resolution.close_rate, 1.1)
+
+    def test_resolve_positions_expires_pending_positions_without_changing_their_value(self):
+        """Auto-generated from _resolver.py:56"""
+        timestamps, data = _data(_FLAT, _FLAT, _FLAT, _FLAT, _FLAT)
+        resolution = _resolve(_account((Direction.BUY, 0.5, None, None)), timestamps, data, _locals())[1]
+        self.assertEqual(resolution.status, Status.PENDING)
+        self.assertEqual(resolution.open_minute, np.inf)
+        self.assertEqual((resolution.close_minute, resolution.close_time), (240, 240))
+        self.assertEqual((resolution.held_value, resolution.initial_value, resolution.final_value), (0, 0, 0))
+
+    def test_resolve_positions_expires_open_positions_at_the_open_of_the_expiry_minute(self):
+        """Auto-generated from _resolver.py:56"""
+        timestamps, data = _data(_FLAT, _FLAT, _FLAT, _FLAT, (1.25, 1.5, 1.0, 1.25))
+        resolution = _resolve(_account((Direction.BUY, None, 2.0, 0.5)), timestamps, data, _locals())[1]
+        self.assertEqual(resolution.status, Status.CLOSED)
+        self.assertEqual((resolution.close_minute, resolution.close_time), (240, 240))
+        self.assertEqual(resolution.close_rate, 1.25)
+
+    def test_resolve_positions_matches_simulate_when_no_two_positions_close_in_the_same_minute(self):
+        """Auto-generated from _resolver.py:56"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "data.npz")
+            _write_data(filename)
+            loops = _run_periods(filename, "loop")
+            resolveds = _run_periods(filename, "resolved")
+        for loop, resolved in zip(loops, resolveds):
+            self.assertGreater(len(loop.history), 20)
+            self.assertEqual(sorted(loop.history), sorted(resolved.history))
+            for name, _ in PositionBook.FIELDS:
+                np.testing.assert_array_equal(_by_id(loop.history, name), _by_id(resolved.history, name), name)
+            np.testing.assert_array_equal(loop.balance.values, resolved.balance.values)
+            # The loop engine values each Position at the data's
+            # precision, so the equity only matches to that.
+            np.testing.assert_allclose(loop.equity.values, resolved.equity.values, atol=1e-3)
+
+    def test_simulate_resolved_does_nothing_but_carry_the_balance_forward_if_there_are_no_positions(self):
+        """Auto-generated from _resolver.py:231"""
+        timestamps, data = _data(_FLAT, _FLAT, _FLAT, _FLAT)
+        account = Account()
+        account.balance.append(5.0)
+        account.equity.append(5.0)
+        simulate_resolved(SimpleNamespace(account=account), _locals(), timestamps, data)
+        self.assertEqual(list(account.balance), [0.0, 5.0, 5.0, 5.0, 5.0])
+        self.assertEqual(list(account.equity), [0.0, 5.0, 5.0, 5.0, 5.0])
+        self.assertEqual(len(account.history), 0)
+
+    def test_simulate_resolved_adds_closed_positions_to_the_balance_on_their_closing_minute(self):
+        """Auto-generated from _resolver.py:231"""
+        loop, resolved = _engines(
+            [(Direction.BUY, None, 1.1, None), (Direction.SELL, None, None, 1.3)],
+            (_FLAT, _FLAT, (1.0, 1.2, 1.0, 1.0), _FLAT, (1.0, 1.4, 1.0, 1.0), _FLAT, _FLAT),
+            close_time=360
+        )
+        balance = list(resolved.balance)
+        self.assertEqual(balance, list(loop.balance))
+        self.assertEqual(len(set(balance)), 3)
+        self.assertEqual(balance[2], resolved.history[1].final_value - resolved.history[1].initial_value)
+        self.assertEqual(balance[2:4], [balance[2]] * 2)
+
+    def test_simulate_resolved_adds_open_positions_to_the_equity_every_minute(self):
+        """Auto-generated from _resolver.py:231"""
+        loop, resolved = _engines(
+            [(Direction.SELL, 1.1, None, None)],
+            (
+                _FLAT, _FLAT, (1.0, 1.2, 0.9, 1.1), (1.1, 1.2, 1.0, 1.2),
+                (1.2, 1.3, 1.1, 1.15), (1.15, 1.2, 1.1, 1.12), _FLAT
+            ),
+            close_time=360
+        )
+        # The balance only moves when the Position expires, at the end.
+        self.assertEqual(list(resolved.balance)[:-1], [0.0] * 6)
+        self.assertEqual(len(set(np.round(resolved.equity[3:6], 3))), 3)
+        np.testing.assert_allclose(list(loop.equity), list(resolved.equity), atol=1e-3)
+
+    def test_simulate_resolved_moves_closed_positions_into_the_history(self):
+        """Auto-generated from _resolver.py:231"""
+        timestamps, data = _data(_FLAT, _FLAT, (1.0, 1.2, 1.0, 1.0), _FLAT, _FLAT, _FLAT)
+        account = _account((Direction.BUY, None, 1.1, None), (Direction.BUY, None, None, None), close_time=300)
+        _l = _locals()
+        _resolve(account, timestamps, data, _l, hold=4)
+        simulate_resolved(SimpleNamespace(account=account), _l, timestamps[:4], data[:, :20])
+        self.assertEqual(list(account.history), [1])
+        self.assertEqual(list(account.positions), [2])
+        self.assertEqual(account.history[1].status, Status.CLOSED_TAKE_PROFIT)
+        self.assertEqual(account.history[1].close_time, 150)
+        self.assertNotIn(1, _l.resolved)
+        self.assertIn(2, _l.resolved)
+
+    def test_simulate_resolved_shows_positions_as_pending_until_their_opening_minute(self):
+        """Auto-generated from _resolver.py:231"""
+        timestamps, data = _data(_FLAT, _FLAT, _FLAT, (1.2, 1.2, 1.2, 1.2), _FLAT, _FLAT)
+        account = _account((Direction.BUY, 1.1, None, None), close_time=300)
+        _l = _locals()
+        _resolve(account, timestamps, data, _l, hold=4)
+        simulate_resolved(SimpleNamespace(account=account), _l, timestamps[:3], data[:, :15])
+        self.assertEqual(account.positions[1].status, Status.PENDING)
+        simulate_resolved(SimpleNamespace(account=account), _l, timestamps[2:5], data[:, 10:25])
+        self.assertEqual(account.positions[1].status, Status.OPEN)
+        self.assertEqual(account.positions[1].open_time, 180)
+
+    def test_first_touch_finds_the_first_minute_whose_range_includes_the_value(self):
+        """Auto-generated from _resolver.py:94"""
+        _, data = _data(_FLAT, _FLAT, (1.0, 1.1, 1.0, 1.0), (1.0, 1.3, 1.0, 1.0), _FLAT)
+        fields = Planar.from_interleaved(data)
+        touches = first_touch(fields, np.zeros(2, np.int64), np.zeros(2, np.int64), np.array([1.05, 1.2], np.float32))
+        self.assertEqual(touches.tolist(), [1, 2])
+
+    def test_first_touch_includes_the_move_from_the_previous_close_to_the_open(self):
+        """Auto-generated from _resolver.py:94"""
+        _, data = _data(_FLAT, _FLAT, (1.2, 1.3, 1.2, 1.2), _FLAT)
+        fields = Planar.from_interleaved(data)
+        touches = first_touch(fields, np.zeros(1, np.int64), np.zeros(1, np.int64), np.array([1.1], np.float32))
+        self.assertEqual(touches.tolist(), [1])
+
+    def test_first_touch_only_searches_from_the_start_given(self):
+        """Auto-generated from _resolver.py:94"""
+        _, data = _data(_FLAT, (1.0, 1.1, 1.0, 1.0), _FLAT, (1.0, 1.1, 1.0, 1.0), _FLAT)
+        fields = Planar.from_interleaved(data)
+        values = np.full(3, 1.05, np.float32)
+        touches = first_touch(fields, np.zeros(3, np.int64), np.array([0, 1, 3]), values)
+        self.assertEqual(touches.tolist(), [0, 2, 4])
+
+    def test_first_touch_returns_the_window_length_if_the_value_is_never_reached_or_NaN(self):
+        """Auto-generated from _resolver.py:94"""
+        _, data = _data(_FLAT, _FLAT, _FLAT, _FLAT)
+        fields = Planar.from_interleaved(data)
+        touches = first_touch(fields, np.zeros(2, np.int64), np.zeros(2, np.int64), np.array([2.0, np.nan], np.float32))
+        self.assertEqual(touches.tolist(), [3, 3])
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -1,6 +1,14 @@
 # Generated by generate_tests (from the Hokohoko project).
 import unittest as ut
 
+import numpy as np
+
+from hokohoko import _run, utils
+
+
+def _ids(*symbols):
+    return np.array([utils.convert_symbol_to_id(s) for s in symbols], np.int64)
+
 
 class TestRun(ut.TestCase):
     def test_run_raises_an_error_if_period_is_None(self):
@@ -331,6 +339,80 @@ class TestRun(ut.TestCase):
         """Auto-generated from _run.py:640"""
         self.fail('TODO: Implement me!')
 
+    def test_plan_symbols_plans_to_load_every_available_symbol_if_there_is_no_subset(self):
+        """Auto-generated from _run.py:622"""
+        available = _ids("EURUSD", "GBPUSD", "EURGBP")
+        plan = _run.plan_symbols(None, available)
+        self.assertIsNone(plan.required_symbols)
+        np.testing.assert_array_equal(plan.symbol_ids, available)
+        np.testing.assert_array_equal(plan.subset_filter, available)
+        self.assertTrue(plan.subset_mask.all())
+
+    def test_plan_symbols_plans_to_load_the_subset_and_its_conversion_symbols(self):
+        """Auto-generated from _run.py:622"""
+        available = _ids("EURUSD", "USDJPY", "GBPUSD", "EURGBP")
+        plan = _run.plan_symbols("EURGBP", available)
+        self.assertEqual(sorted(plan.required_symbols.split(",")), ["EURGBP", "EURUSD", "GBPUSD"])
+        np.testing.assert_array_equal(plan.symbol_ids, _ids("EURUSD", "GBPUSD", "EURGBP"))
+        np.testing.assert_array_equal(plan.subset_filter, _ids("EURGBP"))
+
+    def test_plan_symbols_keeps_the_order_the_symbols_are_available_in(self):
+        """Auto-generated from _run.py:622"""
+        available = _ids("EURUSD", "USDJPY", "GBPUSD", "EURGBP")
+        plan = _run.plan_symbols("EURGBP,USDJPY", available)
+        np.testing.assert_array_equal(plan.symbol_ids, _ids("EURUSD", "USDJPY", "GBPUSD", "EURGBP"))
+        self.assertEqual(plan.symbol_index, {int(s): i for i, s in enumerate(plan.symbol_ids)})
+
+    def test_plan_symbols_uses_the_loaded_symbols_if_given(self):
+        """Auto-generated from _run.py:622"""
+        available = _ids("EURUSD", "GBPUSD", "EURGBP")
+        loaded = _ids("EURGBP", "GBPUSD", "EURUSD")
+        plan = _run.plan_symbols("EURGBP", available, loaded=loaded)
+        np.testing.assert_array_equal(plan.symbol_ids, loaded)
+        self.assertEqual(plan.symbol_index, {int(s): i for i, s in enumerate(loaded)})
+        self.assertEqual(plan.base_index[0, 0], 2)
+        self.assertEqual(plan.target_index[0, 0], 1)
+
+    def test_plan_symbols_masks_the_loaded_symbols_in_the_subset(self):
+        """Auto-generated from _run.py:622"""
+        available = _ids("EURUSD", "GBPUSD", "EURGBP")
+        plan = _run.plan_symbols("EURGBP,EURUSD", available)
+        self.assertEqual(plan.subset_mask.tolist(), [True, False, True])
+
+    def test_plan_symbols_maps_each_symbol_to_its_chain_of_conversion_rows(self):
+        """Auto-generated from _run.py:622"""
+        # GBP only converts through EUR, and AUD not at all.
+        available = _ids("EURUSD", "GBPEUR", "USDJPY", "AUDNZD")
+        plan = _run.plan_symbols(None, available)
+        self.assertEqual(plan.base_index.tolist(), [[0, -1], [1, 0], [2, -1], [-1, -1]])
+        self.assertEqual(plan.target_index.tolist(), [[0, -1], [0, -1], [2, -1], [-1, -1]])
+        self.assertEqual(plan.same[:3].tolist(), [True, False, True])
+
+    def test_plan_symbols_inverts_each_rate_quoted_in_the_currency_nearer_the_account_currency(self):
+        """Auto-generated from _run.py:622"""
+        # Rates are taken as currency per USD: EUR needs EURUSD
+        # inverting, JPY doesn't need USDJPY inverting.
+        available = _ids("EURUSD", "USDJPY", "EURJPY")
+        plan = _run.plan_symbols(None, available)
+        self.assertEqual(plan.base_invert[2].tolist(), [True])
+        self.assertEqual(plan.target_invert[2].tolist(), [False])
+        self.assertEqual(plan.base_invert[0].tolist(), [True])
+        self.assertEqual(plan.base_invert[1].tolist(), [False])
+
+    def test_plan_symbols_inverts_each_hop_of_a_chain_through_a_USDfirst_pair_correctly(self):
+        """Auto-generated from _run.py:641"""
+        # NOK converts through NOKJPY then USDJPY, and SEK through
+        # NOKSEK, NOKJPY then USDJPY. Each rate is in currency per USD.
+        available = np.array([utils.convert_symbol_to_id(s) for s in
+                              ("EURUSD", "USDJPY", "NOKJPY", "NOKSEK")], np.int64)
+        plan = _run.plan_symbols(None, available)
+
+        nokjpy, noksek = plan.symbol_index[int(available[2])], plan.symbol_index[int(available[3])]
+        self.assertEqual([2, 1], list(plan.base_index[nokjpy, :2]))
+        self.assertEqual([True, False], list(plan.base_invert[nokjpy, :2]))
+        self.assertEqual([3, 2, 1], list(plan.target_index[noksek, :3]))
+        self.assertEqual([False, True, False], list(plan.target_invert[noksek, :3]))
+
 
 if __name__ == '__main__':
     ut.main()
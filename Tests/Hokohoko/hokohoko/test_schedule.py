@@ -0,0 +1,149 @@
+# Generated by generate_tests (from the Hokohoko project).
+import os
+import tempfile
+import unittest as ut
+
+import numpy as np
+
+from hokohoko import _schedule
+from hokohoko._period import PeriodConfig
+from hokohoko._schedule import TASKS_PER_PROCESS, Timing
+from hokohoko.entities import Config
+
+
+def _period(period_id, origin, end, symbols=2):
+    return PeriodConfig(period_id, origin, (origin + end) // 2, end, np.arange(symbols, dtype=np.int64))
+
+
+def _ids(tasks):
+    return [[pc.period_id for pc in task] for task in tasks]
+
+
+class TestSchedule(ut.TestCase):
+    def test_load_timings_returns_an_empty_dict_if_filename_is_None(self):
+        """Auto-generated from _schedule.py:50"""
+        self.assertEqual(_schedule.load_timings(None), {})
+
+    def test_load_timings_returns_an_empty_dict_if_the_file_doesnt_exist(self):
+        """Auto-generated from _schedule.py:50"""
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(_schedule.load_timings(os.path.join(directory, "timings.json")), {})
+
+    def test_load_timings_reads_the_timings_written_by_save_timings(self):
+        """Auto-generated from _schedule.py:50"""
+        timings = {"a": 1.5, "b": 0.25}
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "timings.json")
+            _schedule.save_timings(filename, timings)
+            self.assertEqual(_schedule.load_timings(filename), timings)
+
+    def test_timing_key_differs_by_predictor_data_subset_and_engine(self):
+        """Auto-generated from _schedule.py:83"""
+        period = _period(0, 0, 100)
+        keys = {
+            _schedule.timing_key(config, period) for config in (
+                Config(),
+                Config(predictor_class="other.Predictor"),
+                Config(data_class="hokohoko.standard.Native"),
+                Config(data_parameters="other.npz"),
+                Config(data_subset="EURUSD"),
+                Config(engine="vectorized")
+            )
+        }
+        self.assertEqual(len(keys), 6)
+
+    def test_timing_key_differs_by_the_Periods_minutes(self):
+        """Auto-generated from _schedule.py:83"""
+        periods = (
+            PeriodConfig(0, 0, 50, 100, np.arange(2)),
+            PeriodConfig(0, 10, 50, 100, np.arange(2)),
+            PeriodConfig(0, 0, 60, 100, np.arange(2)),
+            PeriodConfig(0, 0, 50, 110, np.arange(2))
+        )
+        self.assertEqual(len({_schedule.timing_key(Config(), pc) for pc in periods}), 4)
+        self.assertEqual(
+            _schedule.timing_key(Config(), periods[0]),
+            _schedule.timing_key(Config(), periods[0]._replace(period_id=5))
+        )
+
+    def test_estimate_costs_uses_the_minutes_times_the_symbols_without_timings(self):
+        """Auto-generated from _schedule.py:100"""
+        periods = [_period(0, 0, 100, 2), _period(1, 0, 50, 3)]
+        self.assertEqual(_schedule.estimate_costs(Config(), periods, {}).tolist(), [200.0, 150.0])
+
+    def test_estimate_costs_uses_the_timings_where_known(self):
+        """Auto-generated from _schedule.py:100"""
+        periods = [_period(0, 0, 100), _period(1, 100, 200)]
+        timings = {_schedule.timing_key(Config(), pc): t for pc, t in zip(periods, (3.0, 5.0))}
+        self.assertEqual(_schedule.estimate_costs(Config(), periods, timings).tolist(), [3.0, 5.0])
+
+    def test_estimate_costs_scales_the_estimate_of_the_others_to_match_the_timings(self):
+        """Auto-generated from _schedule.py:100"""
+        periods = [_period(0, 0, 100, 2), _period(1, 100, 200, 4)]
+        timings = {_schedule.timing_key(Config(), periods[0]): 2.0}
+        self.assertEqual(_schedule.estimate_costs(Config(), periods, timings).tolist(), [2.0, 4.0])
+
+    def test_schedule_returns_one_group_per_Period_in_order_if_ordered(self):
+        """Auto-generated from _schedule.py:130"""
+        periods = [_period(i, 0, 100 * (i + 1)) for i in range(4)]
+        for cache_bytes in (None, 1 << 20):
+            config = Config(schedule="ordered", cache_bytes=cache_bytes)
+            self.assertEqual(_ids(_schedule.schedule(config, periods, {})), [[0], [1], [2], [3]])
+        self.assertEqual(_ids(_schedule.schedule(Config(), periods, {})), [[0], [1], [2], [3]])
+
+    def test_schedule_returns_the_most_expensive_groups_first(self):
+        """Auto-generated from _schedule.py:130"""
+        periods = [_period(i, 100 * i, 100 * i + 50, symbols) for i, symbols in enumerate((1, 3, 2))]
+        tasks = _schedule.schedule(Config(schedule="cost"), periods, {})
+        self.assertEqual(_ids(tasks), [[1], [2], [0]])
+
+    def test_schedule_keeps_each_group_in_order_of_origin(self):
+        """Auto-generated from _schedule.py:130"""
+        periods = [_period(i, 10 * (7 - i), 10 * (7 - i) + 100) for i in range(8)]
+        config = Config(schedule="cost", cache_bytes=1 << 20, process_count=1)
+        for task in _schedule.schedule(config, periods, {}):
+            origins = [pc.origin for pc in task]
+            self.assertEqual(origins, sorted(origins))
+
+    def test_schedule_only_groups_Periods_that_overlap(self):
+        """Auto-generated from _schedule.py:130"""
+        periods = [_period(i, 10 * i, 10 * i + 100) for i in range(3)]
+        periods += [_period(i, 1000 + 10 * i, 1100 + 10 * i) for i in range(3, 8)]
+        config = Config(schedule="cost", cache_bytes=1 << 20, process_count=1)
+        tasks = _schedule.schedule(config, periods, {})
+        self.assertEqual(sorted(_ids(tasks)), [[0, 1], [2], [3], [4, 5], [6, 7]])
+
+    def test_schedule_makes_up_to_TASKS_PER_PROCESS_groups_per_process(self):
+        """Auto-generated from _schedule.py:130"""
+        periods = [_period(i, 10 * i, 10 * i + 100) for i in range(4 * TASKS_PER_PROCESS)]
+        config = Config(schedule="cost", cache_bytes=1 << 20, process_count=1)
+        tasks = _schedule.schedule(config, periods, {})
+        self.assertEqual(len(tasks), TASKS_PER_PROCESS)
+        self.assertEqual(sorted(pc.period_id for task in tasks for pc in task), list(range(len(periods))))
+
+    def test_schedule_doesnt_group_if_theres_no_data_cache(self):
+        """Auto-generated from _schedule.py:130"""
+        periods = [_period(i, 10 * i, 10 * i + 100) for i in range(8)]
+        tasks = _schedule.schedule(Config(schedule="cost", process_count=1), periods, {})
+        self.assertEqual(_ids(tasks), [[i] for i in range(8)])
+
+    def test_schedule_raises_an_error_on_an_unknown_schedule(self):
+        """Auto-generated from _schedule.py:130"""
+        with self.assertRaises(ValueError):
+            _schedule.schedule(Config(schedule="fifo"), [_period(0, 0, 100)], {})
+        with self.assertRaises(ValueError):
+            _schedule.schedule(Config(schedule="fifo"), [], {})
+
+    def test_idle_times_reports_the_idle_seconds_of_each_process(self):
+        """Auto-generated from _schedule.py:191"""
+        timings = [Timing(0, 10, 0.0, 4.0), Timing(1, 11, 0.0, 6.0), Timing(2, 10, 5.0, 9.0)]
+        self.assertEqual(_schedule.idle_times(timings, 0.0, 10.0, 2), {10: 2.0, 11: 4.0})
+
+    def test_idle_times_reports_processes_without_Periods_as_idle_throughout(self):
+        """Auto-generated from _schedule.py:191"""
+        timings = [Timing(0, 10, 0.0, 10.0)]
+        self.assertEqual(_schedule.idle_times(timings, 0.0, 10.0, 3), {10: 0.0, None: 20.0})
+
+
+if __name__ == '__main__':
+    ut.main()
@@ -1,6 +1,28 @@
 # Generated by generate_tests (from the Hokohoko project).
+import itertools
+import time
 import unittest as ut
 
+import numpy as np
+
+from hokohoko import utils
+
+
+def _ids(*symbols):
+    return np.array([utils.convert_symbol_to_id(s) for s in symbols], np.int64)
+
+
+def _map_time(symbol_ids):
+    """
+    The quickest of three runs of generate_currency_map, in seconds.
+    """
+    times = []
+    for _ in range(3):
+        start = time.perf_counter()
+        utils.generate_currency_map(symbol_ids)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
 
 class TestUtils(ut.TestCase):
     def test_get_fq_class_raises_an_error_it_it_cant_access_the_module(self):
@@ -83,6 +105,108 @@ class TestUtils(ut.TestCase):
         """Auto-generated from utils.py:117"""
         self.fail('TODO: Implement me!')
 
+    def test_generate_currency_map_symbols_map_to_a_chain_of_pairs_if_there_is_no_direct_pair(self):
+        """Auto-generated from utils.py:123"""
+        eurusd, gbpeur = _ids("EURUSD", "GBPEUR")
+        currency_map = utils.generate_currency_map(np.array([eurusd, gbpeur]))
+        self.assertEqual(currency_map[gbpeur], (1, (gbpeur, eurusd), (eurusd,)))
+
+    def test_generate_currency_map_chains_are_the_shortest_available(self):
+        """Auto-generated from utils.py:123"""
+        # GBP converts through CHF then JPY, or through EUR.
+        symbol_ids = _ids("GBPCHF", "CHFJPY", "USDJPY", "GBPEUR", "EURUSD")
+        currency_map = utils.generate_currency_map(symbol_ids)
+        self.assertEqual(currency_map[symbol_ids[3]][1], (symbol_ids[3], symbol_ids[4]))
+        self.assertEqual(currency_map[symbol_ids[0]][1], (symbol_ids[3], symbol_ids[4]))
+        self.assertEqual(currency_map[symbol_ids[0]][2], (symbol_ids[1], symbol_ids[2]))
+
+    def test_generate_currency_map_scales_linearly_with_the_number_of_symbols(self):
+        """Auto-generated from utils.py:123"""
+        # Each made-up currency is quoted against USD and the one before,
+        # so every symbol needs converting.
+        currencies = ["".join(c) for c in itertools.product("ABCDEFGHIJKLMNOPQRSTUVWXYZ", repeat=3)]
+        currencies.remove("USD")
+
+        def _symbols(count):
+            pairs = [c + "USD" for c in currencies[:count]]
+            pairs += [a + b for a, b in zip(currencies[1:count], currencies[:count - 1])]
+            return _ids(*pairs)
+
+        small, large = _map_time(_symbols(1000)), _map_time(_symbols(4000))
+        self.assertLess(large, 10 * small)
+
+    def test_subset_currency_map_reindexes_symbols_to_the_rows_of_symbol_ids(self):
+        """Auto-generated from utils.py:195"""
+        eurusd, gbpusd, eurgbp = _ids("EURUSD", "GBPUSD", "EURGBP")
+        currency_map = utils.generate_currency_map(np.array([eurusd, gbpusd, eurgbp]))
+        subset = utils.subset_currency_map(currency_map, np.array([eurgbp, eurusd, gbpusd]))
+        self.assertEqual(subset[eurgbp], (0, (eurusd,), (gbpusd,)))
+        self.assertEqual(subset[eurusd], (1, (eurusd,), (eurusd,)))
+        self.assertEqual(subset[gbpusd], (2, (gbpusd,), (gbpusd,)))
+
+    def test_subset_currency_map_drops_symbols_that_are_not_in_symbol_ids(self):
+        """Auto-generated from utils.py:195"""
+        eurusd, gbpusd, eurgbp = _ids("EURUSD", "GBPUSD", "EURGBP")
+        currency_map = utils.generate_currency_map(np.array([eurusd, gbpusd, eurgbp]))
+        subset = utils.subset_currency_map(currency_map, np.array([eurusd, eurgbp]))
+        self.assertEqual(sorted(subset), sorted([eurusd, eurgbp]))
+
+    def test_subset_currency_map_maps_chains_to_None_if_any_of_their_pairs_are_not_in_symbol_ids(self):
+        """Auto-generated from utils.py:195"""
+        eurusd, gbpeur = _ids("EURUSD", "GBPEUR")
+        currency_map = utils.generate_currency_map(np.array([eurusd, gbpeur]))
+        subset = utils.subset_currency_map(currency_map, np.array([gbpeur]))
+        self.assertEqual(subset, {gbpeur: (0, None, None)})
+
+    def test_resolve_subset_returns_every_row_if_there_is_no_subset(self):
+        """Auto-generated from utils.py:230"""
+        self.assertEqual(utils.resolve_subset(_ids("EURUSD", "GBPUSD", "USDJPY"), None).tolist(), [0, 1, 2])
+        self.assertEqual(utils.resolve_subset(_ids(), None).tolist(), [])
+
+    def test_resolve_subset_returns_the_rows_of_the_subset_in_the_order_of_symbol_ids(self):
+        """Auto-generated from utils.py:230"""
+        symbol_ids = _ids("EURUSD", "GBPUSD", "USDJPY", "AUDUSD")
+        self.assertEqual(utils.resolve_subset(symbol_ids, "AUDUSD,EURUSD,USDJPY").tolist(), [0, 2, 3])
+
+    def test_resolve_subset_accepts_a_commaseparated_string_or_a_list_of_symbols(self):
+        """Auto-generated from utils.py:230"""
+        symbol_ids = _ids("EURUSD", "GBPUSD", "USDJPY")
+        for symbol_subset in ("USDJPY,GBPUSD", " USDJPY , GBPUSD,", ["USDJPY", "GBPUSD"], ("GBPUSD", "USDJPY")):
+            self.assertEqual(utils.resolve_subset(symbol_ids, symbol_subset).tolist(), [1, 2], symbol_subset)
+
+    def test_resolve_subset_ignores_symbols_that_are_not_in_symbol_ids(self):
+        """Auto-generated from utils.py:230"""
+        symbol_ids = _ids("EURUSD", "GBPUSD")
+        self.assertEqual(utils.resolve_subset(symbol_ids, "NZDCAD,GBPUSD").tolist(), [1])
+        self.assertEqual(utils.resolve_subset(symbol_ids, "NZDCAD").tolist(), [])
+
+    def test_resolve_subset_only_matches_whole_symbols(self):
+        """Auto-generated from utils.py:230"""
+        symbol_ids = _ids("EURUSD", "GBPUSD", "USDJPY")
+        for symbol_subset in ("USD", "EUR", "SDJ", "EURUSDX"):
+            self.assertEqual(utils.resolve_subset(symbol_ids, symbol_subset).tolist(), [], symbol_subset)
+
+    def test_parse_timestamp_accepts_UTC_seconds(self):
+        """Auto-generated from utils.py:265"""
+        self.assertEqual(utils.parse_timestamp("1577836800"), 1577836800.0)
+        self.assertEqual(utils.parse_timestamp("60.5"), 60.5)
+
+    def test_parse_timestamp_accepts_ISO_8601_dates_and_times(self):
+        """Auto-generated from utils.py:265"""
+        self.assertEqual(utils.parse_timestamp("2020-01-01T12:00+12:00"), 1577836800.0)
+        self.assertEqual(utils.parse_timestamp("2020-01-01T00:01:30+00:00"), 1577836890.0)
+
+    def test_parse_timestamp_treats_dates_and_times_without_a_timezone_as_UTC(self):
+        """Auto-generated from utils.py:265"""
+        self.assertEqual(utils.parse_timestamp("2020-01-01"), 1577836800.0)
+        self.assertEqual(utils.parse_timestamp("2020-01-01T00:01"), 1577836860.0)
+
+    def test_parse_timestamp_raises_an_error_if_the_value_is_neither(self):
+        """Auto-generated from utils.py:265"""
+        for value in ("", "yesterday", "2020-13-01"):
+            with self.assertRaises(ValueError):
+                utils.parse_timestamp(value)
+
 
 if __name__ == '__main__':
     ut.main()
@@ -0,0 +1,257 @@
+# Generated by generate_tests (from the Hokohoko project).
+import os
+import tempfile
+import unittest as ut
+from types import SimpleNamespace
+
+import numpy as np
+
+from hokohoko import Hokohoko, _run, utils
+from hokohoko._period import Period
+from hokohoko._vectorized import conversion_indexes, simulate_vectorized
+from hokohoko.entities import Account, Bar, Config, Direction, Order, Position, PositionBook, Predictor, Status
+from hokohoko.standard import Npz
+
+
+class _Random(Predictor):
+    """
+    Places random market and limit Orders, some with a take profit or
+    stop loss, on most symbols every Bar.
+    """
+    def seed(self, a=None, version=2):
+        # Predictor seeds with itself, which newer Pythons reject.
+        super().seed(0, version)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def on_start(self, bars):
+        pass
+
+    def on_bar(self, bars):
+        for b in bars:
+            if self.random() < 0.3:
+                continue
+            direction = Direction.BUY if self.random() < 0.5 else Direction.SELL
+            close = float(b.close)
+            width = (float(b.high) - float(b.low)) or close * 0.001
+            open_bid = None if self.random() < 0.5 else close + (self.random() - 0.5) * width
+            sign = 1 if direction == Direction.BUY else -1
+            rate = close if open_bid is None else open_bid
+            take_profit = None if self.random() < 0.2 else rate + sign * self.random() * width
+            stop_loss = None if self.random() < 0.2 else rate - sign * self.random() * width
+            self.place_order(Order(b.symbol_id, direction, open_bid, take_profit, stop_loss))
+
+
+def _write_data(filename, minutes=1500):
+    """
+    Writes a random walk for symbols converted directly, by a cross and
+    through another pair, in the npz format.
+    """
+    symbols = ("EURUSD", "USDJPY", "EURJPY", "GBPUSD", "EURGBP")
+    rng = np.random.default_rng(1)
+    data = np.empty((len(symbols), minutes * 5), np.float32)
+    for i, start in enumerate((1.1, 110.0, 121.0, 1.3, 0.85)):
+        close = start * np.exp(rng.normal(0, 0.0004, minutes).cumsum())
+        open_ = np.concatenate(([start], close[:-1]))
+        data[i, 0::5] = open_
+        data[i, 1::5] = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.0002, minutes)))
+        data[i, 2::5] = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.0002, minutes)))
+        data[i, 3::5] = close
+        data[i, 4::5] = rng.integers(0, 100, minutes)
+    np.savez(
+        filename,
+        symbol_ids=np.array([utils.convert_symbol_to_id(s) for s in symbols], np.int64),
+        timestamps=1577836800.0 + 60 * np.arange(minutes),
+        data=data
+    )
+
+
+def _run_periods(filename, engine):
+    """
+    Runs two Periods of the random Predictor with the given engine.
+    """
+    config = Config(
+        predictor_class=f"{__name__}._Random",
+        data_class="hokohoko.standard.Npz",
+        data_parameters=filename,
+        engine=engine,
+        period_count=2,
+        past_minutes=5,
+        hold_minutes=60,
+        training_minutes=100,
+        test_minutes=500
+    )
+    with Npz(filename, None, load=False) as data:
+        period_configs = Hokohoko._calculate_periods(data.get_minutes(), config, data.get_symbol_ids())
+    Period.init(None, None)
+    return [_run.run(Period(), config, pc) for pc in period_configs]
+
+
+def _simulate(engine, take_profit, stop_loss):
+    """
+    Runs two open EURUSD BUYs through three minutes, the first of which
+    touches take_profit at its high and stop_loss at its low.
+    """
+    symbol_id = utils.convert_symbol_to_id("EURUSD")
+    _locals = _run._Locals(_run.plan_symbols(None, np.array([symbol_id], np.int64)))
+    account = Account()
+    future = Bar(symbol_id, 0.87, 0.87, 0.87, 0.87, 0.0, 0, 240)
+    for p_id, order in ((1, Order(symbol_id, Direction.BUY, None, take_profit, None)),
+                        (2, Order(symbol_id, Direction.BUY, None, None, stop_loss))):
+        account.positions[p_id] = Position(
+            order, future, Status.OPEN, 0, 240, 0.87, 0.0, 1000.0, 1000.0, 1000.0, 0
+        )
+    timestamps = np.array([0, 60, 120, 180], np.int64)
+    data = np.array([[0.87, 0.87, 0.87, 0.87, 1.0,
+                      0.87, take_profit, stop_loss, 0.87, 1.0,
+                      0.87, take_profit, stop_loss, 0.87, 1.0,
+                      0.87, 0.87, 0.87, 0.87, 1.0]], np.float32)
+    engine(SimpleNamespace(account=account), _locals, timestamps, data)
+    return account
+
+
+def _conversion_book(*orders):
+    """
+    A book of one Position per (symbol, direction, symbol_row), and the
+    period-local variables for EURUSD, GBPUSD, EURGBP and AUDNZD, of
+    which AUDNZD has no conversion.
+    """
+    symbol_ids = np.array(
+        [utils.convert_symbol_to_id(s) for s in ("EURUSD", "GBPUSD", "EURGBP", "AUDNZD")], np.int64
+    )
+    _locals = _run._Locals(_run.plan_symbols(None, symbol_ids))
+    book = Account().positions
+    for p_id, (symbol, direction, row) in enumerate(orders):
+        symbol_id = utils.convert_symbol_to_id(symbol)
+        book[p_id] = Position(
+            Order(symbol_id, direction), Bar(symbol_id, 1.0, 1.0, 1.0, 1.0, 0.0, 0, 60),
+            Status.PENDING, 0, 60, -1, -1, 0.0, 0.0, 0.0, row
+        )
+    return book, _locals
+
+
+def _by_id(book, name):
+    """
+    Returns the book's column, ordered by Position id.
+    """
+    rows = book.rows()
+    return book.column(name)[rows[np.argsort(book.ids()[rows])]]
+
+
+class TestVectorized(ut.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "data.npz")
+            _write_data(filename)
+            cls.loop = _run_periods(filename, "loop")
+            cls.vectorized = _run_periods(filename, "vectorized")
+
+    def test_simulate_vectorized_does_nothing_but_carry_the_balance_forward_if_there_are_no_positions(self):
+        """Auto-generated from _vectorized.py:188"""
+        symbol_id = utils.convert_symbol_to_id("EURUSD")
+        _locals = _run._Locals(_run.plan_symbols(None, np.array([symbol_id], np.int64)))
+        account = Account()
+        account.balance.append(5.0)
+        account.equity.append(5.0)
+        data = np.arange(20, dtype=np.float32)[None, :]
+        simulate_vectorized(SimpleNamespace(account=account), _locals, np.arange(4) * 60, data)
+        self.assertEqual(list(account.balance), [0.0, 5.0, 5.0, 5.0, 5.0])
+        self.assertEqual(list(account.equity), [0.0, 5.0, 5.0, 5.0, 5.0])
+        self.assertEqual(len(account.history), 0)
+
+    def test_simulate_vectorized_produces_the_same_balance_and_equity_as_simulate(self):
+        """Auto-generated from _vectorized.py:188"""
+        for loop, vectorized in zip(self.loop, self.vectorized):
+            self.assertGreater(len(loop.history), 100)
+            np.testing.assert_array_equal(loop.balance.values, vectorized.balance.values)
+            np.testing.assert_array_equal(loop.equity.values, vectorized.equity.values)
+
+    def test_simulate_vectorized_produces_the_same_history_as_simulate(self):
+        """Auto-generated from _vectorized.py:188"""
+        for loop, vectorized in zip(self.loop, self.vectorized):
+            self.assertEqual(sorted(loop.history), sorted(vectorized.history))
+            for name, _ in PositionBook.FIELDS:
+                np.testing.assert_array_equal(
+                    _by_id(loop.history, name), _by_id(vectorized.history, name), err_msg=name
+                )
+
+    def test_simulate_vectorized_closes_at_most_one_position_per_minute_as_simulate_does(self):
+        """Auto-generated from _vectorized.py:188"""
+        # Both Positions touch their thresholds in the second minute,
+        # but only the first closes then. The second is left until the
+        # minute after.
+        for engine in (_run.simulate, simulate_vectorized):
+            account = _simulate(engine, 0.88, 0.86)
+            self.assertEqual(Status.CLOSED_TAKE_PROFIT, account.history[1].status)
+            self.assertEqual(90, account.history[1].close_time)
+            self.assertEqual(Status.CLOSED_STOP_LOSS, account.history[2].status)
+            self.assertEqual(150, account.history[2].close_time)
+
+    def test_simulate_vectorized_leaves_the_positions_in_the_same_order(self):
+        """Auto-generated from _vectorized.py:188"""
+        symbol_id = utils.convert_symbol_to_id("EURUSD")
+        _locals = _run._Locals(_run.plan_symbols(None, np.array([symbol_id], np.int64)))
+        future = Bar(symbol_id, 0.87, 0.87, 0.87, 0.87, 0.0, 0, 240)
+        timestamps = np.array([0, 60, 120], np.int64)
+        data = np.array([[0.87, 0.87, 0.87, 0.87, 1.0,
+                          0.87, 0.88, 0.86, 0.87, 1.0,
+                          0.87, 0.87, 0.87, 0.87, 1.0]], np.float32)
+        orders = []
+        for engine in (_run.simulate, simulate_vectorized):
+            account = Account()
+            for p_id, take_profit in ((5, None), (3, 0.88), (9, None), (1, None)):
+                account.positions[p_id] = Position(
+                    Order(symbol_id, Direction.BUY, None, take_profit, None), future,
+                    Status.OPEN, 0, 240, 0.87, 0.0, 1000.0, 1000.0, 1000.0, 0
+                )
+            engine(SimpleNamespace(account=account), _locals, timestamps, data)
+            self.assertEqual(list(account.history), [3])
+            orders.append(list(account.positions))
+        self.assertEqual(orders, [[5, 9, 1], [5, 9, 1]])
+
+    def test_simulate_vectorized_compares_thresholds_at_the_datas_precision_as_simulate_does(self):
+        """Auto-generated from _vectorized.py:205"""
+        # The take profit and stop loss are the float64 nearest the
+        # minute's high and low, which float32 rounds to exactly them.
+        high, low = 0.87205, 0.86795
+        results = [_simulate(engine, high, low) for engine in (_run.simulate, simulate_vectorized)]
+        for account in results:
+            self.assertEqual(Status.CLOSED_TAKE_PROFIT, account.history[1].status)
+            self.assertEqual(90, account.history[1].close_time)
+            self.assertEqual(Status.CLOSED_STOP_LOSS, account.history[2].status)
+        self.assertEqual(
+            [(p.status, p.close_time, p.final_value) for p in results[0].history.values()],
+            [(p.status, p.close_time, p.final_value) for p in results[1].history.values()]
+        )
+        np.testing.assert_array_equal(results[0].balance.values, results[1].balance.values)
+
+    def test_conversion_indexes_takes_each_Positions_symbol_row_from_the_book(self):
+        """Auto-generated from _vectorized.py:41"""
+        book, _locals = _conversion_book(("EURGBP", Direction.BUY, 2), ("EURUSD", Direction.SELL, 0))
+        s_index, _, same, _, buy = conversion_indexes(book, book.rows(), _locals)
+        self.assertEqual(s_index.tolist(), [2, 0])
+        self.assertEqual(same.tolist(), [False, True])
+        self.assertEqual(buy.tolist(), [True, False])
+
+    def test_conversion_indexes_takes_the_target_chain_for_a_BUY_and_the_base_chain_for_a_SELL(self):
+        """Auto-generated from _vectorized.py:41"""
+        book, _locals = _conversion_book(("EURGBP", Direction.BUY, 2), ("EURGBP", Direction.SELL, 2))
+        _, a_index, _, invert, buy = conversion_indexes(book, book.rows(), _locals)
+        self.assertEqual(a_index.tolist(), [[1], [0]])
+        self.assertEqual(invert.tolist(), [[True], [True]])
+        self.assertEqual(buy.tolist(), [True, False])
+
+    def test_conversion_indexes_raises_an_error_naming_a_symbol_with_no_conversion(self):
+        """Auto-generated from _vectorized.py:41"""
+        book, _locals = _conversion_book(("EURUSD", Direction.BUY, 0), ("AUDNZD", Direction.BUY, 3))
+        with self.assertRaisesRegex(ValueError, "AUDNZD"):
+            conversion_indexes(book, book.rows(), _locals)
+
+
+if __name__ == '__main__':
+    ut.main()
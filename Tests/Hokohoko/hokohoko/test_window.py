@@ -0,0 +1,176 @@
+# Generated by generate_tests (from the Hokohoko project).
+import os
+import tempfile
+import unittest as ut
+
+import numpy as np
+
+from hokohoko import utils
+from hokohoko._window import Window
+from hokohoko.entities import Data
+from hokohoko.standard import Npz
+
+
+def _write_data(filename, minutes=300):
+    """
+    Writes random data for three symbols in the npz format.
+    """
+    rng = np.random.default_rng(0)
+    np.savez(
+        filename,
+        symbol_ids=np.array([utils.convert_symbol_to_id(s) for s in ("EURUSD", "GBPUSD", "USDJPY")], np.int64),
+        timestamps=1577836800.0 + 60 * np.arange(minutes),
+        data=rng.random((3, 5 * minutes)).astype(np.float32)
+    )
+
+
+class _Source(Data):
+    """
+    100 minutes of one symbol, counting the chunks loaded.
+    """
+    loads = []
+
+    def __enter__(self):
+        end = 100 if self.end is None else self.end
+        self.symbol_ids = np.array([1])
+        self.timestamps = np.arange(self.origin, end) * 60
+        if self.load:
+            _Source.loads.append(self.origin)
+            self.data = np.arange(self.origin * 5, end * 5, dtype=np.float32)[None, :]
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.data = None
+
+    def get_symbol_ids(self):
+        return self.symbol_ids
+
+    def get_partial_data(self, origin, end):
+        return (self.timestamps[origin - self.origin:end - self.origin],
+                self.data[:, (origin - self.origin) * 5:(end - self.origin) * 5])
+
+
+class TestWindow(ut.TestCase):
+    def test_init_raises_an_error_if_minutes_is_less_than_1(self):
+        """Auto-generated from _window.py:48"""
+        for minutes in (0, -5):
+            with self.assertRaises(ValueError):
+                Window(_Source, minutes, "")
+
+    def test_enter_reads_the_symbols_and_timestamps_without_loading_any_data(self):
+        """Auto-generated from _window.py:76"""
+        _Source.loads = []
+        with Window(_Source, 10, "", origin=20, end=50) as window:
+            self.assertEqual(window.symbol_ids.tolist(), [1])
+            self.assertEqual(window.timestamps.tolist(), (np.arange(20, 50) * 60).tolist())
+            self.assertIsNone(window.data)
+        self.assertEqual(_Source.loads, [])
+
+    def test_enter_starts_with_no_chunks(self):
+        """Auto-generated from _window.py:76"""
+        with Window(_Source, 10, "") as window:
+            self.assertEqual(window._chunks, {})
+            window.get_partial_data(0, 5)
+        with window:
+            self.assertEqual(window._chunks, {})
+
+    def test_get_symbol_ids_returns_the_correct_symbol_ids(self):
+        """Auto-generated from _window.py:103"""
+        with Window(_Source, 10, "") as window:
+            self.assertEqual(window.get_symbol_ids().tolist(), [1])
+
+    def test_get_minutes_returns_the_correct_count_of_minutes(self):
+        """Auto-generated from _window.py:111"""
+        with Window(_Source, 10, "") as window:
+            self.assertEqual(window.get_minutes(), 100)
+        with Window(_Source, 10, "", origin=25, end=60) as window:
+            self.assertEqual(window.get_minutes(), 35)
+
+    def test_get_partial_data_raises_an_error_if_origin_is_negative(self):
+        """Auto-generated from _window.py:119"""
+        with Window(_Source, 10, "") as window:
+            with self.assertRaises(ValueError):
+                window.get_partial_data(-1, 5)
+
+    def test_get_partial_data_raises_an_error_if_end_is_less_than_origin(self):
+        """Auto-generated from _window.py:119"""
+        with Window(_Source, 10, "") as window:
+            with self.assertRaises(ValueError):
+                window.get_partial_data(5, 5)
+
+    def test_get_partial_data_matches_the_wrapped_source(self):
+        """Auto-generated from _window.py:119"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "data.npz")
+            _write_data(filename)
+            for symbol_subset, origin, end in ((None, 0, None), ("USDJPY,EURUSD", 35, 290)):
+                with Npz(filename, symbol_subset, origin, end) as source:
+                    with Window(Npz, 16, filename, symbol_subset, origin, end) as window:
+                        np.testing.assert_array_equal(window.get_symbol_ids(), source.get_symbol_ids())
+                        np.testing.assert_array_equal(window.timestamps, source.timestamps)
+                        for minute in range(origin + 10, source.origin + source.get_minutes() - 20, 7):
+                            for a, b in ((minute - 10, minute), (minute, minute + 20), (minute, minute + 1)):
+                                for x, y in zip(window.get_partial_data(a, b), source.get_partial_data(a, b)):
+                                    np.testing.assert_array_equal(x, y)
+
+    def test_get_partial_data_returns_a_view_within_a_single_chunk(self):
+        """Auto-generated from _window.py:119"""
+        with Window(_Source, 10, "") as window:
+            _, data = window.get_partial_data(12, 17)
+            self.assertIs(data.base, window._chunks[1])
+            self.assertEqual(data.tolist(), [list(range(60, 85))])
+
+    def test_get_partial_data_joins_ranges_spanning_chunks(self):
+        """Auto-generated from _window.py:119"""
+        with Window(_Source, 10, "") as window:
+            timestamps, data = window.get_partial_data(8, 23)
+            self.assertEqual(timestamps.tolist(), (np.arange(8, 23) * 60).tolist())
+            self.assertEqual(data.tolist(), [list(range(40, 115))])
+
+    def test_get_partial_data_only_loads_the_chunks_covering_the_range(self):
+        """Auto-generated from _window.py:119"""
+        _Source.loads = []
+        with Window(_Source, 10, "") as window:
+            window.get_partial_data(25, 42)
+            self.assertEqual(sorted(window._chunks), [2, 3, 4])
+        self.assertEqual(_Source.loads, [20, 30, 40])
+
+    def test_get_partial_data_releases_chunks_before_origin(self):
+        """Auto-generated from _window.py:119"""
+        with Window(_Source, 10, "") as window:
+            for minute in range(0, 60, 5):
+                window.get_partial_data(minute, minute + 5)
+            self.assertEqual(sorted(window._chunks), [5])
+
+    def test_get_partial_data_reloads_released_chunks_if_asked_for_again(self):
+        """Auto-generated from _window.py:119"""
+        _Source.loads = []
+        with Window(_Source, 10, "") as window:
+            window.get_partial_data(5, 10)
+            window.get_partial_data(35, 40)
+            _, data = window.get_partial_data(5, 10)
+            self.assertEqual(data.tolist(), [list(range(25, 50))])
+        self.assertEqual(_Source.loads, [0, 30, 0])
+
+    def test_get_partial_data_keeps_the_chunks_another_length_of_range_is_still_reading(self):
+        """Auto-generated from _window.py:125"""
+        _Source.loads = []
+        with Window(_Source, 10, "") as window:
+            # As a Period reads: the past minutes, then the hold.
+            for minute in range(10, 80, 5):
+                window.get_partial_data(minute - 6, minute)
+                window.get_partial_data(minute, minute + 15)
+        self.assertEqual(_Source.loads, list(range(0, 90, 10)))
+
+    def test_get_partial_data_forgets_lengths_of_range_no_longer_being_read(self):
+        """Auto-generated from _window.py:125"""
+        with Window(_Source, 10, "") as window:
+            window.get_partial_data(0, 1)
+            for minute in range(10, 80, 5):
+                window.get_partial_data(minute - 6, minute)
+                window.get_partial_data(minute, minute + 15)
+            self.assertEqual(sorted(window._chunks), [6, 7, 8])
+
+
+if __name__ == '__main__':
+    ut.main()